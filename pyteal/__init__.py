@@ -1,6 +1,7 @@
 from pyteal.ast import *
 from pyteal.ast import __all__ as ast_all
 from pyteal.compiler import (
+    BudgetEstimate,
     DEFAULT_PROGRAM_VERSION,
     DEFAULT_TEAL_VERSION,
     MAX_PROGRAM_VERSION,
@@ -10,9 +11,12 @@ from pyteal.compiler import (
     Compilation,
     CompileOptions,
     CompileResults,
+    CostProfiler,
+    LineProfile,
     OptimizeOptions,
     PyTealSourceMap,
     R3SourceMap,
+    SubroutineProfile,
     compileTeal,
 )
 from pyteal.config import (
@@ -34,6 +38,7 @@ from pyteal.errors import (
 from pyteal.ir import *
 from pyteal.ir import __all__ as ir_all
 from pyteal.pragma import pragma
+from pyteal.stack_frame import sourcemapping_context
 from pyteal.types import TealType
 
 # begin __all__
@@ -42,12 +47,15 @@ __all__ = (
     + ir_all
     + [
         "AlgodClientError",
+        "BudgetEstimate",
         "Compilation",
         "CompileOptions",
         "CompileResults",
         "compileTeal",
+        "CostProfiler",
         "DEFAULT_PROGRAM_VERSION",
         "DEFAULT_TEAL_VERSION",
+        "LineProfile",
         "MAX_GROUP_SIZE",
         "MAX_PROGRAM_VERSION",
         "MAX_TEAL_VERSION",
@@ -61,6 +69,8 @@ __all__ = (
         "R3SourceMap",
         "RETURN_HASH_PREFIX",
         "SourceMapDisabledError",
+        "sourcemapping_context",
+        "SubroutineProfile",
         "TealCompileError",
         "TealInputError",
         "TealInternalError",
@@ -4,6 +4,7 @@
 from pyteal.ast import *
 from pyteal.ast import __all__ as ast_all
 from pyteal.compiler import (
+    BudgetEstimate,
     DEFAULT_PROGRAM_VERSION,
     DEFAULT_TEAL_VERSION,
     MAX_PROGRAM_VERSION,
@@ -13,9 +14,12 @@ from pyteal.compiler import (
     Compilation,
     CompileOptions,
     CompileResults,
+    CostProfiler,
+    LineProfile,
     OptimizeOptions,
     PyTealSourceMap,
     R3SourceMap,
+    SubroutineProfile,
     compileTeal,
 )
 from pyteal.config import (
@@ -37,6 +41,7 @@ from pyteal.errors import (
 from pyteal.ir import *
 from pyteal.ir import __all__ as ir_all
 from pyteal.pragma import pragma
+from pyteal.stack_frame import sourcemapping_context
 from pyteal.types import TealType
 
 __all__ = [
@@ -69,17 +74,26 @@ __all__ = [
     "BitwiseOr",
     "BitwiseXor",
     "Block",
+    "BoxArray",
+    "BoxCopy",
     "BoxCreate",
     "BoxDelete",
+    "BoxElement",
     "BoxExtract",
     "BoxGet",
+    "BoxHash",
+    "BoxIterChunks",
     "BoxLen",
+    "BoxMap",
+    "BoxMapEntry",
     "BoxPut",
     "BoxReplace",
     "BoxResize",
     "BoxSplice",
+    "BoxStruct",
     "Break",
     "Btoi",
+    "BudgetEstimate",
     "Bytes",
     "BytesAdd",
     "BytesAnd",
@@ -106,6 +120,7 @@ __all__ = [
     "Concat",
     "Cond",
     "Continue",
+    "CostProfiler",
     "DEFAULT_PROGRAM_VERSION",
     "DEFAULT_TEAL_VERSION",
     "Div",
@@ -151,6 +166,7 @@ __all__ = [
     "ImportScratchValue",
     "InnerTxn",
     "InnerTxnAction",
+    "InnerTxnBatch",
     "InnerTxnBuilder",
     "InnerTxnGroup",
     "Int",
@@ -161,6 +177,7 @@ __all__ = [
     "Le",
     "LeafExpr",
     "Len",
+    "LineProfile",
     "Log",
     "Lt",
     "MAX_GROUP_SIZE",
@@ -219,11 +236,13 @@ __all__ = [
     "ShiftRight",
     "SourceMapDisabledError",
     "Sqrt",
+    "StateCache",
     "Subroutine",
     "SubroutineCall",
     "SubroutineDeclaration",
     "SubroutineDefinition",
     "SubroutineFnWrapper",
+    "SubroutineProfile",
     "Substring",
     "Suffix",
     "TealBlock",
@@ -257,5 +276,8 @@ __all__ = [
     "WideRatio",
     "abi",
     "compileTeal",
+    "interning_context",
     "pragma",
+    "sourcemapping_context",
+    "with_state_cache",
 ]
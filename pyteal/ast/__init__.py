@@ -1,5 +1,5 @@
 # abstract types
-from pyteal.ast.expr import Expr
+from pyteal.ast.expr import Expr, interning_context
 
 # basic types
 from pyteal.ast.leafexpr import LeafExpr
@@ -27,7 +27,15 @@ from pyteal.ast.gload import ImportScratchValue
 from pyteal.ast.global_ import Global, GlobalField
 from pyteal.ast.stake import OnlineStake
 
-from pyteal.ast.app import App, AppField, OnComplete, AppParam, AppParamObject
+from pyteal.ast.app import (
+    App,
+    AppField,
+    OnComplete,
+    AppParam,
+    AppParamObject,
+    StateCache,
+    with_state_cache,
+)
 from pyteal.ast.asset import (
     AssetHolding,
     AssetHoldingObject,
@@ -45,11 +53,14 @@ from pyteal.ast.box import (
     BoxLen,
     BoxGet,
     BoxPut,
+    BoxIterChunks,
+    BoxHash,
+    BoxCopy,
 )
 from pyteal.ast.voter import VoterParam, VoterParamObject
 
 # inner txns
-from pyteal.ast.itxn import InnerTxnBuilder, InnerTxn, InnerTxnAction
+from pyteal.ast.itxn import InnerTxnBuilder, InnerTxn, InnerTxnAction, InnerTxnBatch
 
 # meta
 from pyteal.ast.array import Array
@@ -191,6 +202,13 @@ from pyteal.ast.router import (
     Router,
     RouterResults,
 )
+from pyteal.ast.boxcollection import (
+    BoxArray,
+    BoxElement,
+    BoxMap,
+    BoxMapEntry,
+    BoxStruct,
+)
 
 # abi
 import pyteal.ast.abi as abi  # noqa: I250
@@ -225,15 +243,23 @@ __all__ = [
     "BitwiseOr",
     "BitwiseXor",
     "Block",
+    "BoxArray",
+    "BoxCopy",
     "BoxCreate",
+    "BoxElement",
     "BoxResize",
     "BoxDelete",
     "BoxExtract",
     "BoxSplice",
     "BoxGet",
+    "BoxHash",
+    "BoxIterChunks",
     "BoxLen",
+    "BoxMap",
+    "BoxMapEntry",
     "BoxPut",
     "BoxReplace",
+    "BoxStruct",
     "Break",
     "Btoi",
     "Bytes",
@@ -302,9 +328,11 @@ __all__ = [
     "ImportScratchValue",
     "InnerTxn",
     "InnerTxnAction",
+    "InnerTxnBatch",
     "InnerTxnBuilder",
     "InnerTxnGroup",
     "Int",
+    "interning_context",
     "Itob",
     "JsonRef",
     "Keccak256",
@@ -355,6 +383,7 @@ __all__ = [
     "ShiftLeft",
     "ShiftRight",
     "Sqrt",
+    "StateCache",
     "Subroutine",
     "SubroutineCall",
     "SubroutineDeclaration",
@@ -377,4 +406,5 @@ __all__ = [
     "VrfVerify",
     "While",
     "WideRatio",
+    "with_state_cache",
 ]
@@ -117,9 +117,12 @@ def _encode_tuple(values: Sequence[BaseType]) -> Expr:
     return Concat(*toConcat)
 
 
-def _index_tuple(
-    value_types: Sequence[TypeSpec], encoded: Expr, index: int, output: BaseType
-) -> Expr:
+def _tuple_head_bit_offset(value_types: Sequence[TypeSpec], index: int) -> int:
+    """Get the bit offset of a tuple value's head in the tuple encoding.
+
+    Bool values are packed into bit sequences, so only their offset may not be a multiple of
+    NUM_BITS_IN_BYTE. The head of a dynamic value is its uint16 tail offset.
+    """
     if not (0 <= index < len(value_types)):
         raise ValueError("Index outside of range")
 
@@ -145,18 +148,26 @@ def _index_tuple(
 
         offset += typeBefore.byte_length_static()
 
+    if value_types[index] == BoolTypeSpec() and ignoreNext > 0:
+        # value is in the middle of a bool sequence
+        bitOffsetInBoolSeq = lastBoolLength - ignoreNext
+        return lastBoolStart * NUM_BITS_IN_BYTE + bitOffsetInBoolSeq
+
+    # value is the beginning of a bool sequence (or a single bool), or not a bool at all
+    return offset * NUM_BITS_IN_BYTE
+
+
+def _index_tuple(
+    value_types: Sequence[TypeSpec], encoded: Expr, index: int, output: BaseType
+) -> Expr:
+    bitOffsetInEncoded = _tuple_head_bit_offset(value_types, index)
+    offset = bitOffsetInEncoded // NUM_BITS_IN_BYTE
+
     valueType = value_types[index]
     if output.type_spec() != valueType:
         raise TypeError("Output type does not match value type")
 
     if type(output) is Bool:
-        if ignoreNext > 0:
-            # value is in the middle of a bool sequence
-            bitOffsetInBoolSeq = lastBoolLength - ignoreNext
-            bitOffsetInEncoded = lastBoolStart * NUM_BITS_IN_BYTE + bitOffsetInBoolSeq
-        else:
-            # value is the beginning of a bool sequence (or a single bool)
-            bitOffsetInEncoded = offset * NUM_BITS_IN_BYTE
         return output.decode_bit(encoded, Int(bitOffsetInEncoded))
 
     if valueType.is_dynamic():
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Final
+from typing import TYPE_CHECKING, Callable, Final, Sequence, cast
 from enum import Enum
 from pyteal.ast.box import (
     BoxCreate,
@@ -12,15 +12,22 @@ from pyteal.ast.box import (
     BoxPut,
 )
 
+from pyteal.errors import TealInputError
 from pyteal.types import TealType, require_type
 from pyteal.ir import TealOp, Op, TealBlock
 from pyteal.ast.leafexpr import LeafExpr
 from pyteal.ast.expr import Expr
 from pyteal.ast.maybe import MaybeValue
-from pyteal.ast.int import EnumInt
+from pyteal.ast.int import EnumInt, Int
 from pyteal.ast.global_ import Global
+from pyteal.ast.abstractvar import AbstractVar, alloc_abstract_var
+from pyteal.ast.bytes import Bytes
+from pyteal.ast.if_ import If
+from pyteal.ast.seq import Seq
+from pyteal.ast.unaryexpr import Not
 
 if TYPE_CHECKING:
+    from pyteal.ast.frame import Proto
     from pyteal.compiler import CompileOptions
 
 
@@ -68,6 +75,8 @@ AppField.__module__ = "pyteal"
 class App(LeafExpr):
     """An expression related to applications."""
 
+    __slots__ = ("field", "args")
+
     def __init__(self, field: AppField, args) -> None:
         super().__init__()
         self.field = field
@@ -343,6 +352,318 @@ class App(LeafExpr):
 App.__module__ = "pyteal"
 
 
+class _CachedStateKey:
+    """The variables of a key of a StateCache in one subroutine, allocated on first use."""
+
+    def __init__(self, key: str | bytes, local: bool) -> None:
+        self.key = key
+        self.local = local
+        self.value: AbstractVar | None = None
+        self.dirty: AbstractVar | None = None
+        # whether a local key was read from the account since the scope started
+        self.loaded: AbstractVar | None = None
+        self.read = False
+
+    def name(self) -> Expr:
+        return Bytes(self.key)
+
+    def value_var(self) -> AbstractVar:
+        if self.value is None:
+            self.value = alloc_abstract_var(TealType.anytype)
+        return self.value
+
+    def dirty_var(self) -> AbstractVar:
+        if self.dirty is None:
+            self.dirty = alloc_abstract_var(TealType.uint64)
+        return self.dirty
+
+    def loaded_var(self) -> AbstractVar:
+        if self.loaded is None:
+            self.loaded = alloc_abstract_var(TealType.uint64)
+        return self.loaded
+
+
+class _StateCacheSync(Expr):
+    """Loads or flushes the keys of a StateCache that the program ended up using.
+
+    The set of used keys is only known once the whole scope has been built, so the expression is
+    generated at compile time.
+    """
+
+    def __init__(
+        self,
+        cache: "StateCache",
+        keys: dict[tuple[bool, bytes], _CachedStateKey],
+        flush: bool,
+    ) -> None:
+        super().__init__()
+        self.cache = cache
+        self.keys = keys
+        self.flush = flush
+
+    def __teal__(self, options: "CompileOptions"):
+        if self.flush:
+            expr = self.cache._flush_expr(self.keys)
+        else:
+            expr = self.cache._load_expr(self.keys)
+        return expr.__teal__(options)
+
+    def __str__(self):
+        return "(StateCache {})".format("flush" if self.flush else "load")
+
+    def type_of(self):
+        return TealType.none
+
+    def has_return(self):
+        return False
+
+
+class StateCache:
+    """A read-through, write-back cache over declared application state keys.
+
+    Reads of a cached key are served from a frame variable (or a scratch slot outside of
+    subroutines), and writes only update that variable and mark the key as dirty. Dirty keys are
+    written back to the application state by :any:`StateCache.flush`, which runs once when the
+    scope built with :any:`StateCache.scope` ends.
+
+    Only the keys that are used somewhere in the scope are loaded, and keys that are only ever
+    written are not loaded at all. Global keys are loaded when the scope starts. Local keys are
+    loaded when they are first read, so a read of the local state of an account that may not have
+    opted in can be guarded by the body.
+
+    The cache keeps its values in variables of the subroutine where it is used, which are
+    allocated separately in each subroutine. So a cache can be created anywhere, but the
+    expressions reading, writing and flushing it must be used in the same subroutine as its
+    scope, or in the main program.
+
+    NOTE: Inner transactions and early exits such as :any:`Return` or :any:`Approve` do not flush
+    the cache. Call :any:`StateCache.flush` before submitting an inner transaction that may read
+    this application's state, and before leaving the scope early.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str | bytes] = (),
+        *,
+        local_keys: Sequence[str | bytes] = (),
+        account: Expr | None = None,
+    ) -> None:
+        """Create a new StateCache.
+
+        Args:
+            keys: The global state keys that may be read or written through this cache.
+            local_keys (optional): The local state keys that may be read or written through this
+                cache.
+            account (optional): The account whose local state is cached. Required if local_keys
+                is not empty. See :any:`App.localGet` for the accepted values.
+        """
+        if local_keys and account is None:
+            raise TealInputError("An account is required to cache local state keys")
+        if account is not None:
+            require_type(account, TealType.anytype)
+
+        self.account = account
+        self._declared: dict[tuple[bool, bytes], str | bytes] = {}
+        for local, declared in ((False, keys), (True, local_keys)):
+            for key in declared:
+                if not isinstance(key, (str, bytes)):
+                    raise TealInputError(
+                        "State cache keys must be str or bytes, got {}".format(
+                            type(key)
+                        )
+                    )
+                normalized = key.encode("utf-8") if isinstance(key, str) else key
+                if (local, normalized) in self._declared:
+                    raise TealInputError(
+                        "State cache key {!r} is declared twice".format(key)
+                    )
+                self._declared[(local, normalized)] = key
+
+        # the keys of the cache in each subroutine where it is used, see _keys
+        self._allocated: list[
+            tuple["Proto | None", dict[tuple[bool, bytes], _CachedStateKey]]
+        ] = []
+
+    def _keys(self) -> dict[tuple[bool, bytes], _CachedStateKey]:
+        """Get the keys of the cache in the subroutine being built, whose variables are allocated
+        there on first use."""
+        from pyteal.ast.subroutine import SubroutineEval
+
+        proto = SubroutineEval._current_proto
+        for owner, keys in self._allocated:
+            if owner is proto:
+                return keys
+
+        keys = {
+            (local, normalized): _CachedStateKey(key, local)
+            for (local, normalized), key in self._declared.items()
+        }
+        self._allocated.append((proto, keys))
+        return keys
+
+    def _lookup(self, key: str | bytes, local: bool) -> _CachedStateKey:
+        normalized = key.encode("utf-8") if isinstance(key, str) else key
+        cached = self._keys().get((local, normalized))
+        if cached is None:
+            raise TealInputError(
+                "{} state key {!r} is not declared in this cache".format(
+                    "Local" if local else "Global", key
+                )
+            )
+        return cached
+
+    def _get(self, key: str | bytes, local: bool) -> Expr:
+        cached = self._lookup(key, local)
+        cached.read = True
+        if not local:
+            return cached.value_var().load()
+
+        loaded = cached.loaded_var()
+        return Seq(
+            If(Not(loaded.load())).Then(
+                cached.value_var().store(self._read(cached)), loaded.store(Int(1))
+            ),
+            cached.value_var().load(),
+        )
+
+    def _put(self, key: str | bytes, value: Expr, local: bool) -> Expr:
+        require_type(value, TealType.anytype)
+        cached = self._lookup(key, local)
+        # a local key that is written must not be loaded by a later read
+        marks = [cached.loaded_var().store(Int(1))] if local else []
+        return Seq(
+            cached.value_var().store(value), cached.dirty_var().store(Int(1)), *marks
+        )
+
+    def get(self, key: str | bytes) -> Expr:
+        """Read a cached global state key.
+
+        Args:
+            key: A key passed to this cache's keys argument.
+        """
+        return self._get(key, False)
+
+    def put(self, key: str | bytes, value: Expr) -> Expr:
+        """Write a cached global state key.
+
+        The value is written to the application's global state on the next flush.
+
+        Args:
+            key: A key passed to this cache's keys argument.
+            value: The value to write. Can evaluate to any type.
+        """
+        return self._put(key, value, False)
+
+    def local_get(self, key: str | bytes) -> Expr:
+        """Read a cached local state key of the cache's account.
+
+        Args:
+            key: A key passed to this cache's local_keys argument.
+        """
+        return self._get(key, True)
+
+    def local_put(self, key: str | bytes, value: Expr) -> Expr:
+        """Write a cached local state key of the cache's account.
+
+        The value is written to the account's local state on the next flush.
+
+        Args:
+            key: A key passed to this cache's local_keys argument.
+            value: The value to write. Can evaluate to any type.
+        """
+        return self._put(key, value, True)
+
+    def flush(self) -> Expr:
+        """Write the dirty keys of this cache back to the application state.
+
+        Keys that were not written since the last flush are skipped.
+        """
+        return _StateCacheSync(self, self._keys(), True)
+
+    def scope(self, body: Expr) -> Expr:
+        """Run an expression with this cache, loading the keys it reads first and flushing the
+        dirty keys once it completes.
+
+        Args:
+            body: The expression that reads and writes state through this cache. Must evaluate
+                to none.
+        """
+        require_type(body, TealType.none)
+        return Seq(_StateCacheSync(self, self._keys(), False), body, self.flush())
+
+    def _read(self, cached: _CachedStateKey) -> Expr:
+        if cached.local:
+            return App.localGet(cast(Expr, self.account), cached.name())
+        return App.globalGet(cached.name())
+
+    def _write(self, cached: _CachedStateKey, value: Expr) -> Expr:
+        if cached.local:
+            return App.localPut(cast(Expr, self.account), cached.name(), value)
+        return App.globalPut(cached.name(), value)
+
+    def _load_expr(self, keys: dict[tuple[bool, bytes], _CachedStateKey]) -> Expr:
+        loads: list[Expr] = []
+        for cached in keys.values():
+            if cached.read:
+                # local keys are read on first use, but their variable is set on every path
+                value = Int(0) if cached.local else self._read(cached)
+                loads.append(cached.value_var().store(value))
+            if cached.loaded is not None:
+                loads.append(cached.loaded.store(Int(0)))
+            if cached.dirty is not None:
+                loads.append(cached.dirty.store(Int(0)))
+        return Seq(loads)
+
+    def _flush_expr(self, keys: dict[tuple[bool, bytes], _CachedStateKey]) -> Expr:
+        writes: list[Expr] = []
+        for cached in keys.values():
+            if cached.dirty is None:
+                continue
+            writes.append(
+                If(cached.dirty.load()).Then(
+                    self._write(cached, cached.value_var().load()),
+                    cached.dirty.store(Int(0)),
+                )
+            )
+        return Seq(writes)
+
+
+StateCache.__module__ = "pyteal"
+
+
+def with_state_cache(
+    body: Callable[[StateCache], Expr],
+    *,
+    keys: Sequence[str | bytes] = (),
+    local_keys: Sequence[str | bytes] = (),
+    account: Expr | None = None,
+) -> Expr:
+    """Run an expression with a new :any:`StateCache` over the given state keys.
+
+    Example:
+        .. code-block:: python
+
+            with_state_cache(
+                lambda cache: Seq(
+                    cache.put("count", cache.get("count") + Int(1)),
+                    cache.put("total", cache.get("total") + cache.get("count")),
+                ),
+                keys=["count", "total"],
+            )
+
+    Args:
+        body: A callable which receives the cache and returns the expression to run with it.
+            The expression must evaluate to none.
+        keys (optional): The global state keys that may be read or written through the cache.
+        local_keys (optional): The local state keys that may be read or written through the
+            cache.
+        account (optional): The account whose local state is cached. Required if local_keys is
+            not empty.
+    """
+    cache = StateCache(keys, local_keys=local_keys, account=account)
+    return cache.scope(body(cache))
+
+
 class AppParam:
     @classmethod
     def approvalProgram(cls, app: Expr) -> MaybeValue:
@@ -710,3 +710,185 @@ def test_AppParamObject():
             obj.creator_address(), pt.AppParam.creator(app), avm5Options
         )
         assert_MaybeValue_equality(obj.address(), pt.AppParam.address(app), avm5Options)
+
+
+def compile_state_cache(expr: pt.Expr) -> list[str]:
+    program = pt.compileTeal(pt.Seq(expr, pt.Approve()), pt.Mode.Application, version=8)
+    return program.splitlines()[1:-2]
+
+
+def test_state_cache_read_only():
+    lines = compile_state_cache(
+        pt.with_state_cache(
+            lambda cache: pt.Seq(
+                pt.Pop(cache.get("count")),
+                pt.Pop(cache.get("count")),
+            ),
+            keys=["count", "unused"],
+        )
+    )
+    assert lines == [
+        'byte "count"',
+        "app_global_get",
+        "store 0",
+        "load 0",
+        "pop",
+        "load 0",
+        "pop",
+    ]
+
+
+def test_state_cache_write_back():
+    lines = compile_state_cache(
+        pt.with_state_cache(
+            lambda cache: pt.Seq(
+                cache.put("count", cache.get("count") + pt.Int(1)),
+                cache.put("count", cache.get("count") + pt.Int(1)),
+            ),
+            keys=["count"],
+        )
+    )
+    assert lines == [
+        'byte "count"',
+        "app_global_get",
+        "store 0",
+        "int 0",
+        "store 1",
+        "load 0",
+        "int 1",
+        "+",
+        "store 0",
+        "int 1",
+        "store 1",
+        "load 0",
+        "int 1",
+        "+",
+        "store 0",
+        "int 1",
+        "store 1",
+        "load 1",
+        "bz main_l2",
+        'byte "count"',
+        "load 0",
+        "app_global_put",
+        "int 0",
+        "store 1",
+        "main_l2:",
+    ]
+    assert lines.count("app_global_get") == 1
+    assert lines.count("app_global_put") == 1
+
+
+def test_state_cache_write_only_local():
+    cache = pt.StateCache(local_keys=[b"seen"], account=pt.Txn.sender())
+    lines = compile_state_cache(cache.scope(cache.local_put(b"seen", pt.Int(1))))
+    assert "app_local_get" not in lines
+    assert lines[:4] == ["int 0", "store 0", "int 0", "store 2"]
+    assert lines[-9:] == [
+        "load 2",
+        "bz main_l2",
+        "txn Sender",
+        "byte 0x7365656e",
+        "load 1",
+        "app_local_put",
+        "int 0",
+        "store 2",
+        "main_l2:",
+    ]
+
+
+def test_state_cache_local_read_on_first_get():
+    cache = pt.StateCache(local_keys=["seen"], account=pt.Txn.sender())
+    opted_in = pt.App.optedIn(pt.Txn.sender(), pt.Global.current_application_id())
+    lines = compile_state_cache(
+        cache.scope(
+            pt.If(opted_in).Then(
+                cache.local_put("seen", cache.local_get("seen") + pt.Int(1)),
+                pt.Pop(cache.local_get("seen")),
+            )
+        )
+    )
+
+    # the account's local state is only read behind the body's guard, by each get that finds
+    # the key not loaded yet
+    assert lines.index("app_opted_in") < lines.index("app_local_get")
+    assert lines.count("app_local_get") == 2
+    assert lines.count("!") == 2
+
+
+def test_state_cache_flush_before_inner_txn():
+    cache = pt.StateCache(["total"])
+    body = pt.Seq(
+        cache.put("total", pt.Int(5)),
+        cache.flush(),
+        pt.InnerTxnBuilder.Execute({pt.TxnField.type_enum: pt.TxnType.Payment}),
+    )
+    lines = compile_state_cache(cache.scope(body))
+    assert lines.count("app_global_put") == 2
+
+    # the first flush branches to its write and back before the inner transaction
+    assert lines[6:10] == ["load 1", "bnz main_l3", "main_l1:", "itxn_begin"]
+    assert lines[lines.index("main_l3:") :][-2:] == ["b main_l1", "main_l4:"]
+
+
+def test_state_cache_frame_vars():
+    @pt.Subroutine(pt.TealType.uint64)
+    def bump():
+        return pt.Seq(
+            pt.with_state_cache(
+                lambda cache: cache.put("n", cache.get("n") + pt.Int(1)), keys=["n"]
+            ),
+            pt.Int(1),
+        )
+
+    program = pt.Compilation(
+        pt.Return(bump()),
+        pt.Mode.Application,
+        version=8,
+        optimize=pt.OptimizeOptions(frame_pointers=True),
+    ).compile()
+    assert "store" not in program.teal
+    assert program.teal.count("app_global_get") == 1
+
+
+def test_state_cache_vars_where_used():
+    # created outside of any subroutine, but used inside one with frame pointers
+    cache = pt.StateCache(["n"])
+
+    @pt.Subroutine(pt.TealType.none)
+    def bump():
+        return cache.scope(cache.put("n", cache.get("n") + pt.Int(1)))
+
+    program = pt.Compilation(
+        pt.Seq(
+            bump(),
+            cache.scope(cache.put("n", cache.get("n") * pt.Int(2))),
+            pt.Approve(),
+        ),
+        pt.Mode.Application,
+        version=8,
+        optimize=pt.OptimizeOptions(frame_pointers=True),
+    ).compile()
+    main, subroutine = program.teal.split("bump_0:")
+
+    # the subroutine caches the key in frame variables, the main program in slots
+    assert "store" not in subroutine and "load" not in subroutine
+    assert "frame_bury" in subroutine
+    assert "store 0" in main and "load 0" in main
+
+
+def test_state_cache_invalid():
+    with pytest.raises(pt.TealInputError):
+        pt.StateCache(local_keys=["x"])
+    with pytest.raises(pt.TealInputError):
+        pt.StateCache(["x", b"x"])
+    with pytest.raises(pt.TealInputError):
+        pt.StateCache([pt.Bytes("x")])  # type: ignore[list-item]
+
+    cache = pt.StateCache(["x"], local_keys=["y"], account=pt.Txn.sender())
+    with pytest.raises(pt.TealInputError):
+        cache.get("y")
+    with pytest.raises(pt.TealInputError):
+        cache.local_put("x", pt.Int(1))
+    with pytest.raises(pt.TealTypeError):
+        cache.scope(cache.get("x"))
@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 class Assert(Expr):
     """A control flow expression to verify that a condition is true."""
 
+    __slots__ = ("comment", "cond", "_sframes_container")
+
     def __init__(
         self, cond: Expr, *additional_conds: Expr, comment: str | None = None
     ) -> None:
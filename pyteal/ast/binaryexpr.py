@@ -2,7 +2,7 @@ from typing import Union, Tuple, cast, TYPE_CHECKING
 
 from pyteal.types import TealType, require_type
 from pyteal.errors import verifyProgramVersion
-from pyteal.ir import TealOp, Op, TealBlock
+from pyteal.ir import TealOp, Op, TealBlock, TealSimpleBlock
 from pyteal.ast.expr import Expr
 
 if TYPE_CHECKING:
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 class BinaryExpr(Expr):
     """An expression with two arguments."""
 
+    __slots__ = ("op", "outputType", "argLeft", "argRight")
+
     def __init__(
         self,
         op: Op,
@@ -35,15 +37,16 @@ class BinaryExpr(Expr):
         self.argRight = argRight
 
     def __teal__(self, options: "CompileOptions"):
+        return TealBlock.FromPath(options, self._teal_path(options))
+
+    def _teal_path(self, options: "CompileOptions"):
         verifyProgramVersion(
             self.op.min_version,
             options.version,
             "Program version too low to use op {}".format(self.op),
         )
 
-        return TealBlock.FromOp(
-            options, TealOp(self, self.op), self.argLeft, self.argRight
-        )
+        return [self.argLeft, self.argRight, TealSimpleBlock([TealOp(self, self.op)])]
 
     def __str__(self):
         return "({} {} {})".format(
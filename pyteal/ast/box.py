@@ -1,10 +1,18 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 from pyteal.ast.maybe import MaybeValue
-from pyteal.errors import verifyProgramVersion
+from pyteal.errors import TealInputError, verifyProgramVersion
 
 from pyteal.types import TealType, require_type
 from pyteal.ir import TealOp, Op, TealBlock
 from pyteal.ast.expr import Expr
+from pyteal.ast.int import Int
+from pyteal.ast.seq import Seq
+from pyteal.ast.if_ import If
+from pyteal.ast.for_ import For
+from pyteal.ast.assert_ import Assert
+from pyteal.ast.unaryexpr import Pop, Sha256
+from pyteal.ast.naryexpr import Concat
+from pyteal.ast.scratchvar import ScratchVar
 
 if TYPE_CHECKING:
     from pyteal.compiler import CompileOptions
@@ -332,3 +340,157 @@ class BoxPut(Expr):
 
 
 BoxPut.__module__ = "pyteal"
+
+
+# The maximum length of a byte string on the AVM stack
+MAX_STACK_BYTES = 4096
+
+# The digest length of the hash functions accepted by BoxHash
+HASH_DIGEST_LENGTH = 32
+
+
+def _for_each_box_chunk(
+    name: Expr,
+    length: ScratchVar,
+    start: int,
+    chunk_size: int,
+    action: Callable[[Expr, Expr], Expr],
+) -> Expr:
+    offset = ScratchVar(TealType.uint64)
+    chunk = ScratchVar(TealType.bytes)
+    remaining = length.load() - offset.load()
+    chunk_length = If(remaining > Int(chunk_size), Int(chunk_size), remaining)
+
+    return For(
+        offset.store(Int(start)),
+        offset.load() < length.load(),
+        offset.store(offset.load() + Int(chunk_size)),
+    ).Do(
+        chunk.store(BoxExtract(name, offset.load(), chunk_length)),
+        action(offset.load(), chunk.load()),
+    )
+
+
+def _box_length_into(name: Expr, length: ScratchVar) -> Expr:
+    box_length = BoxLen(name)
+    return Seq(
+        box_length,
+        Assert(box_length.hasValue()),
+        length.store(box_length.value()),
+    )
+
+
+def BoxIterChunks(
+    name: Expr,
+    action: Callable[[Expr, Expr], Expr],
+    chunk_size: int = MAX_STACK_BYTES,
+) -> Expr:
+    """Run an action over consecutive chunks of a box.
+
+    Unlike :any:`BoxGet`, this works on boxes larger than the maximum size of a stack value, since
+    only one chunk is read at a time. The program fails if the box does not exist.
+
+    For example:
+
+        .. code-block:: python
+
+            total = ScratchVar(TealType.uint64)
+            Seq(
+                total.store(Int(0)),
+                BoxIterChunks(
+                    Bytes("blob"),
+                    lambda offset, chunk: total.store(total.load() + Len(chunk)),
+                ),
+            )
+
+    Args:
+        name: The key the box was created with. Must evaluate to bytes.
+        action: A function that takes the offset of a chunk in the box and the chunk's bytes, and
+            returns an expression to run for that chunk. The last chunk may be shorter than
+            chunk_size.
+        chunk_size (optional): The number of bytes to read at a time, between 1 and 4096. Defaults
+            to 4096.
+    """
+    require_type(name, TealType.bytes)
+    if not (0 < chunk_size <= MAX_STACK_BYTES):
+        raise TealInputError(
+            f"chunk_size must be between 1 and {MAX_STACK_BYTES}, got {chunk_size}"
+        )
+
+    length = ScratchVar(TealType.uint64)
+    return Seq(
+        _box_length_into(name, length),
+        _for_each_box_chunk(name, length, 0, chunk_size, action),
+    )
+
+
+def BoxHash(name: Expr, hash_fn: Callable[[Expr], Expr] = Sha256) -> Expr:
+    """Hash the contents of a box of any size.
+
+    The AVM cannot hash incrementally, so boxes larger than the maximum size of a stack value are
+    hashed as a chain: the digest of the first 4096 bytes is concatenated with each following
+    chunk of up to 4064 bytes and hashed again. For boxes of up to 4096 bytes the result is the
+    plain digest of the contents. The program fails if the box does not exist.
+
+    Args:
+        name: The key the box was created with. Must evaluate to bytes.
+        hash_fn (optional): A function from bytes to their 32 byte digest, such as :any:`Sha256`,
+            :any:`Sha512_256`, :any:`Sha3_256` or :any:`Keccak256`. Defaults to :any:`Sha256`.
+
+    Returns:
+        An expression that evaluates to the 32 byte digest.
+    """
+    require_type(name, TealType.bytes)
+
+    length = ScratchVar(TealType.uint64)
+    digest = ScratchVar(TealType.bytes)
+    first_length = If(
+        length.load() > Int(MAX_STACK_BYTES), Int(MAX_STACK_BYTES), length.load()
+    )
+
+    return Seq(
+        _box_length_into(name, length),
+        digest.store(hash_fn(BoxExtract(name, Int(0), first_length))),
+        _for_each_box_chunk(
+            name,
+            length,
+            MAX_STACK_BYTES,
+            MAX_STACK_BYTES - HASH_DIGEST_LENGTH,
+            lambda _, chunk: digest.store(hash_fn(Concat(digest.load(), chunk))),
+        ),
+        digest.load(),
+    )
+
+
+def BoxCopy(src: Expr, dst: Expr, chunk_size: int = MAX_STACK_BYTES) -> Expr:
+    """Copy the contents of one box into another, one chunk at a time.
+
+    The destination box is created with the size of the source box if it does not exist. If it
+    exists with a different size, the program fails. The program also fails if the source box
+    does not exist.
+
+    Args:
+        src: The key of the box to copy from. Must evaluate to bytes.
+        dst: The key of the box to copy to. Must evaluate to bytes.
+        chunk_size (optional): The number of bytes to copy at a time, between 1 and 4096. Defaults
+            to 4096.
+    """
+    require_type(src, TealType.bytes)
+    require_type(dst, TealType.bytes)
+    if not (0 < chunk_size <= MAX_STACK_BYTES):
+        raise TealInputError(
+            f"chunk_size must be between 1 and {MAX_STACK_BYTES}, got {chunk_size}"
+        )
+
+    length = ScratchVar(TealType.uint64)
+    return Seq(
+        _box_length_into(src, length),
+        Pop(BoxCreate(dst, length.load())),
+        _for_each_box_chunk(
+            src,
+            length,
+            0,
+            chunk_size,
+            lambda offset, chunk: BoxReplace(dst, offset, chunk),
+        ),
+    )
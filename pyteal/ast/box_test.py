@@ -236,3 +236,70 @@ def test_box_put():
     actual = pt.TealBlock.NormalizeBlocks(actual)
 
     assert expected == actual
+
+
+def compiled_ops(expr: pt.Expr, version: int = 8) -> list[str]:
+    program = pt.compileTeal(
+        pt.Seq(expr, pt.Approve()), pt.Mode.Application, version=version
+    )
+    return [line.split()[0] for line in program.splitlines()[1:]]
+
+
+def test_box_iter_chunks():
+    lengths = pt.ScratchVar(pt.TealType.uint64)
+    expr = pt.BoxIterChunks(
+        pt.Bytes("blob"),
+        lambda offset, chunk: lengths.store(offset + pt.Len(chunk)),
+        chunk_size=100,
+    )
+    assert expr.type_of() == pt.TealType.none
+
+    program = pt.compileTeal(pt.Seq(expr, pt.Approve()), pt.Mode.Application, version=8)
+    assert "box_len" in program
+    assert program.count("box_extract") == 1
+    assert "int 100\n+" in program
+    assert "box_get" not in program
+
+    with pytest.raises(pt.TealInputError):
+        compiled_ops(expr, version=7)
+
+    for invalid_size in (0, 4097):
+        with pytest.raises(pt.TealInputError):
+            pt.BoxIterChunks(pt.Bytes("blob"), lambda o, c: pt.Pop(c), invalid_size)
+    with pytest.raises(pt.TealTypeError):
+        pt.BoxIterChunks(pt.Int(1), lambda o, c: pt.Pop(c))
+
+
+@pytest.mark.parametrize(
+    "hash_fn, hash_op", [(pt.Sha256, "sha256"), (pt.Sha512_256, "sha512_256")]
+)
+def test_box_hash(hash_fn, hash_op):
+    expr = pt.BoxHash(pt.Bytes("blob"), hash_fn)
+    assert expr.type_of() == pt.TealType.bytes
+
+    program = pt.compileTeal(
+        pt.Seq(pt.Pop(expr), pt.Approve()), pt.Mode.Application, version=8
+    )
+    # the first chunk is hashed directly, then the loop chains each digest with the next chunk
+    assert program.count(hash_op) == 2
+    assert "concat\n" + hash_op in program
+    assert "int 4064\n+" in program
+
+    with pytest.raises(pt.TealTypeError):
+        pt.BoxHash(pt.Int(1))
+
+
+def test_box_copy():
+    expr = pt.BoxCopy(pt.Bytes("src"), pt.Bytes("dst"), chunk_size=1024)
+    assert expr.type_of() == pt.TealType.none
+
+    ops = compiled_ops(expr)
+    assert ops.count("box_create") == 1
+    assert ops.count("box_extract") == 1
+    assert ops.count("box_replace") == 1
+    assert ops.index("box_create") < ops.index("box_extract")
+
+    with pytest.raises(pt.TealInputError):
+        pt.BoxCopy(pt.Bytes("src"), pt.Bytes("dst"), chunk_size=5000)
+    with pytest.raises(pt.TealTypeError):
+        pt.BoxCopy(pt.Bytes("src"), pt.Int(1))
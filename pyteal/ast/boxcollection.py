@@ -0,0 +1,571 @@
+from inspect import get_annotations
+from typing import Generic, TypeVar, Union, cast
+
+from pyteal.errors import TealInputError
+from pyteal.types import TealType, require_type
+from pyteal.ast.expr import Expr
+from pyteal.ast.int import Int
+from pyteal.ast.seq import Seq
+from pyteal.ast.assert_ import Assert
+from pyteal.ast.ternaryexpr import SetBit
+from pyteal.ast.unaryexpr import Pop, Sha256
+from pyteal.ast.naryexpr import Concat
+from pyteal.ast.box import (
+    BoxCreate,
+    BoxDelete,
+    BoxExtract,
+    BoxReplace,
+    BoxPut,
+    BoxLen,
+    BoxGet,
+)
+from pyteal.ast import abi
+from pyteal.ast.abi.tuple import _tuple_head_bit_offset
+from pyteal.ast.abi.uint import NUM_BITS_IN_BYTE
+from pyteal.ast.abi.util import type_spec_from_annotation
+
+T = TypeVar("T", bound=abi.BaseType)
+K = TypeVar("K", bound=abi.BaseType)
+V = TypeVar("V", bound=abi.BaseType)
+
+MAX_BOX_NAME_LENGTH = 64
+
+
+def _type_spec_of(value_type: Union[type[abi.BaseType], abi.TypeSpec]) -> abi.TypeSpec:
+    if isinstance(value_type, abi.TypeSpec):
+        return value_type
+    return type_spec_from_annotation(value_type)
+
+
+def _require_static(spec: abi.TypeSpec) -> None:
+    if spec.is_dynamic():
+        raise TealInputError(
+            f"Box collections require a static ABI type, but {spec} is dynamic"
+        )
+
+
+def _offset_expr(offset: Union[int, Expr]) -> Expr:
+    return Int(offset) if type(offset) is int else cast(Expr, offset)
+
+
+def _add_offset(base: Union[int, Expr], extra: Union[int, Expr]) -> Union[int, Expr]:
+    if type(base) is int and type(extra) is int:
+        return base + extra
+    if type(extra) is int and extra == 0:
+        return base
+    if type(base) is int and base == 0:
+        return extra
+    return _offset_expr(base) + _offset_expr(extra)
+
+
+class BoxElement(abi.ComputedValue[T]):
+    """A static ABI value stored at a fixed position inside a box.
+
+    Reading this value extracts only the bytes it occupies with :any:`BoxExtract`, and setting it
+    overwrites only those bytes with :any:`BoxReplace`. Bool values are packed into bits, so setting
+    one rewrites the single byte that contains it.
+
+    Elements of static arrays and fields of static tuples can be accessed with :code:`[]`, which
+    narrows the view further without reading the box.
+    """
+
+    def __init__(
+        self,
+        name: Expr,
+        spec: abi.TypeSpec,
+        byte_offset: Union[int, Expr] = 0,
+        bit_offset: Union[int, Expr, None] = None,
+        checks: list[Expr] | None = None,
+    ) -> None:
+        super().__init__()
+        _require_static(spec)
+        self.name = name
+        self.spec = spec
+        self.byte_offset = byte_offset
+        self.bit_offset = bit_offset
+        self.checks: list[Expr] = checks or []
+
+        if (bit_offset is None) == (spec == abi.BoolTypeSpec()):
+            raise TealInputError("A bit offset must be given exactly for Bool values")
+
+    def produced_type_spec(self) -> abi.TypeSpec:
+        return self.spec
+
+    def __with_checks(self, expr: Expr) -> Expr:
+        return Seq(*self.checks, expr) if self.checks else expr
+
+    def store_into(self, output: T) -> Expr:
+        """Read this value from the box into an ABI instance.
+
+        Args:
+            output: An ABI instance of the same type as this element.
+
+        Returns:
+            An expression which extracts the bytes of this element from the box and stores them
+            into output.
+        """
+        if output.type_spec() != self.spec:
+            raise TealInputError(
+                f"expected type_spec {self.spec} but get {output.type_spec()}"
+            )
+
+        if self.bit_offset is not None:
+            byte = BoxExtract(self.name, _offset_expr(self.byte_offset), Int(1))
+            return self.__with_checks(
+                cast(abi.Bool, output).decode_bit(byte, _offset_expr(self.bit_offset))
+            )
+
+        extracted = BoxExtract(
+            self.name,
+            _offset_expr(self.byte_offset),
+            Int(self.spec.byte_length_static()),
+        )
+        return self.__with_checks(output.decode(extracted))
+
+    def set(self, value: Union[T, abi.ComputedValue[T]]) -> Expr:
+        """Overwrite this value in the box.
+
+        The box must already exist and be large enough to hold this element.
+
+        Args:
+            value: An ABI instance or computed value of the same type as this element.
+
+        Returns:
+            An expression which writes the encoding of value into the box.
+        """
+        if isinstance(value, abi.ComputedValue):
+            return value.use(lambda v: self.set(cast(T, v)))
+
+        if value.type_spec() != self.spec:
+            raise TealInputError(
+                f"Cannot set box element of type {self.spec} to {value.type_spec()}"
+            )
+
+        offset = _offset_expr(self.byte_offset)
+        if self.bit_offset is not None:
+            bit = _offset_expr(self.bit_offset)
+            updated = SetBit(
+                BoxExtract(self.name, offset, Int(1)),
+                bit,
+                cast(abi.Bool, value).get(),
+            )
+            return self.__with_checks(BoxReplace(self.name, offset, updated))
+
+        return self.__with_checks(BoxReplace(self.name, offset, value.encode()))
+
+    def __getitem__(self, index: Union[int, str, Expr]) -> "BoxElement":
+        """Access an element of a static array or a field of a static tuple in the box.
+
+        Args:
+            index: For static arrays, a Python integer or an expression that evaluates to
+                TealType.uint64. An out of bounds integer raises an error, and an out of bounds
+                expression fails the program at runtime. For tuples, a Python integer, or a field
+                name if the tuple is a NamedTuple.
+
+        Returns:
+            A BoxElement that covers just the bytes of the selected value.
+        """
+        if isinstance(self.spec, abi.StaticArrayTypeSpec):
+            return self.__array_element(self.spec, index)
+        if isinstance(self.spec, abi.TupleTypeSpec):
+            return self.__tuple_field(self.spec, index)
+        raise TealInputError(f"Cannot index into a box value of type {self.spec}")
+
+    def __array_element(
+        self, spec: abi.StaticArrayTypeSpec, index: Union[int, str, Expr]
+    ) -> "BoxElement":
+        checks = list(self.checks)
+        length = spec.length_static()
+
+        if isinstance(index, str):
+            raise TealInputError(f"Cannot index array {spec} with a field name")
+        if type(index) is int:
+            if not (0 <= index < length):
+                raise TealInputError(f"Index out of bounds: {index}")
+        else:
+            require_type(cast(Expr, index), TealType.uint64)
+            checks.append(Assert(cast(Expr, index) < Int(length)))
+
+        value_spec = spec.value_type_spec()
+        if value_spec == abi.BoolTypeSpec():
+            if type(index) is int:
+                byte: Union[int, Expr] = index // NUM_BITS_IN_BYTE
+                bit: Union[int, Expr] = index % NUM_BITS_IN_BYTE
+            else:
+                byte = cast(Expr, index) / Int(NUM_BITS_IN_BYTE)
+                bit = cast(Expr, index) % Int(NUM_BITS_IN_BYTE)
+            return BoxElement(
+                self.name, value_spec, _add_offset(self.byte_offset, byte), bit, checks
+            )
+
+        stride = spec._stride()
+        if type(index) is int:
+            offset: Union[int, Expr] = stride * index
+        else:
+            offset = Int(stride) * cast(Expr, index)
+        return BoxElement(
+            self.name,
+            value_spec,
+            _add_offset(self.byte_offset, offset),
+            checks=checks,
+        )
+
+    def __tuple_field(
+        self, spec: abi.TupleTypeSpec, index: Union[int, str, Expr]
+    ) -> "BoxElement":
+        if isinstance(index, str):
+            if not isinstance(spec, abi.NamedTupleTypeSpec):
+                raise TealInputError(f"Tuple {spec} has no field names")
+            fields = list(get_annotations(spec.instance_class))
+            if index not in fields:
+                raise TealInputError(f"{spec.instance_class} has no field {index}")
+            index = fields.index(index)
+        if type(index) is not int:
+            raise TealInputError("Tuple fields must be indexed with a Python int")
+
+        value_specs = spec.value_type_specs()
+        try:
+            bit_offset = _tuple_head_bit_offset(value_specs, index)
+        except ValueError:
+            raise TealInputError(f"Index out of bounds: {index}")
+
+        byte_offset = _add_offset(self.byte_offset, bit_offset // NUM_BITS_IN_BYTE)
+        value_spec = value_specs[index]
+        if value_spec == abi.BoolTypeSpec():
+            return BoxElement(
+                self.name,
+                value_spec,
+                byte_offset,
+                bit_offset % NUM_BITS_IN_BYTE,
+                list(self.checks),
+            )
+        return BoxElement(self.name, value_spec, byte_offset, checks=list(self.checks))
+
+
+BoxElement.__module__ = "pyteal"
+
+
+class _BoxCollection:
+    def __init__(self, name: Expr, spec: abi.TypeSpec) -> None:
+        require_type(name, TealType.bytes)
+        _require_static(spec)
+        self.name = name
+        self.spec = spec
+        self._root: BoxElement = BoxElement(name, spec)
+
+    def byte_length(self) -> int:
+        """Get the number of bytes needed to store this collection in a box."""
+        return self.spec.byte_length_static()
+
+    def create(self) -> Expr:
+        """Create the box with exactly the size of this collection.
+
+        Returns:
+            An expression that evaluates to 1 if the box was created, or 0 if it already existed.
+        """
+        return BoxCreate(self.name, Int(self.byte_length()))
+
+    def delete(self) -> Expr:
+        """Delete the box.
+
+        Returns:
+            An expression that evaluates to 1 if the box existed, or 0 otherwise.
+        """
+        return BoxDelete(self.name)
+
+    def store_into(self, output: abi.BaseType) -> Expr:
+        """Read the whole collection from the box into an ABI instance."""
+        return self._root.store_into(output)
+
+    def set(self, value: Union[abi.BaseType, abi.ComputedValue]) -> Expr:
+        """Write the whole collection into the box, creating the box if it does not exist."""
+        if isinstance(value, abi.ComputedValue):
+            return value.use(self.set)
+        if value.type_spec() != self.spec:
+            raise TealInputError(
+                f"Cannot set box of type {self.spec} to {value.type_spec()}"
+            )
+        return BoxPut(self.name, value.encode())
+
+
+class BoxArray(_BoxCollection, Generic[T]):
+    """A fixed length array of static ABI values stored in a single box.
+
+    The box layout is the ABI encoding of a static array, so reading or writing a single element
+    only touches that element's bytes.
+
+    For example:
+
+        .. code-block:: python
+
+            balances = BoxArray(Bytes("balances"), abi.Uint64, 100)
+
+            program = Seq(
+                Pop(balances.create()),
+                (amount := abi.Uint64()).set(10),
+                balances[Txn.application_args.length()].set(amount),
+                balances[0].store_into(amount),
+            )
+    """
+
+    def __init__(
+        self,
+        name: Expr,
+        value_type: Union[type[T], abi.TypeSpec],
+        length: int,
+    ) -> None:
+        """
+        Args:
+            name: The name of the box. Must evaluate to bytes.
+            value_type: The ABI type or TypeSpec of the elements. Must be static.
+            length: The number of elements in the array.
+        """
+        if length < 0:
+            raise TealInputError(f"Invalid BoxArray length {length}")
+        super().__init__(
+            name, abi.StaticArrayTypeSpec(_type_spec_of(value_type), length)
+        )
+
+    def length(self) -> Expr:
+        """Get the number of elements in this array."""
+        return Int(cast(abi.StaticArrayTypeSpec, self.spec).length_static())
+
+    def __getitem__(self, index: Union[int, Expr]) -> BoxElement[T]:
+        """Access an element of this array.
+
+        Args:
+            index: A Python integer or an expression that evaluates to TealType.uint64. An out of
+                bounds integer raises an error, and an out of bounds expression fails the program at
+                runtime.
+        """
+        return self._root[index]
+
+
+BoxArray.__module__ = "pyteal"
+
+
+class BoxStruct(_BoxCollection, Generic[T]):
+    """A static ABI tuple stored in a single box.
+
+    Each field can be read or written on its own, which only touches that field's bytes.
+
+    For example:
+
+        .. code-block:: python
+
+            class Config(abi.NamedTuple):
+                owner: abi.Field[abi.Address]
+                fee: abi.Field[abi.Uint64]
+                paused: abi.Field[abi.Bool]
+
+            config = BoxStruct(Bytes("config"), Config)
+
+            program = Seq(
+                (paused := abi.Bool()).set(True),
+                config["paused"].set(paused),
+                config.field("fee").store_into(fee := abi.Uint64()),
+            )
+    """
+
+    def __init__(self, name: Expr, value_type: Union[type[T], abi.TypeSpec]) -> None:
+        """
+        Args:
+            name: The name of the box. Must evaluate to bytes.
+            value_type: The ABI tuple type or TypeSpec of the value. Must be static.
+        """
+        spec = _type_spec_of(value_type)
+        if not isinstance(spec, abi.TupleTypeSpec):
+            raise TealInputError(f"BoxStruct requires a tuple type, got {spec}")
+        super().__init__(name, spec)
+
+    def field(self, index: Union[int, str]) -> BoxElement:
+        """Access a field of this struct by position, or by name for a NamedTuple."""
+        return self._root[index]
+
+    def __getitem__(self, index: Union[int, str]) -> BoxElement:
+        return self.field(index)
+
+
+BoxStruct.__module__ = "pyteal"
+
+
+class BoxMapEntry(abi.ComputedValue[V]):
+    """The box that holds the value for a single key of a :any:`BoxMap`."""
+
+    def __init__(self, name: Expr, spec: abi.TypeSpec) -> None:
+        super().__init__()
+        self.name = name
+        self.spec = spec
+
+    def produced_type_spec(self) -> abi.TypeSpec:
+        return self.spec
+
+    def exists(self) -> Expr:
+        """Check if a value is stored for this key.
+
+        Returns:
+            An expression that evaluates to 1 if the box exists, or 0 otherwise.
+        """
+        length = BoxLen(self.name)
+        return Seq(length, length.hasValue())
+
+    def create(self) -> Expr:
+        """Preallocate the box for this key. The value type must be static.
+
+        The box is zero filled, so fields can be written with :code:`[]` before a whole value is
+        ever set.
+
+        Returns:
+            An expression that evaluates to 1 if the box was created, or 0 if it already existed.
+        """
+        _require_static(self.spec)
+        return BoxCreate(self.name, Int(self.spec.byte_length_static()))
+
+    def delete(self) -> Expr:
+        """Delete the value for this key.
+
+        Returns:
+            An expression that evaluates to 1 if the box existed, or 0 otherwise.
+        """
+        return BoxDelete(self.name)
+
+    def store_into(self, output: V) -> Expr:
+        """Read the value for this key into an ABI instance. Fails if no value is stored.
+
+        Args:
+            output: An ABI instance of the value type.
+        """
+        if output.type_spec() != self.spec:
+            raise TealInputError(
+                f"expected type_spec {self.spec} but get {output.type_spec()}"
+            )
+
+        if not self.spec.is_dynamic():
+            return BoxElement[V](self.name, self.spec).store_into(output)
+
+        contents = BoxGet(self.name)
+        return Seq(
+            contents, Assert(contents.hasValue()), output.decode(contents.value())
+        )
+
+    def set(self, value: Union[V, abi.ComputedValue[V]]) -> Expr:
+        """Store a value for this key, creating the box if it does not exist.
+
+        Boxes of dynamic values are recreated, since their size may change.
+
+        Args:
+            value: An ABI instance or computed value of the value type.
+        """
+        if isinstance(value, abi.ComputedValue):
+            return value.use(lambda v: self.set(cast(V, v)))
+
+        if value.type_spec() != self.spec:
+            raise TealInputError(
+                f"Cannot set box map value of type {self.spec} to {value.type_spec()}"
+            )
+
+        if not self.spec.is_dynamic():
+            return BoxPut(self.name, value.encode())
+
+        return Seq(Pop(BoxDelete(self.name)), BoxPut(self.name, value.encode()))
+
+    def __getitem__(self, index: Union[int, str, Expr]) -> BoxElement:
+        """Access a field or element of a static value in place.
+
+        See :any:`BoxElement.__getitem__`.
+        """
+        return BoxElement(self.name, self.spec)[index]
+
+
+BoxMapEntry.__module__ = "pyteal"
+
+
+class BoxMap(Generic[K, V]):
+    """A mapping from ABI keys to ABI values, with one box per key.
+
+    The box name of a key is a fixed prefix followed by the ABI encoding of the key, or by its
+    sha256 hash when :code:`hash_keys` is set. Static values are stored at a fixed size, so a
+    single field can be updated with :any:`BoxReplace` without reading the rest of the value.
+
+    For example:
+
+        .. code-block:: python
+
+            class Account(abi.NamedTuple):
+                balance: abi.Field[abi.Uint64]
+                frozen: abi.Field[abi.Bool]
+
+            accounts = BoxMap(abi.Address, Account, prefix=Bytes("a"))
+
+            program = Seq(
+                (sender := abi.Address()).set(Txn.sender()),
+                Pop(accounts[sender].create()),
+                (amount := abi.Uint64()).set(Btoi(Txn.application_args[1])),
+                accounts[sender]["balance"].set(amount),
+            )
+    """
+
+    def __init__(
+        self,
+        key_type: Union[type[K], abi.TypeSpec],
+        value_type: Union[type[V], abi.TypeSpec],
+        *,
+        prefix: Expr | None = None,
+        hash_keys: bool = False,
+    ) -> None:
+        """
+        Args:
+            key_type: The ABI type or TypeSpec of the keys.
+            value_type: The ABI type or TypeSpec of the values.
+            prefix (optional): A bytes expression prepended to every box name, to keep this map
+                apart from other boxes of the application.
+            hash_keys (optional): If True, use the sha256 hash of the encoded key in box names.
+                This bounds the name length for large or dynamic keys, at the cost of one hash per
+                access. Defaults to False.
+        """
+        if prefix is not None:
+            require_type(prefix, TealType.bytes)
+
+        self.key_spec = _type_spec_of(key_type)
+        self.value_spec = _type_spec_of(value_type)
+        self.prefix = prefix
+        self.hash_keys = hash_keys
+
+        if (
+            not hash_keys
+            and not self.key_spec.is_dynamic()
+            and self.key_spec.byte_length_static() > MAX_BOX_NAME_LENGTH
+        ):
+            raise TealInputError(
+                f"Keys of type {self.key_spec} are longer than the maximum box name length "
+                f"{MAX_BOX_NAME_LENGTH}, use hash_keys=True"
+            )
+
+    def box_name(self, key: K) -> Expr:
+        """Get the box name that stores the value for a key.
+
+        Args:
+            key: An ABI instance of the key type.
+        """
+        if key.type_spec() != self.key_spec:
+            raise TealInputError(
+                f"Expected key of type {self.key_spec} but got {key.type_spec()}"
+            )
+
+        encoded = key.encode()
+        if self.hash_keys:
+            encoded = Sha256(encoded)
+        if self.prefix is None:
+            return encoded
+        return Concat(self.prefix, encoded)
+
+    def __getitem__(self, key: K) -> BoxMapEntry[V]:
+        """Access the value for a key.
+
+        Args:
+            key: An ABI instance of the key type.
+        """
+        return BoxMapEntry(self.box_name(key), self.value_spec)
+
+
+BoxMap.__module__ = "pyteal"
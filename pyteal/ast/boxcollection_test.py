@@ -0,0 +1,329 @@
+from typing import Literal
+
+import pytest
+
+import pyteal as pt
+from pyteal import abi
+
+
+class Config(abi.NamedTuple):
+    fee: abi.Field[abi.Uint64]
+    paused: abi.Field[abi.Bool]
+    frozen: abi.Field[abi.Bool]
+    flags: abi.Field[abi.StaticArray[abi.Bool, Literal[10]]]
+    owner: abi.Field[abi.Address]
+
+
+def compile_lines(expr: pt.Expr) -> list[str]:
+    program = pt.compileTeal(pt.Seq(expr, pt.Approve()), pt.Mode.Application, version=8)
+    return program.splitlines()[1:-2]
+
+
+def test_box_array_layout():
+    arr = pt.BoxArray(pt.Bytes("arr"), abi.Uint64, 100)
+    assert arr.byte_length() == 800
+    assert compile_lines(pt.Pop(arr.create())) == [
+        'byte "arr"',
+        "int 800",
+        "box_create",
+        "pop",
+    ]
+    assert compile_lines(pt.Pop(arr.delete())) == ['byte "arr"', "box_del", "pop"]
+
+    bools = pt.BoxArray(pt.Bytes("bools"), abi.Bool, 20)
+    assert bools.byte_length() == 3
+
+
+def test_box_array_element_int_index():
+    arr = pt.BoxArray(pt.Bytes("arr"), abi.Uint64, 100)
+    value = abi.Uint64()
+
+    lines = compile_lines(arr[3].store_into(value))
+    assert lines == [
+        'byte "arr"',
+        "int 24",
+        "int 8",
+        "box_extract",
+        "btoi",
+        "store 0",
+    ]
+
+    lines = compile_lines(pt.Seq(value.set(5), arr[99].set(value)))
+    assert lines[2:] == [
+        'byte "arr"',
+        "int 792",
+        "load 0",
+        "itob",
+        "box_replace",
+    ]
+
+    with pytest.raises(pt.TealInputError):
+        arr[100]
+    with pytest.raises(pt.TealInputError):
+        arr[-1]
+
+
+def test_box_array_element_expr_index():
+    arr = pt.BoxArray(pt.Bytes("arr"), abi.StaticBytes[Literal[4]], 10)
+    value = abi.StaticBytes(abi.StaticBytesTypeSpec(4))
+
+    lines = compile_lines(arr[pt.Txn.group_index()].store_into(value))
+    assert lines == [
+        "txn GroupIndex",
+        "int 10",
+        "<",
+        "assert",
+        'byte "arr"',
+        "int 4",
+        "txn GroupIndex",
+        "*",
+        "int 4",
+        "box_extract",
+        "store 0",
+    ]
+
+
+def test_box_array_bool_element():
+    bools = pt.BoxArray(pt.Bytes("bools"), abi.Bool, 20)
+    value = abi.Bool()
+
+    assert compile_lines(bools[10].store_into(value)) == [
+        'byte "bools"',
+        "int 1",
+        "int 1",
+        "box_extract",
+        "int 2",
+        "getbit",
+        "store 0",
+    ]
+
+    lines = compile_lines(pt.Seq(value.set(True), bools[10].set(value)))
+    assert lines[2:] == [
+        'byte "bools"',
+        "int 1",
+        'byte "bools"',
+        "int 1",
+        "int 1",
+        "box_extract",
+        "int 2",
+        "load 0",
+        "setbit",
+        "box_replace",
+    ]
+
+
+def test_box_struct_fields():
+    config = pt.BoxStruct(pt.Bytes("config"), Config)
+    assert config.byte_length() == 8 + 1 + 2 + 32
+
+    fee = abi.Uint64()
+    assert compile_lines(config["fee"].store_into(fee)) == [
+        'byte "config"',
+        "int 0",
+        "int 8",
+        "box_extract",
+        "btoi",
+        "store 0",
+    ]
+
+    frozen = abi.Bool()
+    assert compile_lines(config.field(2).store_into(frozen)) == [
+        'byte "config"',
+        "int 8",
+        "int 1",
+        "box_extract",
+        "int 1",
+        "getbit",
+        "store 0",
+    ]
+
+    flag = abi.Bool()
+    assert compile_lines(config["flags"][9].store_into(flag)) == [
+        'byte "config"',
+        "int 10",
+        "int 1",
+        "box_extract",
+        "int 1",
+        "getbit",
+        "store 0",
+    ]
+
+    owner = abi.Address()
+    assert compile_lines(config["owner"].store_into(owner)) == [
+        'byte "config"',
+        "int 11",
+        "int 32",
+        "box_extract",
+        "store 0",
+    ]
+
+    lines = compile_lines(
+        pt.Seq(owner.set(pt.Txn.sender()), config["owner"].set(owner))
+    )
+    assert lines[-4:] == ['byte "config"', "int 11", "load 0", "box_replace"]
+
+
+def test_box_struct_whole_value():
+    config = pt.BoxStruct(pt.Bytes("config"), Config)
+    value = Config()
+
+    assert compile_lines(config.store_into(value)) == [
+        'byte "config"',
+        "int 0",
+        "int 43",
+        "box_extract",
+        "store 0",
+    ]
+    assert compile_lines(pt.Seq(config.store_into(value), config.set(value)))[-3:] == [
+        'byte "config"',
+        "load 0",
+        "box_put",
+    ]
+
+
+def test_box_collection_invalid():
+    with pytest.raises(pt.TealInputError):
+        pt.BoxArray(pt.Bytes("arr"), abi.String, 10)
+    with pytest.raises(pt.TealInputError):
+        pt.BoxStruct(pt.Bytes("config"), abi.Tuple2[abi.Uint64, abi.String])
+    with pytest.raises(pt.TealInputError):
+        pt.BoxStruct(pt.Bytes("config"), abi.Uint64)
+    with pytest.raises(pt.TealTypeError):
+        pt.BoxArray(pt.Int(1), abi.Uint64, 10)
+
+    config = pt.BoxStruct(pt.Bytes("config"), Config)
+    with pytest.raises(pt.TealInputError):
+        config["missing"]
+    with pytest.raises(pt.TealInputError):
+        config[5]
+    with pytest.raises(pt.TealInputError):
+        config["fee"][0]
+    with pytest.raises(pt.TealInputError):
+        config["fee"].store_into(abi.Uint32())
+    with pytest.raises(pt.TealInputError):
+        config["fee"].set(abi.Bool())
+
+    unnamed = pt.BoxStruct(pt.Bytes("pair"), abi.Tuple2[abi.Uint64, abi.Uint64])
+    with pytest.raises(pt.TealInputError):
+        unnamed["fee"]
+
+
+def test_box_element_version():
+    arr = pt.BoxArray(pt.Bytes("arr"), abi.Uint64, 10)
+    with pytest.raises(pt.TealInputError):
+        pt.compileTeal(
+            pt.Seq(arr[0].store_into(abi.Uint64()), pt.Approve()),
+            pt.Mode.Application,
+            version=7,
+        )
+
+
+class Account(abi.NamedTuple):
+    balance: abi.Field[abi.Uint64]
+    frozen: abi.Field[abi.Bool]
+
+
+def test_box_map_static_value():
+    accounts = pt.BoxMap(abi.Address, Account, prefix=pt.Bytes("a"))
+    key = abi.Address()
+    amount = abi.Uint64()
+
+    lines = compile_lines(
+        pt.Seq(
+            key.set(pt.Txn.sender()),
+            pt.Pop(accounts[key].create()),
+            amount.set(5),
+            accounts[key]["balance"].set(amount),
+        )
+    )
+    assert lines[7:] == [
+        'byte "a"',
+        "load 0",
+        "concat",
+        "int 9",
+        "box_create",
+        "pop",
+        "int 5",
+        "store 1",
+        'byte "a"',
+        "load 0",
+        "concat",
+        "int 0",
+        "load 1",
+        "itob",
+        "box_replace",
+    ]
+
+    value = Account()
+    lines = compile_lines(
+        pt.Seq(key.set(pt.Txn.sender()), accounts[key].store_into(value))
+    )
+    assert lines[-7:] == [
+        'byte "a"',
+        "load 0",
+        "concat",
+        "int 0",
+        "int 9",
+        "box_extract",
+        "store 1",
+    ]
+
+
+def test_box_map_dynamic_value():
+    names = pt.BoxMap(abi.Uint64, abi.String)
+    key = abi.Uint64()
+    name = abi.String()
+
+    lines = compile_lines(pt.Seq(key.set(1), name.set("x"), names[key].set(name)))
+    assert lines[4:] == [
+        "load 0",
+        "itob",
+        "box_del",
+        "pop",
+        "load 0",
+        "itob",
+        "load 1",
+        "box_put",
+    ]
+
+    lines = compile_lines(pt.Seq(key.set(1), names[key].store_into(name)))
+    assert lines[2:] == [
+        "load 0",
+        "itob",
+        "box_get",
+        "store 3",
+        "store 2",
+        "load 3",
+        "assert",
+        "load 2",
+        "store 1",
+    ]
+
+    with pytest.raises(pt.TealInputError):
+        names[key].create()
+    with pytest.raises(pt.TealInputError):
+        names[key][0]
+
+
+def test_box_map_hashed_keys():
+    names = pt.BoxMap(abi.String, abi.Uint64, prefix=pt.Bytes("n"), hash_keys=True)
+    key = abi.String()
+
+    lines = compile_lines(pt.Seq(key.set("alice"), pt.Pop(names[key].delete())))
+    assert lines[2:] == ['byte "n"', "load 0", "sha256", "concat", "box_del", "pop"]
+
+
+def test_box_map_invalid():
+    with pytest.raises(pt.TealInputError):
+        pt.BoxMap(abi.StaticBytes[Literal[65]], abi.Uint64)
+    pt.BoxMap(abi.StaticBytes[Literal[65]], abi.Uint64, hash_keys=True)
+    with pytest.raises(pt.TealTypeError):
+        pt.BoxMap(abi.Uint64, abi.Uint64, prefix=pt.Int(1))
+
+    balances = pt.BoxMap(abi.Address, abi.Uint64)
+    with pytest.raises(pt.TealInputError):
+        balances[abi.Uint64()]
+    with pytest.raises(pt.TealInputError):
+        balances[abi.Address()].store_into(abi.Uint32())
+    with pytest.raises(pt.TealInputError):
+        balances[abi.Address()].set(abi.Uint32())
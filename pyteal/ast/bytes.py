@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, cast, overload
 
+from pyteal.ast.expr import _InterningMeta
 from pyteal.ast.leafexpr import LeafExpr
 from pyteal.errors import TealInputError
 from pyteal.ir import Op, TealBlock, TealOp
@@ -10,9 +11,11 @@ if TYPE_CHECKING:
     from pyteal.compiler import CompileOptions
 
 
-class Bytes(LeafExpr):
+class Bytes(LeafExpr, metaclass=_InterningMeta):
     """An expression that represents a byte string."""
 
+    __slots__ = ("base", "byte_str")
+
     @overload
     def __init__(self, arg1: str | bytes | bytearray) -> None:
         pass
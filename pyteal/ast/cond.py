@@ -31,6 +31,8 @@ def _reformat_multi_argv(argv: tuple[list[Expr], ...]) -> list[list[Expr]]:
 class Cond(Expr):
     """A chainable branching expression that supports an arbitrary number of conditions."""
 
+    __slots__ = ("value_type", "args")
+
     def __init__(self, *argv: List[Expr]):
         """Create a new Cond expression.
 
@@ -1,26 +1,235 @@
-from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from abc import ABC, ABCMeta, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+import sys
+from typing import TYPE_CHECKING, Any, Hashable, Iterator
 
 from pyteal.ir import TealBlock, TealSimpleBlock
-from pyteal.stack_frame import NatalStackFrame
+from pyteal.stack_frame import NO_FRAMES, NatalStackFrame
 from pyteal.types import TealType
 
 if TYPE_CHECKING:
     from pyteal.compiler import CompileOptions
 
 
+# the interned expressions of the active interning_context, by class and constructor arguments
+_interned_exprs: ContextVar[dict[Hashable, "Expr"] | None] = ContextVar(
+    "_interned_exprs", default=None
+)
+
+
+@contextmanager
+def interning_context(enabled: bool = True) -> Iterator[None]:
+    """Share the instances of constant and field expressions created while this context is active.
+
+    Inside the context, creating an :any:`Int`, :any:`Bytes`, :any:`Global` or transaction field
+    expression such as :code:`Txn.sender()` with the same arguments as before returns the existing
+    expression instead of a new one. This saves the time and memory of building programs that repeat
+    the same constants and fields many times, and identical leaves can be compared with :code:`is`.
+
+    Interning is skipped while source mapping is enabled, since every expression must then remember
+    where it was created. For the same reason, errors about an interned expression point to where it
+    was first created.
+
+    Interned expressions are shared until the outermost context exits. The context only applies to
+    the current thread or asyncio task.
+
+    Example:
+        .. code-block:: python
+
+            with interning_context():
+                program = build_program()
+            teal = compileTeal(program, mode=Mode.Application, version=8)
+
+    Args:
+        enabled (optional): Whether to intern expressions. Pass False to turn interning off for a
+            nested scope. Defaults to True.
+    """
+    interned = _interned_exprs.get()
+    if not enabled:
+        interned = None
+    elif interned is None:
+        interned = {}
+    token = _interned_exprs.set(interned)
+    try:
+        yield
+    finally:
+        _interned_exprs.reset(token)
+
+
+class _InterningMeta(ABCMeta):
+    """The metaclass of leaf expressions that only depend on their constructor arguments, whose
+    instances are shared inside an :any:`interning_context`."""
+
+    def __call__(cls, *args, **kwargs):
+        interned = _interned_exprs.get()
+        if interned is None or not NatalStackFrame.sourcemapping_is_off():
+            return super().__call__(*args, **kwargs)
+
+        # the types of the arguments are part of the key, so that Int(True) still fails
+        key = (
+            cls,
+            tuple((type(arg), arg) for arg in args),
+            tuple((name, type(arg), arg) for name, arg in sorted(kwargs.items())),
+        )
+        try:
+            expr = interned.get(key)
+        except TypeError:
+            # unhashable arguments, such as a bytearray or an Expr
+            return super().__call__(*args, **kwargs)
+
+        if expr is None:
+            expr = interned[key] = super().__call__(*args, **kwargs)
+        return expr
+
+
+class _Identity:
+    """A hashable wrapper of an unhashable object, which is only equal to wrappers of the same
+    object."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Identity) and other.obj is self.obj
+
+    def __hash__(self) -> int:
+        return id(self.obj)
+
+
+# fields that record where an expression was created rather than what it is
+_NON_STRUCTURAL_FIELDS = frozenset(
+    ("trace", "stack_frames", "_sframes_container", "_label_cond")
+)
+
+_structural_field_names: dict[type, tuple[str, ...]] = {}
+
+
+def _structural_fields(expr: "Expr") -> list[tuple[str, Any]]:
+    cls = type(expr)
+    names = _structural_field_names.get(cls)
+    if names is None:
+        slots: list[str] = []
+        for base in reversed(cls.__mro__):
+            base_slots = base.__dict__.get("__slots__", ())
+            slots += [base_slots] if isinstance(base_slots, str) else base_slots
+        names = _structural_field_names[cls] = tuple(
+            name for name in slots if name not in _NON_STRUCTURAL_FIELDS
+        )
+
+    fields = [(name, getattr(expr, name)) for name in names if hasattr(expr, name)]
+    if hasattr(expr, "__dict__"):
+        fields += sorted(
+            (name, value)
+            for name, value in vars(expr).items()
+            if name not in _NON_STRUCTURAL_FIELDS
+        )
+    return fields
+
+
+def _nested_exprs(value: Any) -> Iterator["Expr"]:
+    if isinstance(value, Expr):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _nested_exprs(item)
+
+
+def _field_key(value: Any, keys: dict[int, int]) -> Hashable:
+    if isinstance(value, Expr):
+        return keys[id(value)]
+    if isinstance(value, (list, tuple)):
+        return tuple(_field_key(item, keys) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return _Identity(value)
+    return type(value), value
+
+
+def _structural_key(root: "Expr") -> tuple[Hashable, ...]:
+    # the distinct structures of the expression in the order they are first completed, each of
+    # which refers to its subexpressions by their index, so keys stay flat however deep
+    # expressions are
+    structures: list[Hashable] = []
+    structure_ids: dict[Hashable, int] = {}
+    # the indices of the visited expressions by id, so shared subexpressions are only visited once
+    keys: dict[int, int] = {}
+    stack: list[tuple["Expr", bool]] = [(root, False)]
+    while stack:
+        expr, children_done = stack.pop()
+        if id(expr) in keys:
+            continue
+
+        fields = _structural_fields(expr)
+        if not children_done:
+            stack.append((expr, True))
+            for _, value in fields:
+                stack.extend((child, False) for child in _nested_exprs(value))
+            continue
+
+        structure = (
+            type(expr),
+            tuple((name, _field_key(value, keys)) for name, value in fields),
+        )
+        key = structure_ids.get(structure)
+        if key is None:
+            key = structure_ids[structure] = len(structures)
+            structures.append(structure)
+        keys[id(expr)] = key
+    # the root is completed last, after all of its subexpressions
+    return tuple(structures)
+
+
 class Expr(ABC):
     """Abstract base class for PyTeal expressions."""
 
+    __slots__ = ("trace", "stack_frames")
+
     def __init__(self):
         import traceback
 
-        self.trace = traceback.format_stack()[0:-1]
-        self.stack_frames: NatalStackFrame = NatalStackFrame()
+        # expressions created at the same place share the strings of their traces
+        self.trace = [sys.intern(line) for line in traceback.format_stack()[0:-1]]
+        self.stack_frames: NatalStackFrame = (
+            NO_FRAMES if NatalStackFrame.sourcemapping_is_off() else NatalStackFrame()
+        )
 
     def getDefinitionTrace(self) -> list[str]:
         return self.trace
 
+    def structural_key(self) -> tuple[Hashable, ...]:
+        """Get a key of the structure of this expression.
+
+        Two expressions have equal keys when they are of the same class and their fields and
+        subexpressions are structurally equal, no matter where they were created. Since :code:`==`
+        builds an :any:`Eq` expression, compare keys instead to find identical expressions or to
+        cache results by expression.
+
+        A key lists each distinct structure in the expression once, referring to subexpressions by
+        their position in the key, so comparing and hashing keys doesn't recurse however deep the
+        expressions are. Keys hold the field values of the expression, such as its scratch slots,
+        for as long as they are kept.
+
+        Equal keys do not make expressions interchangeable when they have side effects, such as two
+        :code:`App.globalPut` calls with the same arguments.
+        """
+        return _structural_key(self)
+
+    def structural_hash(self) -> int:
+        """Get a hash of the structure of this expression, consistent with
+        :any:`structurally_equals`."""
+        return hash(self.structural_key())
+
+    def structurally_equals(self, other: "Expr") -> bool:
+        """Check if this expression has the same structure as another one.
+
+        See :any:`structural_key` for what counts as the same structure.
+        """
+        return self is other or self.structural_key() == other.structural_key()
+
     @abstractmethod
     def type_of(self) -> TealType:
         """Get the return type of this expression."""
@@ -41,6 +250,19 @@ class Expr(ABC):
         """Assemble TEAL IR for this component and its arguments."""
         pass
 
+    def _teal_path(
+        self, options: "CompileOptions"
+    ) -> "list[Expr | TealSimpleBlock] | None":
+        """Get the expressions and blocks that this expression runs in order, if its code is a
+        single path of them.
+
+        :any:`TealBlock.FromPath` lowers such expressions without recursion. Subclasses that return
+        a path must implement :code:`__teal__` as
+        :code:`TealBlock.FromPath(options, self._teal_path(options))` in the same class, and a path
+        is only used for expressions that don't override that :code:`__teal__`.
+        """
+        return None
+
     def __lt__(self, other):
         from pyteal.ast.binaryexpr import Lt
 
@@ -0,0 +1,131 @@
+import pytest
+
+import pyteal as pt
+
+
+def build_program() -> pt.Expr:
+    return pt.Seq(
+        pt.Assert(pt.Txn.sender() == pt.Global.creator_address()),
+        pt.App.globalPut(
+            pt.Bytes("count"), pt.App.globalGet(pt.Bytes("count")) + pt.Int(1)
+        ),
+        pt.If(pt.Gtxn[0].fee() > pt.Int(1000))
+        .Then(pt.Log(pt.Bytes("base16", "0xFF")))
+        .ElseIf(pt.Txn.fee() == pt.Int(0))
+        .Then(pt.Log(pt.Bytes("free"))),
+        pt.Int(1),
+    )
+
+
+def test_interning():
+    with pt.interning_context():
+        assert pt.Int(1) is pt.Int(1)
+        assert pt.Int(1) is not pt.Int(2)
+        assert pt.Bytes("abc") is pt.Bytes("abc")
+        assert pt.Bytes("base16", "0xFF") is pt.Bytes("base16", "0xFF")
+        assert pt.Bytes("abc") is not pt.Bytes(b"abc")
+        assert pt.Global.round() is pt.Global.round()
+        assert pt.Txn.sender() is pt.Txn.sender()
+        assert pt.Txn.sender() is not pt.InnerTxn.sender()
+        assert pt.Gtxn[0].fee() is pt.Gtxn[0].fee()
+        assert pt.Gtxn[0].fee() is not pt.Gtxn[1].fee()
+
+        # unhashable arguments are not interned
+        assert pt.Bytes(bytearray(b"abc")) is not pt.Bytes(bytearray(b"abc"))
+        assert pt.Gtxn[pt.Int(0)].fee() is not pt.Gtxn[pt.Int(0)].fee()
+
+        # invalid arguments still fail
+        with pytest.raises(pt.TealInputError):
+            pt.Int(True)  # type: ignore[arg-type]
+        with pytest.raises(pt.TealInputError):
+            pt.Int(-1)
+
+        with pt.interning_context():
+            nested = pt.Int(1)
+        assert nested is pt.Int(1)
+
+        with pt.interning_context(False):
+            assert pt.Int(1) is not pt.Int(1)
+
+    assert pt.Int(1) is not pt.Int(1)
+    assert pt.Int(1) is not nested
+
+
+def test_interning_compiles_the_same():
+    expected = pt.compileTeal(build_program(), pt.Mode.Application, version=8)
+    with pt.interning_context():
+        program = build_program()
+    actual = pt.compileTeal(program, pt.Mode.Application, version=8)
+    assert actual == expected
+
+
+def test_interning_skipped_when_sourcemapping():
+    with pt.interning_context(), pt.sourcemapping_context():
+        assert pt.Int(1) is not pt.Int(1)
+        assert pt.Txn.sender() is not pt.Txn.sender()
+
+
+def test_structural_key():
+    program = build_program()
+    same = build_program()
+    assert program is not same
+    assert program.structural_key() == same.structural_key()
+    assert program.structural_hash() == same.structural_hash()
+    assert program.structurally_equals(same)
+    assert program.structurally_equals(program)
+
+    assert pt.Int(1).structurally_equals(pt.Int(1))
+    assert not pt.Int(1).structurally_equals(pt.Int(2))
+    assert not pt.Int(1).structurally_equals(pt.EnumInt("1"))
+    assert pt.Txn.fee().structurally_equals(pt.Txn.fee())
+    assert not pt.Txn.fee().structurally_equals(pt.InnerTxn.fee())
+    assert not pt.Gtxn[0].fee().structurally_equals(pt.Gtxn[1].fee())
+    assert pt.Gtxn[pt.Int(0)].fee().structurally_equals(pt.Gtxn[pt.Int(0)].fee())
+    assert not (pt.Int(1) + pt.Int(2)).structurally_equals(pt.Int(2) + pt.Int(1))
+    assert not (pt.Int(1) + pt.Int(2)).structurally_equals(pt.Int(1) - pt.Int(2))
+    assert not pt.Seq(pt.Int(1)).structurally_equals(
+        pt.Seq(pt.Pop(pt.Int(1)), pt.Int(1))
+    )
+
+    keys = {program.structural_key(): "program"}
+    assert keys[same.structural_key()] == "program"
+
+
+def test_structural_key_shared_subexpressions():
+    shared = pt.Int(1) + pt.Int(2)
+    with_shared = pt.Seq(pt.Pop(shared), shared)
+    with_copies = pt.Seq(pt.Pop(pt.Int(1) + pt.Int(2)), pt.Int(1) + pt.Int(2))
+    assert with_shared.structurally_equals(with_copies)
+
+
+def test_structural_key_deep():
+    def build_sum(last: int) -> pt.Expr:
+        expr: pt.Expr = pt.Int(0)
+        for i in range(5000):
+            expr = expr + pt.Int(last if i == 4999 else i)
+        return expr
+
+    expr = build_sum(4999)
+    same = build_sum(4999)
+    different = build_sum(0)
+
+    assert isinstance(expr.structural_hash(), int)
+    assert expr.structurally_equals(same)
+    assert not expr.structurally_equals(different)
+
+    keys = {expr.structural_key(): "expr"}
+    assert keys[same.structural_key()] == "expr"
+    assert different.structural_key() not in keys
+
+
+def test_structural_key_not_retained():
+    import sys
+
+    # keys hold the objects of their expressions, such as scratch slots, only while they are kept
+    slot = pt.ScratchVar(pt.TealType.uint64).slot
+    before = sys.getrefcount(slot)
+    key = pt.ScratchLoad(slot).structural_key()
+    kept = sys.getrefcount(slot)
+    del key
+    after = sys.getrefcount(slot)
+    assert kept > before == after
@@ -46,6 +46,13 @@ class For(Expr):
         if self.doBlock is None:
             raise TealCompileError("For expression must have a doBlock", self)
 
+        if options.optimize.unroll_budget() > 0:
+            from pyteal.compiler.optimizer import unroll_for
+
+            unrolled = unroll_for(self, options)
+            if unrolled is not None:
+                return unrolled
+
         options.enterLoop()
 
         end = TealSimpleBlock([])
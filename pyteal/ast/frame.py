@@ -70,6 +70,8 @@ class ProtoStackLayout(Expr):
     This is only used in Proto internally.
     """
 
+    __slots__ = ("num_return_allocs", "arg_stack_types", "local_stack_types")
+
     def __init__(
         self,
         arg_stack_types: list[TealType],
@@ -146,6 +148,8 @@ class Proto(Expr):
     It is only used in subroutine, for subroutine declaration computation.
     """
 
+    __slots__ = ("num_args", "num_returns", "mem_layout")
+
     def __init__(
         self,
         num_args: int,
@@ -214,6 +218,8 @@ class FrameDig(Expr):
     This is used only internally by FrameVar.
     """
 
+    __slots__ = ("frame_index", "dig_type")
+
     def __init__(self, frame_index: int, *, inferred_type: Optional[TealType] = None):
         super().__init__()
         self.frame_index = frame_index
@@ -248,6 +254,8 @@ class FrameBury(Expr):
     This is used only internally by FrameVar.
     """
 
+    __slots__ = ("value", "frame_index")
+
     def __init__(
         self,
         value: Expr,
@@ -4,6 +4,7 @@ from enum import Enum
 from pyteal.types import TealType
 from pyteal.errors import verifyFieldVersion
 from pyteal.ir import TealOp, Op, TealBlock
+from pyteal.ast.expr import _InterningMeta
 from pyteal.ast.leafexpr import LeafExpr
 
 if TYPE_CHECKING:
@@ -48,9 +49,11 @@ class GlobalField(Enum):
 GlobalField.__module__ = "pyteal"
 
 
-class Global(LeafExpr):
+class Global(LeafExpr, metaclass=_InterningMeta):
     """An expression that accesses a global property."""
 
+    __slots__ = ("field",)
+
     def __init__(self, field: GlobalField) -> None:
         super().__init__()
         self.field = field
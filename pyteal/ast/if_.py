@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
 from pyteal.ast.expr import Expr
 from pyteal.ast.seq import _use_seq_if_multiple
@@ -16,6 +16,14 @@ if TYPE_CHECKING:
 class If(Expr):
     """Simple two-way conditional expression."""
 
+    __slots__ = (
+        "alternateSyntaxFlag",
+        "cond",
+        "thenBranch",
+        "elseBranch",
+        "_label_cond",
+    )
+
     def __init__(
         self, cond: Expr, thenBranch: Expr | None = None, elseBranch: Expr | None = None
     ) -> None:
@@ -52,29 +60,52 @@ class If(Expr):
         self._label_cond: Expr | None = None
 
     def __teal__(self, options: "CompileOptions"):
-        if self.thenBranch is None:
-            raise TealCompileError("If expression must have a thenBranch", self)
-
-        condStart, condEnd = self.cond.__teal__(options)
-        thenStart, thenEnd = self.thenBranch.__teal__(options)
-        end = TealSimpleBlock([])
-
-        branchBlock = TealConditionalBlock([], root_expr=(self._label_cond or self))
-        branchBlock.setTrueBlock(thenStart)
+        # the Ifs of an ElseIf chain are lowered in a loop, since long chains would exceed the
+        # recursion limit
+        chain: list[tuple[If, TealConditionalBlock, TealSimpleBlock]] = []
+        start = None
+        branch = self
+        while True:
+            if branch.thenBranch is None:
+                raise TealCompileError("If expression must have a thenBranch", branch)
+
+            condStart, condEnd = branch.cond.__teal__(options)
+            thenStart, thenEnd = branch.thenBranch.__teal__(options)
+            end = TealSimpleBlock([])
+
+            branchBlock = TealConditionalBlock(
+                [], root_expr=(branch._label_cond or branch)
+            )
+            branchBlock.setTrueBlock(thenStart)
+
+            condEnd.setNextBlock(branchBlock)
+            thenEnd.setNextBlock(end)
+
+            if len(chain) == 0:
+                start = condStart
+            else:
+                chain[-1][1].setFalseBlock(condStart)
+            chain.append((branch, branchBlock, end))
 
-        condEnd.setNextBlock(branchBlock)
-        thenEnd.setNextBlock(end)
+            if type(branch.elseBranch) is not If:
+                break
+            branch = branch.elseBranch
 
-        if self.elseBranch is None:
+        if branch.elseBranch is None:
             branchBlock.setFalseBlock(end)
-            branchBlock._sframes_container = self
+            branchBlock._sframes_container = branch
         else:
-            elseStart, elseEnd = self.elseBranch.__teal__(options)
+            elseStart, elseEnd = branch.elseBranch.__teal__(options)
             branchBlock.setFalseBlock(elseStart)
             elseEnd.setNextBlock(end)
-            elseEnd._sframes_container = self
+            elseEnd._sframes_container = branch
+
+        # the end of each If in the chain leads to the end of the If it is the else branch of
+        for (outer, _, outerEnd), (_, _, innerEnd) in zip(chain, chain[1:]):
+            innerEnd.setNextBlock(outerEnd)
+            innerEnd._sframes_container = outer
 
-        return condStart, end
+        return start, chain[0][2]
 
     def __str__(self):
         if self.thenBranch is None:
@@ -94,15 +125,19 @@ class If(Expr):
         return self.thenBranch.type_of()
 
     def has_return(self):
-        if self.thenBranch is None:
-            raise TealCompileError("If expression must have a thenBranch", self)
-
-        if self.elseBranch is None:
-            # return false in this case because elseBranch does not exist, so it can't have a return
-            # op
-            return False
-        # otherwise, this expression has a return op only if both branches result in a return op
-        return self.thenBranch.has_return() and self.elseBranch.has_return()
+        branch: Expr = self
+        while type(branch) is If:
+            if branch.thenBranch is None:
+                raise TealCompileError("If expression must have a thenBranch", branch)
+            if branch.elseBranch is None:
+                # return false in this case because elseBranch does not exist, so it can't have a
+                # return op
+                return False
+            # otherwise, this expression has a return op only if all branches result in a return op
+            if not branch.thenBranch.has_return():
+                return False
+            branch = branch.elseBranch
+        return branch.has_return()
 
     def Then(self, thenBranch: Expr, *then_branch_multi: Expr):
         if not self.alternateSyntaxFlag:
@@ -110,25 +145,29 @@ class If(Expr):
 
         thenBranch = _use_seq_if_multiple(thenBranch, *then_branch_multi)
 
-        if not self.elseBranch:
-            self.thenBranch = thenBranch
-        else:
-            if not isinstance(self.elseBranch, If):
+        branch = self
+        while branch.elseBranch:
+            if not isinstance(branch.elseBranch, If):
                 raise TealInputError("Else-Then block is malformed")
-            self.elseBranch.Then(thenBranch)
+            branch = branch.elseBranch
+            if not branch.alternateSyntaxFlag:
+                raise TealInputError("Cannot mix two different If syntax styles")
+        branch.thenBranch = thenBranch
         return self
 
     def ElseIf(self, cond):
         if not self.alternateSyntaxFlag:
             raise TealInputError("Cannot mix two different If syntax styles")
 
-        if not self.elseBranch:
-            self.elseBranch = If(cond)
-            self.elseBranch._label_cond = cond
-        else:
-            if not isinstance(self.elseBranch, If):
+        branch = self
+        while branch.elseBranch:
+            if not isinstance(branch.elseBranch, If):
                 raise TealInputError("Else-ElseIf block is malformed")
-            self.elseBranch.ElseIf(cond)
+            branch = branch.elseBranch
+            if not branch.alternateSyntaxFlag:
+                raise TealInputError("Cannot mix two different If syntax styles")
+        branch.elseBranch = If(cond)
+        branch.elseBranch._label_cond = cond
         return self
 
     def Else(self, elseBranch: Expr, *else_branch_multi: Expr):
@@ -140,13 +179,17 @@ class If(Expr):
 
         elseBranch = _use_seq_if_multiple(elseBranch, *else_branch_multi)
 
-        if not self.elseBranch:
-            require_type(elseBranch, self.thenBranch.type_of())
-            self.elseBranch = elseBranch
-        else:
-            if not isinstance(self.elseBranch, If):
+        branch = self
+        while branch.elseBranch:
+            if not isinstance(branch.elseBranch, If):
                 raise TealInputError("Else-Else block is malformed")
-            self.elseBranch.Else(elseBranch)
+            branch = branch.elseBranch
+            if not branch.alternateSyntaxFlag:
+                raise TealInputError("Cannot mix two different If syntax styles")
+            if not branch.thenBranch:
+                raise TealInputError("Must set Then branch before Else branch")
+        require_type(elseBranch, cast(Expr, branch.thenBranch).type_of())
+        branch.elseBranch = elseBranch
         return self
 
 
@@ -3,15 +3,18 @@ from typing import TYPE_CHECKING
 from pyteal.types import TealType
 from pyteal.ir import TealOp, Op, TealBlock
 from pyteal.errors import TealInputError
+from pyteal.ast.expr import _InterningMeta
 from pyteal.ast.leafexpr import LeafExpr
 
 if TYPE_CHECKING:
     from pyteal.compiler import CompileOptions
 
 
-class Int(LeafExpr):
+class Int(LeafExpr, metaclass=_InterningMeta):
     """An expression that represents a uint64."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int) -> None:
         """Create a new uint64.
 
@@ -45,6 +48,8 @@ Int.__module__ = "pyteal"
 class EnumInt(LeafExpr):
     """An expression that represents uint64 enum values."""
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str) -> None:
         """Create an expression to reference a uint64 enum value.
 
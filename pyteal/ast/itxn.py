@@ -1,13 +1,18 @@
 from enum import Enum
 import algosdk
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, cast
 from pyteal.ast.int import EnumInt
 from pyteal.ast.for_ import For
 from pyteal.ast.int import Int
 from pyteal.ast.scratchvar import ScratchVar
+from pyteal.ast.abstractvar import AbstractVar, alloc_abstract_var
+from pyteal.ast.leafexpr import LeafExpr
+from pyteal.ast.if_ import If
 
 from pyteal.ast.methodsig import MethodSignature
+from pyteal.config import MAX_GROUP_SIZE
 from pyteal.types import TealType, require_type
 from pyteal.errors import TealInputError, TealTypeError, verifyProgramVersion
 from pyteal.ir import TealOp, Op, TealBlock
@@ -25,6 +30,7 @@ from pyteal.ast.bytes import Bytes
 from pyteal.ast import abi
 
 if TYPE_CHECKING:
+    from pyteal.ast.frame import Proto
     from pyteal.compiler import CompileOptions
 
 
@@ -501,3 +507,214 @@ InnerTxn: TxnObject = TxnObject(
 )
 
 InnerTxn.__module__ = "pyteal"
+
+
+class InnerTxnBatch:
+    """Submits inner transactions in groups, joining up to 16 of them with :any:`InnerTxnBuilder.Next`.
+
+    Transactions are added one at a time with :any:`InnerTxnBatch.add`, typically from inside a
+    loop. The first transaction of a group starts it with :any:`InnerTxnBuilder.Begin`, later ones
+    with :any:`InnerTxnBuilder.Next`, and the group is submitted as soon as it holds
+    :code:`max_size` transactions. :any:`InnerTxnBatch.flush` submits a partially filled group.
+
+    The batch keeps its state in frame variables inside subroutines that use frame pointers, and in
+    scratch slots elsewhere. They are allocated separately in each subroutine where the batch is
+    used, so a batch can be created anywhere, but :any:`InnerTxnBatch.add`,
+    :any:`InnerTxnBatch.flush` and :any:`InnerTxnBatch.scope` must be called in the same subroutine
+    or in the main program.
+
+    Fields that are the same for every transaction in the batch can be passed as shared fields.
+    Every inner transaction starts from zero values, so shared fields are still set on each
+    transaction, but values that are not constants are only computed once, when the scope built
+    with :any:`InnerTxnBatch.scope` starts. They must therefore not depend on values that change
+    during the scope.
+
+    :any:`InnerTxnBatch.add` and :any:`InnerTxnBatch.flush` read the state that the scope
+    initializes, so they must be used inside the body of a scope, in the same subroutine. Compiling
+    them anywhere else raises a TealInputError.
+
+    NOTE: A group stays open between calls to :any:`InnerTxnBatch.add`, so no other inner
+    transaction may be built or submitted in the scope before calling :any:`InnerTxnBatch.flush`.
+
+    Requires program version 6 or higher. This operation is only permitted in application mode.
+    """
+
+    def __init__(
+        self,
+        shared_fields: dict[TxnField, Expr | list[Expr]] | None = None,
+        *,
+        max_size: int = MAX_GROUP_SIZE,
+    ) -> None:
+        """Create a new InnerTxnBatch.
+
+        Args:
+            shared_fields (optional): A dictionary of fields to set on every transaction of the
+                batch, in the format accepted by :any:`InnerTxnBuilder.SetFields`.
+            max_size (optional): The number of transactions submitted together in one group.
+                Must be between 1 and 16. Defaults to 16.
+        """
+        if not 1 <= max_size <= MAX_GROUP_SIZE:
+            raise TealInputError(
+                "Inner transaction batch size must be between 1 and {}, got {}".format(
+                    MAX_GROUP_SIZE, max_size
+                )
+            )
+
+        self.max_size = max_size
+        self.shared_fields: dict[TxnField, Expr | list[Expr]] = dict(
+            shared_fields or {}
+        )
+        for field, value in self.shared_fields.items():
+            # validate the field and value before precomputing them
+            InnerTxnBuilder.SetField(field, value)
+
+        # the variables of the batch in each subroutine where it is used, see _vars
+        self._allocated: list[tuple["Proto | None", _InnerTxnBatchVars]] = []
+        # the number of scopes of the batch being compiled
+        self._open_scopes = 0
+
+    def _vars(self) -> "_InnerTxnBatchVars":
+        """Get the variables of the batch in the subroutine being built, allocating them on first
+        use there rather than when the batch is created."""
+        from pyteal.ast.subroutine import SubroutineEval
+
+        proto = SubroutineEval._current_proto
+        for owner, allocated in self._allocated:
+            if owner is proto:
+                return allocated
+
+        allocated = _InnerTxnBatchVars(alloc_abstract_var(TealType.uint64), [], {})
+
+        def share(value: Expr) -> Expr:
+            if isinstance(value, LeafExpr):
+                return value
+            var = alloc_abstract_var(value.type_of())
+            allocated.precomputed.append((var, value))
+            return var.load()
+
+        for field, value in self.shared_fields.items():
+            if type(value) is list:
+                allocated.shared_fields[field] = [share(v) for v in value]
+            elif isinstance(value, Expr):
+                allocated.shared_fields[field] = share(value)
+            else:
+                allocated.shared_fields[field] = value
+
+        self._allocated.append((proto, allocated))
+        return allocated
+
+    def add(self, fields: dict[TxnField, Expr | list[Expr]]) -> Expr:
+        """Add a transaction to the current group, submitting the group if it is full.
+
+        The transaction reads the shared fields that are not constants from the variables set when
+        the scope starts, so the returned expression must be used inside the body of
+        :any:`InnerTxnBatch.scope`, in the same subroutine, or compiling it raises a
+        TealInputError.
+
+        Args:
+            fields: A dictionary of fields to set on this transaction in addition to the shared
+                fields, in the format accepted by :any:`InnerTxnBuilder.SetFields`. Non-array
+                fields must not also be shared fields.
+        """
+        for field in fields:
+            if field in self.shared_fields and not field.is_array:
+                raise TealInputError(
+                    "Field {} is already set by the batch's shared fields".format(field)
+                )
+
+        allocated = self._vars()
+        count = allocated.count
+        return _InnerTxnBatchExpr(
+            self,
+            Seq(
+                If(count.load())
+                .Then(InnerTxnBuilder.Next())
+                .Else(InnerTxnBuilder.Begin()),
+                InnerTxnBuilder.SetFields(allocated.shared_fields),
+                InnerTxnBuilder.SetFields(fields),
+                count.store(count.load() + Int(1)),
+                If(count.load() == Int(self.max_size)).Then(
+                    InnerTxnBuilder.Submit(), count.store(Int(0))
+                ),
+            ),
+        )
+
+    def flush(self) -> Expr:
+        """Submit the current group, if it holds any transaction.
+
+        Like :any:`InnerTxnBatch.add`, this must be used inside the body of
+        :any:`InnerTxnBatch.scope`.
+        """
+        count = self._vars().count
+        return _InnerTxnBatchExpr(
+            self, If(count.load()).Then(InnerTxnBuilder.Submit(), count.store(Int(0)))
+        )
+
+    def scope(self, body: Expr) -> Expr:
+        """Run an expression that adds transactions to this batch, then submit the last group.
+
+        Args:
+            body: The expression that calls :any:`InnerTxnBatch.add`. Must evaluate to none.
+        """
+        require_type(body, TealType.none)
+        allocated = self._vars()
+        return _InnerTxnBatchExpr(
+            self,
+            Seq(
+                allocated.count.store(Int(0)),
+                *[var.store(value) for var, value in allocated.precomputed],
+                body,
+                self.flush(),
+            ),
+            opens_scope=True,
+        )
+
+
+InnerTxnBatch.__module__ = "pyteal"
+
+
+@dataclass
+class _InnerTxnBatchVars:
+    """The variables of an InnerTxnBatch in one subroutine."""
+
+    # the number of transactions in the current group
+    count: AbstractVar
+    # the variables of shared fields that are computed once, and their values
+    precomputed: list[tuple[AbstractVar, Expr]]
+    # the shared fields, reading precomputed values from their variables
+    shared_fields: dict[TxnField, Expr | list[Expr]]
+
+
+class _InnerTxnBatchExpr(Expr):
+    """An expression of an InnerTxnBatch, which checks that the operations of the batch are
+    compiled inside one of its scopes."""
+
+    def __init__(self, batch: InnerTxnBatch, expr: Expr, *, opens_scope: bool = False):
+        super().__init__()
+        self.batch = batch
+        self.expr = expr
+        self.opens_scope = opens_scope
+
+    def __teal__(self, options: "CompileOptions"):
+        if not self.opens_scope:
+            if self.batch._open_scopes == 0:
+                raise TealInputError(
+                    "InnerTxnBatch.add and InnerTxnBatch.flush must be used inside "
+                    "InnerTxnBatch.scope, in the same subroutine"
+                )
+            return self.expr.__teal__(options)
+
+        self.batch._open_scopes += 1
+        try:
+            return self.expr.__teal__(options)
+        finally:
+            self.batch._open_scopes -= 1
+
+    def __str__(self):
+        return str(self.expr)
+
+    def type_of(self):
+        return self.expr.type_of()
+
+    def has_return(self):
+        return False
@@ -533,3 +533,122 @@ def test_InnerTxnBuilder_method_call(
 
 
 # txn_test.py performs additional testing
+
+
+def test_InnerTxnBatch():
+    batch = pt.InnerTxnBatch(
+        {
+            TxnField.type_enum: TxnType.Payment,
+            TxnField.note: pt.Concat(pt.Bytes("a"), Txn.note()),
+        },
+        max_size=4,
+    )
+    payout = batch.add({TxnField.receiver: Txn.sender(), TxnField.amount: pt.Int(5)})
+    program = pt.compileTeal(
+        pt.Seq(batch.scope(pt.Seq(payout, payout)), pt.Approve()),
+        pt.Mode.Application,
+        version=6,
+    )
+    lines = program.splitlines()
+
+    # the shared note is computed once, before any transaction is added
+    assert lines[1:7] == [
+        "int 0",
+        "store 0",
+        'byte "a"',
+        "txn Note",
+        "concat",
+        "store 1",
+    ]
+    assert lines.count("concat") == 1
+    assert lines.count("itxn_begin") == 2
+    assert lines.count("itxn_next") == 2
+    assert lines.count("itxn_submit") == 3
+    assert lines.count("int 4") == 2
+    assert lines.count("load 1") == 2
+
+    with pytest.raises(pt.TealInputError):
+        pt.compileTeal(
+            pt.Seq(batch.scope(payout), pt.Approve()), pt.Mode.Application, version=5
+        )
+
+
+def test_InnerTxnBatch_vars_where_used():
+    # created outside of any subroutine, but used inside one with frame pointers
+    batch = pt.InnerTxnBatch({TxnField.type_enum: TxnType.Payment})
+
+    @pt.Subroutine(pt.TealType.none)
+    def pay(amount: pt.Expr) -> pt.Expr:
+        return batch.scope(
+            batch.add({TxnField.receiver: Txn.sender(), TxnField.amount: amount})
+        )
+
+    program = pt.compileTeal(
+        pt.Seq(
+            pay(pt.Int(5)),
+            batch.scope(
+                batch.add({TxnField.receiver: Txn.sender(), TxnField.amount: pt.Int(6)})
+            ),
+            pt.Approve(),
+        ),
+        pt.Mode.Application,
+        version=8,
+        optimize=pt.OptimizeOptions(frame_pointers=True),
+    )
+    main, subroutine = program.split("pay_0:")
+
+    # the subroutine counts transactions in a frame variable, the main program in a slot
+    assert "store" not in subroutine and "load" not in subroutine
+    assert "frame_bury" in subroutine
+    assert "store 0" in main and "load 0" in main
+
+
+def test_InnerTxnBatch_outside_scope():
+    batch = pt.InnerTxnBatch(
+        {
+            TxnField.type_enum: TxnType.Payment,
+            TxnField.amount: pt.Btoi(Txn.application_args[1]),
+        }
+    )
+    payout = batch.add({TxnField.receiver: Txn.sender()})
+
+    @pt.Subroutine(pt.TealType.none)
+    def pay() -> pt.Expr:
+        return pt.Seq(payout, batch.flush())
+
+    # the shared amount is only computed when a scope starts
+    for program in (pt.Seq(payout, batch.flush()), batch.flush(), pay()):
+        with pytest.raises(pt.TealInputError):
+            pt.compileTeal(
+                pt.Seq(program, pt.Approve()),
+                pt.Mode.Application,
+                version=8,
+                optimize=pt.OptimizeOptions(frame_pointers=True),
+            )
+
+    # nor is the scope of a caller the scope of its subroutines
+    with pytest.raises(pt.TealInputError):
+        pt.compileTeal(
+            pt.Seq(batch.scope(pay()), pt.Approve()), pt.Mode.Application, version=8
+        )
+
+    pt.compileTeal(
+        pt.Seq(batch.scope(pt.Seq(payout, batch.flush(), payout)), pt.Approve()),
+        pt.Mode.Application,
+        version=8,
+    )
+
+
+def test_InnerTxnBatch_invalid():
+    with pytest.raises(pt.TealInputError):
+        pt.InnerTxnBatch(max_size=0)
+    with pytest.raises(pt.TealInputError):
+        pt.InnerTxnBatch(max_size=17)
+    with pytest.raises(pt.TealInputError):
+        pt.InnerTxnBatch({TxnField.accounts: Txn.sender()})
+
+    batch = pt.InnerTxnBatch({TxnField.type_enum: TxnType.Payment})
+    with pytest.raises(pt.TealInputError):
+        batch.add({TxnField.type_enum: TxnType.AssetTransfer})
+    with pytest.raises(pt.TealTypeError):
+        batch.scope(pt.Int(1))
@@ -4,6 +4,8 @@ from pyteal.ast.expr import Expr
 class LeafExpr(Expr):
     """Leaf expression base class."""
 
+    __slots__ = ()
+
     def has_return(self):
         return False
 
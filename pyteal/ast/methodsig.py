@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 class MethodSignature(LeafExpr):
     """An expression that represents an ABI method selector"""
 
+    __slots__ = ("methodName",)
+
     def __init__(self, methodName: str) -> None:
         """Create a new method selector for ABI method call.
 
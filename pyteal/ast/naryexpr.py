@@ -1,8 +1,8 @@
-from typing import Sequence, cast, TYPE_CHECKING
+from typing import Sequence, TYPE_CHECKING
 
 from pyteal.types import TealType, require_type
 from pyteal.errors import TealInputError
-from pyteal.ir import TealOp, Op, TealSimpleBlock
+from pyteal.ir import TealOp, Op, TealBlock, TealSimpleBlock
 from pyteal.ast.expr import Expr
 
 if TYPE_CHECKING:
@@ -15,6 +15,8 @@ class NaryExpr(Expr):
     This type of expression takes an arbitrary number of arguments.
     """
 
+    __slots__ = ("op", "outputType", "args")
+
     def __init__(
         self, op: Op, inputType: TealType, outputType: TealType, args: Sequence[Expr]
     ):
@@ -32,20 +34,15 @@ class NaryExpr(Expr):
         self.args = args
 
     def __teal__(self, options: "CompileOptions"):
-        start = None
-        end = None
+        return TealBlock.FromPath(options, self._teal_path(options))
+
+    def _teal_path(self, options: "CompileOptions"):
+        path: list[Expr | TealSimpleBlock] = []
         for i, arg in enumerate(self.args):
-            argStart, argEnd = arg.__teal__(options)
-            if i == 0:
-                start = argStart
-                end = argEnd
-            else:
-                cast(TealSimpleBlock, end).setNextBlock(argStart)
-                opBlock = TealSimpleBlock([TealOp(self, self.op)])
-                argEnd.setNextBlock(opBlock)
-                end = opBlock
-
-        return start, end
+            path.append(arg)
+            if i != 0:
+                path.append(TealSimpleBlock([TealOp(self, self.op)]))
+        return path
 
     def __str__(self):
         ret_str = "(" + str(self.op).title().replace("_", "")
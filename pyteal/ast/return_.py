@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 class Return(Expr):
     """Return a value from the current execution context."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value: Expr | None = None) -> None:
         """Create a new Return expression.
 
@@ -92,6 +94,8 @@ Return.__module__ = "pyteal"
 class ExitProgram(Expr):
     """Immediately exit the program with the indicated success value."""
 
+    __slots__ = ("success",)
+
     def __init__(self, success: Expr) -> None:
         super().__init__()
         require_type(success, TealType.uint64)
@@ -1,18 +1,20 @@
 from contextlib import contextmanager
 from dataclasses import astuple, dataclass, field
 from enum import IntFlag
-from typing import Callable, Final, Optional, cast
+from typing import TYPE_CHECKING, Callable, Final, Optional, cast
 
 from algosdk import abi as sdk_abi
 from algosdk import encoding
 from algosdk.v2client.algod import AlgodClient
 
 from pyteal.ast import abi
+from pyteal.ast.abstractvar import AbstractVar, alloc_abstract_var
 from pyteal.ast.app import OnComplete
 from pyteal.ast.assert_ import Assert
 from pyteal.ast.cond import Cond
 from pyteal.ast.expr import Expr
 from pyteal.ast.frame import FrameVar, Proto, ProtoStackLayout
+from pyteal.ast.if_ import If
 from pyteal.ast.int import EnumInt, Int
 from pyteal.ast.methodsig import MethodSignature
 from pyteal.ast.naryexpr import And, Or
@@ -25,18 +27,24 @@ from pyteal.ast.subroutine import (
     Subroutine,
     SubroutineCall,
     SubroutineDefinition,
+    SubroutineEval,
     SubroutineFnWrapper,
 )
-from pyteal.ast.txn import Txn
+from pyteal.ast.txn import Txn, TxnaExpr
 from pyteal.compiler.compiler import DEFAULT_TEAL_VERSION, Compilation, OptimizeOptions
+from pyteal.compiler.cost import BudgetEstimate
 from pyteal.compiler.sourcemap import PyTealSourceMap, _PyTealSourceMapper
 from pyteal.config import METHOD_ARG_NUM_CUTOFF
 from pyteal.errors import AlgodClientError, TealInputError, TealInternalError
+from pyteal.ir import TealBlock, TealSimpleBlock
 from pyteal.ir.ops import Mode
 from pyteal.stack_frame import NatalStackFrame
 from pyteal.types import TealType
 from pyteal.util import algod_with_assertion
 
+if TYPE_CHECKING:
+    from pyteal.compiler import CompileOptions
+
 ActionType = Expr | SubroutineFnWrapper | ABIReturnSubroutine
 
 
@@ -323,12 +331,16 @@ class CondWithMethod:
     - pre-frame-pointer (scratch slot based)
     - frame-pointer based.
 
+    If `lazy_args` is set, the method arguments are not decoded up front: the method receives lazy views
+    that read from `Txn.application_args` where they are used.
+
     For more details, refer to implementation of `ASTBuilder.wrap_handler`.
     """
 
     method_sig: str
     condition: Expr | int
     method: ABIReturnSubroutine
+    lazy_args: bool = False
 
     def to_cond_node(self, use_frame_pt: bool = False) -> CondNode:
         walk_in_cond = Txn.application_args[0] == MethodSignature(self.method_sig)
@@ -342,6 +354,7 @@ class CondWithMethod:
             self.method,
             use_frame_pt=use_frame_pt,
             handler_stack_frames_container=user_frames_holder,
+            lazy_args=self.lazy_args,
         )
         assert (
             ufhlen := len(user_frames_holder)
@@ -355,10 +368,123 @@ class CondWithMethod:
         cn.reframe_asts(user_frames)
         return cn
 
+    def to_stub_cond_node(
+        self, stub: SubroutineFnWrapper, handler_index: int
+    ) -> CondNode:
+        """Like `to_cond_node`, but the method's IO is handled by `stub`, a subroutine shared by all methods
+        with the same argument and return types (see `ASTBuilder.shared_stub_key`), which is told to call this
+        method's handler by `handler_index`.
+        """
+        walk_in_cond = Txn.application_args[0] == MethodSignature(self.method_sig)
+
+        if not (isinstance(self.condition, Expr) or self.condition == 1):
+            raise TealInputError("Invalid condition input for CondWithMethod")
+
+        res: Expr = Seq(stub(Int(handler_index)), Approve())
+        if isinstance(self.condition, Expr):
+            res = Seq(Assert(self.condition), res)
+
+        cn = CondNode(walk_in_cond, res)
+        cn.reframe_asts(self.method.subroutine.stack_frames)
+        return cn
+
 
 CondWithMethod.__module__ = "pyteal"
 
 
+class _DecodeCapture(AbstractVar):
+    """A write-only AbstractVar that records the expression an ABI decode would store."""
+
+    def __init__(self, stack_type: TealType) -> None:
+        self.stack_type = stack_type
+        self.captured: Expr | None = None
+
+    def store(self, value: Expr) -> Expr:
+        if self.captured is not None:
+            raise TealInternalError("lazy argument decoding must store exactly once")
+        self.captured = value
+        return Seq()
+
+    def load(self) -> Expr:
+        raise TealInternalError("lazy argument decoding must not load its own value")
+
+    def storage_type(self) -> TealType:
+        return self.stack_type
+
+
+class _LazyArgVar(AbstractVar):
+    """_LazyArgVar is the storage behind a lazily decoded ABI method argument.
+
+    Reads are served by re-running the argument's decoding against `Txn.application_args`
+    (or the group index for transaction arguments), so arguments that are never read cost nothing.
+
+    A cache var is allocated if the handler writes to the argument, or if the argument is read at
+    more than one place and decoding it is more expensive than a single `txna`. The decision is
+    only made once the handler body has been constructed, so every read site is lowered
+    consistently through `_LazyArgLoad`.
+    """
+
+    def __init__(self, stack_type: TealType) -> None:
+        self.stack_type = stack_type
+        self.decode_into: Callable[[AbstractVar], Expr] | None = None
+        self.cache: AbstractVar | None = None
+        self.load_count = 0
+
+    def decoded(self) -> Expr:
+        if self.decode_into is None:
+            raise TealInternalError("lazy argument was not bound to a decoding")
+        capture = _DecodeCapture(self.stack_type)
+        self.decode_into(capture)
+        if capture.captured is None:
+            raise TealInternalError("lazy argument decoding did not store a value")
+        return capture.captured
+
+    def store(self, value: Expr) -> Expr:
+        return self.materialize().store(value)
+
+    def load(self) -> Expr:
+        self.load_count += 1
+        return _LazyArgLoad(self, self.decoded())
+
+    def storage_type(self) -> TealType:
+        return self.stack_type
+
+    def materialize(self) -> AbstractVar:
+        if self.cache is None:
+            self.cache = alloc_abstract_var(self.stack_type)
+        return self.cache
+
+    def wants_cache(self) -> bool:
+        if self.cache is not None:
+            return True
+        return self.load_count > 1 and not isinstance(self.decoded(), TxnaExpr)
+
+
+class _LazyArgLoad(Expr):
+    """A read of a lazily decoded argument, resolved to its cache or its decoding at lowering."""
+
+    def __init__(self, var: _LazyArgVar, decoded: Expr) -> None:
+        super().__init__()
+        self.var = var
+        self.decoded = decoded
+
+    def __teal__(self, options: "CompileOptions") -> tuple[TealBlock, TealSimpleBlock]:
+        if self.var.cache is None:
+            return self.decoded.__teal__(options)
+        cached = self.var.cache.load()
+        cached.stack_frames = self.stack_frames
+        return cached.__teal__(options)
+
+    def __str__(self) -> str:
+        return f"(LazyArg {self.decoded})"
+
+    def type_of(self) -> TealType:
+        return self.var.stack_type
+
+    def has_return(self) -> bool:
+        return False
+
+
 @dataclass
 class ASTBuilder:
     def __init__(self):
@@ -520,6 +646,132 @@ class ASTBuilder:
 
         return decode_instructions, arg_vals, proto
 
+    @staticmethod
+    def __lazy_arg(
+        spec: abi.TypeSpec, decode_into: Callable[[abi.BaseType], Expr]
+    ) -> tuple[abi.BaseType, _LazyArgVar]:
+        """Create an ABI instance backed by a `_LazyArgVar`, whose decoding is `decode_into(instance)`."""
+        view = _LazyArgVar(spec.storage_type())
+        instance = SubroutineEval._new_abi_instance_from_storage(spec, view)
+
+        def bound_decode(capture: AbstractVar) -> Expr:
+            instance._stored_value = capture
+            try:
+                return decode_into(instance)
+            finally:
+                instance._stored_value = view
+
+        view.decode_into = bound_decode
+        return instance, view
+
+    @staticmethod
+    def __lazy_args_and_checks(
+        type_specs: list[abi.TypeSpec],
+    ) -> tuple[list[abi.BaseType], list[_LazyArgVar], list[Expr]]:
+        """Lazy counterpart of `__decode_constructions_and_args`.
+
+        Returns the handler arguments as lazy views, their backing vars, and the transaction type
+        checks, which are still run eagerly at handler entry.
+        """
+        app_arg_specs = [
+            spec for spec in type_specs if not isinstance(spec, abi.TransactionTypeSpec)
+        ]
+        txn_arg_cnt = len(type_specs) - len(app_arg_specs)
+        tuplify = len(app_arg_specs) > METHOD_ARG_NUM_CUTOFF
+
+        views: list[_LazyArgVar] = []
+        tupled_arg: abi.Tuple | None = None
+        if tuplify:
+            tupled_spec = abi.TupleTypeSpec(*app_arg_specs[METHOD_ARG_NUM_CUTOFF - 1 :])
+            tupled_instance, tupled_view = ASTBuilder.__lazy_arg(
+                tupled_spec,
+                lambda t: t.decode(Txn.application_args[METHOD_ARG_NUM_CUTOFF]),
+            )
+            tupled_arg = cast(abi.Tuple, tupled_instance)
+            views.append(tupled_view)
+
+        def app_arg_decoding(app_idx: int) -> Callable[[abi.BaseType], Expr]:
+            if tupled_arg is not None and app_idx >= METHOD_ARG_NUM_CUTOFF - 1:
+                element = tupled_arg[app_idx - (METHOD_ARG_NUM_CUTOFF - 1)]
+                return lambda arg: element.store_into(arg)
+            return lambda arg: arg.decode(Txn.application_args[app_idx + 1])
+
+        def txn_arg_decoding(txn_idx: int) -> Callable[[abi.BaseType], Expr]:
+            # transactions precede the current one in the group, in signature order
+            offset = txn_arg_cnt - txn_idx
+            return lambda arg: cast(abi.Transaction, arg)._set_index(
+                Txn.group_index() - Int(offset)
+            )
+
+        args: list[abi.BaseType] = []
+        checks: list[Expr] = []
+        app_idx, txn_idx = 0, 0
+        for spec in type_specs:
+            if isinstance(spec, abi.TransactionTypeSpec):
+                arg, view = ASTBuilder.__lazy_arg(spec, txn_arg_decoding(txn_idx))
+                if type(spec) is not abi.TransactionTypeSpec:
+                    checks.append(
+                        Assert(
+                            cast(abi.Transaction, arg).get().type_enum()
+                            == spec.txn_type_enum()
+                        )
+                    )
+                txn_idx += 1
+            else:
+                if abi.contains_type_spec(spec, abi.TransactionTypeSpecs):
+                    raise TealInputError(
+                        "A Transaction type may not be included in Tuples or Arrays"
+                    )
+                arg, view = ASTBuilder.__lazy_arg(spec, app_arg_decoding(app_idx))
+                app_idx += 1
+            args.append(arg)
+            views.append(view)
+
+        return args, views, checks
+
+    @staticmethod
+    def __lazify_handler(handler: ABIReturnSubroutine) -> ABIReturnSubroutine:
+        """Wrap an ABI method handler into an argument-less ABIReturnSubroutine whose body calls the
+        handler's implementation with lazy views over `Txn.application_args`.
+
+        The wrapper is evaluated separately from `handler`, so other callers of `handler` keep its
+        regular by-value arguments.
+        """
+        type_specs = cast(list[abi.TypeSpec], handler.subroutine.expected_arg_types)
+
+        def lazy_body(**output_kwarg: abi.BaseType) -> Expr:
+            args, views, checks = ASTBuilder.__lazy_args_and_checks(type_specs)
+            evaluated = handler.subroutine.implementation(*args, **output_kwarg)
+            if not isinstance(evaluated, Expr):
+                raise TealInputError(
+                    f"Subroutine function does not return a PyTeal expression. Got type {type(evaluated)}."
+                )
+            caching = [
+                view.materialize().store(view.decoded())
+                for view in views
+                if view.wants_cache()
+            ]
+            return Seq(*caching, *checks, evaluated)
+
+        def lazy_void() -> Expr:
+            return lazy_body()
+
+        def lazy_output(*, output: abi.BaseType) -> Expr:
+            return lazy_body(output=output)
+
+        impl: Callable[..., Expr] = lazy_void
+        if handler.output_kwarg_info is not None:
+            lazy_output.__annotations__[ABIReturnSubroutine.OUTPUT_ARG_NAME] = (
+                handler.subroutine.annotations[ABIReturnSubroutine.OUTPUT_ARG_NAME]
+            )
+            impl = lazy_output
+
+        lazy_handler = ABIReturnSubroutine(
+            impl, overriding_name=f"{handler.name()}_lazy"
+        )
+        lazy_handler.subroutine.stack_frames = handler.subroutine.stack_frames
+        return lazy_handler
+
     @staticmethod
     def wrap_handler(
         is_method_call: bool,
@@ -528,6 +780,7 @@ class ASTBuilder:
         wrap_to_name: str | None = None,
         use_frame_pt: bool = False,
         handler_stack_frames_container: list[NatalStackFrame] | None = None,
+        lazy_args: bool = False,
     ) -> Expr:
         """This is a helper function that handles transaction arguments passing in bare-app-call/abi-method handlers.
         If `is_method_call` is True, then it can only be `ABIReturnSubroutine`,
@@ -542,6 +795,8 @@ class ASTBuilder:
             use_frame_pt: a boolean value that specify if router is compiled to frame pointer based code.
             handler_stack_frames_container: an optional list that is filled with NatalStackFrame's
                 used in source mapping.
+            lazy_args: a boolean value that specify if the ABI method arguments are passed to the handler
+                as lazy views over `Txn.application_args`, rather than decoded before the handler is called.
         Returns:
             Expr:
                 - for bare-appcall it returns an expression that the handler takes no txn arg and Approve
@@ -618,6 +873,9 @@ class ASTBuilder:
                 f"got {handler.subroutine.argument_count()} args with {len(handler.subroutine.abi_args)} ABI args."
             )
 
+        if lazy_args:
+            handler = ASTBuilder.__lazify_handler(handler)
+
         ret_expr, subdef = (
             ASTBuilder.__de_abify_subroutine_frame_pointers(handler)
             if use_frame_pt
@@ -812,17 +1070,118 @@ class ASTBuilder:
         )
 
     def add_method_to_ast(
-        self, method_signature: str, cond: Expr | int, handler: ABIReturnSubroutine
+        self,
+        method_signature: str,
+        cond: Expr | int,
+        handler: ABIReturnSubroutine,
+        lazy_args: bool = False,
     ) -> None:
         if isinstance(cond, int) and cond == 0:
             return
-        self.methods_with_conds.append(CondWithMethod(method_signature, cond, handler))
+        self.methods_with_conds.append(
+            CondWithMethod(method_signature, cond, handler, lazy_args)
+        )
 
-    def program_construction(self, use_frame_pt: bool = False) -> Expr:
-        conditions_n_branches: list[CondNode] = self.bare_calls + [
-            method_with_cond.to_cond_node(use_frame_pt=use_frame_pt)
-            for method_with_cond in self.methods_with_conds
-        ]
+    @staticmethod
+    def shared_stub_key(handler: ABIReturnSubroutine) -> str:
+        """The argument and return types of a method, e.g. `(address,uint64)uint64`."""
+        return handler.method_signature("")
+
+    @staticmethod
+    def __shared_stub(
+        index: int, handlers: list[ABIReturnSubroutine]
+    ) -> SubroutineFnWrapper:
+        """Construct the subroutine shared by `handlers`, which all have the same argument and return types.
+
+        The subroutine is named `method_stub_{index}`, after the index of its group of handlers, since
+        the ABI types of the group may contain characters that are not valid in a TEAL label.
+
+        The subroutine takes the index of the handler to call: it decodes the method arguments from
+        `Txn.application_args`, calls the selected handler, and logs its return value if there is one.
+        Its arguments and output are allocated while the subroutine is evaluated, so they live in scratch
+        slots or in its frame depending on the compilation.
+        """
+        head = handlers[0]
+
+        def stub(handler_index: Expr) -> Expr:
+            (
+                arg_vals,
+                app_arg_vals,
+                txn_arg_vals,
+            ) = ASTBuilder.__subroutine_argument_instance_generate(head)
+            decode_instructions, arg_vals, _ = (
+                ASTBuilder.__decode_constructions_and_args(
+                    arg_vals, app_arg_vals, txn_arg_vals, head
+                )
+            )
+
+            output: abi.BaseType | None = None
+            if head.output_kwarg_info is not None:
+                output = head.output_kwarg_info.abi_type.new_instance()
+
+            calls: list[Expr] = []
+            for handler in handlers:
+                handler_evald = handler(*arg_vals)
+                if output is None:
+                    calls.append(cast(SubroutineCall, handler_evald))
+                else:
+                    calls.append(
+                        cast(abi.ReturnedValue, handler_evald).store_into(output)
+                    )
+
+            # the last handler needs no check: the index is always one of ours
+            dispatch: Expr = calls[-1]
+            for index in reversed(range(len(calls) - 1)):
+                dispatch = If(handler_index == Int(index), calls[index], dispatch)
+
+            returning: list[Expr] = [] if output is None else [abi.MethodReturn(output)]
+            return Seq(*decode_instructions, dispatch, *returning)
+
+        return Subroutine(TealType.none, f"method_stub_{index}")(stub)
+
+    def __method_cond_nodes(
+        self, use_frame_pt: bool, share_stubs: bool
+    ) -> list[CondNode]:
+        if not share_stubs:
+            return [
+                method_with_cond.to_cond_node(use_frame_pt=use_frame_pt)
+                for method_with_cond in self.methods_with_conds
+            ]
+
+        groups: dict[str, list[CondWithMethod]] = dict()
+        for method_with_cond in self.methods_with_conds:
+            if method_with_cond.lazy_args:
+                continue
+            key = ASTBuilder.shared_stub_key(method_with_cond.method)
+            groups.setdefault(key, []).append(method_with_cond)
+
+        shared = [(key, group) for key, group in groups.items() if len(group) > 1]
+        stubs: dict[str, SubroutineFnWrapper] = {
+            key: ASTBuilder.__shared_stub(index, [m.method for m in group])
+            for index, (key, group) in enumerate(shared)
+        }
+
+        cond_nodes: list[CondNode] = []
+        for method_with_cond in self.methods_with_conds:
+            key = ASTBuilder.shared_stub_key(method_with_cond.method)
+            if method_with_cond.lazy_args or key not in stubs:
+                cond_nodes.append(
+                    method_with_cond.to_cond_node(use_frame_pt=use_frame_pt)
+                )
+            else:
+                cond_nodes.append(
+                    method_with_cond.to_stub_cond_node(
+                        stubs[key], groups[key].index(method_with_cond)
+                    )
+                )
+        return cond_nodes
+
+    def program_construction(
+        self, use_frame_pt: bool = False, share_stubs: bool = False
+    ) -> Expr:
+        conditions_n_branches: list[CondNode] = (
+            self.bare_calls + self.__method_cond_nodes(use_frame_pt, share_stubs)
+        )
 
         if not conditions_n_branches:
             return Reject()
@@ -839,6 +1198,7 @@ class RouterResults:
     abi_contract: sdk_abi.Contract
     approval_sourcemap: Optional[PyTealSourceMap] = None
     clear_sourcemap: Optional[PyTealSourceMap] = None
+    approval_budget: Optional[list[BudgetEstimate]] = None
 
 
 RouterResults.__module__ = "pyteal"
@@ -856,6 +1216,7 @@ class _RouterBundle:
     approval_sourcemapper: Optional[_PyTealSourceMapper] = None
     clear_sourcemapper: Optional[_PyTealSourceMapper] = None
     input: Optional["_RouterCompileInput"] = None
+    approval_budget: Optional[list[BudgetEstimate]] = None
 
     def get_results(self) -> RouterResults:
         approval_sourcemap: PyTealSourceMap | None = None
@@ -873,6 +1234,7 @@ class _RouterBundle:
             abi_contract=self.abi_contract,
             approval_sourcemap=approval_sourcemap,
             clear_sourcemap=clear_sourcemap,
+            approval_budget=self.approval_budget,
         )
 
 
@@ -992,6 +1354,8 @@ class Router:
         overriding_name: str | None = None,
         method_config: MethodConfig | None = None,
         description: str | None = None,
+        *,
+        lazy_args: bool = False,
     ) -> ABIReturnSubroutine:
         """Add a method call handler to this Router.
 
@@ -1005,6 +1369,10 @@ class Router:
                 (i.e. only the no-op action during a non-creation call is accepted) if none is provided.
             description (optional): A description for this method. Defaults to the docstring of
                 method_call, if there is one.
+            lazy_args (optional): When `True`, the method's arguments are lazy views that read from
+                :code:`Txn.application_args` where they are used, instead of being decoded before
+                the method runs. Arguments the method writes to, or reads at several places when
+                decoding them takes more than one opcode, are cached on entry. Defaults to `False`.
         """
         if not isinstance(method_call, ABIReturnSubroutine):
             raise TealInputError(
@@ -1037,7 +1405,7 @@ class Router:
 
         method_approval_cond = method_config.approval_cond()
         self.approval_ast.add_method_to_ast(
-            method_signature, method_approval_cond, method_call
+            method_signature, method_approval_cond, method_call, lazy_args
         )
         self.method_configs[method_signature] = method_config
         return method_call
@@ -1055,6 +1423,7 @@ class Router:
         clear_state: CallConfig | None = None,
         update_application: CallConfig | None = None,
         delete_application: CallConfig | None = None,
+        lazy_args: bool = False,
     ):
         """This is an alternative way to register a method, as supposed to :code:`add_method_handler`.
 
@@ -1080,6 +1449,8 @@ class Router:
                 Use Router top level argument `clear_state` instead.
             update_application (optional): The allowed calls during :code:`OnComplete.UpdateApplication`.
             delete_application (optional): The allowed calls during :code:`OnComplete.DeleteApplication`.
+            lazy_args (optional): When `True`, the method's arguments are decoded lazily where they are
+                used. See :code:`add_method_handler` for details. Defaults to `False`.
         """
         # we use `is None` extensively for CallConfig to distinguish 2 following cases
         # - None
@@ -1116,7 +1487,11 @@ class Router:
                     **{k: none_to_never(v) for k, v in ocs.items()}
                 )
             return self.add_method_handler(
-                wrapped_subroutine, name, call_configs, description
+                wrapped_subroutine,
+                name,
+                call_configs,
+                description,
+                lazy_args=lazy_args,
             )
 
         if not func:
@@ -1171,7 +1546,10 @@ class Router:
         optimize = optimize or OptimizeOptions()
         use_frame_pt = optimize.use_frame_pointers(version)
         return (
-            self.approval_ast.program_construction(use_frame_pt=use_frame_pt),
+            self.approval_ast.program_construction(
+                use_frame_pt=use_frame_pt,
+                share_stubs=optimize.share_method_stubs(),
+            ),
             self.clear_state,
             self.contract_construct(),
         )
@@ -1281,6 +1659,8 @@ class Router:
             * abi_contract (abi.Contract): a Python SDK Contract object to allow clients to make off-chain calls
             * approval_sourcemap (PyTealSourceMap | None): source map results for approval program
             * clear_sourcemap (PyTealSourceMap | None): source map results for clear-state program
+            * approval_budget (list[BudgetEstimate] | None): if `optimize` has an `opup`, the estimated
+              opcode cost of the approval program and its methods, and the OpUp calls inserted for them
         """
         approval_filename = approval_filename or f"{self.name}_approval.teal"
         clear_filename = clear_filename or f"{self.name}_clear.teal"
@@ -1340,6 +1720,7 @@ class Router:
             approval_sourcemapper=abundle.sourcemapper,
             clear_sourcemapper=csbundle.sourcemapper,
             input=input,
+            approval_budget=abundle.budget,
         )
 
 
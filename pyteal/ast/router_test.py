@@ -1048,3 +1048,118 @@ def test_router_compile_program_idempotence():
         approval2 == approval1
     ), f"""{approval1=}
 {approval2=}"""
+
+
+@pytest.mark.parametrize("version", [6, 8])
+def test_router_lazy_args(version: int):
+    router = pt.Router("lazy")
+
+    @router.method(lazy_args=True)
+    def check_first(
+        a: pt.abi.Uint64,
+        b: pt.abi.String,
+        c: pt.abi.Tuple2[pt.abi.Uint64, pt.abi.Bool],
+        pay: pt.abi.PaymentTransaction,
+        *,
+        output: pt.abi.Uint64,
+    ) -> pt.Expr:
+        return pt.Seq(
+            pt.Assert(a.get() > pt.Int(2)),
+            c[1].use(lambda flag: pt.Assert(flag.get())),
+            output.set(a.get() + pay.get().amount()),
+        )
+
+    approval, _, contract = router.compile_program(version=version)
+    assert (
+        contract.methods[0].get_signature()
+        == "check_first(uint64,string,(uint64,bool),pay)uint64"
+    )
+
+    lines = approval.splitlines()
+    # the string argument is never read, so it is never extracted
+    assert "txna ApplicationArgs 2" not in lines
+    # the tuple is only read once, straight from the app arg
+    getbit = lines.index("getbit")
+    assert lines[getbit - 2 : getbit] == ["txna ApplicationArgs 3", "int 64"]
+    # the uint64 is read twice, so it is decoded once on entry
+    assert lines.count("txna ApplicationArgs 1") == 1
+    # the payment type check is still enforced
+    assert "int pay" in lines
+
+
+@pytest.mark.parametrize("version", [6, 8])
+def test_router_lazy_args_written(version: int):
+    @pt.ABIReturnSubroutine
+    def bump(a: pt.abi.Uint64) -> pt.Expr:
+        return pt.Seq(a.set(a.get() + pt.Int(1)), pt.Log(a.encode()))
+
+    @pt.ABIReturnSubroutine
+    def peek(a: pt.abi.Uint64, b: pt.abi.Uint64) -> pt.Expr:
+        return pt.Log(pt.Itob(b.get()))
+
+    store_op = "store" if version < 8 else "frame_bury"
+    # bump writes its argument, so it is cached on entry and then overwritten;
+    # peek never reads its first argument and reads the second one only once
+    for handler, expected_stores, expected_reads in (
+        (bump, 2, ["txna ApplicationArgs 1"]),
+        (peek, 0, ["txna ApplicationArgs 2"]),
+    ):
+        router = pt.Router("lazy")
+        router.add_method_handler(handler, lazy_args=True)
+        approval, _, _ = router.compile_program(version=version)
+        lines = approval.splitlines()
+        body = lines[lines.index(f"// {handler.name()}_lazy") :]
+        assert sum(line.startswith(store_op) for line in body) == expected_stores
+        assert [line for line in lines if line.startswith("txna")] == [
+            "txna ApplicationArgs 0",
+            *expected_reads,
+        ]
+
+
+@pytest.mark.parametrize("version", [6, 8])
+def test_router_lazy_args_many_args(version: int):
+    router = pt.Router("lazy")
+    router.add_method_handler(many_args, lazy_args=True)
+    router.add_method_handler(many_args_with_transaction, lazy_args=True)
+    approval, _, _ = router.compile_program(version=version)
+
+    lines = approval.splitlines()
+    # only the last argument is read, from its slot in the tupled app arg
+    assert "txna ApplicationArgs 1" not in lines
+    assert lines.count("txna ApplicationArgs 15") == 2
+
+
+@pytest.mark.parametrize("version", [6, 8])
+def test_router_share_method_stubs(version: int):
+    router = pt.Router("stubs")
+    for handler in (add, sub, mul, div, mod, qrem, reverse):
+        router.add_method_handler(handler)
+    router.add_method_handler(many_args, lazy_args=True)
+
+    shared = pt.OptimizeOptions(share_method_stubs=True)
+    approval, _, contract = router.compile_program(version=version, optimize=shared)
+    default, _, default_contract = router.compile_program(version=version)
+    assert contract.dictify() == default_contract.dictify()
+    assert "method_stub" not in default
+
+    lines = approval.splitlines()
+    # one stub for the five (uint64,uint64)uint64 methods, selected by handler index
+    assert [line for line in lines if line.startswith("// method_stub")] == [
+        "// method_stub_0"
+    ]
+    stub_calls = [
+        lines[i - 1]
+        for i, line in enumerate(lines)
+        if line.startswith("callsub method")
+    ]
+    assert sorted(stub_calls) == [f"int {i}" for i in range(5)]
+    # the shared stub decodes and logs once for all of them, next to qrem and reverse
+    # and the lazy many_args (which never reads its first argument)
+    assert lines.count("txna ApplicationArgs 1") == 3
+    assert lines.count("byte 0x151f7c75") == 4
+    # methods with a unique signature, and lazy methods, keep their own IO
+    assert "// qrem" in lines and "// reverse" in lines
+    assert "// many_args_lazy" in lines
+
+    assert ASTBuilder.shared_stub_key(add) == "(uint64,uint64)uint64"
+    assert ASTBuilder.shared_stub_key(qrem) == "(uint64,uint64)(uint64,uint64)"
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 class ScratchSlot:
     """Represents the allocation of a scratch space slot."""
 
+    __slots__ = ("id", "isReservedSlot")
+
     # Unique identifier for the compiler to automatically assign slots
     # The id field is used by the compiler to map to an actual slot in the source code
     # Slot ids under 256 are manually reserved slots
@@ -104,6 +106,8 @@ ScratchIndex.__module__ = "pyteal"
 class ScratchLoad(Expr):
     """Expression to load a value from scratch space."""
 
+    __slots__ = ("slot", "type", "index_expression")
+
     def __init__(
         self,
         slot: ScratchSlot | None = None,
@@ -171,6 +175,8 @@ ScratchLoad.__module__ = "pyteal"
 class ScratchStore(Expr):
     """Expression to store a value in scratch space."""
 
+    __slots__ = ("slot", "value", "index_expression")
+
     def __init__(
         self,
         slot: ScratchSlot | None,
@@ -241,6 +247,8 @@ class ScratchStackStore(Expr):
     doing.
     """
 
+    __slots__ = ("slot", "_sframes_container")
+
     def __init__(self, slot: ScratchSlot):
         """Create a new ScratchStackStore expression.
 
@@ -2,7 +2,7 @@ from typing import List, TYPE_CHECKING, overload
 
 from pyteal.types import TealType, require_type
 from pyteal.errors import TealInputError, TealTypeError, TealSeqError
-from pyteal.ir import TealSimpleBlock
+from pyteal.ir import TealBlock, TealSimpleBlock
 from pyteal.ast.expr import Expr
 
 if TYPE_CHECKING:
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 class Seq(Expr):
     """A control flow expression to represent a sequence of expressions."""
 
+    __slots__ = ("args",)
+
     @overload
     def __init__(self, *exprs: Expr) -> None:
         pass
@@ -66,13 +68,10 @@ class Seq(Expr):
         self.args = exprs
 
     def __teal__(self, options: "CompileOptions"):
-        start = TealSimpleBlock([])
-        end = start
-        for arg in self.args:
-            argStart, argEnd = arg.__teal__(options)
-            end.setNextBlock(argStart)
-            end = argEnd
-        return start, end
+        return TealBlock.FromPath(options, self._teal_path(options))
+
+    def _teal_path(self, options: "CompileOptions"):
+        return [TealSimpleBlock([]), *self.args]
 
     def __str__(self):
         ret_str = "(Seq"
@@ -81,19 +80,26 @@ class Seq(Expr):
         ret_str += ")"
         return ret_str
 
+    def _last(self) -> Expr | None:
+        """Get the final expression of this Seq, looking through nested Seqs that end it."""
+        last: Expr = self
+        while type(last) is Seq:
+            if len(last.args) == 0:
+                return None
+            last = last.args[-1]
+        return last
+
     def type_of(self):
-        if len(self.args) == 0:
-            return TealType.none
-        return self.args[-1].type_of()
+        last = self._last()
+        return TealType.none if last is None else last.type_of()
 
     def has_return(self):
         # this expression declares it has a return op only if its final expression has a return op
         # TODO: technically if ANY expression, not just the final one, returns true for has_return,
         # this could return true as well. But in that case all expressions after the one that
         # returns true for has_return is dead code, so it could be optimized away
-        if len(self.args) == 0:
-            return False
-        return self.args[-1].has_return()
+        last = self._last()
+        return False if last is None else last.has_return()
 
 
 Seq.__module__ = "pyteal"
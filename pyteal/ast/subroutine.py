@@ -9,6 +9,7 @@ from types import MappingProxyType, NoneType
 from typing import Any, Callable, Final, TYPE_CHECKING, cast, ClassVar
 
 from pyteal.ast import abi
+from pyteal.ast.abstractvar import AbstractVar
 from pyteal.ast.expr import Expr
 from pyteal.ast.seq import Seq
 from pyteal.ast.scratchvar import DynamicScratchVar, ScratchVar, ScratchSlot
@@ -393,6 +394,8 @@ SubroutineDefinition.__module__ = "pyteal"
 
 
 class SubroutineDeclaration(Expr):
+    __slots__ = ("subroutine", "body", "deferred_expr", "_sframes_container")
+
     def __init__(
         self,
         subroutine: SubroutineDefinition,
@@ -443,6 +446,8 @@ OutputKwArgInfo.__module__ = "pyteal"
 
 
 class SubroutineCall(Expr):
+    __slots__ = ("subroutine", "args", "output_kwarg")
+
     def __init__(
         self,
         subroutine: SubroutineDefinition,
@@ -922,10 +927,10 @@ class SubroutineEval:
 
     @staticmethod
     def _new_abi_instance_from_storage(
-        spec: abi.TypeSpec, storage: FrameVar
+        spec: abi.TypeSpec, storage: AbstractVar
     ) -> abi.BaseType:
         """
-        This hidden method generates new ABI instance that is tied to the storage: FrameVar as follows:
+        This hidden method generates new ABI instance that is tied to the storage (usually a FrameVar) as follows:
         - generates new instance that is based on scratch vars
         - rewind the new instance to be using storage: FrameVar
         - rewind the state changed by scratch slot allocation
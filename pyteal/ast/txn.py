@@ -10,7 +10,7 @@ from pyteal.errors import (
 )
 from pyteal.ir import TealOp, Op, TealBlock
 from pyteal.ast.leafexpr import LeafExpr
-from pyteal.ast.expr import Expr
+from pyteal.ast.expr import Expr, _InterningMeta
 from pyteal.ast.int import EnumInt
 from pyteal.ast.array import Array
 
@@ -143,9 +143,11 @@ class TxnField(Enum):
 TxnField.__module__ = "pyteal"
 
 
-class TxnExpr(LeafExpr):
+class TxnExpr(LeafExpr, metaclass=_InterningMeta):
     """An expression that accesses a transaction field from the current transaction."""
 
+    __slots__ = ("op", "name", "field")
+
     def __init__(self, op: Op, name: str, field: TxnField) -> None:
         super().__init__()
         if field.is_array:
@@ -178,6 +180,8 @@ TxnExpr.__module__ = "pyteal"
 class TxnaExpr(LeafExpr):
     """An expression that accesses a transaction array field from the current transaction."""
 
+    __slots__ = ("staticOp", "dynamicOp", "name", "field", "index")
+
     @staticmethod
     def __validate_index_or_throw(index: Union[int, Expr]):
         if not isinstance(index, (int, Expr)):
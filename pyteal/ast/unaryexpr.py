@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 from pyteal.types import TealType, require_type
 from pyteal.errors import verifyProgramVersion
-from pyteal.ir import TealOp, Op, TealBlock
+from pyteal.ir import TealOp, Op, TealBlock, TealSimpleBlock
 from pyteal.ast.expr import Expr
 
 if TYPE_CHECKING:
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 class UnaryExpr(Expr):
     """An expression with a single argument."""
 
+    __slots__ = ("op", "outputType", "arg")
+
     def __init__(
         self, op: Op, inputType: TealType, outputType: TealType, arg: Expr
     ) -> None:
@@ -22,13 +24,16 @@ class UnaryExpr(Expr):
         self.arg = arg
 
     def __teal__(self, options: "CompileOptions"):
+        return TealBlock.FromPath(options, self._teal_path(options))
+
+    def _teal_path(self, options: "CompileOptions"):
         verifyProgramVersion(
             self.op.min_version,
             options.version,
             "Program version too low to use op {}".format(self.op),
         )
 
-        return TealBlock.FromOp(options, TealOp(self, self.op), self.arg)
+        return [self.arg, TealSimpleBlock([TealOp(self, self.op)])]
 
     def __str__(self):
         return "({} {})".format(str(self.op).title().replace("_", ""), self.arg)
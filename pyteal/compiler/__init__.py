@@ -10,7 +10,9 @@ from pyteal.compiler.compiler import (
     CompileResults,
     compileTeal,
 )
+from pyteal.compiler.cost import BudgetEstimate
 from pyteal.compiler.optimizer import OptimizeOptions
+from pyteal.compiler.profiler import CostProfiler, LineProfile, SubroutineProfile
 from pyteal.compiler.sourcemap import PyTealSourceMap, R3SourceMap
 
 
@@ -24,6 +26,10 @@ __all__ = [
     "CompileOptions",
     "Compilation",
     "CompileResults",
+    "BudgetEstimate",
+    "CostProfiler",
+    "LineProfile",
+    "SubroutineProfile",
     "compileTeal",
     "OptimizeOptions",
     "PyTealSourceMap",
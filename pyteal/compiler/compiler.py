@@ -1,17 +1,28 @@
+import warnings
 from dataclasses import dataclass
 from typing import Dict, Final, List, Optional, Set, Tuple, cast
 
 from algosdk.v2client.algod import AlgodClient
 
 from pyteal.ast import Expr, Return, Seq, SubroutineDeclaration, SubroutineDefinition
+from pyteal.config import MAX_STACK_DEPTH
 from pyteal.compiler.constants import createConstantBlocks
-from pyteal.compiler.flatten import flattenBlocks, flattenSubroutines
-from pyteal.compiler.optimizer import OptimizeOptions, apply_global_optimizations
+from pyteal.compiler.cost import BudgetEstimate, insertOpUps
+from pyteal.compiler.flatten import flattenBlocks, flattenSubroutines, threadJumps
+from pyteal.compiler.optimizer import (
+    OptimizeOptions,
+    apply_global_optimizations,
+    fold_constants,
+    lower_maybe_values,
+    hoist_loop_invariants,
+    schedule_stack_slots,
+)
 from pyteal.compiler.scratchslots import (
     assignScratchSlotsToSubroutines,
     collect_unoptimized_slots,
 )
-from pyteal.compiler.sort import sortBlocks
+from pyteal.compiler.sort import layoutBlocks, mergeTailBlocks, sortBlocks
+from pyteal.compiler.stackflow import verifyStack
 from pyteal.compiler.sourcemap import (
     _PyTealSourceMapper,
     PyTealSourceMap,
@@ -234,13 +245,22 @@ def compileSubroutine(
 def sort_subroutine_blocks(
     subroutine_start_blocks: Dict[Optional[SubroutineDefinition], TealBlock],
     subroutine_end_blocks: Dict[Optional[SubroutineDefinition], TealBlock],
+    layout: bool = False,
+    thread: bool = False,
 ) -> Dict[Optional[SubroutineDefinition], List[TealComponent]]:
     subroutine_mapping: Dict[Optional[SubroutineDefinition], List[TealComponent]] = (
         dict()
     )
     for subroutine, start in subroutine_start_blocks.items():
-        order = sortBlocks(start, subroutine_end_blocks[subroutine])
+        end = subroutine_end_blocks[subroutine]
+        if layout:
+            mergeTailBlocks(start, end)
+            order = layoutBlocks(start, end)
+        else:
+            order = sortBlocks(start, end)
         subroutine_mapping[subroutine] = flattenBlocks(order)
+        if thread:
+            subroutine_mapping[subroutine] = threadJumps(subroutine_mapping[subroutine])
 
     return subroutine_mapping
 
@@ -251,6 +271,8 @@ class CompileResults:
 
     teal: str
     sourcemap: PyTealSourceMap | None = None
+    budget: list[BudgetEstimate] | None = None
+    max_stack_depth: int | None = None
 
 
 CompileResults.__module__ = "pyteal"
@@ -285,13 +307,15 @@ class _FullCompilationBundle:
     components: list[TealComponent]
     sourcemapper: _PyTealSourceMapper | None = None
     annotated_teal: str | None = None
+    budget: list[BudgetEstimate] | None = None
+    max_stack_depth: int | None = None
 
     def get_results(self) -> CompileResults:
         sourcemap: PyTealSourceMap | None = None
         if self.sourcemapper:
             sourcemap = self.sourcemapper.get_sourcemap(self.teal)
 
-        return CompileResults(self.teal, sourcemap)
+        return CompileResults(self.teal, sourcemap, self.budget, self.max_stack_depth)
 
 
 class Compilation:
@@ -308,6 +332,7 @@ class Compilation:
         assemble_constants: bool = False,
         assembly_type_track: bool = True,
         optimize: OptimizeOptions | None = None,
+        verify_stack: bool = False,
     ):
         """
         Instantiate a Compilation object providing the necessary data to compile a PyTeal expression.
@@ -328,6 +353,10 @@ class Compilation:
                 type checking at assembly time. This is only useful if PyTeal is producing incorrect
                 TEAL code, or the assembler is producing incorrect type errors. Defaults to `True`.
             optimize (optional): `OptimizeOptions` that determine which optimizations will be applied.
+            verify_stack (optional): When `True`, the compiler will check the compiled program for
+                stack underflows, type mismatches and branches that leave different stack depths,
+                raising a `TealInternalError` if it finds any, and report the maximum stack depth in
+                `CompileResults.max_stack_depth`. Defaults to `False`.
         """
         self.ast = ast
         self.mode = mode
@@ -335,6 +364,7 @@ class Compilation:
         self.assemble_constants = assemble_constants
         self.assembly_type_track = assembly_type_track
         self.optimize: OptimizeOptions = optimize or OptimizeOptions()
+        self.verify_stack = verify_stack
 
     def compile(
         self,
@@ -423,118 +453,165 @@ class Compilation:
                 algod_client, msg="Adding PC's to sourcemap requires live Algod"
             )
 
-        options = CompileOptions(
-            mode=self.mode, version=self.version, optimize=self.optimize
-        )
-
-        subroutineGraph: Dict[SubroutineDefinition, Set[SubroutineDefinition]] = dict()
-        subroutine_start_blocks: Dict[Optional[SubroutineDefinition], TealBlock] = (
-            dict()
-        )
-        subroutine_end_blocks: Dict[Optional[SubroutineDefinition], TealBlock] = dict()
-        compileSubroutine(
-            self.ast,
-            options,
-            subroutineGraph,
-            subroutine_start_blocks,
-            subroutine_end_blocks,
-        )
+        try:
+            options = CompileOptions(
+                mode=self.mode, version=self.version, optimize=self.optimize
+            )
 
-        # note: optimizations are off by default, in which case, apply_global_optimizations
-        # won't make any changes. Because the optimizer is invoked on a subroutine's
-        # control flow graph, the optimizer requires context across block boundaries. This
-        # is necessary for the dependency checking of local slots. Global slots, slots
-        # used by DynamicScratchVar, and reserved slots are not optimized.
-        if options.optimize.optimize_scratch_slots(self.version):
-            options.optimize._skip_slots = collect_unoptimized_slots(
-                subroutine_start_blocks
+            subroutineGraph: Dict[SubroutineDefinition, Set[SubroutineDefinition]] = (
+                dict()
+            )
+            subroutine_start_blocks: Dict[Optional[SubroutineDefinition], TealBlock] = (
+                dict()
+            )
+            subroutine_end_blocks: Dict[Optional[SubroutineDefinition], TealBlock] = (
+                dict()
+            )
+            compileSubroutine(
+                self.ast,
+                options,
+                subroutineGraph,
+                subroutine_start_blocks,
+                subroutine_end_blocks,
             )
-            for start in subroutine_start_blocks.values():
-                apply_global_optimizations(start, options.optimize, self.version)
 
-        localSlotAssignments: Dict[Optional[SubroutineDefinition], Set[int]] = (
-            assignScratchSlotsToSubroutines(subroutine_start_blocks)
-        )
+            if options.optimize.unroll_budget() > 0:
+                for start in subroutine_start_blocks.values():
+                    fold_constants(start)
+
+            if options.optimize.lower_maybe_values():
+                maybe_skip_slots = collect_unoptimized_slots(subroutine_start_blocks)
+                for start in subroutine_start_blocks.values():
+                    lower_maybe_values(start, maybe_skip_slots, self.version)
+
+            if options.optimize.hoist_loop_invariants():
+                for subroutine, start in subroutine_start_blocks.items():
+                    subroutine_start_blocks[subroutine] = hoist_loop_invariants(start)
+
+            # note: optimizations are off by default, in which case, apply_global_optimizations
+            # won't make any changes. Because the optimizer is invoked on a subroutine's
+            # control flow graph, the optimizer requires context across block boundaries. This
+            # is necessary for the dependency checking of local slots. Global slots, slots
+            # used by DynamicScratchVar, and reserved slots are not optimized.
+            if options.optimize.optimize_scratch_slots(self.version):
+                options.optimize._skip_slots = collect_unoptimized_slots(
+                    subroutine_start_blocks
+                )
+                for start in subroutine_start_blocks.values():
+                    apply_global_optimizations(start, options.optimize, self.version)
 
-        subroutineMapping: Dict[Optional[SubroutineDefinition], List[TealComponent]] = (
-            sort_subroutine_blocks(subroutine_start_blocks, subroutine_end_blocks)
-        )
+            if options.optimize.schedule_stack():
+                stack_skip_slots = collect_unoptimized_slots(subroutine_start_blocks)
+                for start in subroutine_start_blocks.values():
+                    schedule_stack_slots(start, stack_skip_slots, self.version)
 
-        spillLocalSlotsDuringRecursion(
-            self.version, subroutineMapping, subroutineGraph, localSlotAssignments
-        )
+            budget: list[BudgetEstimate] | None = None
+            if options.optimize.insert_opups():
+                budget = insertOpUps(subroutine_start_blocks, subroutineGraph, options)
 
-        subroutineLabels = resolveSubroutines(subroutineMapping)
-        components: list[TealComponent] = flattenSubroutines(
-            subroutineMapping, subroutineLabels, options
-        )
+            localSlotAssignments: Dict[Optional[SubroutineDefinition], Set[int]] = (
+                assignScratchSlotsToSubroutines(subroutine_start_blocks)
+            )
 
-        verifyOpsForVersion(components, options.version)
-        verifyOpsForMode(components, options.mode)
+            subroutineMapping: Dict[
+                Optional[SubroutineDefinition], List[TealComponent]
+            ] = sort_subroutine_blocks(
+                subroutine_start_blocks,
+                subroutine_end_blocks,
+                options.optimize.layout_blocks(),
+                options.optimize.thread_jumps(),
+            )
 
-        if self.assemble_constants:
-            if self.version < 3:
-                raise TealInternalError(
-                    f"The minimum program version required to enable assembleConstants is 3. The current version is {self.version}."
-                )
-            components = createConstantBlocks(components)
-
-        componentsPrefix: list[TealComponent] = [TealPragma(version=self.version)]
-        if not self.assembly_type_track:
-            componentsPrefix.append(TealPragma(type_track=False))
-
-        components = componentsPrefix + components  # T2PT0
-        teal_chunks = [tl.assemble() for tl in components]
-        teal_code = "\n".join(teal_chunks)
-
-        full_cpb = _FullCompilationBundle(
-            ast=self.ast,
-            mode=self.mode,
-            version=self.version,
-            assemble_constants=self.assemble_constants,
-            optimize=self.optimize,
-            teal=teal_code,
-            teal_chunks=teal_chunks,
-            components=components,
-        )
-        if not with_sourcemap:
-            return full_cpb
+            spillLocalSlotsDuringRecursion(
+                self.version, subroutineMapping, subroutineGraph, localSlotAssignments
+            )
 
-        # Below is purely for the source mapper:
+            max_stack_depth: int | None = None
+            if self.verify_stack:
+                max_stack_depth = verifyStack(subroutineMapping)
+                if max_stack_depth is not None and max_stack_depth > MAX_STACK_DEPTH:
+                    warnings.warn(
+                        "The program may use up to {} stack values, more than the limit of {}".format(
+                            max_stack_depth, MAX_STACK_DEPTH
+                        )
+                    )
 
-        source_mapper = _PyTealSourceMapper(
-            teal_chunks=teal_chunks,
-            components=components,
-            build=True,
-            teal_filename=teal_filename,
-            include_pcs=pcs_in_sourcemap,
-            algod=algod_client,
-            annotate_teal=annotate_teal,
-            annotate_teal_headers=annotate_teal_headers,
-            annotate_teal_concise=annotate_teal_concise,
-        )
-        full_cpb.sourcemapper = source_mapper
+            subroutineLabels = resolveSubroutines(subroutineMapping)
+            components: list[TealComponent] = flattenSubroutines(
+                subroutineMapping, subroutineLabels, options
+            )
 
-        # run a second time without, and assert that the same teal is produced
-        with sourcemapping_off_context():
-            assert NatalStackFrame.sourcemapping_is_off()
+            verifyOpsForVersion(components, options.version)
+            verifyOpsForMode(components, options.mode)
 
-            # implicitly recursive call!!
-            teal_code_wo = compileTeal(
-                self.ast,
-                self.mode,
+            if self.assemble_constants:
+                if self.version < 3:
+                    raise TealInternalError(
+                        f"The minimum program version required to enable assembleConstants is 3. The current version is {self.version}."
+                    )
+                components = createConstantBlocks(components)
+
+            componentsPrefix: list[TealComponent] = [TealPragma(version=self.version)]
+            if not self.assembly_type_track:
+                componentsPrefix.append(TealPragma(type_track=False))
+
+            components = componentsPrefix + components  # T2PT0
+            teal_chunks = [tl.assemble() for tl in components]
+            teal_code = "\n".join(teal_chunks)
+
+            full_cpb = _FullCompilationBundle(
+                ast=self.ast,
+                mode=self.mode,
                 version=self.version,
-                assembleConstants=self.assemble_constants,
+                assemble_constants=self.assemble_constants,
                 optimize=self.optimize,
+                teal=teal_code,
+                teal_chunks=teal_chunks,
+                components=components,
+                budget=budget,
+                max_stack_depth=max_stack_depth,
             )
-
-            _PyTealSourceMapper._validate_teal_identical(
-                teal_code_wo,
-                teal_code,
-                msg="FATAL ERROR. Program without sourcemaps (LEFT) differs from Program with (RIGHT)",
+            if not with_sourcemap:
+                return full_cpb
+
+            # Below is purely for the source mapper:
+
+            source_mapper = _PyTealSourceMapper(
+                teal_chunks=teal_chunks,
+                components=components,
+                build=True,
+                teal_filename=teal_filename,
+                include_pcs=pcs_in_sourcemap,
+                algod=algod_client,
+                annotate_teal=annotate_teal,
+                annotate_teal_headers=annotate_teal_headers,
+                annotate_teal_concise=annotate_teal_concise,
             )
+            full_cpb.sourcemapper = source_mapper
+
+            # run a second time without, and assert that the same teal is produced
+            with sourcemapping_off_context():
+                assert NatalStackFrame.sourcemapping_is_off()
+
+                # implicitly recursive call!!
+                teal_code_wo = compileTeal(
+                    self.ast,
+                    self.mode,
+                    version=self.version,
+                    assembleConstants=self.assemble_constants,
+                    optimize=self.optimize,
+                )
 
-        return full_cpb
+                _PyTealSourceMapper._validate_teal_identical(
+                    teal_code_wo,
+                    teal_code,
+                    msg="FATAL ERROR. Program without sourcemaps (LEFT) differs from Program with (RIGHT)",
+                )
+
+            return full_cpb
+        finally:
+            # the code locations of this program are unlikely to recur in the next one
+            NatalStackFrame._clear_code_locations()
 
 
 Compilation.__module__ = "pyteal"
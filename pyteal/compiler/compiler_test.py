@@ -1,4 +1,5 @@
 from pathlib import Path
+import sys
 
 import pytest
 
@@ -1864,6 +1865,47 @@ def test_compileSubroutine_deferred_block_malformed():
         pt.compileTeal(program, pt.Mode.Application, version=6, assembleConstants=False)
 
 
+def test_compile_deep_expressions():
+    # long and deeply nested programs must compile without exceeding the recursion limit
+    n = sys.getrecursionlimit()
+
+    total: pt.Expr = pt.Int(0)
+    for i in range(n):
+        total = total + pt.Int(i)
+
+    branches = pt.If(pt.Txn.fee() == pt.Int(0)).Then(pt.Log(pt.Bytes("0")))
+    for i in range(1, n):
+        branches = branches.ElseIf(pt.Txn.fee() == pt.Int(i)).Then(
+            pt.Log(pt.Bytes(str(i)))
+        )
+
+    program = pt.Seq(
+        *[pt.Pop(pt.Int(i)) for i in range(n)],
+        branches.Else(pt.Reject()),
+        pt.Pop(total),
+        pt.Int(1),
+    )
+
+    actual = pt.compileTeal(
+        program, pt.Mode.Application, version=8, assembleConstants=False
+    ).splitlines()
+    assert actual[1:3] == ["int 0", "pop"]
+    assert actual[-2:] == ["int 1", "return"]
+    assert actual.count("+") == n
+    assert sum(line.startswith("bnz ") for line in actual) == n
+
+    nested: pt.Expr = pt.Approve()
+    for i in range(n):
+        nested = pt.Seq(pt.Pop(pt.Int(i)), nested)
+    assert nested.type_of() == pt.TealType.none
+    assert nested.has_return()
+
+    actual = pt.compileTeal(nested, pt.Mode.Application, version=8).splitlines()
+    assert actual[1:3] == ["int " + str(n - 1), "pop"]
+    assert actual[-2:] == ["int 1", "return"]
+    assert actual.count("pop") == n
+
+
 def test_compile_wide_ratio():
     cases = (
         (
@@ -0,0 +1,427 @@
+from dataclasses import dataclass
+from math import ceil
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Set
+
+from pyteal.ast import Expr, Seq, SubroutineDefinition
+from pyteal.ast.opup import _fee_by_source
+from pyteal.errors import TealInputError, TealInternalError, verifyProgramVersion
+from pyteal.ir import Mode, Op, TealBlock, TealOp, TealSimpleBlock
+
+if TYPE_CHECKING:
+    from pyteal.compiler.compiler import CompileOptions
+
+# The opcode budget of a single application call
+APP_CALL_BUDGET = 700
+
+# The minimum transaction fee in microAlgos
+MIN_TXN_FEE = 1000
+
+# The minimum program version where OpUp inner application calls are available
+OPUP_MIN_VERSION = 6
+
+# Opcode costs that differ from 1, taken from the AVM opcode specification. Costs that depend on
+# an immediate argument (e.g. the curve of an elliptic curve op) are keyed by that argument. A
+# cost of None means the op's cost grows with the length of its inputs without a useful bound.
+OP_COSTS: Dict[Op, int | Dict[str, int] | None] = {
+    Op.comment: 0,
+    Op.sha256: 35,
+    Op.keccak256: 130,
+    Op.sha512_256: 45,
+    Op.sha3_256: 130,
+    Op.ed25519verify: 1900,
+    Op.ed25519verify_bare: 1900,
+    Op.ecdsa_verify: {"Secp256k1": 1700, "Secp256r1": 2500},
+    Op.ecdsa_pk_decompress: {"Secp256k1": 650, "Secp256r1": 2400},
+    Op.ecdsa_pk_recover: 2000,
+    Op.vrf_verify: 5700,
+    Op.sqrt: 4,
+    Op.expw: 10,
+    Op.divmodw: 20,
+    Op.b_add: 10,
+    Op.b_minus: 10,
+    Op.b_div: 20,
+    Op.b_mul: 20,
+    Op.b_mod: 20,
+    Op.b_or: 6,
+    Op.b_and: 6,
+    Op.b_xor: 6,
+    Op.b_not: 4,
+    Op.bsqrt: 40,
+    # 1 + 1 per 16 bytes, for an input of at most 4096 bytes
+    Op.base64_decode: 257,
+    # 25 + 2 per 7 bytes, for an input of at most 4096 bytes
+    Op.json_ref: 1197,
+    Op.ec_add: {
+        "BN254g1": 125,
+        "BN254g2": 170,
+        "BLS12_381g1": 205,
+        "BLS12_381g2": 290,
+    },
+    Op.ec_scalar_mul: {
+        "BN254g1": 1810,
+        "BN254g2": 3430,
+        "BLS12_381g1": 2950,
+        "BLS12_381g2": 6530,
+    },
+    Op.ec_subgroup_check: {
+        "BN254g1": 20,
+        "BN254g2": 3100,
+        "BLS12_381g1": 1850,
+        "BLS12_381g2": 2340,
+    },
+    Op.ec_map_to: {
+        "BN254g1": 630,
+        "BN254g2": 3300,
+        "BLS12_381g1": 1950,
+        "BLS12_381g2": 8150,
+    },
+    Op.ec_pairing_check: None,
+    Op.ec_multi_scalar_mul: None,
+    Op.mimc: None,
+}
+
+
+def opCost(op: TealOp) -> Optional[int]:
+    """Get the worst case opcode cost of a single TEAL operation.
+
+    Returns:
+        The cost, or None if the cost depends on the length of the op's inputs.
+    """
+    cost = OP_COSTS.get(op.op, 1)
+    if isinstance(cost, dict):
+        if op.args and isinstance(op.args[0], str) and op.args[0] in cost:
+            return cost[op.args[0]]
+        return max(cost.values())
+    return cost
+
+
+def _ops_cost(
+    ops: List[TealOp],
+    subroutine_costs: Mapping[Optional[SubroutineDefinition], Optional[int]],
+) -> Optional[int]:
+    total = 0
+    for op in ops:
+        cost = opCost(op)
+        if cost is None:
+            return None
+        total += cost
+        for subroutine in op.getSubroutines():
+            callee_cost = subroutine_costs.get(subroutine)
+            if callee_cost is None:
+                return None
+            total += callee_cost
+    return total
+
+
+def _topological_blocks(start: TealBlock) -> Optional[List[TealBlock]]:
+    """Order the blocks of a control flow graph so every block comes before its successors.
+
+    Returns:
+        The ordered blocks, or None if the graph has a cycle.
+    """
+    order: List[TealBlock] = []
+    visiting: Set[int] = set()
+    visited: Set[int] = set()
+
+    # iterative DFS, where each stack entry is a block and its next outgoing index
+    stack: List[tuple[TealBlock, int]] = [(start, 0)]
+    visiting.add(id(start))
+    while stack:
+        block, index = stack.pop()
+        outgoing = block.getOutgoing()
+        if index < len(outgoing):
+            stack.append((block, index + 1))
+            succ = outgoing[index]
+            if id(succ) in visiting:
+                return None
+            if id(succ) not in visited:
+                visiting.add(id(succ))
+                stack.append((succ, 0))
+            continue
+        visiting.remove(id(block))
+        visited.add(id(block))
+        order.append(block)
+
+    order.reverse()
+    return order
+
+
+def maxPathCost(
+    start: TealBlock,
+    subroutine_costs: Mapping[Optional[SubroutineDefinition], Optional[int]],
+) -> Optional[int]:
+    """Compute the worst case opcode cost of running a control flow graph to completion.
+
+    Calls to subroutines add the cost given for them in subroutine_costs.
+
+    Returns:
+        The cost of the most expensive path through the graph, or None if the graph has a loop or
+        contains an op or subroutine call without a bounded cost.
+    """
+    order = _topological_blocks(start)
+    if order is None:
+        return None
+
+    cost_from: Dict[int, int] = {}
+    for block in reversed(order):
+        own = _ops_cost(block.ops, subroutine_costs)
+        if own is None:
+            return None
+        cost_from[id(block)] = own + max(
+            (cost_from[id(succ)] for succ in block.getOutgoing()), default=0
+        )
+
+    return cost_from[id(start)]
+
+
+def estimateSubroutineCosts(
+    subroutine_start_blocks: Mapping[Optional[SubroutineDefinition], TealBlock],
+    subroutineGraph: Mapping[SubroutineDefinition, Set[SubroutineDefinition]],
+) -> Dict[Optional[SubroutineDefinition], Optional[int]]:
+    """Compute the worst case opcode cost of each subroutine and the main program.
+
+    The cost of a subroutine includes the cost of all subroutines it calls. Recursive subroutines
+    and subroutines with loops have no bounded cost.
+
+    Returns:
+        A dictionary from each subroutine (None for the main program) to its cost, or None if the
+        cost is not bounded.
+    """
+    costs: Dict[Optional[SubroutineDefinition], Optional[int]] = {}
+
+    def visit(subroutine: SubroutineDefinition, active: Set[SubroutineDefinition]):
+        if subroutine in costs:
+            return
+        if subroutine in active:
+            # recursion, the cost of every subroutine on the cycle is unbounded
+            for member in active:
+                costs[member] = None
+            return
+
+        active.add(subroutine)
+        for callee in sorted(subroutineGraph.get(subroutine, ()), key=lambda s: s.id):
+            visit(callee, active)
+        active.remove(subroutine)
+
+        if subroutine not in costs:
+            costs[subroutine] = maxPathCost(subroutine_start_blocks[subroutine], costs)
+
+    for subroutine in subroutine_start_blocks:
+        if subroutine is not None:
+            visit(subroutine, set())
+
+    costs[None] = maxPathCost(subroutine_start_blocks[None], costs)
+    return costs
+
+
+@dataclass(frozen=True)
+class BudgetEstimate:
+    """The estimated opcode budget of the main program or one of the subroutines it calls.
+
+    Attributes:
+        name: The subroutine name, or "main" for the main program.
+        cost: The worst case opcode cost, including called subroutines, or None if it is not bounded.
+        opups: The number of OpUp inner transactions inserted to cover the cost.
+        fee: The fee of the inserted inner transactions at the minimum fee, in microAlgos.
+    """
+
+    name: str
+    cost: Optional[int]
+    opups: int
+    fee: int
+
+
+BudgetEstimate.__module__ = "pyteal"
+
+
+def _opup_blocks(
+    opups: int, options: "CompileOptions"
+) -> tuple[TealBlock, TealSimpleBlock]:
+    opup = options.optimize._opup
+    if opup is None:
+        raise TealInternalError("No OpUp configured")
+
+    expr: Expr = Seq(
+        *(
+            opup._construct_itxn(
+                inner_fee=_fee_by_source(options.optimize._opup_fee_source)
+            )
+            for _ in range(opups)
+        )
+    )
+    start, end = expr.__teal__(options)
+    start.addIncoming()
+    start.validateTree()
+    return start, end
+
+
+def _opup_cost(options: "CompileOptions") -> int:
+    start, _ = _opup_blocks(1, options)
+    cost = maxPathCost(start, {})
+    if cost is None:
+        raise TealInternalError("OpUp inner transaction has an unbounded cost")
+    return cost
+
+
+def _call_site_costs(
+    start: TealBlock,
+    subroutine_costs: Mapping[Optional[SubroutineDefinition], Optional[int]],
+) -> Optional[Dict[SubroutineDefinition, int]]:
+    """For each subroutine called by a control flow graph, get the worst case cost of running the
+    graph, excluding that subroutine itself, on any path that calls it.
+    """
+    order = _topological_blocks(start)
+    if order is None:
+        return None
+
+    op_costs: Dict[int, List[int]] = {}
+    for block in order:
+        costs = []
+        for op in block.ops:
+            cost = _ops_cost([op], subroutine_costs)
+            if cost is None:
+                return None
+            costs.append(cost)
+        op_costs[id(block)] = costs
+
+    cost_to: Dict[int, int] = {id(start): 0}
+    for block in order:
+        out = cost_to[id(block)] + sum(op_costs[id(block)])
+        for succ in block.getOutgoing():
+            cost_to[id(succ)] = max(cost_to.get(id(succ), 0), out)
+
+    cost_from: Dict[int, int] = {}
+    for block in reversed(order):
+        cost_from[id(block)] = max(
+            (cost_from[id(succ)] for succ in block.getOutgoing()), default=0
+        )
+        cost_from[id(block)] += sum(op_costs[id(block)])
+
+    sites: Dict[SubroutineDefinition, int] = {}
+    for block in order:
+        through = cost_to[id(block)] + cost_from[id(block)]
+        for op in block.ops:
+            for subroutine in op.getSubroutines():
+                callee_cost = subroutine_costs[subroutine]
+                if callee_cost is None:
+                    return None
+                sites[subroutine] = max(sites.get(subroutine, 0), through - callee_cost)
+    return sites
+
+
+def insertOpUps(
+    subroutine_start_blocks: Dict[Optional[SubroutineDefinition], TealBlock],
+    subroutineGraph: Mapping[SubroutineDefinition, Set[SubroutineDefinition]],
+    options: "CompileOptions",
+) -> List[BudgetEstimate]:
+    """Insert OpUp inner transactions where the static cost of a program exceeds its budget.
+
+    The main program and each subroutine it calls directly, such as the methods of a Router, are
+    analyzed. Each of them receives exactly enough unrolled OpUp calls at its start to cover the
+    worst case cost of every path of the program that runs it, assuming the program starts with
+    the budget of a single application call. Programs or subroutines whose cost is not bounded,
+    because of loops, recursion or ops with input dependent costs, are left unchanged and reported
+    with a cost of None.
+
+    Args:
+        subroutine_start_blocks: The start block of each subroutine, and of the main program under
+            the key None. Start blocks that receive OpUp calls are replaced.
+        subroutineGraph: The subroutines called by each subroutine.
+        options: The compile options, with an OpUp configured in options.optimize.
+
+    Returns:
+        A BudgetEstimate for the main program and each subroutine it calls directly.
+    """
+    if options.mode != Mode.Application:
+        raise TealInputError("Automatic OpUp insertion requires Mode.Application")
+    verifyProgramVersion(
+        OPUP_MIN_VERSION,
+        options.version,
+        f"Automatic OpUp insertion requires program version {OPUP_MIN_VERSION} or higher",
+    )
+
+    costs = estimateSubroutineCosts(subroutine_start_blocks, subroutineGraph)
+    opup_gain = APP_CALL_BUDGET - _opup_cost(options)
+
+    def opups_for(cost: int) -> int:
+        return ceil(max(0, cost - APP_CALL_BUDGET) / opup_gain)
+
+    main_start = subroutine_start_blocks[None]
+    entries = sorted(
+        {
+            subroutine
+            for block in TealBlock.Iterate(main_start)
+            for op in block.ops
+            for subroutine in op.getSubroutines()
+        },
+        key=lambda s: s.id,
+    )
+
+    # the cost of the main program without the subroutines it calls, which pay for themselves
+    own_costs = dict(costs)
+    for entry in entries:
+        own_costs[entry] = 0
+    main_own_cost = maxPathCost(main_start, own_costs)
+
+    estimates: List[BudgetEstimate] = []
+    planned: Dict[Optional[SubroutineDefinition], int] = {}
+
+    if main_own_cost is not None:
+        planned[None] = opups_for(main_own_cost)
+    estimates.append(
+        BudgetEstimate(
+            "main",
+            costs[None],
+            planned.get(None, 0),
+            planned.get(None, 0) * MIN_TXN_FEE,
+        )
+    )
+
+    sites = (
+        _call_site_costs(main_start, costs)
+        if all(costs[entry] is not None for entry in entries)
+        else None
+    )
+    # the OpUps of the main program run before any subroutine it calls, so the budget they raise
+    # is already available to every call site
+    main_raised = planned.get(None, 0) * opup_gain
+    for entry in entries:
+        entry_cost = costs[entry]
+        if entry_cost is not None and sites is not None:
+            planned[entry] = opups_for(sites[entry] + entry_cost - main_raised)
+        opups = planned.get(entry, 0)
+        estimates.append(
+            BudgetEstimate(entry.name(), entry_cost, opups, opups * MIN_TXN_FEE)
+        )
+
+    for subroutine, opups in planned.items():
+        if opups == 0:
+            continue
+        subroutine_start_blocks[subroutine] = _prepend_opups(
+            subroutine_start_blocks[subroutine], opups, options
+        )
+
+    return estimates
+
+
+def _prepend_opups(
+    start: TealBlock, opups: int, options: "CompileOptions"
+) -> TealBlock:
+    opup_start, opup_end = _opup_blocks(opups, options)
+
+    # proto must stay the first op of a subroutine that uses frame pointers
+    head: Optional[TealSimpleBlock] = None
+    if start.ops and start.ops[0].op == Op.proto:
+        head = TealSimpleBlock([start.ops[0]])
+        start.ops = start.ops[1:]
+
+    opup_end.setNextBlock(start)
+
+    new_start = opup_start
+    if head is not None:
+        head.setNextBlock(opup_start)
+        new_start = head
+
+    new_start.addIncoming()
+    new_start.validateTree()
+    return TealBlock.NormalizeBlocks(new_start)
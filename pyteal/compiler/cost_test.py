@@ -0,0 +1,159 @@
+from math import ceil
+
+import pytest
+
+import pyteal as pt
+from pyteal.compiler.cost import APP_CALL_BUDGET, _opup_cost, opCost
+
+opup_options = pt.OptimizeOptions(opup=pt.OpUp(pt.OpUpMode.OnCall))
+
+
+def test_op_cost():
+    assert opCost(pt.TealOp(None, pt.Op.int, 1)) == 1
+    assert opCost(pt.TealOp(None, pt.Op.comment, "x")) == 0
+    assert opCost(pt.TealOp(None, pt.Op.sha256)) == 35
+    assert opCost(pt.TealOp(None, pt.Op.ecdsa_verify, "Secp256k1")) == 1700
+    assert opCost(pt.TealOp(None, pt.Op.ecdsa_verify, "Secp256r1")) == 2500
+    assert opCost(pt.TealOp(None, pt.Op.ec_add, "BLS12_381g2")) == 290
+    assert opCost(pt.TealOp(None, pt.Op.ec_pairing_check, "BN254g1")) is None
+
+
+def compile_with_opup(program: pt.Expr, version: int = 8) -> pt.CompileResults:
+    return pt.Compilation(
+        program, pt.Mode.Application, version=version, optimize=opup_options
+    ).compile()
+
+
+def test_opup_not_needed():
+    results = compile_with_opup(pt.Seq(pt.Pop(pt.Sha256(pt.Bytes("a"))), pt.Approve()))
+    assert results.budget == [pt.BudgetEstimate("main", 2 + 35 + 2, 0, 0)]
+    assert "itxn_submit" not in results.teal
+
+    default = pt.Compilation(pt.Approve(), pt.Mode.Application, version=8).compile()
+    assert default.budget is None
+
+
+def test_opup_main_program():
+    hashes = [pt.Pop(pt.Keccak256(pt.Bytes("a"))) for _ in range(10)]
+    results = compile_with_opup(pt.Seq(*hashes, pt.Approve()))
+
+    cost = 10 * (1 + 130 + 1) + 2
+    assert cost > APP_CALL_BUDGET
+    assert results.budget is not None
+    (main,) = results.budget
+    assert main.cost == cost
+    assert main.opups == 1
+    assert main.fee == 1000
+    lines = results.teal.splitlines()
+    assert lines[1] == "itxn_begin"
+    assert lines.count("itxn_submit") == 1
+
+
+def test_opup_subroutines():
+    @pt.Subroutine(pt.TealType.none)
+    def expensive():
+        return pt.Seq(
+            *[
+                pt.Pop(
+                    pt.Ed25519Verify_Bare(pt.Bytes("a"), pt.Bytes("b"), pt.Bytes("c"))
+                )
+            ]
+            * 2
+        )
+
+    @pt.Subroutine(pt.TealType.none)
+    def cheap():
+        return pt.Pop(pt.Int(1))
+
+    program = pt.Seq(
+        pt.If(pt.Txn.application_args.length() == pt.Int(0))
+        .Then(expensive())
+        .Else(cheap()),
+        pt.Approve(),
+    )
+    results = compile_with_opup(program)
+    assert results.budget is not None
+    main, expensive_budget, cheap_budget = results.budget
+
+    assert main.opups == 0
+    assert expensive_budget.name == "expensive"
+    assert expensive_budget.cost is not None and expensive_budget.cost > 3800
+    assert expensive_budget.opups == 5
+    assert cheap_budget == pt.BudgetEstimate("cheap", 4, 0, 0)
+
+    # the OpUp calls run inside the expensive subroutine, after its proto
+    lines = results.teal.splitlines()
+    start = lines.index("expensive_0:")
+    assert lines[start + 1].startswith("proto")
+    assert lines[start + 2] == "itxn_begin"
+    assert lines.count("itxn_submit") == 5
+
+
+def test_opup_main_and_subroutine():
+    @pt.Subroutine(pt.TealType.none)
+    def heavy():
+        return pt.Seq(*[pt.Pop(pt.Keccak256(pt.Bytes("a"))) for _ in range(20)])
+
+    hashes = [pt.Pop(pt.Keccak256(pt.Bytes("a"))) for _ in range(10)]
+    results = compile_with_opup(pt.Seq(*hashes, heavy(), pt.Approve()))
+    assert results.budget is not None
+    main, heavy_budget = results.budget
+
+    assert main.cost is not None and main.cost > 2 * APP_CALL_BUDGET
+    assert main.opups == 1
+
+    # the budget raised by the OpUps of main is not raised again in the subroutine
+    options = pt.CompileOptions(
+        mode=pt.Mode.Application, version=8, optimize=opup_options
+    )
+    gain = APP_CALL_BUDGET - _opup_cost(options)
+    needed = ceil((main.cost - APP_CALL_BUDGET) / gain)
+    assert heavy_budget.opups == needed - main.opups
+    assert results.teal.count("itxn_submit") == needed
+
+
+def test_opup_unbounded():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    program = pt.Seq(
+        pt.For(
+            i.store(pt.Int(0)), i.load() < pt.Int(100), i.store(i.load() + pt.Int(1))
+        ).Do(pt.Pop(pt.Keccak256(pt.Bytes("a")))),
+        pt.Approve(),
+    )
+    results = compile_with_opup(program)
+    assert results.budget == [pt.BudgetEstimate("main", None, 0, 0)]
+    assert "itxn_submit" not in results.teal
+
+
+def test_opup_router():
+    router = pt.Router("budget")
+
+    @router.method
+    def hash_many(data: pt.abi.DynamicBytes, *, output: pt.abi.DynamicBytes):
+        digest = data.get()
+        for _ in range(30):
+            digest = pt.Keccak256(digest)
+        return output.set(digest)
+
+    @router.method
+    def add(a: pt.abi.Uint64, b: pt.abi.Uint64, *, output: pt.abi.Uint64):
+        return output.set(a.get() + b.get())
+
+    results = router.compile(version=8, optimize=opup_options)
+    assert results.approval_budget is not None
+    names = {estimate.name: estimate for estimate in results.approval_budget}
+    assert names["hash_many_caster"].opups == 5
+    assert names["add_caster"].opups == 0
+    assert results.approval_teal.count("itxn_submit") == 5
+
+
+def test_opup_invalid():
+    with pytest.raises(pt.TealInputError):
+        pt.Compilation(
+            pt.Approve(), pt.Mode.Signature, version=8, optimize=opup_options
+        ).compile()
+
+    with pytest.raises(pt.TealInputError):
+        pt.Compilation(
+            pt.Approve(), pt.Mode.Application, version=5, optimize=opup_options
+        ).compile()
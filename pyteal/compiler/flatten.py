@@ -1,4 +1,5 @@
 from collections import defaultdict
+from typing import cast
 
 from pyteal.ast import Expr, SubroutineDeclaration, SubroutineDefinition
 from pyteal import compiler
@@ -105,6 +106,147 @@ def flattenBlocks(blocks: list[TealBlock]) -> list[TealComponent]:
     return teal
 
 
+_BRANCH_OPS = {Op.b, Op.bz, Op.bnz}
+_EXIT_OPS = {Op.return_, Op.err, Op.retsub}
+_CONSTANT_OPS = {Op.int, Op.pushint}
+
+
+def _label_positions(teal: list[TealComponent]) -> dict[int, int]:
+    return {
+        id(stmt.getLabelRef()): i
+        for i, stmt in enumerate(teal)
+        if isinstance(stmt, TealLabel)
+    }
+
+
+def _ops_at(teal: list[TealComponent], index: int, count: int) -> list[TealOp]:
+    """Get up to count ops that execute from index onwards, skipping labels."""
+    ops: list[TealOp] = []
+    for stmt in teal[index:]:
+        if len(ops) == count:
+            break
+        if isinstance(stmt, TealOp):
+            ops.append(stmt)
+    return ops
+
+
+def _trivial_exit(
+    teal: list[TealComponent], positions: dict[int, int], target: LabelReference
+) -> list[TealOp] | None:
+    """Get the ops at target if they are an exit op, optionally preceded by a constant."""
+    ops = _ops_at(teal, positions[id(target)], 2)
+    if len(ops) > 0 and ops[0].getOp() in _EXIT_OPS:
+        return ops[:1]
+    if (
+        len(ops) == 2
+        and ops[0].getOp() in _CONSTANT_OPS
+        and ops[1].getOp() in _EXIT_OPS
+    ):
+        return ops
+    return None
+
+
+def _thread_target(
+    teal: list[TealComponent], positions: dict[int, int], target: LabelReference
+) -> LabelReference:
+    """Follow unconditional branches from target to the label they end up at."""
+    seen = {id(target)}
+    while True:
+        ops = _ops_at(teal, positions[id(target)], 1)
+        if len(ops) == 0 or ops[0].getOp() != Op.b:
+            return target
+        following = cast(LabelReference, ops[0].args[0])
+        if id(following) in seen:
+            return target
+        seen.add(id(following))
+        target = following
+
+
+def _falls_through(teal: list[TealComponent], index: int, target: int) -> bool:
+    return index < target and all(
+        isinstance(stmt, TealLabel) for stmt in teal[index + 1 : target]
+    )
+
+
+def threadJumps(teal: list[TealComponent]) -> list[TealComponent]:
+    """Simplify the branches of a flattened subroutine.
+
+    Branches to a label that immediately branches elsewhere are retargeted to the final label,
+    unconditional branches to a label that exits the program or subroutine are replaced with the
+    exiting ops, branches to the following label are removed, and finally labels that are no longer
+    referenced, along with the ops that can no longer be reached, are dropped.
+
+    Args:
+        teal: The flattened TealComponents of a single subroutine or the main program, as returned
+            by :any:`flattenBlocks`.
+
+    Returns:
+        The simplified list of TealComponents.
+    """
+    teal = list(teal)
+    changed = True
+    while changed:
+        changed = False
+        positions = _label_positions(teal)
+
+        simplified: list[TealComponent] = []
+        for i, stmt in enumerate(teal):
+            if not isinstance(stmt, TealOp) or stmt.getOp() not in _BRANCH_OPS:
+                simplified.append(stmt)
+                continue
+
+            label = cast(LabelReference, stmt.args[0])
+            target = _thread_target(teal, positions, label)
+            if target is not label:
+                stmt = TealOp(stmt.expr, stmt.getOp(), target)
+                changed = True
+
+            if _falls_through(teal, i, positions[id(target)]):
+                if stmt.getOp() != Op.b:
+                    # the condition still has to be removed from the stack
+                    simplified.append(TealOp(stmt.expr, Op.pop))
+                changed = True
+                continue
+
+            exit_ops = (
+                _trivial_exit(teal, positions, target) if stmt.getOp() == Op.b else None
+            )
+            if exit_ops is not None:
+                simplified += [TealOp(op.expr, op.getOp(), *op.args) for op in exit_ops]
+                changed = True
+                continue
+
+            simplified.append(stmt)
+        teal = simplified
+
+        referenced = {
+            id(arg)
+            for stmt in teal
+            if isinstance(stmt, TealOp)
+            for arg in stmt.args
+            if isinstance(arg, LabelReference)
+        }
+        reachable = True
+        simplified = []
+        for stmt in teal:
+            if isinstance(stmt, TealLabel):
+                if id(stmt.getLabelRef()) not in referenced:
+                    changed = True
+                    continue
+                reachable = True
+            elif not reachable and cast(TealOp, stmt).getOp() != Op.comment:
+                changed = True
+                continue
+            simplified.append(stmt)
+            if isinstance(stmt, TealOp) and (
+                stmt.getOp() == Op.b or stmt.getOp() in _EXIT_OPS
+            ):
+                reachable = False
+        teal = simplified
+
+    return teal
+
+
 def flattenSubroutines(
     subroutineMapping: dict[SubroutineDefinition | None, list[TealComponent]],
     subroutineToLabel: dict[SubroutineDefinition, str],
@@ -2,7 +2,7 @@ from collections import OrderedDict
 
 import pyteal as pt
 
-from pyteal.compiler.flatten import flattenBlocks, flattenSubroutines
+from pyteal.compiler.flatten import flattenBlocks, flattenSubroutines, threadJumps
 
 
 def test_flattenBlocks_none():
@@ -554,3 +554,142 @@ def test_flattenSubroutines_multiple_subroutines():
     actual = flattenSubroutines(subroutineMapping, subroutineToLabel, opts)
 
     assert actual == expected
+
+
+def test_threadJumps_branch_chain():
+    l1 = pt.LabelReference("l1")
+    l2 = pt.LabelReference("l2")
+    l3 = pt.LabelReference("l3")
+    teal = [
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.bnz, l1),
+        pt.TealOp(None, pt.Op.byte, '"false"'),
+        pt.TealOp(None, pt.Op.b, l3),
+        pt.TealLabel(None, l1),
+        pt.TealOp(None, pt.Op.b, l2),
+        pt.TealLabel(None, l2),
+        pt.TealOp(None, pt.Op.b, l3),
+        pt.TealOp(None, pt.Op.byte, '"dead"'),
+        pt.TealLabel(None, l3),
+        pt.TealOp(None, pt.Op.pop),
+    ]
+
+    expected = [
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.bnz, l3),
+        pt.TealOp(None, pt.Op.byte, '"false"'),
+        pt.TealLabel(None, l3),
+        pt.TealOp(None, pt.Op.pop),
+    ]
+    assert threadJumps(teal) == expected
+
+
+def test_threadJumps_exit():
+    l1 = pt.LabelReference("l1")
+    l2 = pt.LabelReference("l2")
+    teal = [
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.bz, l1),
+        pt.TealOp(None, pt.Op.byte, '"true"'),
+        pt.TealOp(None, pt.Op.b, l2),
+        pt.TealLabel(None, l1),
+        pt.TealOp(None, pt.Op.byte, '"false"'),
+        pt.TealOp(None, pt.Op.b, l2),
+        pt.TealOp(None, pt.Op.int, 0),
+        pt.TealOp(None, pt.Op.return_),
+        pt.TealLabel(None, l2),
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.return_),
+    ]
+
+    expected = [
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.bz, l1),
+        pt.TealOp(None, pt.Op.byte, '"true"'),
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.return_),
+        pt.TealLabel(None, l1),
+        pt.TealOp(None, pt.Op.byte, '"false"'),
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.return_),
+    ]
+    assert threadJumps(teal) == expected
+
+
+def test_threadJumps_next_label():
+    l1 = pt.LabelReference("l1")
+    l2 = pt.LabelReference("l2")
+    teal = [
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.bnz, l1),
+        pt.TealLabel(None, l1),
+        pt.TealOp(None, pt.Op.b, l2),
+        pt.TealLabel(None, l2),
+        pt.TealOp(None, pt.Op.byte, '"end"'),
+    ]
+
+    # the condition of a branch to the next label is still popped
+    expected = [
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.pop),
+        pt.TealOp(None, pt.Op.byte, '"end"'),
+    ]
+    assert threadJumps(teal) == expected
+
+
+def test_threadJumps_loop():
+    l1 = pt.LabelReference("l1")
+    l2 = pt.LabelReference("l2")
+    teal = [
+        pt.TealLabel(None, l1),
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.bnz, l2),
+        pt.TealOp(None, pt.Op.err),
+        pt.TealLabel(None, l2),
+        pt.TealOp(None, pt.Op.b, l1),
+    ]
+
+    assert threadJumps(teal) == [
+        pt.TealLabel(None, l1),
+        pt.TealOp(None, pt.Op.int, 1),
+        pt.TealOp(None, pt.Op.bnz, l1),
+        pt.TealOp(None, pt.Op.err),
+    ]
+
+    # branches that only lead back to themselves are kept
+    spin = [pt.TealLabel(None, l1), pt.TealOp(None, pt.Op.b, l1)]
+    assert threadJumps(spin) == spin
+
+
+def test_threadJumps_compile():
+    @pt.Subroutine(pt.TealType.uint64)
+    def pick(x: pt.Expr) -> pt.Expr:
+        return pt.If(x).Then(pt.Int(1)).Else(pt.Int(2))
+
+    program = pt.Return(pick(pt.Txn.fee()))
+
+    def compile_lines(thread_jumps: bool) -> list[str]:
+        return (
+            pt.Compilation(
+                program,
+                pt.Mode.Application,
+                version=8,
+                optimize=pt.OptimizeOptions(thread_jumps=thread_jumps),
+            )
+            .compile()
+            .teal.splitlines()
+        )
+
+    assert "b pick_0_l3" in compile_lines(False)
+    lines = compile_lines(True)
+    assert lines[lines.index("pick_0:") :] == [
+        "pick_0:",
+        "proto 1 1",
+        "frame_dig -1",
+        "bnz pick_0_l2",
+        "int 2",
+        "retsub",
+        "pick_0_l2:",
+        "int 1",
+        "retsub",
+    ]
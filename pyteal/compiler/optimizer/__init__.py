@@ -1,4 +1,11 @@
 from pyteal.compiler.optimizer.optimizer import (
     OptimizeOptions,
     apply_global_optimizations,
+    lower_maybe_values,
 )
+from pyteal.compiler.optimizer.loops import (
+    fold_constants,
+    hoist_loop_invariants,
+    unroll_for,
+)
+from pyteal.compiler.optimizer.stack import schedule_stack_slots
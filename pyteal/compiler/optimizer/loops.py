@@ -0,0 +1,565 @@
+import base64
+import operator
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Final,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
+
+from pyteal.ast import (
+    BinaryExpr,
+    Bytes,
+    Expr,
+    For,
+    Int,
+    NaryExpr,
+    ScratchLoad,
+    ScratchSlot,
+    ScratchStore,
+)
+from pyteal.ir import Op, TealBlock, TealOp, TealSimpleBlock
+
+if TYPE_CHECKING:
+    from pyteal.compiler import CompileOptions
+
+# ops that push a single value without reading the stack
+_LEAF_OPS: Final[Set[Op]] = {
+    Op.int,
+    Op.pushint,
+    Op.byte,
+    Op.pushbytes,
+    Op.addr,
+    Op.method_signature,
+    Op.txn,
+    Op.global_,
+    Op.load,
+    Op.frame_dig,
+}
+
+# global fields that can change while the program runs
+_VARYING_GLOBALS: Final[Set[str]] = {"OpcodeBudget"}
+
+MAX_BYTES_LENGTH: Final[int] = 4096
+
+# ops and fields pushing byte strings of a known length
+_FIXED_LENGTHS: Final[Dict[Op, int]] = {
+    Op.addr: 32,
+    Op.method_signature: 4,
+    Op.itob: 8,
+    Op.sha256: 32,
+    Op.keccak256: 32,
+    Op.sha512_256: 32,
+    Op.sha3_256: 32,
+}
+_ADDRESS_FIELDS: Final[Set[str]] = {
+    "Sender",
+    "Receiver",
+    "TxID",
+    "ZeroAddress",
+    "CurrentApplicationAddress",
+    "CreatorAddress",
+    "GroupID",
+}
+
+# ops without side effects that push a single value: op -> (number of arguments, can fail)
+_PURE_OPS: Final[Dict[Op, Tuple[int, bool]]] = {
+    Op.len: (1, False),
+    Op.itob: (1, False),
+    Op.sha256: (1, False),
+    Op.keccak256: (1, False),
+    Op.sha512_256: (1, False),
+    Op.sha3_256: (1, False),
+    Op.logic_not: (1, False),
+    Op.bitwise_not: (1, False),
+    Op.bitlen: (1, False),
+    Op.btoi: (1, True),
+    Op.extract: (1, True),
+    Op.substring: (1, True),
+    Op.eq: (2, False),
+    Op.neq: (2, False),
+    Op.lt: (2, False),
+    Op.gt: (2, False),
+    Op.le: (2, False),
+    Op.ge: (2, False),
+    Op.logic_and: (2, False),
+    Op.logic_or: (2, False),
+    Op.bitwise_and: (2, False),
+    Op.bitwise_or: (2, False),
+    Op.bitwise_xor: (2, False),
+    Op.add: (2, True),
+    Op.minus: (2, True),
+    Op.mul: (2, True),
+    Op.div: (2, True),
+    Op.mod: (2, True),
+    Op.exp: (2, True),
+    Op.shl: (2, True),
+    Op.shr: (2, True),
+    Op.concat: (2, True),
+    Op.getbyte: (2, True),
+    Op.getbit: (2, True),
+    Op.extract_uint16: (2, True),
+    Op.extract_uint32: (2, True),
+    Op.extract_uint64: (2, True),
+    Op.extract3: (3, True),
+    Op.substring3: (3, True),
+}
+
+
+class _Loop(NamedTuple):
+    header: TealBlock
+    blocks: List[TealBlock]
+
+
+class _Value(NamedTuple):
+    start: int
+    hoistable: bool
+    length: Optional[int] = None
+
+
+def _bytes_length(op: TealOp) -> Optional[int]:
+    """Get the length of the byte string an op pushes, if it is known at compile time."""
+    if op.op in _FIXED_LENGTHS:
+        return _FIXED_LENGTHS[op.op]
+    if op.op in (Op.txn, Op.global_):
+        return 32 if op.args[0] in _ADDRESS_FIELDS else None
+    if op.op != Op.byte or not isinstance(op.expr, Bytes):
+        return None
+
+    if op.expr.base == "utf8":
+        escaped = op.expr.byte_str[1:-1]
+        return len(escaped.encode("latin-1").decode("unicode-escape"))
+    if op.expr.base == "base16":
+        return len(op.expr.byte_str) // 2
+    if op.expr.base == "base64":
+        return len(base64.b64decode(op.expr.byte_str))
+    return len(op.expr.byte_str.rstrip("=")) * 5 // 8
+
+
+def _find_loops(start: TealBlock) -> List[_Loop]:
+    """Find the natural loops of a control flow graph, outermost first."""
+    predecessors: Dict[int, List[TealBlock]] = {}
+    back_edges: Dict[int, Tuple[TealBlock, List[TealBlock]]] = {}
+
+    on_path: Set[int] = set()
+    visited: Set[int] = {id(start)}
+    stack = [(start, iter(start.getOutgoing()))]
+    on_path.add(id(start))
+    while stack:
+        block, outgoing = stack[-1]
+        nxt = next(outgoing, None)
+        if nxt is None:
+            on_path.discard(id(block))
+            stack.pop()
+            continue
+
+        predecessors.setdefault(id(nxt), []).append(block)
+        if id(nxt) in on_path:
+            back_edges.setdefault(id(nxt), (nxt, []))[1].append(block)
+        elif id(nxt) not in visited:
+            visited.add(id(nxt))
+            on_path.add(id(nxt))
+            stack.append((nxt, iter(nxt.getOutgoing())))
+
+    loops: List[_Loop] = []
+    for header, tails in back_edges.values():
+        body: Dict[int, TealBlock] = {id(header): header}
+        pending = [tail for tail in tails if id(tail) not in body]
+        while pending:
+            block = pending.pop()
+            if id(block) in body:
+                continue
+            body[id(block)] = block
+            pending.extend(predecessors.get(id(block), []))
+        loops.append(_Loop(header, list(body.values())))
+
+    loops.sort(key=lambda loop: len(loop.blocks), reverse=True)
+    return loops
+
+
+def _find_invariants(
+    block: TealBlock, is_header: bool, is_invariant_leaf
+) -> List[Tuple[int, int]]:
+    """Find the maximal spans of ops in a block that compute a loop-invariant value.
+
+    Only the header of a loop runs every time the loop is entered, so spans elsewhere must not
+    contain ops that can fail.
+
+    Returns:
+        A list of (start, end) index pairs, inclusive and non-overlapping.
+    """
+    spans: List[Tuple[int, int]] = []
+    stack: List[_Value] = []
+
+    def consume(values: List[_Value], end: int):
+        for i, value in enumerate(values):
+            value_end = values[i + 1].start - 1 if i + 1 < len(values) else end
+            if value.hoistable and value_end > value.start:
+                spans.append((value.start, value_end))
+
+    for i, op in enumerate(block.ops):
+        if type(op) is not TealOp:
+            consume(stack, i - 1)
+            stack = []
+            continue
+
+        if op.op in _LEAF_OPS:
+            stack.append(_Value(i, is_invariant_leaf(op), _bytes_length(op)))
+            continue
+
+        if op.op not in _PURE_OPS:
+            consume(stack, i - 1)
+            stack = []
+            continue
+
+        num_args, can_fail = _PURE_OPS[op.op]
+        if len(stack) < num_args:
+            consume(stack, i - 1)
+            stack = [_Value(i, False)]
+            continue
+
+        args = stack[len(stack) - num_args :]
+        del stack[len(stack) - num_args :]
+        length = _bytes_length(op)
+        if op.op == Op.concat and all(arg.length is not None for arg in args):
+            length = sum(cast(int, arg.length) for arg in args)
+            # concatenating byte strings of a known length only fails if they are too long
+            can_fail = length > MAX_BYTES_LENGTH
+        hoistable = all(arg.hoistable for arg in args) and (is_header or not can_fail)
+        if not hoistable:
+            consume(args, i - 1)
+        stack.append(_Value(args[0].start if args else i, hoistable, length))
+
+    consume(stack, len(block.ops) - 1)
+    return spans
+
+
+def _hoist_loop(start: TealBlock, loop: _Loop) -> TealBlock:
+    stored: Set[ScratchSlot] = set()
+    buried: Set[int] = set()
+    # subroutine calls and dynamic stores may write any slot, including the new ones holding
+    # hoisted values if the call is recursive, and the other ops may move the frame's values
+    slots_opaque = frame_opaque = False
+    for block in loop.blocks:
+        for op in block.ops:
+            if type(op) is not TealOp:
+                continue
+            if op.op == Op.store:
+                stored.update(op.getSlots())
+            elif op.op == Op.frame_bury:
+                buried.add(cast(int, op.args[0]))
+            elif op.op in (Op.callsub, Op.stores):
+                slots_opaque = frame_opaque = True
+            elif op.op in (Op.bury, Op.popn, Op.cover, Op.uncover):
+                frame_opaque = True
+
+    def is_invariant_leaf(op: TealOp) -> bool:
+        if op.op == Op.global_:
+            return op.args[0] not in _VARYING_GLOBALS
+        if op.op == Op.load:
+            return not slots_opaque and not set(op.getSlots()) & stored
+        if op.op == Op.frame_dig:
+            return not frame_opaque and op.args[0] not in buried
+        return True
+
+    slots: Dict[Tuple, ScratchSlot] = {}
+    hoisted: List[TealOp] = []
+    for block in loop.blocks:
+        spans = _find_invariants(block, block is loop.header, is_invariant_leaf)
+        for first, last in reversed(spans):
+            ops = block.ops[first : last + 1]
+            key = tuple((op.op, tuple(op.args)) for op in ops)
+            if key not in slots:
+                slots[key] = ScratchSlot()
+                hoisted += ops + [TealOp(ops[-1].expr, Op.store, slots[key])]
+            block.ops[first : last + 1] = [TealOp(ops[-1].expr, Op.load, slots[key])]
+
+    if not hoisted:
+        return start
+
+    in_loop = {id(block) for block in loop.blocks}
+    outside = [
+        block
+        for block in TealBlock.Iterate(start)
+        if id(block) not in in_loop
+        and any(nxt is loop.header for nxt in block.getOutgoing())
+    ]
+    if (
+        len(outside) == 1
+        and type(outside[0]) is TealSimpleBlock
+        and loop.header is not start
+    ):
+        outside[0].ops += hoisted
+        return start
+
+    preheader = TealSimpleBlock(hoisted)
+    preheader.setNextBlock(loop.header)
+    preheader.incoming = outside
+    for block in outside:
+        block.replaceOutgoing(loop.header, preheader)
+    loop.header.incoming = [
+        block for block in loop.header.incoming if id(block) in in_loop
+    ] + [preheader]
+    return preheader if loop.header is start else start
+
+
+def hoist_loop_invariants(start: TealBlock) -> TealBlock:
+    """Move computations of loop-invariant values out of the loops of a control flow graph.
+
+    A value is loop-invariant if it only depends on constants, transaction and global fields, and
+    scratch slots or frame variables that the loop never writes. Each such value computed by more
+    than one op in a loop is computed once, before the loop header, and stored in a new scratch
+    slot that the loop reads instead.
+
+    Args:
+        start: The start block of a subroutine's control flow graph.
+
+    Returns:
+        The start block of the graph, which is a new block if a loop starts the graph.
+    """
+    for loop in _find_loops(start):
+        start = _hoist_loop(start, loop)
+    return start
+
+
+MAX_UINT64: Final[int] = 2**64 - 1
+
+# uint64 ops evaluated at compile time when both arguments are constants; None means the op
+# would fail
+_FOLDABLE_OPS: Final[Dict[Op, Callable[[int, int], Optional[int]]]] = {
+    Op.add: lambda a, b: a + b if a + b <= MAX_UINT64 else None,
+    Op.minus: lambda a, b: a - b if a >= b else None,
+    Op.mul: lambda a, b: a * b if a * b <= MAX_UINT64 else None,
+    Op.div: lambda a, b: a // b if b != 0 else None,
+    Op.mod: lambda a, b: a % b if b != 0 else None,
+    Op.lt: lambda a, b: int(a < b),
+    Op.gt: lambda a, b: int(a > b),
+    Op.le: lambda a, b: int(a <= b),
+    Op.ge: lambda a, b: int(a >= b),
+    Op.eq: lambda a, b: int(a == b),
+    Op.neq: lambda a, b: int(a != b),
+    Op.logic_and: lambda a, b: int(a != 0 and b != 0),
+    Op.logic_or: lambda a, b: int(a != 0 or b != 0),
+}
+
+_LOOP_CONDITIONS: Final[Dict[Op, Callable[[int, int], bool]]] = {
+    Op.lt: operator.lt,
+    Op.le: operator.le,
+    Op.gt: operator.gt,
+    Op.ge: operator.ge,
+    Op.neq: operator.ne,
+}
+
+MAX_IMMEDIATE: Final[int] = 255
+
+
+def _constant(op: TealOp) -> Optional[int]:
+    if type(op) is TealOp and op.op == Op.int and type(op.args[0]) is int:
+        return op.args[0]
+    return None
+
+
+def _fold_op(ops: List[TealOp], i: int) -> bool:
+    """Evaluate the op at ops[i] if its two arguments are the constants right before it.
+
+    Returns:
+        True if ops was changed.
+    """
+    if i < 2:
+        return False
+    a, b = _constant(ops[i - 2]), _constant(ops[i - 1])
+    if a is None or b is None:
+        return False
+
+    op = ops[i]
+    replacement: TealOp
+    if op.op in _FOLDABLE_OPS:
+        result = _FOLDABLE_OPS[op.op](a, b)
+        if result is None:
+            return False
+        replacement = TealOp(op.expr, Op.int, result)
+    elif op.op == Op.extract3 and a <= MAX_IMMEDIATE and 0 < b <= MAX_IMMEDIATE:
+        # an immediate length of 0 means the rest of the string, so it is not folded
+        replacement = TealOp(op.expr, Op.extract, a, b)
+    elif op.op == Op.substring3 and a <= b <= MAX_IMMEDIATE:
+        replacement = TealOp(op.expr, Op.substring, a, b)
+    else:
+        return False
+
+    ops[i - 2 : i + 1] = [replacement]
+    return True
+
+
+def fold_constants(start: TealBlock) -> None:
+    """Evaluate uint64 ops whose arguments are constants at compile time.
+
+    Arithmetic and comparisons of int constants become a single int constant, unless they would
+    fail, and extract3 and substring3 with constant positions become extract and substring with
+    immediate arguments.
+
+    Args:
+        start: The start block of the graph to fold.
+    """
+    for block in TealBlock.Iterate(start):
+        ops = block.ops
+        i = 0
+        while i < len(ops):
+            if _fold_op(ops, i):
+                i -= 1
+            else:
+                i += 1
+
+
+def _counter_values(
+    loop: For, limit: int
+) -> Optional[Tuple[ScratchSlot, List[int], int]]:
+    """Get the values the counter of a constant-bound For loop takes.
+
+    Returns:
+        The slot of the counter, the counter value of each iteration and the counter value after
+        the loop, or None if the loop does not count from a constant to a constant bound by a
+        constant step in at most limit iterations.
+    """
+    start, cond, step = loop.start, loop.cond, loop.step
+    if not (
+        isinstance(start, ScratchStore)
+        and start.slot is not None
+        and not start.slot.isReservedSlot
+        and type(start.value) is Int
+    ):
+        return None
+    slot = start.slot
+
+    def is_counter(expr) -> bool:
+        return isinstance(expr, ScratchLoad) and expr.slot is slot
+
+    if not (
+        isinstance(cond, BinaryExpr)
+        and cond.op in _LOOP_CONDITIONS
+        and is_counter(cond.argLeft)
+        and type(cond.argRight) is Int
+    ):
+        return None
+    if not (isinstance(step, ScratchStore) and step.slot is slot):
+        return None
+    # i + step is an NaryExpr, while i - step is a BinaryExpr
+    step_args: Sequence[Expr]
+    step_op: Op
+    if isinstance(step.value, NaryExpr) and step.value.op == Op.add:
+        step_args, step_op = step.value.args, Op.add
+    elif isinstance(step.value, BinaryExpr) and step.value.op == Op.minus:
+        step_args, step_op = [step.value.argLeft, step.value.argRight], Op.minus
+    else:
+        return None
+    if not (
+        len(step_args) == 2 and is_counter(step_args[0]) and type(step_args[1]) is Int
+    ):
+        return None
+
+    condition = _LOOP_CONDITIONS[cond.op]
+    bound = cast(Int, cond.argRight).value
+    update = _FOLDABLE_OPS[step_op]
+    delta = cast(Int, step_args[1]).value
+
+    values: List[int] = []
+    value: Optional[int] = cast(Int, start.value).value
+    while condition(cast(int, value), bound):
+        if len(values) == limit:
+            return None
+        values.append(cast(int, value))
+        value = update(cast(int, value), delta)
+        if value is None:
+            # the step fails at runtime
+            return None
+    return slot, values, cast(int, value)
+
+
+def _compile_iteration(
+    loop: For, options: "CompileOptions", slot: ScratchSlot, value: int
+) -> Optional[Tuple[TealBlock, TealSimpleBlock, int]]:
+    options.enterLoop()
+    start, end = cast(Expr, loop.doBlock).__teal__(options)
+    breakBlocks, continueBlocks = options.exitLoop()
+    if breakBlocks or continueBlocks:
+        return None
+
+    num_ops = 0
+    # subroutines and dynamic loads may read the counter from its slot
+    reads_slot = False
+    for block in TealBlock.Iterate(start):
+        for i, op in enumerate(block.ops):
+            if op.op == Op.stores or (op.op == Op.store and slot in op.getSlots()):
+                return None
+            if op.op == Op.load and slot in op.getSlots():
+                block.ops[i] = TealOp(op.expr, Op.int, value)
+            elif op.op in (Op.callsub, Op.loads):
+                reads_slot = True
+        num_ops += len(block.ops)
+
+    if reads_slot:
+        counter = TealSimpleBlock(
+            [TealOp(loop, Op.int, value), TealOp(loop, Op.store, slot)]
+        )
+        counter.setNextBlock(start)
+        start = counter
+        num_ops += len(counter.ops)
+    return start, end, num_ops
+
+
+def unroll_for(
+    loop: For, options: "CompileOptions"
+) -> Optional[Tuple[TealBlock, TealSimpleBlock]]:
+    """Compile a For loop whose counter only takes constant values as one copy of its body per
+    iteration, with the counter replaced by its value.
+
+    The constants this leaves are folded by :any:`fold_constants` once the blocks of the program
+    are normalized.
+
+    The loop must store constants to a ScratchVar counter, compare it against a constant bound,
+    add or subtract a constant step, and its body must not contain Break or Continue or write the
+    counter. The unrolled code must fit in the budget given by the OptimizeOptions. Copies that
+    call subroutines or load slots dynamically, which may read the counter from its slot, store
+    the counter's value before they run.
+
+    Args:
+        loop: The For loop to compile.
+        options: The compilation options.
+
+    Returns:
+        The start and end blocks of the unrolled loop, or None if it cannot be unrolled.
+    """
+    budget = options.optimize.unroll_budget()
+    counter = _counter_values(loop, budget)
+    if counter is None:
+        return None
+    slot, values, final = counter
+
+    end = TealSimpleBlock([TealOp(loop, Op.int, final), TealOp(loop, Op.store, slot)])
+    size = len(end.ops)
+    start: TealBlock = end
+    previous: Optional[TealSimpleBlock] = None
+    for value in values:
+        iteration = _compile_iteration(loop, options, slot, value)
+        if iteration is None:
+            return None
+        iteration_start, iteration_end, num_ops = iteration
+        size += num_ops
+        if size > budget:
+            return None
+
+        if previous is None:
+            start = iteration_start
+        else:
+            previous.setNextBlock(iteration_start)
+        previous = iteration_end
+
+    if previous is not None:
+        previous.setNextBlock(end)
+    return start, end
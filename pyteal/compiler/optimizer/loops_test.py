@@ -0,0 +1,376 @@
+from typing import Literal
+
+import pyteal as pt
+from pyteal.compiler.optimizer import fold_constants
+
+hoist_options = pt.OptimizeOptions(hoist_loop_invariants=True)
+
+
+def compile_lines(expr: pt.Expr, optimize=hoist_options) -> list[str]:
+    program = pt.Compilation(
+        pt.Seq(expr, pt.Approve()),
+        pt.Mode.Application,
+        version=8,
+        optimize=optimize,
+    ).compile()
+    return program.teal.splitlines()[1:-2]
+
+
+def counting_loop(i: pt.ScratchVar, bound: pt.Expr, *body: pt.Expr) -> pt.Expr:
+    return pt.For(
+        i.store(pt.Int(0)), i.load() < bound, i.store(i.load() + pt.Int(1))
+    ).Do(*body)
+
+
+def test_hoist_loop_condition():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    data = pt.ScratchVar(pt.TealType.bytes)
+    program = pt.Seq(
+        data.store(pt.Txn.note()),
+        counting_loop(i, pt.Len(data.load()) / pt.Int(2), pt.Log(pt.Itob(i.load()))),
+    )
+
+    assert compile_lines(program) == [
+        "txn Note",
+        "store 1",
+        "int 0",
+        "store 0",
+        "load 1",
+        "len",
+        "int 2",
+        "/",
+        "store 2",
+        "main_l1:",
+        "load 0",
+        "load 2",
+        "<",
+        "bz main_l3",
+        "load 0",
+        "itob",
+        "log",
+        "load 0",
+        "int 1",
+        "+",
+        "store 0",
+        "b main_l1",
+        "main_l3:",
+    ]
+
+
+def test_hoist_loop_body():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    program = counting_loop(
+        i,
+        pt.Int(3),
+        pt.Log(pt.Concat(pt.Bytes("prefix"), pt.Sha256(pt.Txn.sender()))),
+        pt.Log(pt.Concat(pt.Bytes("prefix"), pt.Sha256(pt.Txn.sender()))),
+        # btoi may fail, so it stays in the loop, which may not run at all
+        pt.Pop(pt.Btoi(pt.Txn.note())),
+        pt.Pop(pt.Concat(pt.Global.current_application_address(), pt.Itob(i.load()))),
+    )
+
+    lines = compile_lines(program)
+    assert lines[:9] == [
+        "int 0",
+        "store 0",
+        'byte "prefix"',
+        "txn Sender",
+        "sha256",
+        "concat",
+        "store 1",
+        "main_l1:",
+        "load 0",
+    ]
+    assert lines.count("sha256") == 1
+    assert lines.count("load 1") == 2
+    assert lines[lines.index("bz main_l3") + 1 :][:8] == [
+        "load 1",
+        "log",
+        "load 1",
+        "log",
+        "txn Note",
+        "btoi",
+        "pop",
+        "global CurrentApplicationAddress",
+    ]
+
+
+def test_hoist_loop_skips_written_slots():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    total = pt.ScratchVar(pt.TealType.uint64)
+    program = pt.Seq(
+        total.store(pt.Int(0)),
+        counting_loop(
+            i,
+            pt.Int(10),
+            total.store(total.load() + pt.Len(pt.Bytes("abc"))),
+            # multiplying may overflow, so it stays in the loop
+            total.store(total.load() * pt.Int(3)),
+        ),
+    )
+
+    lines = compile_lines(program)
+    assert lines[:7] == [
+        "int 0",
+        "store 1",
+        "int 0",
+        "store 0",
+        'byte "abc"',
+        "len",
+        "store 2",
+    ]
+    assert lines[lines.index("bz main_l3") + 1 :][:8] == [
+        "load 1",
+        "load 2",
+        "+",
+        "store 1",
+        "load 1",
+        "int 3",
+        "*",
+        "store 1",
+    ]
+
+
+def test_hoist_loop_skips_loads_around_calls():
+    @pt.Subroutine(pt.TealType.none)
+    def touch() -> pt.Expr:
+        return pt.Pop(pt.Int(1))
+
+    i = pt.ScratchVar(pt.TealType.uint64)
+    data = pt.ScratchVar(pt.TealType.bytes)
+    program = pt.Seq(
+        data.store(pt.Txn.note()),
+        counting_loop(i, pt.Len(data.load()), touch()),
+    )
+
+    lines = compile_lines(program)
+    assert lines.index("len") > lines.index("main_l1:")
+
+
+def test_hoist_loop_new_preheader():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    loop = pt.While(pt.Len(pt.Txn.note()) > i.load()).Do(i.store(i.load() + pt.Int(1)))
+    # the loop is entered from a conditional block, so its invariants get a block of their own
+    program = pt.Seq(i.store(pt.Int(0)), pt.If(pt.Txn.fee() > pt.Int(0)).Then(loop))
+
+    assert compile_lines(program) == [
+        "int 0",
+        "store 0",
+        "txn Fee",
+        "int 0",
+        ">",
+        "bz main_l4",
+        "txn Note",
+        "len",
+        "store 1",
+        "main_l2:",
+        "load 1",
+        "load 0",
+        ">",
+        "bz main_l4",
+        "load 0",
+        "int 1",
+        "+",
+        "store 0",
+        "b main_l2",
+        "main_l4:",
+    ]
+
+
+def test_hoist_loop_with_continue():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    program = pt.For(
+        i.store(pt.Int(0)),
+        i.load() < pt.Len(pt.Txn.note()),
+        i.store(i.load() + pt.Int(1)),
+    ).Do(
+        pt.If(i.load() == pt.Int(2)).Then(pt.Continue()),
+        pt.If(i.load() == pt.Len(pt.Txn.note())).Then(pt.Break()),
+    )
+
+    lines = compile_lines(program)
+    assert lines[:6] == ["int 0", "store 0", "txn Note", "len", "store 1", "main_l1:"]
+    assert lines.count("len") == 1
+    assert lines.count("load 1") == 2
+
+
+def test_hoist_loop_default_off():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    program = counting_loop(i, pt.Len(pt.Txn.note()), pt.Pop(pt.Int(1)))
+
+    lines = compile_lines(program, optimize=None)
+    assert lines.index("len") > lines.index("main_l1:")
+
+
+unroll_options = pt.OptimizeOptions(unroll_budget=100)
+
+
+def test_unroll_constant_loop():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    names = pt.abi.make(
+        pt.abi.StaticArray[pt.abi.StaticBytes[Literal[4]], Literal[3]]  # type: ignore[misc]
+    )
+    name = pt.abi.make(pt.abi.StaticBytes[Literal[4]])  # type: ignore[misc]
+    program = pt.Seq(
+        names.decode(pt.Txn.note()),
+        counting_loop(
+            i,
+            pt.Int(3),
+            names[i.load()].store_into(name),
+            pt.Log(name.encode()),
+        ),
+    )
+
+    assert compile_lines(program, unroll_options) == [
+        "txn Note",
+        "store 1",
+        "load 1",
+        "extract 0 4",
+        "store 2",
+        "load 2",
+        "log",
+        "load 1",
+        "extract 4 4",
+        "store 2",
+        "load 2",
+        "log",
+        "load 1",
+        "extract 8 4",
+        "store 2",
+        "load 2",
+        "log",
+        "int 3",
+        "store 0",
+    ]
+
+
+def test_unroll_counting_down():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    program = pt.For(
+        i.store(pt.Int(10)), i.load() > pt.Int(0), i.store(i.load() - pt.Int(5))
+    ).Do(pt.Log(pt.Itob(i.load() * pt.Int(2))))
+
+    assert compile_lines(program, unroll_options) == [
+        "int 20",
+        "itob",
+        "log",
+        "int 10",
+        "itob",
+        "log",
+        "int 0",
+        "store 0",
+    ]
+
+    # the last step would underflow, failing at runtime
+    underflow = pt.For(
+        i.store(pt.Int(10)), i.load() > pt.Int(0), i.store(i.load() - pt.Int(3))
+    ).Do(pt.Pop(i.load()))
+    assert "main_l1:" in compile_lines(underflow, unroll_options)
+
+
+def test_unroll_not_applicable():
+    i = pt.ScratchVar(pt.TealType.uint64)
+
+    def is_unrolled(program: pt.Expr, budget: int = 100) -> bool:
+        lines = compile_lines(program, pt.OptimizeOptions(unroll_budget=budget))
+        return "main_l1:" not in lines
+
+    assert is_unrolled(counting_loop(i, pt.Int(4), pt.Pop(i.load())))
+    assert not is_unrolled(counting_loop(i, pt.Int(4), pt.Pop(i.load())), budget=0)
+    assert not is_unrolled(counting_loop(i, pt.Int(40), pt.Pop(i.load())), budget=50)
+    assert not is_unrolled(counting_loop(i, pt.Txn.fee(), pt.Pop(i.load())))
+    assert not is_unrolled(
+        counting_loop(i, pt.Int(4), pt.If(i.load() == pt.Int(2)).Then(pt.Break()))
+    )
+    assert not is_unrolled(counting_loop(i, pt.Int(4), i.store(i.load() + pt.Int(1))))
+
+
+def test_unroll_loop_read_in_subroutine():
+    i = pt.ScratchVar(pt.TealType.uint64)
+
+    @pt.Subroutine(pt.TealType.none)
+    def show():
+        return pt.Log(pt.Itob(i.load()))
+
+    lines = compile_lines(counting_loop(i, pt.Int(3), show()), unroll_options)
+    assert lines[: lines.index("return") - 1] == [
+        "int 0",
+        "store 0",
+        "callsub show_0",
+        "int 1",
+        "store 0",
+        "callsub show_0",
+        "int 2",
+        "store 0",
+        "callsub show_0",
+        "int 3",
+        "store 0",
+    ]
+    assert lines[lines.index("show_0:") + 2] == "load 0"
+
+    # dynamic loads may read the counter too
+    d = pt.DynamicScratchVar(pt.TealType.uint64)
+    lines = compile_lines(
+        pt.Seq(d.set_index(i), counting_loop(i, pt.Int(2), pt.Log(pt.Itob(d.load())))),
+        unroll_options,
+    )
+    assert lines.count("store 0") == 3
+    assert lines.index("store 0") < lines.index("loads")
+
+
+def test_unroll_nested_loops():
+    i = pt.ScratchVar(pt.TealType.uint64)
+    j = pt.ScratchVar(pt.TealType.uint64)
+    program = counting_loop(
+        i,
+        pt.Int(2),
+        counting_loop(j, pt.Int(2), pt.Log(pt.Itob(i.load() * pt.Int(2) + j.load()))),
+    )
+
+    lines = compile_lines(program, unroll_options)
+    assert [line for line in lines if line not in ("itob", "log")] == [
+        "int 0",
+        "int 1",
+        "int 2",
+        "store 1",
+        "int 2",
+        "int 3",
+        "int 2",
+        "store 1",
+        "int 2",
+        "store 0",
+    ]
+
+
+def test_fold_constants():
+    def folded(*ops: pt.TealOp) -> list[pt.TealOp]:
+        block = pt.TealSimpleBlock(list(ops))
+        fold_constants(block)
+        return block.ops
+
+    def op(kind: pt.Op, *args) -> pt.TealOp:
+        return pt.TealOp(None, kind, *args)
+
+    assert folded(
+        op(pt.Op.int, 2),
+        op(pt.Op.int, 3),
+        op(pt.Op.mul),
+        op(pt.Op.int, 1),
+        op(pt.Op.add),
+    ) == [op(pt.Op.int, 7)]
+    assert folded(
+        op(pt.Op.txn, "Note"), op(pt.Op.int, 1), op(pt.Op.int, 2), op(pt.Op.extract3)
+    ) == [op(pt.Op.txn, "Note"), op(pt.Op.extract, 1, 2)]
+
+    # ops that would fail, and extracts to the end of the string, are kept
+    underflow = [op(pt.Op.int, 1), op(pt.Op.int, 2), op(pt.Op.minus)]
+    assert folded(*underflow) == underflow
+    empty = [
+        op(pt.Op.txn, "Note"),
+        op(pt.Op.int, 1),
+        op(pt.Op.int, 0),
+        op(pt.Op.extract3),
+    ]
+    assert folded(*empty) == empty
+    enum = [op(pt.Op.int, "NoOp"), op(pt.Op.int, 0), op(pt.Op.eq)]
+    assert folded(*enum) == enum
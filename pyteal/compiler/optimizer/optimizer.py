@@ -1,6 +1,6 @@
-from typing import Final, Optional, Set
+from typing import Dict, Final, List, Optional, Set
 
-from pyteal.ast import ScratchSlot
+from pyteal.ast import MaybeValue, OpUp, OpUpFeeSource, ScratchSlot
 from pyteal.errors import TealInternalError, verifyProgramVersion
 from pyteal.ir import Op, TealBlock, TealOp
 
@@ -25,6 +25,45 @@ class OptimizeOptions:
             that have no load dependencies elsewhere. Starting with program version 9, defaults to optimizing.
         frame_pointers (optional): employ frame pointers instead of scratch slots during compilation.
             Available only starting in program version 8. Defaults to optimizing starting in program version 8.
+        share_method_stubs (optional): when building a Router's approval program, decode arguments, call
+            the handler and log the return value of ABI methods with identical argument and return types
+            in a single shared subroutine, instead of repeating this code in each method's branch.
+            Defaults to not sharing.
+        opup (optional): an `OpUp` used to cover the opcode budget of application programs. When given,
+            the compiler estimates the worst case opcode cost of the main program and of each subroutine
+            it calls, such as Router methods, and inserts exactly enough unrolled OpUp inner
+            transactions at their start. Code without a bounded cost, such as loops, is left as is.
+            Defaults to no insertion.
+        opup_fee_source (optional): the `OpUpFeeSource` paying for the inserted OpUp inner transactions.
+            Defaults to `OpUpFeeSource.Any`.
+        stack_maybe_values (optional): keep the value and flag returned by a `MaybeValue` (such as
+            `App.globalGetEx`, `AssetHolding.balance` or `BoxGet`) on the stack instead of storing them in
+            scratch slots, when they are read once right after the operation. For example,
+            `Assert(mv.hasValue())` followed by `mv.value()` needs no scratch slots. Defaults to not
+            lowering.
+        hoist_loop_invariants (optional): compute values that do not change between iterations of a
+            loop, such as `Len(Bytes("abc"))` or `Concat(Txn.note(), Bytes("x"))`, once before the loop
+            and store them in a scratch slot that the loop reads instead. Only side effect free ops that
+            depend on constants, transaction and global fields, and slots or frame variables the loop
+            never writes are moved, and ops that can fail are only moved out of the loop condition.
+            Defaults to not hoisting.
+        unroll_budget (optional): unroll `For` loops whose ScratchVar counter goes from a constant start
+            to a constant bound by a constant step, and whose body has no `Break` or `Continue`, when the
+            unrolled code has at most this many ops. Reads of the counter become constants, and arithmetic
+            on constants is evaluated, so that indexing ABI arrays by the counter extracts at fixed offsets.
+            Defaults to 0, which disables unrolling.
+        layout_blocks (optional): merge blocks with identical ops and successors, such as repeated `Approve()` or `Err()` exits,
+            and order blocks so that branches fall through to their most likely successor where
+            possible, with blocks that always fail placed last. Defaults to the order of a depth first
+            search.
+        thread_jumps (optional): after blocks are placed, retarget branches that lead to another
+            unconditional branch to its final target, replace branches to a lone `return`, `err` or
+            `retsub` (optionally preceded by a constant) with those ops, remove branches to the next
+            label, and drop labels that are no longer referenced. Defaults to not threading.
+        schedule_stack (optional): keep values that are stored in a scratch slot once and only loaded
+            later in the same block, such as the temporaries of ABI encoding and `MultiValue`, on the
+            stack, replacing the loads with `dup`, `dig`, `swap` or `uncover` when the ops in between
+            leave the value in place. Defaults to not scheduling.
     """
 
     def __init__(
@@ -32,9 +71,27 @@ class OptimizeOptions:
         *,
         scratch_slots: Optional[bool] = None,
         frame_pointers: Optional[bool] = None,
+        share_method_stubs: bool = False,
+        opup: Optional[OpUp] = None,
+        opup_fee_source: OpUpFeeSource = OpUpFeeSource.Any,
+        stack_maybe_values: bool = False,
+        hoist_loop_invariants: bool = False,
+        unroll_budget: int = 0,
+        layout_blocks: bool = False,
+        thread_jumps: bool = False,
+        schedule_stack: bool = False,
     ):
         self._scratch_slots: Final[Optional[bool]] = scratch_slots
         self._frame_pointers: Final[Optional[bool]] = frame_pointers
+        self._share_method_stubs: Final[bool] = share_method_stubs
+        self._opup: Final[Optional[OpUp]] = opup
+        self._opup_fee_source: Final[OpUpFeeSource] = opup_fee_source
+        self._stack_maybe_values: Final[bool] = stack_maybe_values
+        self._hoist_loop_invariants: Final[bool] = hoist_loop_invariants
+        self._unroll_budget: Final[int] = unroll_budget
+        self._layout_blocks: Final[bool] = layout_blocks
+        self._thread_jumps: Final[bool] = thread_jumps
+        self._schedule_stack: Final[bool] = schedule_stack
 
         self._skip_slots: Set[ScratchSlot] = set()
 
@@ -61,6 +118,30 @@ class OptimizeOptions:
 
         return self._frame_pointers
 
+    def share_method_stubs(self) -> bool:
+        return self._share_method_stubs
+
+    def insert_opups(self) -> bool:
+        return self._opup is not None
+
+    def lower_maybe_values(self) -> bool:
+        return self._stack_maybe_values
+
+    def hoist_loop_invariants(self) -> bool:
+        return self._hoist_loop_invariants
+
+    def unroll_budget(self) -> int:
+        return self._unroll_budget
+
+    def layout_blocks(self) -> bool:
+        return self._layout_blocks
+
+    def thread_jumps(self) -> bool:
+        return self._thread_jumps
+
+    def schedule_stack(self) -> bool:
+        return self._schedule_stack
+
 
 def _remove_extraneous_slot_access(start: TealBlock, remove: Set[ScratchSlot]):
     def keep_op(op: TealOp) -> bool:
@@ -120,6 +201,119 @@ def _apply_slot_to_stack(
     _remove_extraneous_slot_access(start, slots_to_remove)
 
 
+def _is_slot_op(op: TealOp, kind: Op, slot: ScratchSlot) -> bool:
+    return type(op) is TealOp and op.op == kind and op.getSlots() == [slot]
+
+
+def _lower_maybe_value(
+    ops: List[TealOp], i: int, loads: Dict[ScratchSlot, int], version: int
+) -> bool:
+    """Rewrite the outputs of the MaybeValue op at ops[i] to stay on the stack, if possible.
+
+    The op is followed by a store of its flag and a store of its value. Each rewrite below
+    removes the store and the load of a slot that is read at most once, right after the op.
+
+    Returns:
+        True if ops was changed.
+    """
+    store_ok, store_value = ops[i + 1], ops[i + 2]
+    ok, value = store_ok.getSlots()[0], store_value.getSlots()[0]
+    rest = ops[i + 3 : i + 6]
+    loads_ok, loads_value = loads.get(ok, 0), loads.get(value, 0)
+
+    def next_is(*expected: tuple[Op, Optional[ScratchSlot]]) -> bool:
+        if len(rest) < len(expected):
+            return False
+        for op, (kind, slot) in zip(rest, expected):
+            if slot is None:
+                if type(op) is not TealOp or op.op != kind:
+                    return False
+            elif not _is_slot_op(op, kind, slot):
+                return False
+        return True
+
+    def new_op(kind: Op, *args: int) -> TealOp:
+        return TealOp(store_ok.expr, kind, *args)
+
+    replacement: List[TealOp]
+    consumed: int
+    if loads_ok == 1 and next_is((Op.load, ok), (Op.assert_, None)):
+        if loads_value == 1 and next_is(
+            (Op.load, ok), (Op.assert_, None), (Op.load, value)
+        ):
+            # op; assert -- the value is left on the stack for its only use
+            replacement, consumed = [rest[1]], 5
+        elif loads_value == 0:
+            replacement, consumed = [rest[1], new_op(Op.pop)], 4
+        else:
+            replacement, consumed = [rest[1], store_value], 4
+    elif loads_ok == 1 and next_is((Op.load, ok)):
+        if loads_value == 0:
+            if version >= Op.bury.min_version:
+                replacement = [new_op(Op.bury, 1)]
+            else:
+                replacement = [new_op(Op.swap), new_op(Op.pop)]
+        else:
+            replacement = [new_op(Op.swap), store_value]
+        consumed = 3
+    elif loads_ok == 0 and loads_value == 1 and next_is((Op.load, value)):
+        replacement, consumed = [new_op(Op.pop)], 3
+    elif loads_ok == 0:
+        replacement, consumed = [new_op(Op.pop)], 1
+        if loads_value == 0:
+            replacement.append(new_op(Op.pop))
+            consumed = 2
+        else:
+            replacement.append(store_value)
+            consumed = 2
+    else:
+        return False
+
+    ops[i + 1 : i + 1 + consumed] = replacement
+    return True
+
+
+def lower_maybe_values(start: TealBlock, skip_slots: Set[ScratchSlot], version: int):
+    """Keep the outputs of MaybeValue ops on the stack where their uses allow it.
+
+    Only slots that are stored once, by the MaybeValue op, and are local to the control flow
+    graph of start are rewritten.
+
+    Args:
+        start: The start block of a subroutine's control flow graph.
+        skip_slots: Slots that must not be rewritten, such as global slots.
+        version: The program version.
+    """
+    loads: Dict[ScratchSlot, int] = {}
+    stores: Dict[ScratchSlot, int] = {}
+    for block in TealBlock.Iterate(start):
+        for op in block.ops:
+            if op.op == Op.load:
+                for slot in op.getSlots():
+                    loads[slot] = loads.get(slot, 0) + 1
+            elif op.op == Op.store:
+                for slot in op.getSlots():
+                    stores[slot] = stores.get(slot, 0) + 1
+
+    for block in TealBlock.Iterate(start):
+        ops = block.ops
+        i = 0
+        while i + 2 < len(ops):
+            op = ops[i]
+            if isinstance(op.expr, MaybeValue) and op.op == op.expr.op:
+                ok, value = op.expr.output_slots[1], op.expr.output_slots[0]
+                if (
+                    _is_slot_op(ops[i + 1], Op.store, ok)
+                    and _is_slot_op(ops[i + 2], Op.store, value)
+                    and stores.get(ok) == 1
+                    and stores.get(value) == 1
+                    and ok not in skip_slots
+                    and value not in skip_slots
+                ):
+                    _lower_maybe_value(ops, i, loads, version)
+            i += 1
+
+
 def apply_global_optimizations(
     start: TealBlock, options: OptimizeOptions, version: int
 ) -> TealBlock:
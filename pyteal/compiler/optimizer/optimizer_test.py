@@ -595,3 +595,119 @@ def test_optimize_default_for_version_etc():
 
     assert oo.use_frame_pointers(8) is True
     assert oo.use_frame_pointers(9) is True
+
+
+def _global_get_ex() -> pt.MaybeValue:
+    return pt.App.globalGetEx(pt.Int(0), pt.Bytes("k"))
+
+
+@pytest.mark.parametrize(
+    "version, build, expected",
+    [
+        # assert the flag, then use the value right away
+        (
+            8,
+            lambda mv: pt.Seq(mv, pt.Assert(mv.hasValue()), pt.Pop(mv.value())),
+            ["app_global_get_ex", "assert", "pop"],
+        ),
+        # assert the flag, use the value later
+        (
+            8,
+            lambda mv: pt.Seq(
+                mv, pt.Assert(mv.hasValue()), pt.Pop(pt.Int(1) + mv.value())
+            ),
+            ["app_global_get_ex", "assert", "store 0", "int 1", "load 0", "+", "pop"],
+        ),
+        # only the flag is used
+        (
+            8,
+            lambda mv: pt.Seq(mv, pt.Assert(mv.hasValue())),
+            ["app_global_get_ex", "assert", "pop"],
+        ),
+        (
+            8,
+            lambda mv: pt.Seq(mv, pt.Pop(mv.hasValue())),
+            ["app_global_get_ex", "bury 1", "pop"],
+        ),
+        (
+            6,
+            lambda mv: pt.Seq(mv, pt.Pop(mv.hasValue())),
+            ["app_global_get_ex", "swap", "pop", "pop"],
+        ),
+        # only the value is used
+        (
+            8,
+            lambda mv: pt.Seq(mv, pt.Pop(mv.value())),
+            ["app_global_get_ex", "pop", "pop"],
+        ),
+        # the flag is used right away, the value in another block
+        (
+            8,
+            lambda mv: pt.Seq(mv, pt.If(mv.hasValue()).Then(pt.Pop(mv.value()))),
+            [
+                "app_global_get_ex",
+                "swap",
+                "store 0",
+                "bz main_l2",
+                "load 0",
+                "pop",
+                "main_l2:",
+            ],
+        ),
+        # the flag is not read right after the op
+        (
+            8,
+            lambda mv: pt.Seq(
+                mv, pt.Pop(pt.Int(1)), pt.Assert(mv.hasValue()), pt.Pop(mv.value())
+            ),
+            [
+                "app_global_get_ex",
+                "store 1",
+                "store 0",
+                "int 1",
+                "pop",
+                "load 1",
+                "assert",
+                "load 0",
+                "pop",
+            ],
+        ),
+    ],
+)
+def test_optimize_stack_maybe_values(version, build, expected):
+    mv = _global_get_ex()
+    program = pt.Seq(build(mv), pt.Approve())
+
+    unoptimized = pt.compileTeal(
+        program, version=version, mode=pt.Mode.Application
+    ).splitlines()
+    actual = pt.compileTeal(
+        program,
+        version=version,
+        mode=pt.Mode.Application,
+        optimize=OptimizeOptions(stack_maybe_values=True, scratch_slots=False),
+    ).splitlines()
+
+    assert unoptimized[3:5] == ["app_global_get_ex", "store 1"]
+    assert actual[:3] == [f"#pragma version {version}", "int 0", 'byte "k"']
+    assert actual[3:-2] == expected
+    assert actual[-2:] == ["int 1", "return"]
+
+
+def test_optimize_stack_maybe_values_global_slots():
+    mv = _global_get_ex()
+
+    @pt.Subroutine(pt.TealType.uint64)
+    def read_value():
+        return mv.value()
+
+    program = pt.Seq(mv, pt.Pop(mv.hasValue()), pt.Pop(read_value()), pt.Approve())
+    actual = pt.compileTeal(
+        program,
+        version=8,
+        mode=pt.Mode.Application,
+        optimize=OptimizeOptions(stack_maybe_values=True),
+    ).splitlines()
+
+    # the value slot is read by a subroutine, so it stays in scratch
+    assert actual[3:7] == ["app_global_get_ex", "store 1", "store 0", "load 1"]
@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from pyteal.ast import ScratchSlot
+from pyteal.ir import Op, TealBlock, TealOp
+
+
+def _count_slot_ops(
+    start: TealBlock,
+) -> Tuple[Dict[ScratchSlot, int], Dict[ScratchSlot, int]]:
+    loads: Dict[ScratchSlot, int] = {}
+    stores: Dict[ScratchSlot, int] = {}
+    for block in TealBlock.Iterate(start):
+        for op in block.ops:
+            counts = (
+                loads if op.op == Op.load else stores if op.op == Op.store else None
+            )
+            if counts is None:
+                continue
+            for slot in op.getSlots():
+                counts[slot] = counts.get(slot, 0) + 1
+    return loads, stores
+
+
+def _schedule_slot(
+    ops: List[TealOp], i: int, uses: int, version: int
+) -> Optional[Tuple[List[TealOp], int]]:
+    """Get the ops that keep the value stored by ops[i] on the stack for its loads.
+
+    The value stays where the store would have removed it, and each load is replaced with a
+    :code:`dup` or :code:`dig` of it, except for the last one, which moves it to the top of the
+    stack with :code:`swap` or :code:`uncover`. This is only possible when none of the ops between
+    the store and its last load reach the value.
+
+    Returns:
+        The ops that replace the store and everything up to its last load, along with the index of
+        the last load, or None if the value can't be kept on the stack.
+    """
+    store = ops[i]
+    slot = store.getSlots()[0]
+    # the number of values above the stored value
+    depth = 0
+    rewritten: List[TealOp] = []
+    for j in range(i + 1, len(ops)):
+        op = ops[j]
+        if op.op == Op.load and op.getSlots() == [slot]:
+            uses -= 1
+            if uses > 0:
+                if depth == 0:
+                    rewritten.append(TealOp(op.expr, Op.dup))
+                elif version >= Op.dig.min_version:
+                    rewritten.append(TealOp(op.expr, Op.dig, depth))
+                else:
+                    return None
+                depth += 1
+                continue
+
+            if depth == 1 and version >= Op.swap.min_version:
+                rewritten.append(TealOp(op.expr, Op.swap))
+            elif depth > 1 and version >= Op.uncover.min_version:
+                rewritten.append(TealOp(op.expr, Op.uncover, depth))
+            elif depth != 0:
+                return None
+            return rewritten, j
+
+        effect = op.stackEffect()
+        if effect is None or effect[0] > depth:
+            return None
+        rewritten.append(op)
+        depth += effect[1] - effect[0]
+
+    return None
+
+
+def schedule_stack_slots(start: TealBlock, skip_slots: Set[ScratchSlot], version: int):
+    """Keep values that are stored in a slot and only loaded later in the same block on the stack.
+
+    A slot that is stored once and whose loads all follow the store in the same block is replaced
+    with stack manipulation ops when the ops in between leave the stored value in place: each load
+    but the last becomes a :code:`dup` or :code:`dig`, and the last becomes a :code:`swap` or
+    :code:`uncover`, or is removed if the value is already on top of the stack. This replaces at
+    least two ops with at most one for every slot and saves the bytes of the slot immediates.
+
+    Args:
+        start: The start block of a subroutine's control flow graph.
+        skip_slots: Slots that must not be rewritten, such as global slots.
+        version: The program version.
+    """
+    loads, stores = _count_slot_ops(start)
+
+    for block in TealBlock.Iterate(start):
+        ops = block.ops
+        i = 0
+        while i < len(ops):
+            op = ops[i]
+            if op.op != Op.store or len(op.getSlots()) != 1:
+                i += 1
+                continue
+
+            slot = op.getSlots()[0]
+            uses = loads.get(slot, 0)
+            if slot in skip_slots or stores.get(slot) != 1 or uses == 0:
+                i += 1
+                continue
+
+            in_block = sum(
+                1
+                for later in ops[i + 1 :]
+                if later.op == Op.load and later.getSlots() == [slot]
+            )
+            rewritten = (
+                _schedule_slot(ops, i, uses, version) if in_block == uses else None
+            )
+            if rewritten is None:
+                i += 1
+                continue
+
+            replacement, last = rewritten
+            ops[i : last + 1] = replacement
@@ -0,0 +1,183 @@
+import pytest
+
+import pyteal as pt
+from pyteal.compiler.optimizer import schedule_stack_slots
+
+
+def op(kind: pt.Op, *args) -> pt.TealOp:
+    return pt.TealOp(None, kind, *args)
+
+
+def scheduled(*ops: pt.TealOp, version: int = 8, skip=()) -> list[pt.TealOp]:
+    block = pt.TealSimpleBlock(list(ops))
+    schedule_stack_slots(block, set(skip), version)
+    return block.ops
+
+
+def test_schedule_single_use():
+    slot = pt.ScratchSlot()
+
+    # the value is already on top of the stack when it is loaded
+    assert scheduled(
+        op(pt.Op.int, 1),
+        op(pt.Op.store, slot),
+        op(pt.Op.load, slot),
+        op(pt.Op.itob),
+    ) == [op(pt.Op.int, 1), op(pt.Op.itob)]
+
+    assert scheduled(
+        op(pt.Op.txn, "Sender"),
+        op(pt.Op.store, slot),
+        op(pt.Op.byte, '"prefix"'),
+        op(pt.Op.load, slot),
+        op(pt.Op.concat),
+    ) == [
+        op(pt.Op.txn, "Sender"),
+        op(pt.Op.byte, '"prefix"'),
+        op(pt.Op.swap),
+        op(pt.Op.concat),
+    ]
+
+    assert scheduled(
+        op(pt.Op.txn, "Sender"),
+        op(pt.Op.store, slot),
+        op(pt.Op.byte, '"a"'),
+        op(pt.Op.byte, '"b"'),
+        op(pt.Op.concat),
+        op(pt.Op.int, 1),
+        op(pt.Op.load, slot),
+    ) == [
+        op(pt.Op.txn, "Sender"),
+        op(pt.Op.byte, '"a"'),
+        op(pt.Op.byte, '"b"'),
+        op(pt.Op.concat),
+        op(pt.Op.int, 1),
+        op(pt.Op.uncover, 2),
+    ]
+
+
+def test_schedule_multiple_uses():
+    slot = pt.ScratchSlot()
+
+    assert scheduled(
+        op(pt.Op.txn, "Fee"),
+        op(pt.Op.store, slot),
+        op(pt.Op.load, slot),
+        op(pt.Op.int, 2),
+        op(pt.Op.load, slot),
+        op(pt.Op.mul),
+        op(pt.Op.add),
+    ) == [
+        op(pt.Op.txn, "Fee"),
+        op(pt.Op.dup),
+        op(pt.Op.int, 2),
+        op(pt.Op.uncover, 2),
+        op(pt.Op.mul),
+        op(pt.Op.add),
+    ]
+
+    assert scheduled(
+        op(pt.Op.txn, "Fee"),
+        op(pt.Op.store, slot),
+        op(pt.Op.int, 1),
+        op(pt.Op.load, slot),
+        op(pt.Op.add),
+        op(pt.Op.load, slot),
+        op(pt.Op.add),
+    ) == [
+        op(pt.Op.txn, "Fee"),
+        op(pt.Op.int, 1),
+        op(pt.Op.dig, 1),
+        op(pt.Op.add),
+        op(pt.Op.swap),
+        op(pt.Op.add),
+    ]
+
+
+@pytest.mark.parametrize(
+    "ops",
+    [
+        # the value is consumed by an op before it is loaded
+        [
+            op(pt.Op.int, 1),
+            op(pt.Op.int, 2),
+            op(pt.Op.store, 0),
+            op(pt.Op.pop),
+            op(pt.Op.load, 0),
+        ],
+        # subroutines may read the whole stack
+        [
+            op(pt.Op.int, 1),
+            op(pt.Op.store, 0),
+            op(pt.Op.callsub, "sub"),
+            op(pt.Op.load, 0),
+        ],
+        # the slot is loaded before it is stored
+        [
+            op(pt.Op.load, 0),
+            op(pt.Op.int, 1),
+            op(pt.Op.store, 0),
+            op(pt.Op.load, 0),
+        ],
+        # the slot is stored twice
+        [
+            op(pt.Op.int, 1),
+            op(pt.Op.store, 0),
+            op(pt.Op.int, 2),
+            op(pt.Op.store, 0),
+            op(pt.Op.load, 0),
+        ],
+        # uncover is not available before version 5
+        [
+            op(pt.Op.int, 1),
+            op(pt.Op.store, 0),
+            op(pt.Op.int, 2),
+            op(pt.Op.int, 3),
+            op(pt.Op.load, 0),
+        ],
+    ],
+)
+def test_schedule_not_applicable(ops):
+    slot = pt.ScratchSlot()
+    ops = [op(o.op, slot) if o.op in (pt.Op.load, pt.Op.store) else o for o in ops]
+    assert scheduled(*ops, version=4) == ops
+
+
+def test_schedule_skip_slots_and_blocks():
+    slot = pt.ScratchSlot()
+    ops = [op(pt.Op.int, 1), op(pt.Op.store, slot), op(pt.Op.load, slot)]
+    assert scheduled(*ops, skip=[slot]) == ops
+
+    # loads in other blocks keep the slot
+    first = pt.TealSimpleBlock([op(pt.Op.int, 1), op(pt.Op.store, slot)])
+    second = pt.TealSimpleBlock([op(pt.Op.load, slot), op(pt.Op.pop)])
+    first.setNextBlock(second)
+    schedule_stack_slots(first, set(), 8)
+    assert first.ops == [op(pt.Op.int, 1), op(pt.Op.store, slot)]
+    assert second.ops == [op(pt.Op.load, slot), op(pt.Op.pop)]
+
+
+def test_schedule_router():
+    router = pt.Router("schedule")
+
+    @router.method
+    def pair(
+        name: pt.abi.String,
+        amount: pt.abi.Uint64,
+        *,
+        output: pt.abi.Tuple2[pt.abi.String, pt.abi.Uint64],
+    ):
+        return output.set(name, amount)
+
+    def compile_teal(schedule_stack: bool) -> str:
+        return router.compile(
+            version=8,
+            optimize=pt.OptimizeOptions(
+                scratch_slots=True, frame_pointers=False, schedule_stack=schedule_stack
+            ),
+        ).approval_teal
+
+    default, optimized = compile_teal(False), compile_teal(True)
+    assert optimized.count("\nstore ") < default.count("\nstore ")
+    assert optimized.count("\nload ") < default.count("\nload ")
+    assert len(optimized.splitlines()) < len(default.splitlines())
@@ -0,0 +1,308 @@
+from collections import Counter
+from dataclasses import dataclass
+import json
+import os
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Union
+
+from tabulate import tabulate  # type: ignore
+
+from pyteal.compiler.cost import opCost
+from pyteal.compiler.sourcemap import PyTealSourceMap
+from pyteal.errors import TealInputError
+from pyteal.ir import Op, TealOp
+
+# The name of the bottom frame of every call stack, as in the labels of the main program
+MAIN_FRAME = "main"
+
+# The keys of the traces of each kind of program in simulate and dryrun responses
+_SIMULATE_TRACE_KEYS = {
+    "approval": "approval-program-trace",
+    "clear": "clear-state-program-trace",
+    "logicsig": "logic-sig-trace",
+}
+_DRYRUN_TRACE_KEYS = {
+    "approval": "app-call-trace",
+    "clear": "app-call-trace",
+    "logicsig": "logic-sig-trace",
+}
+
+_OPS_BY_NAME: Dict[str, Op] = {op.value.value: op for op in Op}
+
+ProgramKind = Literal["approval", "clear", "logicsig"]
+Trace = Union[str, "os.PathLike[str]", Dict[str, Any], List[Any]]
+
+
+def _teal_line_cost(line: str) -> int:
+    tokens = line.split()
+    if not tokens or tokens[0].endswith(":") or tokens[0].startswith(("#", "//")):
+        return 0
+    if (op := _OPS_BY_NAME.get(tokens[0])) is None:
+        return 1
+    cost = opCost(TealOp(None, op, *tokens[1:2]))
+    # ops whose cost grows with their inputs cost at least 1
+    return 1 if cost is None else cost
+
+
+def _trace_pcs(trace: Trace, program: ProgramKind) -> List[List[int]]:
+    """Get the sequences of executed PCs from a trace, one for each program execution."""
+    if isinstance(trace, (str, os.PathLike)):
+        with open(trace) as f:
+            trace = json.load(f)
+
+    if isinstance(trace, list):
+        return [[unit["pc"] if isinstance(unit, dict) else unit for unit in trace]]
+
+    if not isinstance(trace, dict):
+        raise TealInputError(f"Unsupported trace of type {type(trace)}")
+
+    executions: List[List[int]] = []
+    if "txn-groups" in trace:
+        key = _SIMULATE_TRACE_KEYS[program]
+        for group in trace["txn-groups"]:
+            for result in group.get("txn-results", []):
+                if units := result.get("exec-trace", {}).get(key):
+                    executions.append([unit["pc"] for unit in units])
+    elif "txns" in trace:
+        key = _DRYRUN_TRACE_KEYS[program]
+        for txn in trace["txns"]:
+            if units := txn.get(key):
+                executions.append([unit["pc"] for unit in units])
+    else:
+        raise TealInputError(
+            "Expected a simulate response with 'txn-groups' or a dryrun response with 'txns'"
+        )
+    return executions
+
+
+@dataclass(frozen=True)
+class LineProfile:
+    """The opcode cost of a line of PyTeal source code in profiled executions.
+
+    Fields:
+        - :code:`source` - The path of the PyTeal file, or ``None`` for TEAL that isn't mapped to PyTeal.
+        - :code:`line` - The line number in the PyTeal file, counting from 1, or ``None``.
+        - :code:`code` - The PyTeal code that generated the TEAL of the line, if known.
+        - :code:`hits` - The number of executed opcodes generated by the line.
+        - :code:`cost` - The opcode cost of those opcodes.
+    """
+
+    source: Optional[str]
+    line: Optional[int]
+    code: Optional[str]
+    hits: int
+    cost: int
+
+
+LineProfile.__module__ = "pyteal"
+
+
+@dataclass(frozen=True)
+class SubroutineProfile:
+    """The opcode cost of a subroutine in profiled executions.
+
+    Router methods are profiled as the subroutines that implement them.
+
+    Fields:
+        - :code:`name` - The label of the subroutine in the TEAL program, or :code:`"main"` for the
+          main program.
+        - :code:`calls` - The number of times the subroutine was called.
+        - :code:`hits` - The number of opcodes executed in the subroutine itself.
+        - :code:`cost` - The opcode cost of the subroutine itself.
+        - :code:`total_cost` - The opcode cost of the subroutine and everything it called.
+    """
+
+    name: str
+    calls: int
+    hits: int
+    cost: int
+    total_cost: int
+
+
+SubroutineProfile.__module__ = "pyteal"
+
+
+class CostProfiler:
+    """Attribute the opcode cost of program executions to PyTeal source lines and subroutines.
+
+    The profiler replays the PCs of execution traces against a source map with PCs, such as the
+    one returned by :code:`compile(with_sourcemap=True, pcs_in_sourcemap=True)`. Each executed
+    opcode is charged its cost from the AVM opcode specification. Ops whose cost grows with their
+    inputs are charged their worst case, or 1 if it is unbounded.
+
+    Example:
+        .. code-block:: python
+
+            profiler = CostProfiler(results.approval_sourcemap)
+            profiler.add_trace("simulate_response.json")
+            print(profiler.report())
+            with open("profile.folded", "w") as f:
+                f.write(profiler.collapsed_stacks())
+    """
+
+    def __init__(self, sourcemap: PyTealSourceMap) -> None:
+        """Create a new profiler.
+
+        Args:
+            sourcemap: The source map of the profiled program, which must include PCs.
+        """
+        r3_sourcemap, pc_sourcemap = sourcemap.r3_sourcemap, sourcemap.pc_sourcemap
+        if r3_sourcemap is None or not r3_sourcemap.file_lines:
+            raise TealInputError("Profiling requires a source map with TEAL lines")
+        if pc_sourcemap is None:
+            raise TealInputError(
+                "Profiling requires a source map with PCs, see pcs_in_sourcemap"
+            )
+
+        self.teal_lines: List[str] = r3_sourcemap.file_lines
+        self.pc_to_line: Dict[int, int] = pc_sourcemap.pc_to_line
+        self.costs: List[int] = [_teal_line_cost(line) for line in self.teal_lines]
+
+        # the PyTeal source of each TEAL line
+        self.sources: List[Tuple[Optional[str], Optional[int], Optional[str]]] = []
+        for i in range(len(self.teal_lines)):
+            try:
+                entry = r3_sourcemap[i]
+            except (IndexError, KeyError):
+                self.sources.append((None, None, None))
+                continue
+            line = None if entry.source_line is None else entry.source_line + 1
+            self.sources.append((entry.source, line, entry.source_extract))
+
+        self._line_hits: Counter[Tuple[Optional[str], Optional[int]]] = Counter()
+        self._line_costs: Counter[Tuple[Optional[str], Optional[int]]] = Counter()
+        self._codes: Dict[Tuple[Optional[str], Optional[int]], Optional[str]] = {}
+        self._calls: Counter[str] = Counter()
+        self._hits: Counter[str] = Counter()
+        self._costs: Counter[str] = Counter()
+        self._total_costs: Counter[str] = Counter()
+        self._stacks: Counter[Tuple[str, ...]] = Counter()
+
+    def add_trace(self, trace: Trace, program: ProgramKind = "approval") -> None:
+        """Add the executions in a trace to the profile.
+
+        Args:
+            trace: One of
+
+                * the path of a JSON file holding any of the below
+                * a simulate response with execution traces enabled, whose traces of the given
+                  kind of program are all added
+                * a dryrun response, whose traces of the given kind of program are all added
+                * a single trace, i.e. a list of trace units with a :code:`"pc"` or a list of PCs
+
+                Traces of inner transactions are not added.
+            program (optional): The kind of program that was profiled. Defaults to approval
+                programs.
+        """
+        for pcs in _trace_pcs(trace, program):
+            self._add_execution(pcs)
+
+    def _add_execution(self, pcs: Iterable[int]) -> None:
+        stack = [MAIN_FRAME]
+        self._calls[MAIN_FRAME] += 1
+        for pc in pcs:
+            if (teal_line := self.pc_to_line.get(pc)) is None:
+                raise TealInputError(f"PC {pc} of the trace is not in the source map")
+
+            cost = self.costs[teal_line]
+            source, line, code = self.sources[teal_line]
+            location = (source, line)
+            self._line_hits[location] += 1
+            self._line_costs[location] += cost
+            self._codes.setdefault(location, code)
+
+            self._hits[stack[-1]] += 1
+            self._costs[stack[-1]] += cost
+            for name in set(stack):
+                self._total_costs[name] += cost
+            frame = f"{source}:{line}" if source is not None else "unknown"
+            self._stacks[(*stack, frame)] += cost
+
+            op, *args = self.teal_lines[teal_line].split() or [""]
+            if op == Op.callsub.value.value and args:
+                stack.append(args[0])
+                self._calls[args[0]] += 1
+            elif op == Op.retsub.value.value and len(stack) > 1:
+                stack.pop()
+
+    def lines(self) -> List[LineProfile]:
+        """Get the profile of each executed PyTeal source line, with the most expensive first."""
+        profiles = [
+            LineProfile(
+                source,
+                line,
+                self._codes[source, line],
+                hits,
+                self._line_costs[source, line],
+            )
+            for (source, line), hits in self._line_hits.items()
+        ]
+        return sorted(
+            profiles,
+            key=lambda p: (-p.cost, -p.hits, p.source or "", p.line or 0),
+        )
+
+    def subroutines(self) -> List[SubroutineProfile]:
+        """Get the profile of the main program and each called subroutine, with the most
+        expensive first."""
+        profiles = [
+            SubroutineProfile(
+                name,
+                calls,
+                self._hits[name],
+                self._costs[name],
+                self._total_costs[name],
+            )
+            for name, calls in self._calls.items()
+        ]
+        return sorted(profiles, key=lambda p: (-p.total_cost, -p.cost, p.name))
+
+    def report(
+        self,
+        sort_by: Literal["cost", "hits", "line"] = "cost",
+        limit: Optional[int] = None,
+    ) -> str:
+        """Get a table of the profile of each executed PyTeal source line.
+
+        Args:
+            sort_by (optional): Sort the lines by descending :code:`"cost"` (the default), by
+                descending :code:`"hits"`, or by source :code:`"line"`.
+            limit (optional): The maximum number of lines to include.
+        """
+        profiles = self.lines()
+        total = sum(p.cost for p in profiles)
+        if sort_by == "hits":
+            profiles.sort(key=lambda p: -p.hits)
+        elif sort_by == "line":
+            profiles.sort(key=lambda p: (p.source or "", p.line or 0))
+        elif sort_by != "cost":
+            raise TealInputError(f"Cannot sort a profile by {sort_by}")
+
+        rows = [
+            [
+                p.source,
+                p.line,
+                p.hits,
+                p.cost,
+                f"{100 * p.cost / total:.1f}%" if total else "",
+                p.code,
+            ]
+            for p in profiles[:limit]
+        ]
+        return tabulate(
+            rows, headers=["PyTeal Path", "Line", "Hits", "Cost", "% Cost", "PyTeal"]
+        )
+
+    def collapsed_stacks(self) -> str:
+        """Get the profile in the collapsed stack format read by flamegraph tools.
+
+        Each line holds the frames of a call stack separated by semicolons, from the main program
+        through the called subroutines to a PyTeal source line, followed by the opcode cost spent
+        there.
+        """
+        return "".join(
+            f"{';'.join(stack)} {cost}\n"
+            for stack, cost in sorted(self._stacks.items())
+        )
+
+
+CostProfiler.__module__ = "pyteal"
@@ -0,0 +1,140 @@
+import json
+
+import pytest
+from algosdk.source_map import SourceMap as PCSourceMap
+
+import pyteal as pt
+from pyteal.compiler.sourcemap import R3SourceMapping, _base64vlq_encode
+
+# TEAL lines, their PyTeal source lines and their number of bytes
+program = [
+    ("#pragma version 8", 20, 1),
+    ("callsub hash_0", 10, 3),
+    ("int 1", 10, 2),
+    ("return", 11, 1),
+    ("hash_0:", 2, 0),
+    ("byte 0x00", 3, 3),
+    ("sha256", 3, 1),
+    ("pop", 3, 1),
+    ("retsub", 4, 1),
+]
+approval_pcs = [1, 7, 10, 11, 12, 4, 6]
+
+
+def make_sourcemap(with_pcs: bool = True) -> pt.PyTealSourceMap:
+    entries = {
+        (i, 0): R3SourceMapping(
+            line=i,
+            column=0,
+            source="app.py",
+            source_line=line - 1,
+            source_column=0,
+            _source_extract=f"code of line {line}",
+        )
+        for i, (_, line, _) in enumerate(program)
+    }
+    r3_sourcemap = pt.R3SourceMap(
+        filename=None,
+        source_root=None,
+        entries=entries,
+        index=[(0,)] * len(program),
+        file_lines=[teal for teal, _, _ in program],
+    )
+
+    # the line of each PC, encoded as in algod's source maps
+    pc_lines = [i for i, (_, _, size) in enumerate(program) for _ in range(size)]
+    mappings = ";".join(
+        _base64vlq_encode(0, 0, line - prev, 0) if pc == 0 or line != prev else ""
+        for pc, (prev, line) in enumerate(zip([0] + pc_lines, pc_lines))
+    )
+    pc_sourcemap = PCSourceMap({"version": 3, "sources": [], "mappings": mappings})
+    return pt.PyTealSourceMap(
+        None, r3_sourcemap, pc_sourcemap if with_pcs else None, None
+    )
+
+
+def test_profile():
+    profiler = pt.CostProfiler(make_sourcemap())
+    profiler.add_trace(approval_pcs)
+
+    assert profiler.lines() == [
+        pt.LineProfile("app.py", 3, "code of line 3", 3, 1 + 35 + 1),
+        pt.LineProfile("app.py", 10, "code of line 10", 2, 2),
+        pt.LineProfile("app.py", 4, "code of line 4", 1, 1),
+        pt.LineProfile("app.py", 11, "code of line 11", 1, 1),
+    ]
+    assert profiler.subroutines() == [
+        pt.SubroutineProfile("main", 1, 3, 3, 41),
+        pt.SubroutineProfile("hash_0", 1, 4, 38, 38),
+    ]
+    assert profiler.collapsed_stacks() == (
+        "main;app.py:10 2\n"
+        "main;app.py:11 1\n"
+        "main;hash_0;app.py:3 37\n"
+        "main;hash_0;app.py:4 1\n"
+    )
+
+    report = profiler.report(sort_by="line").splitlines()
+    assert report[0].split() == [
+        "PyTeal",
+        "Path",
+        "Line",
+        "Hits",
+        "Cost",
+        "%",
+        "Cost",
+        "PyTeal",
+    ]
+    assert [row.split()[:5] for row in report[2:]] == [
+        ["app.py", "3", "3", "37", "90.2%"],
+        ["app.py", "4", "1", "1", "2.4%"],
+        ["app.py", "10", "2", "2", "4.9%"],
+        ["app.py", "11", "1", "1", "2.4%"],
+    ]
+    assert len(profiler.report(limit=1).splitlines()) == 3
+
+    with pytest.raises(pt.TealInputError):
+        profiler.report(sort_by="name")  # type: ignore[arg-type]
+
+
+def test_profile_responses(tmp_path):
+    units = [{"pc": pc} for pc in approval_pcs]
+    simulate = {
+        "txn-groups": [
+            {
+                "txn-results": [
+                    {"exec-trace": {"approval-program-trace": units}},
+                    {},
+                    {"exec-trace": {"approval-program-trace": units[5:]}},
+                ]
+            }
+        ]
+    }
+    profiler = pt.CostProfiler(make_sourcemap())
+    profiler.add_trace(simulate)
+    profiler.add_trace(simulate, program="clear")
+    assert [(s.name, s.calls, s.total_cost) for s in profiler.subroutines()] == [
+        ("main", 2, 41 + 2),
+        ("hash_0", 1, 38),
+    ]
+
+    dryrun = {"txns": [{"app-call-trace": units}, {"logic-sig-trace": units}]}
+    path = tmp_path / "dryrun.json"
+    path.write_text(json.dumps(dryrun))
+    from_file = pt.CostProfiler(make_sourcemap())
+    from_file.add_trace(str(path))
+    from_trace = pt.CostProfiler(make_sourcemap())
+    from_trace.add_trace(units)
+    assert from_file.lines() == from_trace.lines()
+    assert from_file.collapsed_stacks() == from_trace.collapsed_stacks()
+
+
+def test_profile_invalid():
+    with pytest.raises(pt.TealInputError):
+        pt.CostProfiler(make_sourcemap(with_pcs=False))
+
+    profiler = pt.CostProfiler(make_sourcemap())
+    with pytest.raises(pt.TealInputError):
+        profiler.add_trace([100])
+    with pytest.raises(pt.TealInputError):
+        profiler.add_trace({"unknown": []})
@@ -1,8 +1,11 @@
-from typing import List
+from typing import Dict, Final, List, Optional, Set, Tuple
 
-from pyteal.ir import TealBlock
+from pyteal.ir import Op, TealBlock, TealSimpleBlock
 from pyteal.errors import TealInternalError
 
+# ops after which control does not continue to a next block
+_EXIT_OPS: Final[Set[Op]] = {Op.return_, Op.err, Op.retsub}
+
 
 def sortBlocks(start: TealBlock, end: TealBlock) -> List[TealBlock]:
     """Topologically sort the graph which starts with the input TealBlock.
@@ -41,3 +44,148 @@ def sortBlocks(start: TealBlock, end: TealBlock) -> List[TealBlock]:
     order.append(end)
 
     return order
+
+
+def _block_key(block: TealBlock) -> Tuple:
+    ops = tuple((op.op, tuple(op.args)) for op in block.ops)
+    return (type(block), ops, tuple(id(b) for b in block.getOutgoing()))
+
+
+def mergeTailBlocks(start: TealBlock, end: TealBlock) -> None:
+    """Merge blocks that have the same ops and the same outgoing blocks.
+
+    Every edge to a duplicate block is redirected to a single copy. This is not limited to exits:
+    any blocks with identical ops that continue to the same blocks are merged, for example identical
+    exits such as :code:`int 1; return` or :code:`err` reached from several places, or identical
+    blocks that branch or fall through to a shared block. Only blocks that leave the program by
+    falling off its end are kept apart. Merging repeats until no duplicates are left, so chains of
+    identical blocks leading to a merged block are merged as well.
+
+    Args:
+        start: The starting point of the graph.
+        end: The end block of the graph, which is always kept.
+    """
+    while True:
+        blocks = list(TealBlock.Iterate(start))
+        copies: Dict[Tuple, TealBlock] = {}
+        replacements: Dict[int, TealBlock] = {}
+        # the end and start blocks must stay in the graph, so they are kept over any copy
+        for block in sorted(
+            blocks, key=lambda b: 0 if b is end else 1 if b is start else 2
+        ):
+            if block.isTerminal() and (
+                len(block.ops) == 0 or block.ops[-1].op not in _EXIT_OPS
+            ):
+                # control only leaves this block by falling off the end of the program
+                continue
+            key = _block_key(block)
+            if key in copies:
+                replacements[id(block)] = copies[key]
+            else:
+                copies[key] = block
+
+        if not replacements:
+            return
+
+        for block in blocks:
+            for outgoing in block.getOutgoing():
+                if id(outgoing) in replacements:
+                    block.replaceOutgoing(outgoing, replacements[id(outgoing)])
+
+
+def _is_cold(block: TealBlock, cold: Dict[int, bool]) -> bool:
+    """Check if a block always leads to the program failing, through blocks without branches."""
+    # follow the blocks without branches iteratively, since they can form long chains
+    chain: List[TealBlock] = []
+    result: Optional[bool] = None
+    while result is None:
+        if id(block) in cold:
+            result = cold[id(block)]
+            break
+
+        cold[id(block)] = False
+        chain.append(block)
+        if block.isTerminal():
+            ops = block.ops
+            result = len(ops) > 0 and (
+                ops[-1].op == Op.err
+                or (
+                    ops[-1].op == Op.return_
+                    and len(ops) > 1
+                    and ops[-2].op == Op.int
+                    and ops[-2].args == [0]
+                )
+            )
+        elif type(block) is TealSimpleBlock and block.nextBlock is not None:
+            block = block.nextBlock
+        else:
+            result = False
+
+    for chained in chain:
+        cold[id(chained)] = result
+    return result
+
+
+def layoutBlocks(start: TealBlock, end: TealBlock) -> List[TealBlock]:
+    """Order the blocks of a graph so that as many branches as possible become fallthroughs.
+
+    Blocks are laid out in chains: each block is followed by one of its outgoing blocks that has
+    not been placed yet. Conditional blocks prefer to fall through to their true branch, such as
+    the body of a :any:`Cond` case, unless it leads to a failure. Chains that always lead to a
+    failure, like the :code:`err` at the end of a :any:`Cond`, are placed after the others, except
+    for a chain that continues to the end block, which is placed last so it falls through to it.
+
+    Args:
+        start: The starting point of the graph to order.
+        end: The end block of the graph.
+
+    Returns:
+        An ordered list of the blocks reachable from start.
+    """
+    if start is end:
+        return [end]
+
+    cold: Dict[int, bool] = {}
+    placed = {id(end)}
+    reaches_end = False
+    warm_chains: List[List[TealBlock]] = []
+    cold_chains: List[List[TealBlock]] = []
+    # chain heads, the last one is laid out next
+    heads: List[TealBlock] = [start]
+    cold_heads: List[TealBlock] = []
+
+    while heads or cold_heads:
+        is_cold = not heads
+        block: Optional[TealBlock] = heads.pop() if heads else cold_heads.pop()
+        chain: List[TealBlock] = []
+        while block is not None and id(block) not in placed:
+            chain.append(block)
+            placed.add(id(block))
+
+            outgoing = block.getOutgoing()
+            reaches_end |= any(b is end for b in outgoing)
+            candidates = [b for b in outgoing if id(b) not in placed]
+            warm = [b for b in candidates if not _is_cold(b, cold)]
+            following = warm[0] if warm else (candidates[0] if candidates else None)
+            for other in reversed(candidates):
+                if other is not following:
+                    (cold_heads if _is_cold(other, cold) else heads).append(other)
+            block = following
+        if chain:
+            (cold_chains if is_cold else warm_chains).append(chain)
+
+    if not reaches_end:
+        raise TealInternalError("End block not present")
+
+    first, others = warm_chains[0], warm_chains[1:] + cold_chains
+    if not any(b is end for b in first[-1].getOutgoing()):
+        for i in reversed(range(len(others))):
+            if any(b is end for b in others[i][-1].getOutgoing()):
+                others.append(others.pop(i))
+                break
+
+    order = list(first)
+    for chain in others:
+        order += chain
+    order.append(end)
+    return order
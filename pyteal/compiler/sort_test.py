@@ -1,6 +1,6 @@
 import pyteal as pt
 
-from pyteal.compiler.sort import sortBlocks
+from pyteal.compiler.sort import layoutBlocks, mergeTailBlocks, sortBlocks
 
 
 def test_sort_single():
@@ -92,3 +92,169 @@ def test_sort_branch_converge():
     actual = sortBlocks(block, blockEnd)
 
     assert actual == expected
+
+
+def test_layout_sequence():
+    block3 = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.int, 3)])
+    block2 = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.int, 2)])
+    block2.setNextBlock(block3)
+    block1 = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.int, 1)])
+    block1.setNextBlock(block2)
+
+    assert layoutBlocks(block1, block3) == [block1, block2, block3]
+    assert layoutBlocks(block3, block3) == [block3]
+
+
+def test_layout_cold_blocks_last():
+    end = pt.TealSimpleBlock([])
+    fail = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.err)])
+    reject = pt.TealSimpleBlock(
+        [pt.TealOp(None, pt.Op.int, 0), pt.TealOp(None, pt.Op.return_)]
+    )
+    body2 = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.byte, '"2"')])
+    body2.setNextBlock(end)
+    cond2 = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 2)])
+    cond2.setTrueBlock(body2)
+    cond2.setFalseBlock(fail)
+    body1 = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.byte, '"1"')])
+    body1.setNextBlock(reject)
+    cond1 = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 1)])
+    cond1.setTrueBlock(body1)
+    cond1.setFalseBlock(cond2)
+
+    # body1 only leads to a rejection, so the second case falls through to its body
+    # and the failing blocks come last
+    assert sortBlocks(cond1, end) == [cond1, cond2, fail, body2, body1, reject, end]
+    assert layoutBlocks(cond1, end) == [cond1, cond2, body2, fail, body1, reject, end]
+
+
+def test_layout_end_chain_last():
+    end = pt.TealSimpleBlock([])
+    fail = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.err)])
+    body = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.byte, '"body"')])
+    body.setNextBlock(end)
+    reject = pt.TealSimpleBlock(
+        [pt.TealOp(None, pt.Op.int, 0), pt.TealOp(None, pt.Op.return_)]
+    )
+    inner = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 2)])
+    inner.setTrueBlock(reject)
+    inner.setFalseBlock(fail)
+    cond = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 1)])
+    cond.setTrueBlock(inner)
+    cond.setFalseBlock(body)
+
+    # the chain that continues to the end block is placed right before it
+    assert layoutBlocks(cond, end) == [cond, inner, reject, fail, body, end]
+
+
+def test_layout_prefers_true_branch():
+    end = pt.TealSimpleBlock([])
+    blockTrue = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.byte, '"true"')])
+    blockTrue.setNextBlock(end)
+    blockFalse = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.byte, '"false"')])
+    blockFalse.setNextBlock(end)
+    block = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 1)])
+    block.setTrueBlock(blockTrue)
+    block.setFalseBlock(blockFalse)
+
+    assert layoutBlocks(block, end) == [block, blockTrue, blockFalse, end]
+
+
+def test_merge_tail_blocks():
+    def approve() -> pt.TealSimpleBlock:
+        return pt.TealSimpleBlock(
+            [pt.TealOp(None, pt.Op.int, 1), pt.TealOp(None, pt.Op.return_)]
+        )
+
+    end = pt.TealSimpleBlock([])
+    approve1, approve2 = approve(), approve()
+    log1 = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.log)])
+    log1.setNextBlock(approve1)
+    log2 = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.log)])
+    log2.setNextBlock(approve2)
+    falls_off = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.int, 1)])
+    inner = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 2)])
+    inner.setTrueBlock(log2)
+    inner.setFalseBlock(falls_off)
+    block = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 1)])
+    block.setTrueBlock(log1)
+    block.setFalseBlock(inner)
+    falls_off.setNextBlock(end)
+
+    mergeTailBlocks(block, end)
+
+    # the exits merge first, which makes the blocks logging before them identical too
+    assert block.trueBlock is log1
+    assert inner.trueBlock is log1
+    assert log1.nextBlock is approve1
+    assert inner.falseBlock is falls_off
+    assert layoutBlocks(block, end) == [block, log1, approve1, inner, falls_off, end]
+
+
+def test_merge_tail_blocks_keeps_end():
+    end = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.retsub)])
+    other = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.retsub)])
+    block = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 1)])
+    block.setTrueBlock(other)
+    block.setFalseBlock(end)
+
+    mergeTailBlocks(block, end)
+
+    assert block.trueBlock is end
+    assert block.falseBlock is end
+    assert layoutBlocks(block, end) == [block, end]
+
+
+def test_merge_tail_blocks_shared_successor():
+    end = pt.TealSimpleBlock([])
+    after = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.pop)])
+    after.setNextBlock(end)
+    branch1 = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.txn, "Fee")])
+    branch1.setTrueBlock(after)
+    branch1.setFalseBlock(end)
+    branch2 = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.txn, "Fee")])
+    branch2.setTrueBlock(after)
+    branch2.setFalseBlock(end)
+    other = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.txn, "Fee")])
+    other.setTrueBlock(end)
+    other.setFalseBlock(after)
+    inner = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 2)])
+    inner.setTrueBlock(branch2)
+    inner.setFalseBlock(other)
+    block = pt.TealConditionalBlock([pt.TealOp(None, pt.Op.int, 1)])
+    block.setTrueBlock(branch1)
+    block.setFalseBlock(inner)
+
+    mergeTailBlocks(block, end)
+
+    # blocks that do not exit are merged when their ops and successors are the same
+    assert block.trueBlock is branch1
+    assert inner.trueBlock is branch1
+    # the same ops with successors in a different order are kept apart
+    assert inner.falseBlock is other
+
+
+def test_layout_program():
+    program = pt.Cond(
+        [pt.Txn.application_id() == pt.Int(0), pt.Approve()],
+        [pt.Txn.on_completion() == pt.OnComplete.NoOp, pt.Approve()],
+        [
+            pt.Txn.on_completion() == pt.OnComplete.OptIn,
+            pt.Seq(pt.Log(pt.Bytes("hi")), pt.Approve()),
+        ],
+    )
+
+    teal = (
+        pt.Compilation(
+            program,
+            pt.Mode.Application,
+            version=8,
+            optimize=pt.OptimizeOptions(layout_blocks=True),
+        )
+        .compile()
+        .teal
+    )
+    lines = teal.splitlines()
+    assert lines.count("return") == 2
+    assert lines.count("err") == 1
+    assert lines[-1] == "err"
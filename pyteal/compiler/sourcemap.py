@@ -1,11 +1,22 @@
+from array import array
 import bisect
 from collections import defaultdict
 from dataclasses import dataclass, field
 from difflib import unified_diff
-from functools import partial
+from functools import cached_property, partial
 from itertools import count
 import re
-from typing import Any, Final, Literal, Mapping, OrderedDict, TypedDict, cast
+from typing import (
+    IO,
+    Any,
+    Final,
+    Iterator,
+    Literal,
+    Mapping,
+    OrderedDict,
+    TypedDict,
+    cast,
+)
 
 from tabulate import tabulate  # type: ignore
 
@@ -29,45 +40,84 @@ from pyteal.util import algod_with_assertion
 #
 # ###
 
-_b64chars = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
-_b64table = [-1] * (max(_b64chars) + 1)
-for i, b in enumerate(_b64chars):
-    _b64table[b] = i
-
 shiftsize, flag, mask = 5, 1 << 5, (1 << 5) - 1
 
+# lookup tables from base64 characters to digits and back
+_b64digits: Final[str] = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+)
+_b64values: Final[dict[str, int]] = {c: i for i, c in enumerate(_b64digits)}
+# the values of the characters that are complete VLQ values on their own
+_b64singles: Final[dict[str, int]] = {
+    c: -(i >> 1) if i & 1 else i >> 1 for c, i in _b64values.items() if not i & flag
+}
+
+
+def _base64vlq_encode_value(v: int) -> str:
+    # add sign bit
+    v = (abs(v) << 1) | int(v < 0)
+    digits = []
+    while True:
+        toencode, v = v & mask, v >> shiftsize
+        digits.append(_b64digits[toencode | (v and flag)])
+        if not v:
+            return "".join(digits)
+
+
+# the encodings of all values of at most 2 VLQ digits, which covers almost all deltas
+_VLQ_TABLE_BOUND: Final[int] = (1 << (2 * shiftsize - 1)) - 1
+_b64vlq_table: Final[list[str]] = [
+    _base64vlq_encode_value(v) for v in range(-_VLQ_TABLE_BOUND, _VLQ_TABLE_BOUND + 1)
+]
+
 
 def _base64vlq_decode(vlqval: str) -> list[int]:
     """Decode Base64 VLQ value"""
     results = []
     shift = value = 0
-    # use byte values and a table to go from base64 characters to integers
-    for v in map(_b64table.__getitem__, vlqval.encode("ascii")):
-        v = cast(int, v)
+    # use a table to go from base64 characters to integers
+    for v in map(_b64values.__getitem__, vlqval):
         value += (v & mask) << shift
         if v & flag:
             shift += shiftsize
             continue
         # determine sign and add to results
-        results.append((value >> 1) * (-1 if value & 1 else 1))
+        results.append(-(value >> 1) if value & 1 else value >> 1)
         shift = value = 0
     return results
 
 
 def _base64vlq_encode(*values: int) -> str:
     """Encode integers to a VLQ value"""
-    results: list[int] = []
-    add = results.append
-    for v in values:
-        # add sign bit
-        v = (abs(v) << 1) | int(v < 0)
-        while True:
-            toencode, v = v & mask, v >> shiftsize
-            add(toencode | (v and flag))
-            if not v:
-                break
-    # TODO: latest version of gist avoids the decode() step
-    return bytes(map(_b64chars.__getitem__, results)).decode()
+    table, bound = _b64vlq_table, _VLQ_TABLE_BOUND
+    return "".join(
+        [
+            table[v + bound] if -bound <= v <= bound else _base64vlq_encode_value(v)
+            for v in values
+        ]
+    )
+
+
+def _base64vlq_decode_mappings(
+    mappings: str,
+) -> Iterator[tuple[int, tuple[int, ...]]]:
+    """Decode the segments of an R3 :code:`mappings` string one at a time.
+
+    Yields the generated line of each segment along with its VLQ decoded fields. As the
+    same segments recur throughout a source map, each distinct segment is decoded once.
+    """
+    decoded: dict[str, tuple[int, ...]] = {}
+    for gline, vlqs in enumerate(mappings.split(";")):
+        if not vlqs:
+            continue
+        for vlq in vlqs.split(","):
+            if (fields := decoded.get(vlq)) is None:
+                try:
+                    fields = tuple(map(_b64singles.__getitem__, vlq))
+                except KeyError:
+                    fields = tuple(_base64vlq_decode(vlq))
+                decoded[vlq] = fields
+            yield gline, fields
 
 
 class autoindex(defaultdict):
@@ -84,12 +134,15 @@ class R3SourceMapping:
     source_line: int | None = None
     source_column: int | None = None
     source_content: list[str] | None = None
-    source_extract: str | None = None
-    target_extract: str | None = None
+    # explicitly given extracts, otherwise they are computed from the content lines, see
+    # source_extract and target_extract
+    _source_extract: str | None = field(default=None, repr=False)
+    _target_extract: str | None = field(default=None, repr=False)
     name: str | None = None
     source_line_end: int | None = None
     source_column_end: int | None = None
     column_end: int | None = None
+    target_content: list[str] | None = field(default=None, compare=False)
 
     def __post_init__(self):
         if self.source is not None and (
@@ -103,6 +156,37 @@ class R3SourceMapping:
                 "Invalid source mapping; name entry without source location info"
             )
 
+    @property
+    def source_extract(self) -> str | None:
+        """The source code of the mapping, computed from source_content unless it was given"""
+        if self._source_extract is not None:
+            return self._source_extract
+        if self.source_line is None or self.source_column is None:
+            return None
+        return self.extract_window(
+            self.source_content,
+            self.source_line,
+            self.source_column,
+            self.source_column_end,
+        )
+
+    @source_extract.setter
+    def source_extract(self, extract: str | None) -> None:
+        self._source_extract = extract
+
+    @property
+    def target_extract(self) -> str | None:
+        """The target code of the mapping, computed from target_content unless it was given"""
+        if self._target_extract is not None:
+            return self._target_extract
+        return self.extract_window(
+            self.target_content, self.line, self.column, self.column_end
+        )
+
+    @target_extract.setter
+    def target_extract(self, extract: str | None) -> None:
+        self._target_extract = extract
+
     def __lt__(self, other: "R3SourceMapping") -> bool:
         assert isinstance(other, type(self)), f"received incomparable {type(other)}"
 
@@ -168,6 +252,213 @@ class R3SourceMapJSON(TypedDict, total=False):
     mappings: str
 
 
+# line, column, source, source line, source column, name and source content of a mapping
+_R3Segment = tuple[
+    int, int, str | None, int | None, int | None, str | None, list[str] | None
+]
+
+
+class _R3Entries(Mapping[tuple[int, int], R3SourceMapping]):
+    """
+    The entries of an :any:`R3SourceMap` decoded from JSON.
+
+    The decoded segments are kept in parallel arrays, and each :any:`R3SourceMapping`
+    is only built the first time it is looked up. It is kept from then on, so that
+    changes made to it are not lost.
+    """
+
+    _NONE: Final[int] = -1
+
+    def __init__(
+        self,
+        sources: list[str],
+        names: list[str] | None,
+        target_content: list[str] | None,
+        source_contents: list[list[str] | None],
+    ):
+        self.sources: Final = sources
+        self.names: Final = names
+        self.target_content: Final = target_content
+        self.source_contents: Final = source_contents
+
+        self.lines = array("i")
+        self.columns = array("i")
+        self.column_ends = array("i")
+        self.source_ids = array("i")
+        self.source_lines = array("i")
+        self.source_columns = array("i")
+        self.source_column_ends = array("i")
+        self.name_ids = array("i")
+
+        self._positions: dict[tuple[int, int], int] | None = None
+        self._built: dict[int, R3SourceMapping] = {}
+
+    @classmethod
+    def decode(
+        cls,
+        mappings: str,
+        sources: list[str],
+        names: list[str] | None,
+        target_content: list[str] | None,
+        source_contents: list[list[str] | None],
+    ) -> tuple["_R3Entries", list[tuple[int, ...]]]:
+        """Decode an R3 :code:`mappings` string into entries and their column index"""
+        entries = cls(sources, names, target_content, source_contents)
+        index: list[tuple[int, ...]] = [()] * (mappings.count(";") + 1)
+        line_columns: list[int] = []
+        add_line, add_column = entries.lines.append, entries.columns.append
+        add_source, add_name = entries.source_ids.append, entries.name_ids.append
+        add_source_line = entries.source_lines.append
+        add_source_column = entries.source_columns.append
+
+        spos = npos = sline = scol = 0
+        prev_gline = gcol = 0
+        for gline, (gcd, *ref) in _base64vlq_decode_mappings(mappings):
+            if gline != prev_gline:
+                index[prev_gline] = tuple(line_columns)
+                prev_gline, gcol, line_columns = gline, 0, []
+            gcol += gcd
+            add_line(gline)
+            add_column(gcol)
+            line_columns.append(gcol)
+            if len(ref) < 3:
+                add_source(cls._NONE)
+                add_source_line(0)
+                add_source_column(0)
+                add_name(cls._NONE)
+                continue
+
+            sd, sld, scd, *namedelta = ref
+            spos, sline, scol = spos + sd, sline + sld, scol + scd
+            add_source(spos)
+            add_source_line(sline)
+            add_source_column(scol)
+            if namedelta and names:
+                npos += namedelta[0]
+                add_name(npos)
+            else:
+                add_name(cls._NONE)
+
+        entries.column_ends = array("i", [cls._NONE]) * len(entries)
+        entries.source_column_ends = array("i", [cls._NONE]) * len(entries)
+        index[prev_gline] = tuple(line_columns)
+        return entries, index
+
+    def add_right_bounds(self, with_sources: bool) -> None:
+        """The equivalent of :any:`R3SourceMap.add_right_bounds`, before any entry is built"""
+        assert not self._built, "right bounds must be added before entries are built"
+        lines, columns = self.lines, self.columns
+        source_ids, source_lines = self.source_ids, self.source_lines
+        source_columns = self.source_columns
+        for i in range(len(self) - 1):
+            j = i + 1
+            if lines[i] != lines[j] or columns[i] >= columns[j]:
+                continue
+            self.column_ends[i] = columns[j]
+
+            if (
+                with_sources
+                and self._source(j)
+                and source_ids[i] == source_ids[j]
+                and source_lines[i] == source_lines[j]
+                and source_columns[i] < source_columns[j]
+            ):
+                self.source_column_ends[i] = source_columns[j]
+
+    def _optional(self, values: array, i: int) -> int | None:
+        return None if (value := values[i]) == self._NONE else value
+
+    def _source(self, i: int) -> str | None:
+        spos = self.source_ids[i]
+        return self.sources[spos] if 0 <= spos < len(self.sources) else None
+
+    def _source_content(self, i: int) -> list[str] | None:
+        spos = self.source_ids[i]
+        return (
+            self.source_contents[spos]
+            if 0 <= spos < len(self.source_contents)
+            else None
+        )
+
+    def _name(self, i: int) -> str | None:
+        npos = self.name_ids[i]
+        return None if npos == self._NONE else cast(list[str], self.names)[npos]
+
+    def mapping(self, i: int) -> R3SourceMapping:
+        """The i'th entry, built on first access"""
+        if (mapping := self._built.get(i)) is not None:
+            return mapping
+
+        # the extracts are windows of the content lines, computed when accessed
+        column_end = self._optional(self.column_ends, i)
+        if self.source_ids[i] == self._NONE:
+            # only bounded segments without a source have a target extract
+            mapping = R3SourceMapping(
+                line=self.lines[i],
+                column=self.columns[i],
+                column_end=column_end,
+                target_content=None if column_end is None else self.target_content,
+            )
+        else:
+            mapping = R3SourceMapping(
+                line=self.lines[i],
+                column=self.columns[i],
+                column_end=column_end,
+                target_content=self.target_content,
+                source=self._source(i),
+                source_line=self.source_lines[i],
+                source_column=self.source_columns[i],
+                source_column_end=self._optional(self.source_column_ends, i),
+                source_content=self._source_content(i),
+                name=self._name(i),
+            )
+        self._built[i] = mapping
+        return mapping
+
+    def segments(self) -> Iterator[_R3Segment]:
+        """The fields that :any:`R3SourceMap.to_json` encodes, without building entries"""
+        for i, (line, column) in enumerate(zip(self.lines, self.columns)):
+            if (mapping := self._built.get(i)) is not None:
+                yield _segment(line, column, mapping)
+            elif self.source_ids[i] == self._NONE:
+                yield line, column, None, None, None, None, None
+            else:
+                yield (
+                    line,
+                    column,
+                    self._source(i),
+                    self.source_lines[i],
+                    self.source_columns[i],
+                    self._name(i),
+                    self._source_content(i),
+                )
+
+    def __getitem__(self, key: tuple[int, int]) -> R3SourceMapping:
+        if self._positions is None:
+            self._positions = {
+                position: i for i, position in enumerate(zip(self.lines, self.columns))
+            }
+        return self.mapping(self._positions[key])
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.lines, self.columns)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+
+def _segment(line: int, column: int, mapping: R3SourceMapping) -> _R3Segment:
+    return (
+        line,
+        column,
+        mapping.source,
+        mapping.source_line,
+        mapping.source_column,
+        mapping.name,
+        mapping.source_content,
+    )
+
+
 @dataclass(frozen=True)
 class R3SourceMap:
     """
@@ -181,6 +472,7 @@ class R3SourceMap:
     - :code:`from_json` - accepting new params :code:`sources_override`, :code:`sources_content_override`, :code:`target`, :code:`add_right_bounds`
     - :code:`add_right_bounds` (new) - allow specifying the right column bounds
     - :code:`to_json` - accepting new param :code:`with_contents`
+    - :code:`from_json` only builds each :any:`R3SourceMapping` when it is accessed, and the source and target extracts of mappings are only computed when they are accessed
 
     The main methods for this class are :code:`from_json` and :code:`to_json` which
     follow the encoding conventions outlined in
@@ -196,12 +488,16 @@ class R3SourceMap:
     source_files_lines: list[list[str] | None] | None = None
 
     def __post_init__(self):
-        entries = list(self.entries.values())
-        for i, entry in enumerate(entries):
-            if i + 1 >= len(entries):
-                return
-
-            if entry >= entries[i + 1]:
+        # decoded entries are keyed by their positions, so they need not be built
+        positions = (
+            list(self.entries)
+            if isinstance(self.entries, _R3Entries)
+            else [(entry.line, entry.column) for entry in self.entries.values()]
+        )
+        for i in range(len(positions) - 1):
+            if positions[i] >= positions[i + 1]:
+                entries = list(self.entries.values())
+                entry = entries[i]
                 raise TypeError(
                     f"Invalid source map as entries aren't properly ordered: entries[{i}] = {entry} >= entries[{i + 1}] = {entries[i + 1]}"
                 )
@@ -242,9 +538,6 @@ class R3SourceMap:
         """
         if smap.get("version") != 3:
             raise ValueError("Only version 3 sourcemaps are supported ")
-        entries: dict[tuple[int, int], R3SourceMapping] = {}
-        index: list[list[int]] = []
-        spos = npos = sline = scol = 0
 
         sources = smap.get("sources")
         if sources and sources_override:
@@ -265,67 +558,36 @@ class R3SourceMap:
             [c.splitlines() if c else None for c in contents],
         )
 
+        entries: Mapping[tuple[int, int], R3SourceMapping] = {}
+        index: list[tuple[int, ...]] = []
         if "mappings" in smap:
-            for gline, vlqs in enumerate(smap["mappings"].split(";")):
-                index += [[]]
-                if not vlqs:
-                    continue
-                gcol = 0
-                for gcd, *ref in map(_base64vlq_decode, vlqs.split(",")):
-                    gcol += gcd
-                    kwargs = {}
-                    if len(ref) >= 3:
-                        sd, sld, scd, *namedelta = ref
-                        spos, sline, scol = spos + sd, sline + sld, scol + scd
-                        scont = sp_conts[spos] if len(sp_conts) > spos else None  # type: ignore
-                        # extract the referenced source till the end of the current line
-                        extract = R3SourceMapping.extract_window
-                        kwargs = {
-                            "source": sources[spos] if spos < len(sources) else None,
-                            "source_line": sline,
-                            "source_column": scol,
-                            "source_content": scont,
-                            "source_extract": extract(scont, sline, scol, None),
-                            "target_extract": extract(tcont, gline, gcol, None),
-                        }
-                        if namedelta and names:
-                            npos += namedelta[0]
-                            kwargs["name"] = names[npos]
-                    entries[gline, gcol] = R3SourceMapping(
-                        line=gline, column=gcol, **kwargs  # type: ignore
-                    )
-                    index[gline].append(gcol)
+            entries, index = _R3Entries.decode(
+                smap["mappings"], sources, names, tcont, sp_conts
+            )
+            if add_right_bounds:
+                entries.add_right_bounds(bool(sources and sp_conts))
 
-        sourcemap = cls(
+        return cls(
             smap.get("file"),
             smap.get("sourceRoot"),
             entries,
-            [tuple(cs) for cs in index],
+            index,
             tcont,
             sources,
             sp_conts,
         )
-        if add_right_bounds:
-            sourcemap.add_right_bounds()
-        return sourcemap
 
     def add_right_bounds(self) -> None:
-        entries = list(self.entries.values())
-        for i, entry in enumerate(entries):
-            if i + 1 >= len(entries):
-                continue
-
-            next_entry = entries[i + 1]
-
-            def same_line_less_than(lc, nlc):
-                return (lc[0], lc[1]) == (nlc[0], nlc[1]) and lc[2] < nlc[2]
+        def same_line_less_than(lc, nlc):
+            return (lc[0], lc[1]) == (nlc[0], nlc[1]) and lc[2] < nlc[2]
 
+        entries = list(self.entries.values())
+        for entry, next_entry in zip(entries, entries[1:]):
             if not same_line_less_than(entry.location(), next_entry.location()):
                 continue
             entry.column_end = next_entry.column
-            entry.target_extract = entry.extract_window(
-                self.file_lines, entry.line, entry.column, entry.column_end
-            )
+            # the extracts are recomputed from the lines with the new bounds on access
+            entry.target_content, entry.target_extract = self.file_lines, None
 
             if not all(
                 [
@@ -349,54 +611,68 @@ class R3SourceMap:
                 and isinstance(entry.source_line, int)
                 and isinstance(entry.source_column, int)
             ):
-                entry.source_extract = entry.extract_window(
-                    self.source_files_lines[fidx],
-                    entry.source_line,
-                    entry.source_column,
-                    next_entry.source_column,
-                )
+                entry.source_content = self.source_files_lines[fidx]
+                entry.source_extract = None
+
+    def _segments(self) -> Iterator[_R3Segment]:
+        if isinstance(self.entries, _R3Entries):
+            yield from self.entries.segments()
+            return
+
+        for gline, cols in enumerate(self.index):
+            for col in cols:
+                yield _segment(gline, col, self.entries[gline, col])
 
     def to_json(self, with_contents: bool = False) -> R3SourceMapJSON:
         content: list[str | None] = []
-        mappings: list[str] = []
         sources, names = autoindex(), autoindex()
-        entries = self.entries
+        # each distinct segment is only encoded once
+        encoded_segments: dict[tuple[int, ...], str] = {}
+        mappings: list[str] = []
+        add = mappings.append
         spos = sline = scol = npos = 0
-        for gline, cols in enumerate(self.index):
-            gcol = 0
-            mapping = []
-            for col in cols:
-                entry = entries[gline, col]
-                ds, gcol = [col - gcol], col
-
-                if entry.source is not None:
-                    assert entry.source_line is not None
-                    assert entry.source_column is not None
-                    ds += (
-                        sources[entry.source] - spos,
-                        entry.source_line - sline,
-                        entry.source_column - scol,
-                    )
-                    spos, sline, scol = (
-                        spos + ds[1],
-                        sline + ds[2],
-                        scol + ds[3],
+        gline = gcol = 0
+        first = True
+        for segment in self._segments():
+            line, col, source, source_line, source_column, name, source_content = (
+                segment
+            )
+            if line != gline:
+                add(";" * (line - gline))
+                gline, gcol = line, 0
+            elif not first:
+                add(",")
+            first = False
+
+            ds: tuple[int, ...] = (col - gcol,)
+            gcol = col
+            if source is not None:
+                assert source_line is not None
+                assert source_column is not None
+                ds += (
+                    sources[source] - spos,
+                    source_line - sline,
+                    source_column - scol,
+                )
+                spos, sline, scol = spos + ds[1], source_line, source_column
+                if spos == len(content):
+                    content.append(
+                        "\n".join(source_content) if source_content else None
                     )
-                    if spos == len(content):
-                        c = entry.source_content
-                        content.append("\n".join(c) if c else None)
-                    if entry.name is not None:
-                        ds += (names[entry.name] - npos,)
-                        npos += ds[-1]
-                mapping.append(_base64vlq_encode(*ds))
+                if name is not None:
+                    ds += (names[name] - npos,)
+                    npos += ds[-1]
 
-            mappings.append(",".join(mapping))
+            if (vlq := encoded_segments.get(ds)) is None:
+                vlq = encoded_segments[ds] = _base64vlq_encode(*ds)
+            add(vlq)
+        add(";" * (len(self.index) - 1 - gline))
 
         encoded = {
             "version": 3,
             "sources": [s for s, _ in sorted(sources.items(), key=lambda si: si[1])],
             "names": [n for n, _ in sorted(names.items(), key=lambda ni: ni[1])],
-            "mappings": ";".join(mappings),
+            "mappings": "".join(mappings),
         }
         if with_contents:
             encoded["sourcesContent"] = content
@@ -554,11 +830,295 @@ class TealMapItem(PyTealFrame):
             source_column=self.column(),
             source_line_end=nel - 1 if (nel := self.node_end_lineno()) else None,
             source_column_end=self.node_end_col_offset(),
-            source_extract=self.hybrid_unparsed(),
-            target_extract=self.teal_line,
+            _source_extract=self.hybrid_unparsed(),
+            _target_extract=self.teal_line,
         )
 
 
+class _TealMapColumns:
+    """
+    Compact, column oriented storage of the TealMapItem's of a source map.
+
+    Each TEAL line only costs a few entries in parallel arrays: the index of its
+    component and of its PyTeal frame, whether it is a sentinel and its PC's.
+    The PyTeal file, source text, node source window, line and column boundaries
+    and status of each distinct frame are stored once in arrays of their own, with
+    strings interned. The frames themselves are not kept: each one is identified by
+    the component whose best frame it is or was inferred from, and its status.
+
+    Indexing or iterating builds TealMapItem views lazily, recovering their frames
+    from the components.
+    """
+
+    _NONE: Final[int] = -1
+
+    def __init__(self, components: list["pt.TealComponent"]):
+        self.components: Final[list["pt.TealComponent"]] = components
+        self.root: str | None = None
+
+        # per TEAL line
+        self.teal_lines: list[str] = []
+        self.component_ids = array("I")
+        self.frame_ids = array("I")
+        self.sentinels = bytearray()
+        self.pc_starts = array("I")
+        self.pcs = array("I")
+
+        # per PyTeal frame
+        self.origin_ids = array("I")
+        self.file_ids = array("I")
+        self.source_ids = array("I")
+        self.window_ids = array("I")
+        self.source_offsets = array("i")
+        self.linenos = array("i")
+        self.columns = array("i")
+        self.end_linenos = array("i")
+        self.end_columns = array("i")
+        self.status_codes = bytearray()
+
+        # interned strings
+        self.files: list[str] = []
+        self.sources: list[str] = []
+        self.windows: list[str] = []
+
+        self._frame_index: dict[tuple[int, int], int] = {}
+        self._file_index: dict[str, int] = {}
+        self._source_index: dict[str, int] = {}
+        self._window_index: dict[str, int] = {}
+
+    @classmethod
+    def _intern(cls, table: list[str], index: dict[str, int], value: str) -> int:
+        if (i := index.get(value)) is None:
+            i = index[value] = len(table)
+            table.append(value)
+        return i
+
+    @classmethod
+    def _optional(cls, value: int | None) -> int:
+        return cls._NONE if value is None else value
+
+    def _add_frame(self, frame: PyTealFrame, origin: int) -> int:
+        status = frame.status_code()
+        if (i := self._frame_index.get((origin, status))) is not None:
+            return i
+
+        if self.root is None:
+            self.root = frame.root()
+        elif self.root != frame.root():
+            raise AssertionError("inconsistent sourceRoot - aborting")
+
+        i = self._frame_index[(origin, status)] = len(self.origin_ids)
+        self.origin_ids.append(origin)
+        source, offset = frame._hybrid_w_offset()
+        window = frame.node_source_window()
+        self.file_ids.append(self._intern(self.files, self._file_index, frame.file()))
+        self.source_ids.append(self._intern(self.sources, self._source_index, source))
+        self.window_ids.append(self._intern(self.windows, self._window_index, window))
+        self.source_offsets.append(offset)
+        self.linenos.append(self._optional(frame.lineno()))
+        self.columns.append(frame.column())
+        self.end_linenos.append(self._optional(frame.node_end_lineno()))
+        self.end_columns.append(self._optional(frame.node_end_col_offset()))
+        self.status_codes.append(int(status))
+        return i
+
+    def frame(self, f: int) -> PyTealFrame:
+        """Recover the PyTeal frame with index f from the component it originates from"""
+        best = self.components[self.origin_ids[f]].stack_frames()
+        frame = best._best_frame_as_pyteal_frame()
+        if frame is None:
+            raise TealInternalError(
+                f"the best frame of component {self.origin_ids[f]} is missing"
+            )
+        status = PyTealFrameStatus(self.status_codes[f])
+        return frame if frame.status_code() == status else frame.clone(status)
+
+    def append(
+        self,
+        frame: PyTealFrame,
+        origin: int,
+        teal_line: str,
+        component_id: int,
+        pcs: list[int] | None = None,
+        is_sentinel: bool = False,
+    ) -> None:
+        self.teal_lines.append(teal_line)
+        self.component_ids.append(component_id)
+        self.frame_ids.append(self._add_frame(frame, origin))
+        self.sentinels.append(is_sentinel)
+        self.pc_starts.append(len(self.pcs))
+        self.pcs.extend(pcs or [])
+
+    def __len__(self) -> int:
+        return len(self.teal_lines)
+
+    def line_pcs(self, i: int) -> list[int]:
+        end = self.pc_starts[i + 1] if i + 1 < len(self) else len(self.pcs)
+        return list(self.pcs[self.pc_starts[i] : end])
+
+    def __getitem__(self, i: int) -> "TealMapItem":
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+
+        return self._item(i, self.frame(self.frame_ids[i]))
+
+    def __iter__(self) -> Iterator["TealMapItem"]:
+        frames: dict[int, PyTealFrame] = {}
+        for i in range(len(self)):
+            f = self.frame_ids[i]
+            if (frame := frames.get(f)) is None:
+                frame = frames[f] = self.frame(f)
+            yield self._item(i, frame)
+
+    def _item(self, i: int, frame: PyTealFrame) -> "TealMapItem":
+        return TealMapItem(
+            pt_frame=frame,
+            teal_lineno=i + 1,
+            teal_line=self.teal_lines[i],
+            teal_component=self.components[self.component_ids[i]],
+            pcs=self.line_pcs(i),
+            is_sentinel=bool(self.sentinels[i]),
+        )
+
+    def source_mapping(self, i: int) -> "R3SourceMapping":
+        """The equivalent of TealMapItem.source_mapping(), computed from the columns alone"""
+        f = self.frame_ids[i]
+        if (lineno := self.linenos[f]) == self._NONE:
+            raise ValueError("unable to export without valid target PyTEAL line number")
+
+        end_lineno, end_column = self.end_linenos[f], self.end_columns[f]
+        teal_line = self.teal_lines[i]
+        return R3SourceMapping(
+            line=i,
+            column=0,
+            column_end=len(teal_line),
+            source=self.files[self.file_ids[f]],
+            source_line=lineno - 1,
+            source_column=self.columns[f],
+            source_line_end=None if end_lineno == self._NONE else end_lineno - 1,
+            source_column_end=None if end_column == self._NONE else end_column,
+            _source_extract=self.sources[self.source_ids[f]],
+            _target_extract=teal_line,
+        )
+
+
+def _spans(values: list[int]) -> list[tuple[int, int]]:
+    """Merge sorted, distinct values into the inclusive spans of consecutive values"""
+    spans: list[tuple[int, int]] = []
+    for value in values:
+        if spans and spans[-1][1] + 1 == value:
+            spans[-1] = (spans[-1][0], value)
+        else:
+            spans.append((value, value))
+    return spans
+
+
+class _SourceIndex:
+    """
+    An interval index from the PyTeal source ranges of a source map to the TEAL lines
+    that they generated.
+
+    The source ranges of each file are sorted by their start and laid out as an implicit
+    balanced search tree, where each node also holds the largest end position in its
+    subtree. So finding all the ranges that overlap a query takes O(log n + k) steps for
+    k results.
+    """
+
+    # source positions are encoded as line * _LINE_WIDTH + column
+    _LINE_WIDTH: Final[int] = 1 << 32
+
+    def __init__(self, r3_sourcemap: R3SourceMap):
+        ranges: dict[str, list[tuple[int, int, int]]] = defaultdict(list)
+        for entry in r3_sourcemap.entries.values():
+            if entry.source is None or entry.source_line is None:
+                continue
+            start = self._position(entry.source_line, entry.source_column or 0)
+            end_line = (
+                entry.source_line
+                if entry.source_line_end is None
+                else entry.source_line_end
+            )
+            end = (
+                self._position(end_line + 1, 0)
+                if entry.source_column_end is None
+                else self._position(end_line, entry.source_column_end)
+            )
+            ranges[entry.source].append((start, max(end, start + 1), entry.line))
+
+        self.starts: dict[str, list[int]] = {}
+        self.ends: dict[str, list[int]] = {}
+        self.lines: dict[str, list[int]] = {}
+        self.max_ends: dict[str, list[int]] = {}
+        for source, source_ranges in ranges.items():
+            source_ranges.sort()
+            self.starts[source] = [start for start, _, _ in source_ranges]
+            self.ends[source] = ends = [end for _, end, _ in source_ranges]
+            self.lines[source] = [line for _, _, line in source_ranges]
+            self.max_ends[source] = max_ends = list(ends)
+            self._build(max_ends, 0, len(ends))
+
+    @classmethod
+    def _position(cls, line: int, column: int) -> int:
+        return line * cls._LINE_WIDTH + column
+
+    @classmethod
+    def _build(cls, max_ends: list[int], lo: int, hi: int) -> int:
+        """Set the largest end of the subtree over [lo, hi), rooted at its midpoint"""
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        max_ends[mid] = max(
+            max_ends[mid],
+            cls._build(max_ends, lo, mid),
+            cls._build(max_ends, mid + 1, hi),
+        )
+        return max_ends[mid]
+
+    def teal_lines(
+        self,
+        source: str,
+        line: int,
+        column: int,
+        end_line: int,
+        end_column: int | None,
+    ) -> list[int]:
+        """
+        The sorted, 0-based TEAL lines generated by the source ranges of the given file
+        that overlap the given 0-based source range. A missing end column extends the
+        range to the end of its line.
+        """
+        if not (starts := self.starts.get(source)):
+            return []
+        ends, lines = self.ends[source], self.lines[source]
+        max_ends = self.max_ends[source]
+        query_start = self._position(line, column)
+        query_end = (
+            self._position(end_line + 1, 0)
+            if end_column is None
+            else self._position(end_line, end_column)
+        )
+
+        found: set[int] = set()
+        subtrees = [(0, len(starts))]
+        while subtrees:
+            lo, hi = subtrees.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # no range in this subtree ends after the query starts
+            if max_ends[mid] <= query_start:
+                continue
+            subtrees.append((lo, mid))
+            # the ranges from the midpoint on start no earlier than it
+            if starts[mid] < query_end:
+                if ends[mid] > query_start:
+                    found.add(lines[mid])
+                subtrees.append((mid + 1, hi))
+        return sorted(found)
+
+
 @dataclass(frozen=True)
 class PyTealSourceMap:
     """
@@ -578,6 +1138,85 @@ class PyTealSourceMap:
     pc_sourcemap: PCSourceMap | None
     annotated_teal: str | None
 
+    @cached_property
+    def _source_index(self) -> _SourceIndex:
+        if self.r3_sourcemap is None:
+            raise ValueError("cannot look up source lines without an R3 source map")
+        return _SourceIndex(self.r3_sourcemap)
+
+    def _teal_lines(
+        self,
+        source: str,
+        line: int,
+        end_line: int | None,
+        column: int,
+        end_column: int | None,
+    ) -> list[int]:
+        return self._source_index.teal_lines(
+            source,
+            line - 1,
+            column,
+            (line if end_line is None else end_line) - 1,
+            end_column,
+        )
+
+    def teal_line_spans(
+        self,
+        source: str,
+        line: int,
+        end_line: int | None = None,
+        column: int = 0,
+        end_column: int | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Get the TEAL lines generated by a range of PyTeal source code.
+
+        The source ranges of the map are indexed the first time this is called, after which
+        each lookup takes time logarithmic in the size of the map.
+
+        Args:
+            source: The path of the PyTeal file, as listed in the :code:`sources` of the R3 source map.
+            line: The line that the range starts at, counting from 1.
+            end_line (optional): The line that the range ends at. Defaults to :code:`line`.
+            column (optional): The column that the range starts at, counting from 0. Defaults to 0.
+            end_column (optional): The column before which the range ends. Defaults to the end of :code:`end_line`.
+
+        Returns:
+            The inclusive spans of consecutive TEAL line numbers, counting from 1, that were generated
+            by PyTeal expressions overlapping the range.
+        """
+        return _spans(
+            [
+                teal_line + 1
+                for teal_line in self._teal_lines(
+                    source, line, end_line, column, end_column
+                )
+            ]
+        )
+
+    def pc_spans(
+        self,
+        source: str,
+        line: int,
+        end_line: int | None = None,
+        column: int = 0,
+        end_column: int | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Get the program counters of the bytecode generated by a range of PyTeal source code.
+
+        Takes the same arguments as :any:`teal_line_spans`, and requires a source map built with PC's.
+
+        Returns:
+            The inclusive spans of consecutive program counters.
+        """
+        if (pcsm := self.pc_sourcemap) is None:
+            raise ValueError("cannot look up PC's in a source map built without them")
+        teal_lines = self._teal_lines(source, line, end_line, column, end_column)
+        return _spans(
+            sorted({pc for tl in teal_lines for pc in pcsm.line_to_pc.get(tl, [])})
+        )
+
 
 PyTealSourceMap.__module__ = "pyteal"
 
@@ -722,7 +1361,7 @@ class _PyTealSourceMapper:
         self._best_frames: list[PyTealFrame | None] = []
         self._cached_r3sourcemap: R3SourceMap | None = None
 
-        self._cached_tmis: list[TealMapItem] = []
+        self._cached_tmis: _TealMapColumns = _TealMapColumns(components)
         self._cached_pc_sourcemap: PCSourceMap | None = None
 
         self._most_recent_omit_headers: bool | None = None
@@ -827,10 +1466,11 @@ class _PyTealSourceMapper:
         ), "Abort source mapping as even the very first best frame is missing"
 
         # PASS II. Attempt to fill any "gaps" by inferring from adjacent BFC's
-        self._best_frames, inferred = self._infer(self._best_frames)
+        self._best_frames, inferred, origins = self._infer(self._best_frames)
         if inferred:
             self._inferred_frames_at = inferred
 
+        self._cached_tmis = _TealMapColumns(self.components)
         lineno = 1
         for i, best_frame in enumerate(self._best_frames):
             teal_chunk = self.teal_chunks[i]
@@ -840,14 +1480,12 @@ class _PyTealSourceMapper:
                 if self.include_pcs:
                     pcs = pcsm.line_to_pc.get(lineno - 1, [])
                 self._cached_tmis.append(
-                    TealMapItem(
-                        pt_frame=best_frame or sentinel_frame,
-                        teal_lineno=lineno,
-                        teal_line=line,  # type: ignore
-                        teal_component=self.components[i],
-                        pcs=pcs,
-                        is_sentinel=(best_frame is None),
-                    )
+                    best_frame or sentinel_frame,
+                    origins[i] if best_frame else 0,
+                    line,
+                    i,
+                    pcs=pcs,
+                    is_sentinel=(best_frame is None),
                 )
                 lineno += 1
 
@@ -883,7 +1521,8 @@ class _PyTealSourceMapper:
                     f"TealMapItem's don't match R3SourceMap.file_lines at index {i}. ('{tmi_line}' v. '{target_line}')"
                 )
 
-        for tmi in self._cached_tmis:
+        for i in range(len(self._cached_tmis)):
+            tmi = self._cached_tmis[i]
             if not tmi.is_sentinel:
                 continue
             print(
@@ -894,14 +1533,11 @@ WARNING: Source mapping is unknown for the following:
             )
 
     def _build_r3sourcemap(self):
-        assert self._cached_tmis, "Unexpected error: no cached TealMapItems found"
-
-        root = self._cached_tmis[0].root()
-        assert all(
-            root == tmi.root() for tmi in self._cached_tmis
-        ), "inconsistent sourceRoot - aborting"
+        tmis = self._cached_tmis
+        assert tmis, "Unexpected error: no cached TealMapItems found"
 
-        r3sms = [tmi.source_mapping() for tmi in self._cached_tmis]
+        root = tmis.root
+        r3sms = [tmis.source_mapping(i) for i in range(len(tmis))]
         entries = {(r3sm.line, r3sm.column): r3sm for r3sm in r3sms}
         lines = [cast(str, r3sm.target_extract) for r3sm in r3sms]
 
@@ -916,10 +1552,7 @@ WARNING: Source mapping is unknown for the following:
             prev_line = line
 
         index: list[tuple[int, ...]] = [tuple(cs) for cs in index_l]
-        sources = []
-        for tmi in self._cached_tmis:
-            if (f := tmi.file()) not in sources:
-                sources.append(f)
+        sources = list(tmis.files)
 
         self._cached_r3sourcemap = R3SourceMap(
             filename=self.teal_filename,
@@ -952,7 +1585,7 @@ WARNING: Source mapping is unknown for the following:
 
     def as_list(self) -> list[TealMapItem]:
         self.build()
-        return self._cached_tmis
+        return list(self._cached_tmis)
 
     def as_r3sourcemap(self) -> R3SourceMap | None:
         self.build()
@@ -961,10 +1594,17 @@ WARNING: Source mapping is unknown for the following:
     @classmethod
     def _infer(
         cls, best_frames: list[PyTealFrame | None]
-    ) -> tuple[list[PyTealFrame | None], list[int]]:
+    ) -> tuple[list[PyTealFrame | None], list[int], list[int]]:
+        """
+        Patch the compiler generated best frames from their neighbors.
+
+        Returns the patched frames, the indices of the patched frames, and for each frame the index
+        of the best frame it was originally taken from.
+        """
         inferred = []
         frames = list(best_frames)
         N = len(frames)
+        origins = list(range(N))
 
         def infer_source(i: int) -> PyTealFrame | None:
             frame = frames[i]
@@ -1010,8 +1650,15 @@ WARNING: Source mapping is unknown for the following:
                 if ptf_or_none:
                     inferred.append(i)
                     frames[i] = ptf_or_none
+                    if ptf_or_none.status_code() in (
+                        PyTealFrameStatus.PATCHED_BY_PREV,
+                        PyTealFrameStatus.PATCHED_BY_PREV_AND_NEXT,
+                    ):
+                        origins[i] = origins[i - 1]
+                    else:
+                        origins[i] = i + 1
 
-        return frames, inferred
+        return frames, inferred, origins
 
     def pure_teal(self) -> str:
         return "\n".join(tmi.teal_line for tmi in self.as_list())
@@ -1286,33 +1933,116 @@ WARNING: Source mapping is unknown for the following:
                 "_cached_r3sourcemap.file_lines not available but should be"
             )
 
-        teal_col = "// GENERATED TEAL"
-        comment_col = "_1"
-        kwargs = dict(
-            tablefmt="plain",
-            omit_headers=omit_headers,
-            omit_repeating_col_except=[teal_col, comment_col],
-            numalign="left",
-            teal=teal_col,
-            const_col_2="//",
-        )
+        annotated = "\n".join(self._annotated_lines(omit_headers, concise))
 
-        if self.include_pcs:
-            kwargs["program_counters"] = "PC"
+        self._validate_annotated(omit_headers, file_lines, annotated.splitlines())
 
-        if not concise:
-            kwargs["pyteal_filename"] = "PYTEAL PATH"
-            kwargs["pyteal_line_number"] = "LINE"
+        return annotated
 
-        kwargs["pyteal_hybrid_unparsed"] = "PYTEAL"
-        kwargs["pyteal_node_ast_source_boundaries"] = "PYTEAL RANGE"
+    def write_annotated_teal(
+        self, out: IO[str], omit_headers: bool = True, concise: bool = True
+    ) -> None:
+        """
+        Write the annotated teal of annotated_teal() to a file-like object line by line,
+        without holding the whole table in memory.
 
-        kwargs["post_process_delete_cols"] = [_PYTEAL_NODE_AST_SOURCE_BOUNDARIES]
-        annotated = self.tabulate(**kwargs)  # type: ignore
+        Args:
+            out: the text stream to write to, e.g. a file opened with `open(path, "w")`
+            omit_headers (default=True): when False, a first line names each annotation column
+            concise (default=True): when False, the PyTeal file and line number columns are added
+        """
+        if not self._built():
+            raise ValueError(
+                "not ready for write_annotated_teal() because build() has yet to be called"
+            )
 
-        self._validate_annotated(omit_headers, file_lines, annotated.splitlines())
+        for line in self._annotated_lines(omit_headers, concise):
+            out.write(line + "\n")
 
-        return annotated
+    def _annotated_rows(self, concise: bool) -> Iterator[list[Any]]:
+        """
+        Generate the cells of each annotated teal line, with the repetitions omitted exactly as `tabulate(omit_repeating_col_except=...)` does.
+
+        The cells of each PyTeal frame are computed once and shared by all of its lines.
+        """
+        tmis = self._cached_tmis
+        frame_cells: dict[int, tuple[list[Any], Any, str]] = {}
+        prev: tuple[list[Any], Any, str] | None = None
+        prev_teal = ""
+        for i, teal in enumerate(tmis.teal_lines):
+            f = tmis.frame_ids[i]
+            if (cells := frame_cells.get(f)) is None:
+                lineno = tmis.linenos[f]
+                cells = frame_cells[f] = (
+                    (
+                        []
+                        if concise
+                        else [
+                            tmis.files[tmis.file_ids[f]],
+                            None if lineno == _TealMapColumns._NONE else lineno,
+                        ]
+                    ),
+                    tmis.sources[tmis.source_ids[f]],
+                    tmis.windows[tmis.window_ids[f]],
+                )
+            source_cols, hybrid, window = cells
+            pcs = tmis.line_pcs(i)
+            annotations = (
+                [f"({pcs[0]})" if pcs else ""] if self.include_pcs else []
+            ) + source_cols
+
+            if prev is None:
+                row = [teal, "//"] + annotations + [hybrid]
+            else:
+                prev_annotations, prev_hybrid, prev_window = prev
+                if window or prev_window:
+                    drop_hybrid = window == prev_window
+                else:
+                    drop_hybrid = teal != prev_teal
+                row = (
+                    [teal, "//"]
+                    + [
+                        a if a != p else None
+                        for a, p in zip(annotations, prev_annotations)
+                    ]
+                    + [hybrid if hybrid != prev_hybrid or not drop_hybrid else None]
+                )
+
+            yield row
+            prev, prev_teal = (annotations, hybrid, window), teal
+
+    @classmethod
+    def _annotated_cell(cls, value: Any) -> str:
+        # tabulate's rendering of missing values, numbers and surrounding whitespace
+        return "" if value is None else str(value).strip()
+
+    def _annotated_lines(self, omit_headers: bool, concise: bool) -> Iterator[str]:
+        """
+        Generate the lines of the annotated teal in two passes over the source map: the first
+        measures the width of each column and the second pads the cells to it.
+
+        The result is the same as tabulating with `tablefmt="plain"` and `numalign="left"`.
+        """
+        headers = ["// GENERATED TEAL", "//"]
+        if self.include_pcs:
+            headers.append("PC")
+        if not concise:
+            headers += ["PYTEAL PATH", "LINE"]
+        headers.append("PYTEAL")
+
+        # tabulate leaves a padding of 2 around the headers
+        widths = [0] * len(headers) if omit_headers else [len(h) + 2 for h in headers]
+        for row in self._annotated_rows(concise):
+            for j, value in enumerate(row):
+                widths[j] = max(widths[j], len(self._annotated_cell(value)))
+
+        def render(cells: list[str]) -> str:
+            return "  ".join(c.ljust(w) for c, w in zip(cells, widths)).rstrip()
+
+        if not omit_headers:
+            yield render(headers)
+        for row in self._annotated_rows(concise):
+            yield render([self._annotated_cell(value) for value in row])
 
     @classmethod
     def _validate_annotated(
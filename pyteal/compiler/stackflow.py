@@ -0,0 +1,254 @@
+from typing import Dict, List, Optional, Sequence, Set, Tuple, cast
+
+from pyteal.ast import SubroutineDefinition
+from pyteal.errors import TealInternalError
+from pyteal.ir import LabelReference, Op, TealComponent, TealLabel, TealOp
+from pyteal.types import TealType
+
+_U = TealType.uint64
+_A = TealType.anytype
+
+
+def _describe(stmt: TealComponent) -> str:
+    if isinstance(stmt, TealLabel):
+        return stmt.getLabelRef().getLabel()
+    return str(cast(TealOp, stmt).getOp())
+
+
+def _merge_types(first: TealType, second: TealType) -> TealType:
+    return first if first == second else _A
+
+
+class _StackState:
+    def __init__(self, subroutine: Optional[SubroutineDefinition]) -> None:
+        self.name = "main" if subroutine is None else subroutine.name()
+        self.types: List[TealType] = []
+
+    def fail(self, op: TealOp, message: str) -> None:
+        raise TealInternalError(
+            "Stack verification failed in {} at {}: {}".format(
+                self.name, _describe(op), message
+            )
+        )
+
+    def pop(self, op: TealOp, expected: Sequence[TealType]) -> List[TealType]:
+        count = len(expected)
+        if count > len(self.types):
+            self.fail(
+                op,
+                "needs {} values but the stack has {}".format(count, len(self.types)),
+            )
+        popped = self.types[len(self.types) - count :]
+        for actual, wanted in zip(popped, expected):
+            if _A not in (actual, wanted) and actual != wanted:
+                self.fail(op, "expected {} but got {}".format(wanted, actual))
+        del self.types[len(self.types) - count :]
+        return popped
+
+    def apply(self, op: TealOp) -> None:
+        kind = op.getOp()
+        if kind.pop_types is not None and kind.push_types is not None:
+            self.pop(op, kind.pop_types)
+            self.types += kind.push_types
+            return
+
+        arg = op.args[0] if len(op.args) > 0 and isinstance(op.args[0], int) else 0
+        if kind == Op.dup:
+            self.types += self.pop(op, (_A,)) * 2
+        elif kind == Op.dup2:
+            self.types += self.pop(op, (_A, _A)) * 2
+        elif kind == Op.swap:
+            self.types += reversed(self.pop(op, (_A, _A)))
+        elif kind == Op.dig:
+            values = self.pop(op, (_A,) * (arg + 1))
+            self.types += values + values[:1]
+        elif kind == Op.cover:
+            values = self.pop(op, (_A,) * (arg + 1))
+            self.types += values[-1:] + values[:-1]
+        elif kind == Op.uncover:
+            values = self.pop(op, (_A,) * (arg + 1))
+            self.types += values[1:] + values[:1]
+        elif kind == Op.bury:
+            values = self.pop(op, (_A,) * (arg + 1))
+            self.types += values[-1:] + values[1:-1]
+        elif kind == Op.dupn:
+            self.types += self.pop(op, (_A,)) * (arg + 1)
+        elif kind == Op.select:
+            first, second, _ = self.pop(op, (_A, _A, _U))
+            self.types.append(_merge_types(first, second))
+        else:
+            effect = op.stackEffect()
+            if effect is None:
+                raise TealInternalError(
+                    "Unable to verify the stack effect of {}".format(op)
+                )
+            self.pop(op, (_A,) * effect[0])
+            self.types += [_A] * effect[1]
+
+
+def _return_count(subroutine: SubroutineDefinition) -> int:
+    if subroutine.has_abi_output:
+        return 1
+    return int(subroutine.return_type != TealType.none)
+
+
+def _successors(
+    teal: List[TealComponent], i: int, positions: Dict[int, int]
+) -> List[int]:
+    stmt = teal[i]
+    if not isinstance(stmt, TealOp):
+        return [i + 1]
+    kind = stmt.getOp()
+    if kind in (Op.return_, Op.err, Op.retsub):
+        return []
+    targets = [
+        positions[id(arg)] for arg in stmt.args if isinstance(arg, LabelReference)
+    ]
+    if kind == Op.b:
+        return targets
+    return [i + 1] + targets
+
+
+def _verify_subroutine(
+    subroutine: Optional[SubroutineDefinition], teal: List[TealComponent]
+) -> Tuple[int, List[Tuple[int, SubroutineDefinition]]]:
+    """Verify the stack use of a single subroutine or the main program.
+
+    Returns:
+        The maximum stack depth reached, counting the subroutine's arguments but not calls to
+        other subroutines, and for each call, the stack depth before the call and the callee.
+    """
+    positions = {
+        id(stmt.getLabelRef()): i
+        for i, stmt in enumerate(teal)
+        if isinstance(stmt, TealLabel)
+    }
+    arguments = 0 if subroutine is None else subroutine.argument_count()
+    returns = 0 if subroutine is None else _return_count(subroutine)
+
+    states: Dict[int, List[TealType]] = {0: [_A] * arguments}
+    frame: Optional[Tuple[int, int]] = None
+    calls: Dict[int, Tuple[int, SubroutineDefinition]] = {}
+    max_depth = arguments
+    pending: List[int] = [0]
+    queued: Set[int] = {0}
+
+    while len(pending) > 0:
+        i = pending.pop()
+        queued.discard(i)
+        if i >= len(teal):
+            continue
+
+        state = _StackState(subroutine)
+        state.types = list(states[i])
+        stmt = teal[i]
+        if isinstance(stmt, TealOp):
+            kind = stmt.getOp()
+            if kind == Op.callsub:
+                callee = stmt.getSubroutines()[0]
+                calls[i] = (len(state.types), callee)
+                state.pop(stmt, (_A,) * callee.argument_count())
+                state.types += [_A] * _return_count(callee)
+            elif kind == Op.proto:
+                frame = (_int_immediate(stmt.args[0]), _int_immediate(stmt.args[1]))
+                if frame[0] > len(state.types):
+                    state.fail(stmt, "the frame has more arguments than the stack")
+            elif kind == Op.retsub:
+                expected = returns if frame is None else frame[1]
+                depth = len(state.types) - (0 if frame is None else frame[0])
+                if depth < expected or (frame is None and depth != expected):
+                    state.fail(
+                        stmt,
+                        "returns {} values but {} are on the stack".format(
+                            expected, depth
+                        ),
+                    )
+            else:
+                state.apply(stmt)
+        max_depth = max(max_depth, len(state.types))
+
+        for following in _successors(teal, i, positions):
+            previous = states.get(following)
+            if previous is None:
+                merged = list(state.types)
+            else:
+                if len(previous) != len(state.types):
+                    raise TealInternalError(
+                        "Stack verification failed in {}: branches reaching {} leave {} "
+                        "and {} values on the stack".format(
+                            state.name,
+                            (
+                                _describe(teal[following])
+                                if following < len(teal)
+                                else "the end"
+                            ),
+                            len(previous),
+                            len(state.types),
+                        )
+                    )
+                merged = [_merge_types(a, b) for a, b in zip(previous, state.types)]
+                if merged == previous:
+                    continue
+            states[following] = merged
+            if following not in queued:
+                pending.append(following)
+                queued.add(following)
+
+    return max_depth, sorted(calls.values(), key=lambda call: call[0])
+
+
+def _int_immediate(value: object) -> int:
+    if not isinstance(value, int):
+        raise TealInternalError("Expected an integer immediate, got {}".format(value))
+    return value
+
+
+def verifyStack(
+    subroutineMapping: Dict[Optional[SubroutineDefinition], List[TealComponent]],
+) -> Optional[int]:
+    """Verify the stack use of every subroutine in a program and compute its maximum stack depth.
+
+    Each subroutine is interpreted abstractly: every op must find enough values of the right type
+    on the stack, every path to a label must leave the same number of values on the stack, and
+    every :code:`retsub` must leave exactly the subroutine's return values.
+
+    Args:
+        subroutineMapping: A dictionary containing a list of TealComponents for every subroutine in
+            a program, before subroutine labels are resolved. The key None is taken to indicate the
+            main program routine.
+
+    Returns:
+        The maximum number of values on the stack when running the program, or None if it is not
+        bounded because of recursion.
+
+    Raises:
+        TealInternalError: if an op can underflow the stack or receive a value of the wrong type, or
+            if the stack depth at a label or :code:`retsub` depends on the path taken.
+    """
+    results = {
+        subroutine: _verify_subroutine(subroutine, teal)
+        for subroutine, teal in subroutineMapping.items()
+    }
+
+    totals: Dict[Optional[SubroutineDefinition], Optional[int]] = {}
+    visiting: Set[Optional[SubroutineDefinition]] = set()
+
+    def total(subroutine: Optional[SubroutineDefinition]) -> Optional[int]:
+        if subroutine in totals:
+            return totals[subroutine]
+        if subroutine in visiting:
+            return None
+        visiting.add(subroutine)
+        max_depth, calls = results[subroutine]
+        result: Optional[int] = max_depth
+        for depth, callee in calls:
+            callee_depth = total(callee)
+            if callee_depth is None or result is None:
+                result = None
+                continue
+            result = max(result, depth - callee.argument_count() + callee_depth)
+        visiting.discard(subroutine)
+        totals[subroutine] = result
+        return result
+
+    return total(None)
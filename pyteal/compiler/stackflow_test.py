@@ -0,0 +1,119 @@
+import pytest
+
+import pyteal as pt
+import pyteal.compiler.compiler
+from pyteal.compiler.stackflow import verifyStack
+
+
+def op(kind: pt.Op, *args) -> pt.TealOp:
+    return pt.TealOp(None, kind, *args)
+
+
+def test_verify_stack_depth():
+    teal = [
+        op(pt.Op.int, 1),
+        op(pt.Op.int, 2),
+        op(pt.Op.int, 3),
+        op(pt.Op.add),
+        op(pt.Op.dup),
+        op(pt.Op.uncover, 2),
+        op(pt.Op.add),
+        op(pt.Op.add),
+        op(pt.Op.return_),
+    ]
+    assert verifyStack({None: teal}) == 3
+
+
+def test_verify_stack_branches():
+    l1 = pt.LabelReference("l1")
+    l2 = pt.LabelReference("l2")
+    teal = [
+        op(pt.Op.txn, "Fee"),
+        op(pt.Op.bnz, l1),
+        op(pt.Op.byte, '"a"'),
+        op(pt.Op.b, l2),
+        pt.TealLabel(None, l1),
+        op(pt.Op.byte, '"b"'),
+        op(pt.Op.byte, '"c"'),
+        op(pt.Op.concat),
+        pt.TealLabel(None, l2),
+        op(pt.Op.len),
+    ]
+    assert verifyStack({None: teal}) == 2
+
+    # the paths reaching l2 leave a different number of values on the stack
+    teal[7:8] = []
+    with pytest.raises(pt.TealInternalError, match="branches reaching l2"):
+        verifyStack({None: teal})
+
+
+def test_verify_stack_errors():
+    with pytest.raises(pt.TealInternalError, match="needs 2 values"):
+        verifyStack({None: [op(pt.Op.int, 1), op(pt.Op.add)]})
+
+    with pytest.raises(pt.TealInternalError, match="expected TealType.bytes"):
+        verifyStack({None: [op(pt.Op.int, 1), op(pt.Op.len)]})
+
+    # the type of a value is known after moving it around on the stack
+    with pytest.raises(pt.TealInternalError, match="expected TealType.uint64"):
+        verifyStack(
+            {
+                None: [
+                    op(pt.Op.byte, '"a"'),
+                    op(pt.Op.int, 1),
+                    op(pt.Op.swap),
+                    op(pt.Op.itob),
+                ]
+            }
+        )
+
+
+def test_verify_stack_subroutines():
+    @pt.Subroutine(pt.TealType.uint64)
+    def double(x: pt.Expr) -> pt.Expr:
+        return x + x
+
+    subroutine = double.subroutine
+    teal = {
+        None: [
+            op(pt.Op.int, 1),
+            op(pt.Op.int, 2),
+            op(pt.Op.callsub, subroutine),
+            op(pt.Op.add),
+            op(pt.Op.return_),
+        ],
+        subroutine: [
+            op(pt.Op.dup),
+            op(pt.Op.dup),
+            op(pt.Op.add),
+            op(pt.Op.add),
+            op(pt.Op.retsub),
+        ],
+    }
+    # 2 values in main, one of which is the argument, then 3 in the subroutine
+    assert verifyStack(teal) == 4
+
+    teal[subroutine][3:4] = []
+    with pytest.raises(pt.TealInternalError, match="returns 1 values but 2"):
+        verifyStack(teal)
+
+    # recursion makes the stack depth unbounded
+    teal[subroutine][3:4] = [op(pt.Op.callsub, subroutine)]
+    assert verifyStack(teal) is None
+
+
+def test_compile_max_stack_depth(monkeypatch):
+    program = pt.Return(pt.Int(1) + (pt.Int(2) - (pt.Int(3) * pt.Int(4))))
+    results = pt.Compilation(program, pt.Mode.Application, version=8).compile()
+    assert results.max_stack_depth is None
+
+    results = pt.Compilation(
+        program, pt.Mode.Application, version=8, verify_stack=True
+    ).compile()
+    assert results.max_stack_depth == 4
+
+    monkeypatch.setattr(pyteal.compiler.compiler, "MAX_STACK_DEPTH", 3)
+    with pytest.warns(UserWarning, match="up to 4 stack values"):
+        pt.Compilation(
+            program, pt.Mode.Application, version=8, verify_stack=True
+        ).compile()
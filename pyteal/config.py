@@ -4,6 +4,9 @@ from algosdk.atomic_transaction_composer import ABI_RETURN_HASH
 # Maximum size of an atomic transaction group.
 MAX_GROUP_SIZE = 16
 
+# Maximum number of values on the stack.
+MAX_STACK_DEPTH = 1000
+
 # Number of scratch space slots available.
 NUM_SLOTS = 256
 
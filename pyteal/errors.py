@@ -104,6 +104,7 @@ class SourceMapDisabledError(RuntimeError):
     Cannot calculate Teal to PyTeal source map because stack frame discovery is turned off.
 
     To enable source maps: import `from feature_gates import FeatureGates` and call `FeatureGates.set_sourcemap_enabled(True)`.
+    To enable source maps for some programs only: create and compile them inside `with sourcemapping_context():`.
     """
 
     def __str__(self):
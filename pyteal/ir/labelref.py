@@ -1,4 +1,6 @@
 class LabelReference:
+    __slots__ = ("label",)
+
     def __init__(self, label: str) -> None:
         self.label = label
 
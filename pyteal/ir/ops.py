@@ -1,5 +1,12 @@
 from dataclasses import dataclass
 from enum import Enum, Flag, auto
+from typing import Optional, Tuple
+
+from pyteal.types import TealType
+
+_U = TealType.uint64
+_B = TealType.bytes
+_A = TealType.anytype
 
 
 class Mode(Flag):
@@ -17,6 +24,10 @@ class OpType:
     value: str
     mode: Mode
     min_version: int
+    pops: Optional[int] = None
+    pushes: Optional[int] = None
+    pop_types: Optional[Tuple[TealType, ...]] = None
+    push_types: Optional[Tuple[TealType, ...]] = None
 
 
 class Op(Enum):
@@ -35,190 +46,226 @@ class Op(Enum):
         """Get the minimum version where this op is available."""
         return self.value.min_version
 
+    @property
+    def pops(self) -> Optional[int]:
+        """Get the number of values this op removes from the stack.
+
+        This is None if the number depends on the op's immediate arguments, like :code:`popn`, or
+        on a subroutine, like :code:`callsub`.
+        """
+        return self.value.pops
+
+    @property
+    def pushes(self) -> Optional[int]:
+        """Get the number of values this op adds to the stack.
+
+        This is None if the number depends on the op's immediate arguments, like :code:`dupn`, or
+        on a subroutine, like :code:`callsub`.
+        """
+        return self.value.pushes
+
+    @property
+    def pop_types(self) -> Optional[Tuple[TealType, ...]]:
+        """Get the types of the values this op removes from the stack, from the bottom of the stack
+        to the top.
+
+        This is None if the types are not known, in which case the values can be of any type.
+        """
+        return self.value.pop_types
+
+    @property
+    def push_types(self) -> Optional[Tuple[TealType, ...]]:
+        """Get the types of the values this op adds to the stack, from the bottom of the stack to
+        the top.
+
+        This is None if the types are not known, in which case the values can be of any type.
+        """
+        return self.value.push_types
+
     # fmt: off
     # meta
-    comment             = OpType("//",                  Mode.Signature | Mode.Application,  0)
+    comment             = OpType("//",                  Mode.Signature | Mode.Application,  0,    0,    0)
     # avm
-    err                 = OpType("err",                 Mode.Signature | Mode.Application,  2)
-    sha256              = OpType("sha256",              Mode.Signature | Mode.Application,  2)
-    keccak256           = OpType("keccak256",           Mode.Signature | Mode.Application,  2)
-    sha512_256          = OpType("sha512_256",          Mode.Signature | Mode.Application,  2)
-    mimc                = OpType("mimc",                Mode.Signature | Mode.Application,  11)
-    ed25519verify       = OpType("ed25519verify",       Mode.Signature | Mode.Application,  2)
-    add                 = OpType("+",                   Mode.Signature | Mode.Application,  2)
-    minus               = OpType("-",                   Mode.Signature | Mode.Application,  2)
-    div                 = OpType("/",                   Mode.Signature | Mode.Application,  2)
-    mul                 = OpType("*",                   Mode.Signature | Mode.Application,  2)
-    lt                  = OpType("<",                   Mode.Signature | Mode.Application,  2)
-    gt                  = OpType(">",                   Mode.Signature | Mode.Application,  2)
-    le                  = OpType("<=",                  Mode.Signature | Mode.Application,  2)
-    ge                  = OpType(">=",                  Mode.Signature | Mode.Application,  2)
-    logic_and           = OpType("&&",                  Mode.Signature | Mode.Application,  2)
-    logic_or            = OpType("||",                  Mode.Signature | Mode.Application,  2)
-    eq                  = OpType("==",                  Mode.Signature | Mode.Application,  2)
-    neq                 = OpType("!=",                  Mode.Signature | Mode.Application,  2)
-    logic_not           = OpType("!",                   Mode.Signature | Mode.Application,  2)
-    len                 = OpType("len",                 Mode.Signature | Mode.Application,  2)
-    itob                = OpType("itob",                Mode.Signature | Mode.Application,  2)
-    btoi                = OpType("btoi",                Mode.Signature | Mode.Application,  2)
-    mod                 = OpType("%",                   Mode.Signature | Mode.Application,  2)
-    bitwise_or          = OpType("|",                   Mode.Signature | Mode.Application,  2)
-    bitwise_and         = OpType("&",                   Mode.Signature | Mode.Application,  2)
-    bitwise_xor         = OpType("^",                   Mode.Signature | Mode.Application,  2)
-    bitwise_not         = OpType("~",                   Mode.Signature | Mode.Application,  2)
-    mulw                = OpType("mulw",                Mode.Signature | Mode.Application,  2)
-    addw                = OpType("addw",                Mode.Signature | Mode.Application,  2)
-    intcblock           = OpType("intcblock",           Mode.Signature | Mode.Application,  2)
-    intc                = OpType("intc",                Mode.Signature | Mode.Application,  2)
-    intc_0              = OpType("intc_0",              Mode.Signature | Mode.Application,  2)
-    intc_1              = OpType("intc_1",              Mode.Signature | Mode.Application,  2)
-    intc_2              = OpType("intc_2",              Mode.Signature | Mode.Application,  2)
-    intc_3              = OpType("intc_3",              Mode.Signature | Mode.Application,  2)
-    int                 = OpType("int",                 Mode.Signature | Mode.Application,  2)
-    bytecblock          = OpType("bytecblock",          Mode.Signature | Mode.Application,  2)
-    bytec               = OpType("bytec",               Mode.Signature | Mode.Application,  2)
-    bytec_0             = OpType("bytec_0",             Mode.Signature | Mode.Application,  2)
-    bytec_1             = OpType("bytec_1",             Mode.Signature | Mode.Application,  2)
-    bytec_2             = OpType("bytec_2",             Mode.Signature | Mode.Application,  2)
-    bytec_3             = OpType("bytec_3",             Mode.Signature | Mode.Application,  2)
-    byte                = OpType("byte",                Mode.Signature | Mode.Application,  2)
-    addr                = OpType("addr",                Mode.Signature | Mode.Application,  2)
-    method_signature    = OpType("method",              Mode.Signature | Mode.Application,  2)
-    arg                 = OpType("arg",                 Mode.Signature,                     2)
-    txn                 = OpType("txn",                 Mode.Signature | Mode.Application,  2)
-    global_             = OpType("global",              Mode.Signature | Mode.Application,  2)
-    gtxn                = OpType("gtxn",                Mode.Signature | Mode.Application,  2)
-    load                = OpType("load",                Mode.Signature | Mode.Application,  2)
-    store               = OpType("store",               Mode.Signature | Mode.Application,  2)
-    txna                = OpType("txna",                Mode.Signature | Mode.Application,  2)
-    gtxna               = OpType("gtxna",               Mode.Signature | Mode.Application,  2)
-    bnz                 = OpType("bnz",                 Mode.Signature | Mode.Application,  2)
-    bz                  = OpType("bz",                  Mode.Signature | Mode.Application,  2)
-    b                   = OpType("b",                   Mode.Signature | Mode.Application,  2)
-    return_             = OpType("return",              Mode.Signature | Mode.Application,  2)
-    pop                 = OpType("pop",                 Mode.Signature | Mode.Application,  2)
-    dup                 = OpType("dup",                 Mode.Signature | Mode.Application,  2)
-    dup2                = OpType("dup2",                Mode.Signature | Mode.Application,  2)
-    concat              = OpType("concat",              Mode.Signature | Mode.Application,  2)
-    substring           = OpType("substring",           Mode.Signature | Mode.Application,  2)
-    substring3          = OpType("substring3",          Mode.Signature | Mode.Application,  2)
-    balance             = OpType("balance",             Mode.Application,                   2)
-    app_opted_in        = OpType("app_opted_in",        Mode.Application,                   2)
-    app_local_get       = OpType("app_local_get",       Mode.Application,                   2)
-    app_local_get_ex    = OpType("app_local_get_ex",    Mode.Application,                   2)
-    app_global_get      = OpType("app_global_get",      Mode.Application,                   2)
-    app_global_get_ex   = OpType("app_global_get_ex",   Mode.Application,                   2)
-    app_local_put       = OpType("app_local_put",       Mode.Application,                   2)
-    app_global_put      = OpType("app_global_put",      Mode.Application,                   2)
-    app_local_del       = OpType("app_local_del",       Mode.Application,                   2)
-    app_global_del      = OpType("app_global_del",      Mode.Application,                   2)
-    asset_holding_get   = OpType("asset_holding_get",   Mode.Application,                   2)
-    asset_params_get    = OpType("asset_params_get",    Mode.Application,                   2)
-    gtxns               = OpType("gtxns",               Mode.Signature | Mode.Application,  3)
-    gtxnsa              = OpType("gtxnsa",              Mode.Signature | Mode.Application,  3)
-    assert_             = OpType("assert",              Mode.Signature | Mode.Application,  3)
-    dig                 = OpType("dig",                 Mode.Signature | Mode.Application,  3)
-    swap                = OpType("swap",                Mode.Signature | Mode.Application,  3)
-    select              = OpType("select",              Mode.Signature | Mode.Application,  3)
-    getbit              = OpType("getbit",              Mode.Signature | Mode.Application,  3)
-    setbit              = OpType("setbit",              Mode.Signature | Mode.Application,  3)
-    getbyte             = OpType("getbyte",             Mode.Signature | Mode.Application,  3)
-    setbyte             = OpType("setbyte",             Mode.Signature | Mode.Application,  3)
-    min_balance         = OpType("min_balance",         Mode.Application,                   3)
-    pushbytes           = OpType("pushbytes",           Mode.Signature | Mode.Application,  3)
-    pushint             = OpType("pushint",             Mode.Signature | Mode.Application,  3)
-    shl                 = OpType("shl",                 Mode.Signature | Mode.Application,  4)
-    shr                 = OpType("shr",                 Mode.Signature | Mode.Application,  4)
-    sqrt                = OpType("sqrt",                Mode.Signature | Mode.Application,  4)
-    bitlen              = OpType("bitlen",              Mode.Signature | Mode.Application,  4)
-    exp                 = OpType("exp",                 Mode.Signature | Mode.Application,  4)
-    divmodw             = OpType("divmodw",             Mode.Signature | Mode.Application,  4)
-    expw                = OpType("expw",                Mode.Signature | Mode.Application,  4)
-    b_add               = OpType("b+",                  Mode.Signature | Mode.Application,  4)
-    b_minus             = OpType("b-",                  Mode.Signature | Mode.Application,  4)
-    b_div               = OpType("b/",                  Mode.Signature | Mode.Application,  4)
-    b_mul               = OpType("b*",                  Mode.Signature | Mode.Application,  4)
-    b_lt                = OpType("b<",                  Mode.Signature | Mode.Application,  4)
-    b_gt                = OpType("b>",                  Mode.Signature | Mode.Application,  4)
-    b_le                = OpType("b<=",                 Mode.Signature | Mode.Application,  4)
-    b_ge                = OpType("b>=",                 Mode.Signature | Mode.Application,  4)
-    b_eq                = OpType("b==",                 Mode.Signature | Mode.Application,  4)
-    b_neq               = OpType("b!=",                 Mode.Signature | Mode.Application,  4)
-    b_mod               = OpType("b%",                  Mode.Signature | Mode.Application,  4)
-    b_or                = OpType("b|",                  Mode.Signature | Mode.Application,  4)
-    b_and               = OpType("b&",                  Mode.Signature | Mode.Application,  4)
-    b_xor               = OpType("b^",                  Mode.Signature | Mode.Application,  4)
-    b_not               = OpType("b~",                  Mode.Signature | Mode.Application,  4)
-    bzero               = OpType("bzero",               Mode.Signature | Mode.Application,  4)
-    gload               = OpType("gload",               Mode.Application,                   4)
-    gloads              = OpType("gloads",              Mode.Application,                   4)
-    gaid                = OpType("gaid",                Mode.Application,                   4)
-    gaids               = OpType("gaids",               Mode.Application,                   4)
-    callsub             = OpType("callsub",             Mode.Signature | Mode.Application,  4)
-    retsub              = OpType("retsub",              Mode.Signature | Mode.Application,  4)
-    ecdsa_verify        = OpType("ecdsa_verify",        Mode.Signature | Mode.Application,  5)
-    ecdsa_pk_decompress = OpType("ecdsa_pk_decompress", Mode.Signature | Mode.Application,  5)
-    ecdsa_pk_recover    = OpType("ecdsa_pk_recover",    Mode.Signature | Mode.Application,  5)
-    loads               = OpType("loads",               Mode.Signature | Mode.Application,  5)
-    stores              = OpType("stores",              Mode.Signature | Mode.Application,  5)
-    cover               = OpType("cover",               Mode.Signature | Mode.Application,  5)
-    uncover             = OpType("uncover",             Mode.Signature | Mode.Application,  5)
-    extract             = OpType("extract",             Mode.Signature | Mode.Application,  5)
-    extract3            = OpType("extract3",            Mode.Signature | Mode.Application,  5)
-    extract_uint16      = OpType("extract_uint16",      Mode.Signature | Mode.Application,  5)
-    extract_uint32      = OpType("extract_uint32",      Mode.Signature | Mode.Application,  5)
-    extract_uint64      = OpType("extract_uint64",      Mode.Signature | Mode.Application,  5)
-    app_params_get      = OpType("app_params_get",      Mode.Application,                   5)
-    log                 = OpType("log",                 Mode.Application,                   5)
-    itxn_begin          = OpType("itxn_begin",          Mode.Application,                   5)
-    itxn_field          = OpType("itxn_field",          Mode.Application,                   5)
-    itxn_submit         = OpType("itxn_submit",         Mode.Application,                   5)
-    itxn                = OpType("itxn",                Mode.Application,                   5)
-    itxna               = OpType("itxna",               Mode.Application,                   5)
-    txnas               = OpType("txnas",               Mode.Signature | Mode.Application,  5)
-    gtxnas              = OpType("gtxnas",              Mode.Signature | Mode.Application,  5)
-    gtxnsas             = OpType("gtxnsas",             Mode.Signature | Mode.Application,  5)
-    args                = OpType("args",                Mode.Signature,                     5)
-    bsqrt               = OpType("bsqrt",               Mode.Signature | Mode.Application,  6)
-    divw                = OpType("divw",                Mode.Signature | Mode.Application,  6)
-    itxn_next           = OpType("itxn_next",           Mode.Application,                   6)
-    itxnas              = OpType("itxnas",              Mode.Application,                   6)
-    gitxn               = OpType("gitxn",               Mode.Application,                   6)
-    gitxna              = OpType("gitxna",              Mode.Application,                   6)
-    gitxnas             = OpType("gitxnas",             Mode.Application,                   6)
-    gloadss             = OpType("gloadss",             Mode.Application,                   6)
-    acct_params_get     = OpType("acct_params_get",     Mode.Application,                   6)
-    voter_params_get    = OpType("voter_params_get",    Mode.Application,                  11)
-    online_stake        = OpType("online_stake",        Mode.Application,                  11)
-    replace2            = OpType("replace2",            Mode.Signature | Mode.Application,  7)
-    replace3            = OpType("replace3",            Mode.Signature | Mode.Application,  7)
-    base64_decode       = OpType("base64_decode",       Mode.Signature | Mode.Application,  7)
-    json_ref            = OpType("json_ref",            Mode.Signature | Mode.Application,  7)
-    ed25519verify_bare  = OpType("ed25519verify_bare",  Mode.Signature | Mode.Application,  7)
-    sha3_256            = OpType("sha3_256",            Mode.Signature | Mode.Application,  7)
-    vrf_verify          = OpType("vrf_verify",          Mode.Signature | Mode.Application,  7)
-    block               = OpType("block",               Mode.Signature | Mode.Application,  7)
-    box_create          = OpType("box_create",          Mode.Application,                   8)
-    box_extract         = OpType("box_extract",         Mode.Application,                   8)
-    box_replace         = OpType("box_replace",         Mode.Application,                   8)
-    box_del             = OpType("box_del",             Mode.Application,                   8)
-    box_len             = OpType("box_len",             Mode.Application,                   8)
-    box_get             = OpType("box_get",             Mode.Application,                   8)
-    box_put             = OpType("box_put",             Mode.Application,                   8)
-    popn                = OpType("popn",                Mode.Signature | Mode.Application,  8)
-    dupn                = OpType("dupn",                Mode.Signature | Mode.Application,  8)
-    bury                = OpType("bury",                Mode.Signature | Mode.Application,  8)
-    frame_dig           = OpType("frame_dig",           Mode.Signature | Mode.Application,  8)
-    frame_bury          = OpType("frame_bury",          Mode.Signature | Mode.Application,  8)
-    proto               = OpType("proto",               Mode.Signature | Mode.Application,  8)
-    box_splice          = OpType("box_splice",          Mode.Application,                  10)
-    box_resize          = OpType("box_resize",          Mode.Application,                  10)
-    ec_add              = OpType("ec_add",              Mode.Signature | Mode.Application, 10)
-    ec_scalar_mul       = OpType("ec_scalar_mul",       Mode.Signature | Mode.Application, 10)
-    ec_pairing_check    = OpType("ec_pairing_check",    Mode.Signature | Mode.Application, 10)
-    ec_multi_scalar_mul = OpType("ec_multi_scalar_mul", Mode.Signature | Mode.Application, 10)
-    ec_subgroup_check   = OpType("ec_subgroup_check",   Mode.Signature | Mode.Application, 10)
-    ec_map_to           = OpType("ec_map_to",           Mode.Signature | Mode.Application, 10)
+    err                 = OpType("err",                 Mode.Signature | Mode.Application,  2,    0,    0)
+    sha256              = OpType("sha256",              Mode.Signature | Mode.Application,  2,    1,    1, (_B,), (_B,))
+    keccak256           = OpType("keccak256",           Mode.Signature | Mode.Application,  2,    1,    1, (_B,), (_B,))
+    sha512_256          = OpType("sha512_256",          Mode.Signature | Mode.Application,  2,    1,    1, (_B,), (_B,))
+    mimc                = OpType("mimc",                Mode.Signature | Mode.Application,  11,    1,    1, (_B,), (_B,))
+    ed25519verify       = OpType("ed25519verify",       Mode.Signature | Mode.Application,  2,    3,    1, (_B, _B, _B), (_U,))
+    add                 = OpType("+",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    minus               = OpType("-",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    div                 = OpType("/",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    mul                 = OpType("*",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    lt                  = OpType("<",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    gt                  = OpType(">",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    le                  = OpType("<=",                  Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    ge                  = OpType(">=",                  Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    logic_and           = OpType("&&",                  Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    logic_or            = OpType("||",                  Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    eq                  = OpType("==",                  Mode.Signature | Mode.Application,  2,    2,    1, (_A, _A), (_U,))
+    neq                 = OpType("!=",                  Mode.Signature | Mode.Application,  2,    2,    1, (_A, _A), (_U,))
+    logic_not           = OpType("!",                   Mode.Signature | Mode.Application,  2,    1,    1, (_U,), (_U,))
+    len                 = OpType("len",                 Mode.Signature | Mode.Application,  2,    1,    1, (_B,), (_U,))
+    itob                = OpType("itob",                Mode.Signature | Mode.Application,  2,    1,    1, (_U,), (_B,))
+    btoi                = OpType("btoi",                Mode.Signature | Mode.Application,  2,    1,    1, (_B,), (_U,))
+    mod                 = OpType("%",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    bitwise_or          = OpType("|",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    bitwise_and         = OpType("&",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    bitwise_xor         = OpType("^",                   Mode.Signature | Mode.Application,  2,    2,    1, (_U, _U), (_U,))
+    bitwise_not         = OpType("~",                   Mode.Signature | Mode.Application,  2,    1,    1, (_U,), (_U,))
+    mulw                = OpType("mulw",                Mode.Signature | Mode.Application,  2,    2,    2, (_U, _U), (_U, _U))
+    addw                = OpType("addw",                Mode.Signature | Mode.Application,  2,    2,    2, (_U, _U), (_U, _U))
+    intcblock           = OpType("intcblock",           Mode.Signature | Mode.Application,  2,    0,    0)
+    intc                = OpType("intc",                Mode.Signature | Mode.Application,  2,    0,    1, (), (_U,))
+    intc_0              = OpType("intc_0",              Mode.Signature | Mode.Application,  2,    0,    1, (), (_U,))
+    intc_1              = OpType("intc_1",              Mode.Signature | Mode.Application,  2,    0,    1, (), (_U,))
+    intc_2              = OpType("intc_2",              Mode.Signature | Mode.Application,  2,    0,    1, (), (_U,))
+    intc_3              = OpType("intc_3",              Mode.Signature | Mode.Application,  2,    0,    1, (), (_U,))
+    int                 = OpType("int",                 Mode.Signature | Mode.Application,  2,    0,    1, (), (_U,))
+    bytecblock          = OpType("bytecblock",          Mode.Signature | Mode.Application,  2,    0,    0)
+    bytec               = OpType("bytec",               Mode.Signature | Mode.Application,  2,    0,    1, (), (_B,))
+    bytec_0             = OpType("bytec_0",             Mode.Signature | Mode.Application,  2,    0,    1, (), (_B,))
+    bytec_1             = OpType("bytec_1",             Mode.Signature | Mode.Application,  2,    0,    1, (), (_B,))
+    bytec_2             = OpType("bytec_2",             Mode.Signature | Mode.Application,  2,    0,    1, (), (_B,))
+    bytec_3             = OpType("bytec_3",             Mode.Signature | Mode.Application,  2,    0,    1, (), (_B,))
+    byte                = OpType("byte",                Mode.Signature | Mode.Application,  2,    0,    1, (), (_B,))
+    addr                = OpType("addr",                Mode.Signature | Mode.Application,  2,    0,    1, (), (_B,))
+    method_signature    = OpType("method",              Mode.Signature | Mode.Application,  2,    0,    1, (), (_B,))
+    arg                 = OpType("arg",                 Mode.Signature,                     2,    0,    1)
+    txn                 = OpType("txn",                 Mode.Signature | Mode.Application,  2,    0,    1)
+    global_             = OpType("global",              Mode.Signature | Mode.Application,  2,    0,    1)
+    gtxn                = OpType("gtxn",                Mode.Signature | Mode.Application,  2,    0,    1)
+    load                = OpType("load",                Mode.Signature | Mode.Application,  2,    0,    1)
+    store               = OpType("store",               Mode.Signature | Mode.Application,  2,    1,    0)
+    txna                = OpType("txna",                Mode.Signature | Mode.Application,  2,    0,    1)
+    gtxna               = OpType("gtxna",               Mode.Signature | Mode.Application,  2,    0,    1)
+    bnz                 = OpType("bnz",                 Mode.Signature | Mode.Application,  2,    1,    0, (_U,), ())
+    bz                  = OpType("bz",                  Mode.Signature | Mode.Application,  2,    1,    0, (_U,), ())
+    b                   = OpType("b",                   Mode.Signature | Mode.Application,  2,    0,    0)
+    return_             = OpType("return",              Mode.Signature | Mode.Application,  2,    1,    0, (_U,), ())
+    pop                 = OpType("pop",                 Mode.Signature | Mode.Application,  2,    1,    0)
+    dup                 = OpType("dup",                 Mode.Signature | Mode.Application,  2,    1,    2)
+    dup2                = OpType("dup2",                Mode.Signature | Mode.Application,  2,    2,    4)
+    concat              = OpType("concat",              Mode.Signature | Mode.Application,  2,    2,    1, (_B, _B), (_B,))
+    substring           = OpType("substring",           Mode.Signature | Mode.Application,  2,    1,    1, (_B,), (_B,))
+    substring3          = OpType("substring3",          Mode.Signature | Mode.Application,  2,    3,    1, (_B, _U, _U), (_B,))
+    balance             = OpType("balance",             Mode.Application,                   2,    1,    1)
+    app_opted_in        = OpType("app_opted_in",        Mode.Application,                   2,    2,    1)
+    app_local_get       = OpType("app_local_get",       Mode.Application,                   2,    2,    1, (_A, _A), (_A,))
+    app_local_get_ex    = OpType("app_local_get_ex",    Mode.Application,                   2,    3,    2, (_A, _A, _A), (_A, _U))
+    app_global_get      = OpType("app_global_get",      Mode.Application,                   2,    1,    1, (_A,), (_A,))
+    app_global_get_ex   = OpType("app_global_get_ex",   Mode.Application,                   2,    2,    2, (_A, _A), (_A, _U))
+    app_local_put       = OpType("app_local_put",       Mode.Application,                   2,    3,    0, (_A, _A, _A), ())
+    app_global_put      = OpType("app_global_put",      Mode.Application,                   2,    2,    0, (_A, _A), ())
+    app_local_del       = OpType("app_local_del",       Mode.Application,                   2,    2,    0, (_A, _A), ())
+    app_global_del      = OpType("app_global_del",      Mode.Application,                   2,    1,    0, (_A,), ())
+    asset_holding_get   = OpType("asset_holding_get",   Mode.Application,                   2,    2,    2)
+    asset_params_get    = OpType("asset_params_get",    Mode.Application,                   2,    1,    2)
+    gtxns               = OpType("gtxns",               Mode.Signature | Mode.Application,  3,    1,    1)
+    gtxnsa              = OpType("gtxnsa",              Mode.Signature | Mode.Application,  3,    1,    1)
+    assert_             = OpType("assert",              Mode.Signature | Mode.Application,  3,    1,    0, (_U,), ())
+    dig                 = OpType("dig",                 Mode.Signature | Mode.Application,  3, None, None)
+    swap                = OpType("swap",                Mode.Signature | Mode.Application,  3,    2,    2)
+    select              = OpType("select",              Mode.Signature | Mode.Application,  3,    3,    1)
+    getbit              = OpType("getbit",              Mode.Signature | Mode.Application,  3,    2,    1, (_A, _U), (_U,))
+    setbit              = OpType("setbit",              Mode.Signature | Mode.Application,  3,    3,    1)
+    getbyte             = OpType("getbyte",             Mode.Signature | Mode.Application,  3,    2,    1, (_B, _U), (_U,))
+    setbyte             = OpType("setbyte",             Mode.Signature | Mode.Application,  3,    3,    1, (_B, _U, _U), (_B,))
+    min_balance         = OpType("min_balance",         Mode.Application,                   3,    1,    1)
+    pushbytes           = OpType("pushbytes",           Mode.Signature | Mode.Application,  3,    0,    1, (), (_B,))
+    pushint             = OpType("pushint",             Mode.Signature | Mode.Application,  3,    0,    1, (), (_U,))
+    shl                 = OpType("shl",                 Mode.Signature | Mode.Application,  4,    2,    1, (_U, _U), (_U,))
+    shr                 = OpType("shr",                 Mode.Signature | Mode.Application,  4,    2,    1, (_U, _U), (_U,))
+    sqrt                = OpType("sqrt",                Mode.Signature | Mode.Application,  4,    1,    1, (_U,), (_U,))
+    bitlen              = OpType("bitlen",              Mode.Signature | Mode.Application,  4,    1,    1, (_A,), (_U,))
+    exp                 = OpType("exp",                 Mode.Signature | Mode.Application,  4,    2,    1, (_U, _U), (_U,))
+    divmodw             = OpType("divmodw",             Mode.Signature | Mode.Application,  4,    4,    4, (_U, _U, _U, _U), (_U, _U, _U, _U))
+    expw                = OpType("expw",                Mode.Signature | Mode.Application,  4,    2,    2, (_U, _U), (_U, _U))
+    b_add               = OpType("b+",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_B,))
+    b_minus             = OpType("b-",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_B,))
+    b_div               = OpType("b/",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_B,))
+    b_mul               = OpType("b*",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_B,))
+    b_lt                = OpType("b<",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_U,))
+    b_gt                = OpType("b>",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_U,))
+    b_le                = OpType("b<=",                 Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_U,))
+    b_ge                = OpType("b>=",                 Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_U,))
+    b_eq                = OpType("b==",                 Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_U,))
+    b_neq               = OpType("b!=",                 Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_U,))
+    b_mod               = OpType("b%",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_B,))
+    b_or                = OpType("b|",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_B,))
+    b_and               = OpType("b&",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_B,))
+    b_xor               = OpType("b^",                  Mode.Signature | Mode.Application,  4,    2,    1, (_B, _B), (_B,))
+    b_not               = OpType("b~",                  Mode.Signature | Mode.Application,  4,    1,    1, (_B,), (_B,))
+    bzero               = OpType("bzero",               Mode.Signature | Mode.Application,  4,    1,    1, (_U,), (_B,))
+    gload               = OpType("gload",               Mode.Application,                   4,    0,    1)
+    gloads              = OpType("gloads",              Mode.Application,                   4,    1,    1)
+    gaid                = OpType("gaid",                Mode.Application,                   4,    0,    1, (), (_U,))
+    gaids               = OpType("gaids",               Mode.Application,                   4,    1,    1, (_U,), (_U,))
+    callsub             = OpType("callsub",             Mode.Signature | Mode.Application,  4, None, None)
+    retsub              = OpType("retsub",              Mode.Signature | Mode.Application,  4, None, None)
+    ecdsa_verify        = OpType("ecdsa_verify",        Mode.Signature | Mode.Application,  5,    5,    1, (_B, _B, _B, _B, _B), (_U,))
+    ecdsa_pk_decompress = OpType("ecdsa_pk_decompress", Mode.Signature | Mode.Application,  5,    1,    2, (_B,), (_B, _B))
+    ecdsa_pk_recover    = OpType("ecdsa_pk_recover",    Mode.Signature | Mode.Application,  5,    4,    2, (_B, _U, _B, _B), (_B, _B))
+    loads               = OpType("loads",               Mode.Signature | Mode.Application,  5,    1,    1)
+    stores              = OpType("stores",              Mode.Signature | Mode.Application,  5,    2,    0)
+    cover               = OpType("cover",               Mode.Signature | Mode.Application,  5, None, None)
+    uncover             = OpType("uncover",             Mode.Signature | Mode.Application,  5, None, None)
+    extract             = OpType("extract",             Mode.Signature | Mode.Application,  5,    1,    1, (_B,), (_B,))
+    extract3            = OpType("extract3",            Mode.Signature | Mode.Application,  5,    3,    1, (_B, _U, _U), (_B,))
+    extract_uint16      = OpType("extract_uint16",      Mode.Signature | Mode.Application,  5,    2,    1, (_B, _U), (_U,))
+    extract_uint32      = OpType("extract_uint32",      Mode.Signature | Mode.Application,  5,    2,    1, (_B, _U), (_U,))
+    extract_uint64      = OpType("extract_uint64",      Mode.Signature | Mode.Application,  5,    2,    1, (_B, _U), (_U,))
+    app_params_get      = OpType("app_params_get",      Mode.Application,                   5,    1,    2)
+    log                 = OpType("log",                 Mode.Application,                   5,    1,    0, (_B,), ())
+    itxn_begin          = OpType("itxn_begin",          Mode.Application,                   5,    0,    0)
+    itxn_field          = OpType("itxn_field",          Mode.Application,                   5,    1,    0)
+    itxn_submit         = OpType("itxn_submit",         Mode.Application,                   5,    0,    0)
+    itxn                = OpType("itxn",                Mode.Application,                   5,    0,    1)
+    itxna               = OpType("itxna",               Mode.Application,                   5,    0,    1)
+    txnas               = OpType("txnas",               Mode.Signature | Mode.Application,  5,    1,    1)
+    gtxnas              = OpType("gtxnas",              Mode.Signature | Mode.Application,  5,    1,    1)
+    gtxnsas             = OpType("gtxnsas",             Mode.Signature | Mode.Application,  5,    2,    1)
+    args                = OpType("args",                Mode.Signature,                     5,    1,    1)
+    bsqrt               = OpType("bsqrt",               Mode.Signature | Mode.Application,  6,    1,    1, (_B,), (_B,))
+    divw                = OpType("divw",                Mode.Signature | Mode.Application,  6,    3,    1, (_U, _U, _U), (_U,))
+    itxn_next           = OpType("itxn_next",           Mode.Application,                   6,    0,    0)
+    itxnas              = OpType("itxnas",              Mode.Application,                   6,    1,    1)
+    gitxn               = OpType("gitxn",               Mode.Application,                   6,    0,    1)
+    gitxna              = OpType("gitxna",              Mode.Application,                   6,    0,    1)
+    gitxnas             = OpType("gitxnas",             Mode.Application,                   6,    1,    1)
+    gloadss             = OpType("gloadss",             Mode.Application,                   6,    2,    1)
+    acct_params_get     = OpType("acct_params_get",     Mode.Application,                   6,    1,    2)
+    voter_params_get    = OpType("voter_params_get",    Mode.Application,                  11,    1,    2)
+    online_stake        = OpType("online_stake",        Mode.Application,                  11,    0,    1)
+    replace2            = OpType("replace2",            Mode.Signature | Mode.Application,  7,    2,    1, (_B, _B), (_B,))
+    replace3            = OpType("replace3",            Mode.Signature | Mode.Application,  7,    3,    1, (_B, _U, _B), (_B,))
+    base64_decode       = OpType("base64_decode",       Mode.Signature | Mode.Application,  7,    1,    1, (_B,), (_B,))
+    json_ref            = OpType("json_ref",            Mode.Signature | Mode.Application,  7,    2,    1)
+    ed25519verify_bare  = OpType("ed25519verify_bare",  Mode.Signature | Mode.Application,  7,    3,    1, (_B, _B, _B), (_U,))
+    sha3_256            = OpType("sha3_256",            Mode.Signature | Mode.Application,  7,    1,    1, (_B,), (_B,))
+    vrf_verify          = OpType("vrf_verify",          Mode.Signature | Mode.Application,  7,    3,    2, (_B, _B, _B), (_B, _U))
+    block               = OpType("block",               Mode.Signature | Mode.Application,  7,    1,    1)
+    box_create          = OpType("box_create",          Mode.Application,                   8,    2,    1, (_B, _U), (_U,))
+    box_extract         = OpType("box_extract",         Mode.Application,                   8,    3,    1, (_B, _U, _U), (_B,))
+    box_replace         = OpType("box_replace",         Mode.Application,                   8,    3,    0, (_B, _U, _B), ())
+    box_del             = OpType("box_del",             Mode.Application,                   8,    1,    1, (_B,), (_U,))
+    box_len             = OpType("box_len",             Mode.Application,                   8,    1,    2, (_B,), (_U, _U))
+    box_get             = OpType("box_get",             Mode.Application,                   8,    1,    2, (_B,), (_B, _U))
+    box_put             = OpType("box_put",             Mode.Application,                   8,    2,    0, (_B, _B), ())
+    popn                = OpType("popn",                Mode.Signature | Mode.Application,  8, None, None)
+    dupn                = OpType("dupn",                Mode.Signature | Mode.Application,  8, None, None)
+    bury                = OpType("bury",                Mode.Signature | Mode.Application,  8, None, None)
+    frame_dig           = OpType("frame_dig",           Mode.Signature | Mode.Application,  8,    0,    1)
+    frame_bury          = OpType("frame_bury",          Mode.Signature | Mode.Application,  8,    1,    0)
+    proto               = OpType("proto",               Mode.Signature | Mode.Application,  8,    0,    0)
+    box_splice          = OpType("box_splice",          Mode.Application,                  10,    4,    0, (_B, _U, _U, _B), ())
+    box_resize          = OpType("box_resize",          Mode.Application,                  10,    2,    0, (_B, _U), ())
+    ec_add              = OpType("ec_add",              Mode.Signature | Mode.Application, 10,    2,    1)
+    ec_scalar_mul       = OpType("ec_scalar_mul",       Mode.Signature | Mode.Application, 10,    2,    1)
+    ec_pairing_check    = OpType("ec_pairing_check",    Mode.Signature | Mode.Application, 10,    2,    1)
+    ec_multi_scalar_mul = OpType("ec_multi_scalar_mul", Mode.Signature | Mode.Application, 10,    2,    1)
+    ec_subgroup_check   = OpType("ec_subgroup_check",   Mode.Signature | Mode.Application, 10,    1,    1)
+    ec_map_to           = OpType("ec_map_to",           Mode.Signature | Mode.Application, 10,    1,    1)
     # fmt: on
 
 
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from collections import deque
 
-from typing import Dict, List, Tuple, Set, Iterator, cast, TYPE_CHECKING
+from typing import Dict, List, Sequence, Tuple, Set, Iterator, cast, TYPE_CHECKING
 
 from pyteal.ir.tealop import TealOp, Op
 from pyteal.errors import TealCompileError
@@ -11,9 +12,24 @@ if TYPE_CHECKING:
     from pyteal.ir.tealsimpleblock import TealSimpleBlock
 
 
+def _lowers_by_path(exprType: type) -> bool:
+    """Check if the class defining the _teal_path of an Expr type also defines its __teal__."""
+    if (lowers := _path_types.get(exprType)) is None:
+        owner = next(c for c in exprType.__mro__ if "_teal_path" in vars(c))
+        lowers = _path_types[exprType] = vars(owner).get("__teal__") is getattr(
+            exprType, "__teal__"
+        )
+    return lowers
+
+
+_path_types: Dict[type, bool] = {}
+
+
 class TealBlock(ABC):
     """Represents a basic block of TealComponents in a graph."""
 
+    __slots__ = ("ops", "incoming", "_sframes_container")
+
     def __init__(self, ops: List[TealOp], root_expr: "Expr | None" = None) -> None:
         self.ops = ops
         self.incoming: List[TealBlock] = []
@@ -48,21 +64,25 @@ class TealBlock(ABC):
             visited (optional): Used internally to remember blocks that have been visited. Set to None.
         """
         if visited is None:
-            # using a list instead of a set as TealBlock is not hashable and PyTEAL programs should be short anyway
             visited = []
-
-        if parent is not None:
-            count = 0
-            for block in self.incoming:
-                if parent is block:
-                    count += 1
-            assert count == 1
-
-        if all(self is not b for b in visited):
-            # if the block was not already visited
-            visited.append(self)
-            for block in self.getOutgoing():
-                block.validateTree(self, visited)
+        visitedIds = {id(b) for b in visited}
+
+        # blocks are checked in the same depth-first order as a recursive walk, using an explicit
+        # stack so that long programs don't exceed the recursion limit
+        stack: List[Tuple[TealBlock, TealBlock | None]] = [(self, parent)]
+        while len(stack) != 0:
+            block, blockParent = stack.pop()
+            if blockParent is not None:
+                count = 0
+                for incoming in block.incoming:
+                    if blockParent is incoming:
+                        count += 1
+                assert count == 1
+
+            if id(block) not in visitedIds:
+                visitedIds.add(id(block))
+                visited.append(block)
+                stack.extend((b, block) for b in reversed(block.getOutgoing()))
 
     def addIncoming(
         self,
@@ -76,17 +96,21 @@ class TealBlock(ABC):
             visited (optional): Used internally to remember blocks that have been visited. Set to None.
         """
         if visited is None:
-            # using a list instead of a set as TealBlock is not hashable and PyTEAL programs should be short anyway
             visited = []
+        visitedIds = {id(b) for b in visited}
 
-        if parent is not None and all(parent is not b for b in self.incoming):
-            self.incoming.append(parent)
+        stack: List[Tuple[TealBlock, TealBlock | None]] = [(self, parent)]
+        while len(stack) != 0:
+            block, blockParent = stack.pop()
+            if blockParent is not None and all(
+                blockParent is not b for b in block.incoming
+            ):
+                block.incoming.append(blockParent)
 
-        if all(self is not b for b in visited):
-            # if the block was not already visited
-            visited.append(self)
-            for b in self.getOutgoing():
-                b.addIncoming(self, visited)
+            if id(block) not in visitedIds:
+                visitedIds.add(id(block))
+                visited.append(block)
+                stack.extend((b, block) for b in reversed(block.getOutgoing()))
 
     def validateSlots(
         self,
@@ -99,33 +123,42 @@ class TealBlock(ABC):
         if slotsInUse is None:
             slotsInUse = set()
 
-        currentSlotsInUse = set(slotsInUse)
-        errors = []
+        errors: List[TealCompileError] = []
 
-        for op in self.ops:
-            if op.getOp() == Op.store:
-                for slot in op.getSlots():
-                    currentSlotsInUse.add(slot)
-
-            if op.getOp() == Op.load:
-                for slot in op.getSlots():
-                    if slot not in currentSlotsInUse:
-                        e = TealCompileError(
-                            "Scratch slot load occurs before store", op.expr
-                        )
-                        errors.append(e)
-
-        if not self.isTerminal():
-            sortedSlots = sorted(slot.id for slot in currentSlotsInUse)
-            for block in self.getOutgoing():
-                visitedKey = (id(block), *sortedSlots)
+        # each entry is a block, the slots stored before reaching it, and the key that marks it as
+        # visited with those slots, or None for this block
+        stack: List[Tuple[TealBlock, Set["ScratchSlot"], Tuple[int, ...] | None]] = [
+            (self, slotsInUse, None)
+        ]
+        while len(stack) != 0:
+            block, blockSlotsInUse, visitedKey = stack.pop()
+            if visitedKey is not None:
                 if visitedKey in visited:
                     continue
                 visited.add(visitedKey)
 
-                for error in block.validateSlots(currentSlotsInUse, visited):
-                    if error not in errors:
-                        errors.append(error)
+            currentSlotsInUse = set(blockSlotsInUse)
+            for op in block.ops:
+                if op.getOp() == Op.store:
+                    for slot in op.getSlots():
+                        currentSlotsInUse.add(slot)
+
+                if op.getOp() == Op.load:
+                    for slot in op.getSlots():
+                        if slot not in currentSlotsInUse:
+                            e = TealCompileError(
+                                "Scratch slot load occurs before store", op.expr
+                            )
+                            # errors of later blocks are only reported once
+                            if visitedKey is None or e not in errors:
+                                errors.append(e)
+
+            if not block.isTerminal():
+                sortedSlots = sorted(slot.id for slot in currentSlotsInUse)
+                stack.extend(
+                    (nextBlock, currentSlotsInUse, (id(nextBlock), *sortedSlots))
+                    for nextBlock in reversed(block.getOutgoing())
+                )
 
         return errors
 
@@ -153,39 +186,65 @@ class TealBlock(ABC):
         if len(args) == 0:
             return opBlock, opBlock
 
-        start = None
-        prevArgEnd = None
-        for i, arg in enumerate(args):
-            argStart, argEnd = arg.__teal__(options)
-            if i == 0:
-                start = argStart
-            else:
-                cast(TealSimpleBlock, prevArgEnd).setNextBlock(argStart)
-            prevArgEnd = argEnd
+        return TealBlock.FromPath(options, [*args, opBlock])
 
-        cast(TealSimpleBlock, prevArgEnd).setNextBlock(opBlock)
+    @classmethod
+    def FromPath(
+        cls, options: "CompileOptions", path: Sequence["Expr | TealSimpleBlock"]
+    ) -> Tuple["TealBlock", "TealSimpleBlock"]:
+        """Create a path of blocks that runs the given expressions and blocks in order.
+
+        Expressions that lower to a path themselves, such as arithmetic and :any:`Seq`, are expanded
+        with an explicit stack instead of recursive calls to :code:`__teal__`, so that deeply nested
+        expressions don't exceed the recursion limit. Expressions whose class overrides the
+        :code:`__teal__` that goes with its :code:`_teal_path` are lowered by their own
+        :code:`__teal__`.
+
+        Returns:
+            The starting and ending block of the path.
+        """
+        # each entry is the remaining items of a path, and the start and end of its blocks so far
+        stack: List[Tuple[Iterator["Expr | TealSimpleBlock"], List[TealBlock | None]]]
+        stack = [(iter(path), [None, None])]
+        while True:
+            items, ends = stack[-1]
+            item = next(items, None)
+            if item is None:
+                stack.pop()
+                start, end = ends
+                if len(stack) == 0:
+                    return cast(TealBlock, start), cast("TealSimpleBlock", end)
+                ends = stack[-1][1]
+            elif isinstance(item, TealBlock):
+                start, end = item, item
+            elif (
+                _lowers_by_path(type(item))
+                and (itemPath := item._teal_path(options)) is not None
+            ):
+                stack.append((iter(itemPath), [None, None]))
+                continue
+            else:
+                start, end = item.__teal__(options)
 
-        return cast(TealBlock, start), opBlock
+            if ends[0] is None:
+                ends[0] = start
+            else:
+                cast("TealSimpleBlock", ends[1]).setNextBlock(cast(TealBlock, start))
+            ends[1] = end
 
     @classmethod
     def Iterate(cls, start: "TealBlock") -> Iterator["TealBlock"]:
         """Perform a breadth-first search of the graph of blocks starting with start."""
-        queue = [start]
-        visited = list(queue)
-
-        def is_in_visited(block):
-            for v in visited:
-                if block is v:
-                    return True
-            return False
+        queue = deque([start])
+        visited = {id(start)}
 
         while len(queue) != 0:
-            w = queue.pop(0)
+            w = queue.popleft()
             nextBlocks = w.getOutgoing()
             yield w
             for nextBlock in nextBlocks:
-                if not is_in_visited(nextBlock):
-                    visited.append(nextBlock)
+                if id(nextBlock) not in visited:
+                    visited.add(id(nextBlock))
                     queue.append(nextBlock)
 
     @classmethod
@@ -161,6 +161,95 @@ def test_normalize_single():
     assert actual == expected
 
 
+def test_from_path():
+    arg_1 = pt.Int(1)
+    arg_2 = pt.Int(2)
+    arg_1_plus_2 = arg_1 + arg_2
+    block = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.pop)])
+
+    expected = pt.TealSimpleBlock(
+        [
+            pt.TealOp(arg_1, pt.Op.int, 1),
+            pt.TealOp(arg_2, pt.Op.int, 2),
+            pt.TealOp(arg_1_plus_2, pt.Op.add),
+            pt.TealOp(None, pt.Op.pop),
+        ]
+    )
+
+    actual, end = pt.TealBlock.FromPath(options, [arg_1_plus_2, block])
+    assert end is block
+    actual.addIncoming()
+    actual = pt.TealBlock.NormalizeBlocks(actual)
+    actual.validateTree()
+
+    assert actual == expected
+
+
+def test_long_chain():
+    # graph walks must not be limited by the recursion limit
+    expr: pt.Expr = pt.Int(0)
+    for i in range(3000):
+        expr = expr + pt.Int(i)
+
+    start, _ = pt.TealBlock.FromPath(options, [expr])
+    start.addIncoming()
+    start.validateTree()
+    assert start.validateSlots() == []
+    assert len(list(pt.TealBlock.Iterate(start))) == 2 * 3000 + 1
+
+    start = pt.TealBlock.NormalizeBlocks(start)
+    start.validateTree()
+    assert len(start.ops) == 2 * 3000 + 1
+
+
+def test_from_path_overridden_teal():
+    class Logged(pt.BinaryExpr):
+        def __init__(self, left: pt.Expr, right: pt.Expr):
+            super().__init__(
+                pt.Op.add, pt.TealType.uint64, pt.TealType.uint64, left, right
+            )
+            self.lowered = 0
+
+        def __teal__(self, options: "pt.CompileOptions"):
+            self.lowered += 1
+            start, end = super().__teal__(options)
+            end.setNextBlock(pt.TealSimpleBlock([pt.TealOp(self, pt.Op.log)]))
+            return start, end.nextBlock
+
+    class Doubled(pt.BinaryExpr):
+        def __init__(self, arg: pt.Expr):
+            super().__init__(
+                pt.Op.add, pt.TealType.uint64, pt.TealType.uint64, arg, arg
+            )
+
+        def _teal_path(self, options: "pt.CompileOptions"):
+            arg, _, add = super()._teal_path(options)
+            return [arg, pt.TealSimpleBlock([pt.TealOp(self, pt.Op.dup)]), add]
+
+    logged = Logged(pt.Int(1), pt.Int(2))
+    doubled = Doubled(pt.Int(3))
+    expr = pt.Seq(pt.Pop(logged + pt.Int(3)), pt.Pop(doubled))
+
+    start, _ = pt.TealBlock.FromPath(options, [expr])
+    assert logged.lowered == 1
+    start.addIncoming()
+    start = pt.TealBlock.NormalizeBlocks(start)
+    start.validateTree()
+    assert [op.op for op in start.ops] == [
+        pt.Op.int,
+        pt.Op.int,
+        pt.Op.add,
+        pt.Op.log,
+        pt.Op.int,
+        pt.Op.add,
+        pt.Op.pop,
+        pt.Op.int,
+        pt.Op.dup,
+        pt.Op.add,
+        pt.Op.pop,
+    ]
+
+
 def test_normalize_sequence():
     block6 = pt.TealSimpleBlock([])
     block5 = pt.TealSimpleBlock([pt.TealOp(None, pt.Op.int, 5)])
@@ -9,6 +9,8 @@ if TYPE_CHECKING:
 
 
 class TealComponent(ABC):
+    __slots__ = ("expr", "_stack_frames", "_sframes_container")
+
     def __init__(self, expr: "Expr | None"):
         self.expr: Expr | None = expr
 
@@ -7,6 +7,8 @@ from pyteal.ir.tealblock import TealBlock
 class TealConditionalBlock(TealBlock):
     """Represents a basic block of TealComponents in a graph ending with a branch condition."""
 
+    __slots__ = ("trueBlock", "falseBlock")
+
     def __init__(self, ops: List[TealOp], root_expr: "Expr | None" = None) -> None:  # type: ignore
         super().__init__(ops, root_expr=root_expr)
         self.trueBlock: TealBlock | None = None
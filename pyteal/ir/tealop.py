@@ -1,4 +1,4 @@
-from typing import Union, List, Optional, TYPE_CHECKING
+from typing import Union, List, Optional, Tuple, TYPE_CHECKING
 
 from pyteal.ir.tealcomponent import TealComponent
 from pyteal.ir.labelref import LabelReference
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 
 
 class TealOp(TealComponent):
+    __slots__ = ("op", "args")
+
     def __init__(
         self,
         expr: Optional["Expr"],
@@ -43,6 +45,35 @@ class TealOp(TealComponent):
             if subroutine == arg:
                 self.args[i] = label
 
+    def stackEffect(self) -> Optional[Tuple[int, int]]:
+        """Get the number of values this op removes from and then adds to the stack.
+
+        Ops that rearrange values below the top of the stack, such as :code:`dig 2` or
+        :code:`cover 2`, are counted as removing and adding back every value they reach.
+
+        Returns:
+            A tuple of the number of values popped and pushed, or None if it is not known, such as
+            for :code:`callsub` and :code:`retsub`.
+        """
+        pops, pushes = self.op.pops, self.op.pushes
+        if pops is not None and pushes is not None:
+            return pops, pushes
+
+        if len(self.args) != 1 or not isinstance(self.args[0], int):
+            return None
+        n = self.args[0]
+        if self.op == Op.dig:
+            return n + 1, n + 2
+        if self.op in (Op.cover, Op.uncover):
+            return n + 1, n + 1
+        if self.op == Op.bury:
+            return n + 1, n
+        if self.op == Op.popn:
+            return n, 0
+        if self.op == Op.dupn:
+            return 1, n + 1
+        return None
+
     def assemble(self) -> str:
         from pyteal.ast import ScratchSlot, SubroutineDefinition
 
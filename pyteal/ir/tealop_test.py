@@ -0,0 +1,58 @@
+import pytest
+
+import pyteal as pt
+
+IMMEDIATE_EFFECT_OPS = {
+    pt.Op.dig,
+    pt.Op.cover,
+    pt.Op.uncover,
+    pt.Op.bury,
+    pt.Op.popn,
+    pt.Op.dupn,
+    pt.Op.callsub,
+    pt.Op.retsub,
+}
+
+
+def test_op_stack_effects():
+    for op in pt.Op:
+        if op in IMMEDIATE_EFFECT_OPS:
+            assert op.pops is None and op.pushes is None
+        else:
+            assert op.pops is not None and op.pushes is not None, op
+
+    assert (pt.Op.add.pops, pt.Op.add.pushes) == (2, 1)
+    assert (pt.Op.app_global_get_ex.pops, pt.Op.app_global_get_ex.pushes) == (2, 2)
+    assert (pt.Op.box_put.pops, pt.Op.box_put.pushes) == (2, 0)
+
+
+def test_op_stack_types():
+    for op in pt.Op:
+        assert (op.pop_types is None) == (op.push_types is None), op
+        if op.pop_types is not None and op.push_types is not None:
+            assert len(op.pop_types) == op.pops, op
+            assert len(op.push_types) == op.pushes, op
+
+    U, B = pt.TealType.uint64, pt.TealType.bytes
+    assert (pt.Op.add.pop_types, pt.Op.add.push_types) == ((U, U), (U,))
+    assert (pt.Op.box_get.pop_types, pt.Op.box_get.push_types) == ((B,), (B, U))
+    assert pt.Op.dup.pop_types is None
+
+
+@pytest.mark.parametrize(
+    "op, expected",
+    [
+        (pt.TealOp(None, pt.Op.int, 1), (0, 1)),
+        (pt.TealOp(None, pt.Op.divmodw), (4, 4)),
+        (pt.TealOp(None, pt.Op.dig, 2), (3, 4)),
+        (pt.TealOp(None, pt.Op.cover, 1), (2, 2)),
+        (pt.TealOp(None, pt.Op.uncover, 3), (4, 4)),
+        (pt.TealOp(None, pt.Op.bury, 1), (2, 1)),
+        (pt.TealOp(None, pt.Op.popn, 3), (3, 0)),
+        (pt.TealOp(None, pt.Op.dupn, 2), (1, 3)),
+        (pt.TealOp(None, pt.Op.callsub, "sub"), None),
+        (pt.TealOp(None, pt.Op.retsub), None),
+    ],
+)
+def test_stack_effect(op, expected):
+    assert op.stackEffect() == expected
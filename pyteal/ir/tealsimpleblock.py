@@ -5,6 +5,8 @@ from pyteal.ir.tealop import TealOp
 class TealSimpleBlock(TealBlock):
     """Represents a basic block of TealComponents in a graph that does not contain a branch condition."""
 
+    __slots__ = ("nextBlock", "visited")
+
     def __init__(self, ops: list[TealOp]) -> None:
         super().__init__(ops)
         self.nextBlock: TealBlock | None = None
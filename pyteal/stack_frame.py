@@ -2,12 +2,16 @@ from feature_gates import FeatureGates
 
 from ast import AST, FunctionDef, unparse
 from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from enum import IntEnum
-from inspect import FrameInfo, stack
+from functools import cached_property
+from inspect import FrameInfo, Traceback, getframeinfo
 from typing import Callable, Final, cast
 import os
 import re
+import sys
+from types import CodeType, FrameType
 
 from executing import Source
 
@@ -76,7 +80,7 @@ class StackFrame:
         However, if the resulting is considered "Python Crud" abandon and return None.
         When debugging, also persist the full_stack that was provided.
         """
-        node = cast(AST | None, Source.executing(f.frame).node)
+        node = _code_locations.node(f.frame)
         frame = StackFrame(
             f, node, creator, full_stack if NatalStackFrame._debugging() else None
         )
@@ -190,35 +194,163 @@ class StackFrame:
         )
 
 
+class _CodeLocation:
+    """
+    What is known about a code location, i.e. an instruction of a code object, regardless
+    of the frame executing it: its traceback information, its classifications by StackFrame
+    and its AST node.
+
+    No frame is kept, so that caching a location doesn't keep the frame's locals alive.
+    """
+
+    def __init__(self, frame: FrameType):
+        self.traceback: Traceback = getframeinfo(frame, 1)
+        self._node: AST | None = None
+        self._node_resolved: bool = False
+
+    def frame_info(self, frame: FrameType) -> FrameInfo:
+        if sys.version_info >= (3, 11):
+            return FrameInfo(frame, *self.traceback, positions=self.traceback.positions)
+        return FrameInfo(frame, *self.traceback)
+
+    @cached_property
+    def _frameless_info(self) -> FrameInfo:
+        return self.frame_info(cast(FrameType, None))
+
+    @cached_property
+    def not_py_crud(self) -> bool:
+        return StackFrame._frame_info_not_py_crud(self._frameless_info)
+
+    @cached_property
+    def is_pyteal(self) -> bool:
+        return StackFrame._frame_info_is_pyteal(self._frameless_info)
+
+    @cached_property
+    def is_pyteal_import(self) -> bool:
+        return StackFrame._frame_info_is_pyteal_import(self._frameless_info)
+
+    @cached_property
+    def is_compilation_gateway(self) -> bool:
+        return StackFrame._is_compilation_gateway(self._frameless_info)
+
+    @cached_property
+    def compiler_generated(self) -> bool | None:
+        return StackFrame._frame_info_compiler_generated(self._frameless_info)
+
+    def node(self, frame: FrameType) -> AST | None:
+        if not self._node_resolved:
+            self._node = cast(AST | None, Source.executing(frame).node)
+            self._node_resolved = True
+        return self._node
+
+
+class _CodeLocationCache:
+    """
+    A bounded cache of the _CodeLocation of each (code object, instruction offset) pair.
+
+    Expressions built in loops or by helper functions are all created at the same few
+    code locations, so their stack traces, AST nodes and classifications are computed
+    once instead of once per expression. When the cache is full the oldest location is
+    evicted. The cache is cleared after each compilation.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize: Final[int] = maxsize
+        self._locations: dict[tuple[CodeType, int], _CodeLocation] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def location(self, frame: FrameType) -> _CodeLocation:
+        key = (frame.f_code, frame.f_lasti)
+        if (location := self._locations.get(key)) is None:
+            if len(self._locations) >= self.maxsize:
+                del self._locations[next(iter(self._locations))]
+            location = self._locations[key] = _CodeLocation(frame)
+        return location
+
+    def stack(self, frame: FrameType | None) -> list[tuple[FrameInfo, _CodeLocation]]:
+        """The equivalent of inspect.stack() from the given frame outwards, with the locations"""
+        frames = []
+        while frame is not None:
+            location = self.location(frame)
+            frames.append((location.frame_info(frame), location))
+            frame = frame.f_back
+        return frames
+
+    def node(self, frame: FrameType) -> AST | None:
+        return self.location(frame).node(frame)
+
+    def clear(self) -> None:
+        self._locations.clear()
+
+
+_code_locations: Final[_CodeLocationCache] = _CodeLocationCache(maxsize=4096)
+
+
+# Overrides the sourcemap_enabled feature gate for the current thread or task when set
+_sourcemapping_scope: ContextVar[bool | None] = ContextVar(
+    "_sourcemapping_scope", default=None
+)
+
+
+@contextmanager
+def sourcemapping_context(enabled: bool = True):
+    """Context manager that turns sourcemapping on or off for the duration of the context.
+
+    Unlike `FeatureGates.set_sourcemap_enabled()`, this only affects code that runs in the
+    current thread or asyncio task while the context is active, so stack frames are only
+    captured for the expressions created inside it. To source map a program, both create
+    and compile it inside the context:
+
+    .. code-block:: python
+
+        with sourcemapping_context():
+            router = make_router()
+            results = router.compile(version=8, with_sourcemaps=True)
+
+    Expressions created outside of the context, such as ones defined at the top level of an
+    imported module, are mapped to the source of their neighbors when possible.
+
+    Args:
+        enabled (optional): Whether to turn sourcemapping on or off. Defaults to on.
+    """
+    token = _sourcemapping_scope.set(enabled)
+    try:
+        yield
+    finally:
+        _sourcemapping_scope.reset(token)
+
+
 @contextmanager
 def sourcemapping_off_context():
     """Context manager that turns off sourcemapping for the duration of the context"""
     from feature_gates import FeatureGates
 
-    _sourcemap_before = FeatureGates.sourcemap_enabled()
+    _sourcemap_off_before = NatalStackFrame.sourcemapping_is_off()
     _sourcemap_debug_before = FeatureGates.sourcemap_debug()
-    FeatureGates.set_sourcemap_enabled(False)
     FeatureGates.set_sourcemap_debug(False)
-    assert (
-        NatalStackFrame.sourcemapping_is_off()
-    ), "Unexpected error. Please report to PyTeal team."
-    assert (
-        not NatalStackFrame._debugging()
-    ), "Unexpected error. Please report to PyTeal team."
-
-    try:
-        yield
-
-    finally:
-        FeatureGates.set_sourcemap_debug(_sourcemap_debug_before)
-        FeatureGates.set_sourcemap_enabled(_sourcemap_before)
+    with sourcemapping_context(False):
         assert (
-            NatalStackFrame.sourcemapping_is_off() is not _sourcemap_before
+            NatalStackFrame.sourcemapping_is_off()
         ), "Unexpected error. Please report to PyTeal team."
         assert (
-            NatalStackFrame._debugging() is _sourcemap_debug_before
+            not NatalStackFrame._debugging()
         ), "Unexpected error. Please report to PyTeal team."
 
+        try:
+            yield
+
+        finally:
+            FeatureGates.set_sourcemap_debug(_sourcemap_debug_before)
+            assert (
+                NatalStackFrame._debugging() is _sourcemap_debug_before
+            ), "Unexpected error. Please report to PyTeal team."
+
+    assert (
+        NatalStackFrame.sourcemapping_is_off() is _sourcemap_off_before
+    ), "Unexpected error. Please report to PyTeal team."
+
 
 class NatalStackFrame:
     """
@@ -234,16 +366,24 @@ class NatalStackFrame:
     the name is misleading.
     """
 
+    __slots__ = ("_pyteal_gen", "_frames")
+
     _keep_all_debugging = False
 
     @staticmethod
     def sourcemapping_is_off() -> bool:
+        if (scoped := _sourcemapping_scope.get()) is not None:
+            return not scoped
         return not FeatureGates.sourcemap_enabled()  # type: ignore[attr-defined]
 
     @staticmethod
     def _debugging() -> bool:
         return FeatureGates.sourcemap_debug()  # type: ignore[attr-defined]
 
+    @staticmethod
+    def _clear_code_locations() -> None:
+        _code_locations.clear()
+
     def __init__(
         self,
     ):
@@ -254,10 +394,12 @@ class NatalStackFrame:
             return
 
         # 1. get the full stack trace
-        full_stack = stack()
+        located_stack = _code_locations.stack(sys._getframe())
+        full_stack = [f for f, _ in located_stack]
 
         # 2. discard frames whose filename begins with "<"
-        frame_infos = list(filter(StackFrame._frame_info_not_py_crud, full_stack))
+        located = [(f, loc) for f, loc in located_stack if loc.not_py_crud]
+        frame_infos = [f for f, _ in located]
 
         def _make_stack_frames(fis):
             return [
@@ -277,24 +419,24 @@ class NatalStackFrame:
 
         # 4. fast forward the right bound until we're out of pyteal-library code
         # This sets last_keep_idx to the first frame index which isn't pyteal
-        while i < len(frame_infos) and StackFrame._frame_info_is_pyteal(frame_infos[i]):
+        while i < len(located) and located[i][1].is_pyteal:
             i += 1
         last_keep_idx = i
 
         # 5. back up looking for a compiler gateway and so signal that the expression was generated by pyteal itself
         for i in range(last_keep_idx, -1, -1):
-            if StackFrame._is_compilation_gateway(frame_infos[i]):
+            if located[i][1].is_compilation_gateway:
                 self._pyteal_gen = True
                 break
 
         # 6. if the pyteal-library exit point was an import, the expression was
         # generated by pyteal itself. So let's back up and look for a "# T2PT*" comment
         # which will give us a clue for what to do with this expression
-        if StackFrame._frame_info_is_pyteal_import(frame_infos[last_keep_idx]):
+        if located[last_keep_idx][1].is_pyteal_import:
             found = False
             i = -1
             for i in range(last_keep_idx - 1, -1, -1):
-                if StackFrame._frame_info_compiler_generated(frame_infos[i]):
+                if located[i][1].compiler_generated:
                     found = True
                     break
 
@@ -501,6 +643,13 @@ error: {smsfe}
             cls.reframe_ops_in_blocks(root_expr, nxt)
 
 
+# The frames of all the expressions created while sourcemapping is off, so that they
+# don't each hold an empty NatalStackFrame
+NO_FRAMES: Final[NatalStackFrame] = NatalStackFrame.__new__(NatalStackFrame)
+NO_FRAMES._pyteal_gen = False
+NO_FRAMES._frames = []
+
+
 class PT_GENERATED:
     PRAGMA = "PyTeal generated pragma"
     SUBR_LABEL = "PyTeal generated subroutine label"
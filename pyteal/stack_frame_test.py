@@ -144,3 +144,65 @@ def test_root():
     with patch("os.getcwd", return_value="FOOFOO"):
         assert ptf.root() == "FOOFOO"
         assert ptf._root == "FOOFOO"
+
+
+def test_code_location_cache():
+    import inspect
+
+    from pyteal.stack_frame import _CodeLocationCache
+
+    def make_stack(cache):
+        return cache.stack(inspect.currentframe())
+
+    cache = _CodeLocationCache(maxsize=1000)
+    stacks = [make_stack(cache) for _ in range(3)]
+    # the locations are computed once for all the calls from the same code location
+    assert all(a[1] is b[1] for a, b in zip(stacks[1], stacks[0]))
+    assert len(cache) == len({id(loc) for _, loc in stacks[0]})
+
+    frame = inspect.currentframe()
+    expected = inspect.getouterframes(frame)
+    located = cache.stack(frame)
+    # the current frame has moved on to the next call
+    assert [f for f, _ in located][1:] == expected[1:]
+    assert [f.positions for f, _ in located][1:] == [f.positions for f in expected][1:]
+    assert located[0][0].frame is frame
+    location = located[1][1]
+    assert location.is_pyteal == StackFrame._frame_info_is_pyteal(expected[1])
+    assert location.not_py_crud == StackFrame._frame_info_not_py_crud(expected[1])
+    assert located[0][1].node(frame) is not None
+
+    small = _CodeLocationCache(maxsize=2)
+    small.stack(inspect.currentframe())
+    assert len(small) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_code_location_cache_cleared_between_compilations():
+    import pyteal as pt
+    from pyteal.stack_frame import _code_locations
+
+    with pt.sourcemapping_context():
+        program = pt.Seq(*[pt.Pop(pt.Int(i)) for i in range(5)], pt.Approve())
+        frames = [e.stack_frames._frames[0] for e in program.args[:-1]]
+        assert len({frame.node for frame in frames}) == 1
+        before = list(_code_locations._locations.values())
+        assert before
+
+        pt.Compilation(program, pt.Mode.Application, version=8)._compile_impl(
+            with_sourcemap=False
+        )
+        assert len(_code_locations) == 0
+
+        # expressions built after a compilation don't reuse the earlier locations
+        pt.Pop(pt.Int(0))
+        after = list(_code_locations._locations.values())
+        assert after
+        assert not any(loc is old for loc in after for old in before)
+
+        # including compilations that fail
+        with pytest.raises(pt.TealCompileError):
+            pt.Compilation(pt.Txn.sender(), pt.Mode.Application, version=8).compile()
+        assert len(_code_locations) == 0
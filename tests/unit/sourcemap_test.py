@@ -153,6 +153,129 @@ def no_regressions_algobank():
     compare_and_assert(ALGOBANK / "algobank_approval.teal", approval)
 
 
+def test_base64vlq():
+    from pyteal.compiler.sourcemap import (
+        _base64vlq_decode,
+        _base64vlq_decode_mappings,
+        _base64vlq_encode,
+    )
+
+    values = [0, 1, -1, 15, -16, 16, 511, -512, 123456789, -987654321]
+    assert _base64vlq_encode(0, 1, -1, 15, 16) == "ACDegB"
+    assert _base64vlq_decode(_base64vlq_encode(*values)) == values
+    for v in values:
+        assert _base64vlq_decode(_base64vlq_encode(v)) == [v]
+
+    assert list(_base64vlq_decode_mappings("AACA,EAAE;;gBAAgB")) == [
+        (0, (0, 0, 1, 0)),
+        (0, (2, 0, 0, 2)),
+        (2, (16, 0, 0, 16)),
+    ]
+
+
+def test_R3SourceMap_from_json_lazy():
+    from pyteal.compiler.sourcemap import _R3Entries
+
+    mappings = "AAGIA,IAAM,G;;ECDF,KAACC;ADEA;;"
+    smap = R3SourceMapJSON(
+        version=3, sources=["a.py", "b.py"], names=["foo", "bar"], mappings=mappings
+    )
+    contents = [
+        "\n".join(f"a{i} = foo(bar, baz)" for i in range(5)),
+        "\n".join(f"b{i} := qux(quux)" for i in range(5)),
+    ]
+    target = "int 1 // x\n\nbyte 0x00 ; foo\nlog\n\n"
+
+    r3sm = R3SourceMap.from_json(smap, sources_content_override=contents, target=target)
+    assert isinstance(r3sm.entries, _R3Entries)
+    assert r3sm.index == [(0, 4, 7), (), (2, 7), (0,), (), ()]
+    assert list(r3sm.entries) == [(0, 0), (0, 4), (0, 7), (2, 2), (2, 7), (3, 0)]
+    # nothing is built until accessed
+    assert not r3sm.entries._built
+    assert r3sm.to_json() == smap
+    assert not r3sm.entries._built
+
+    entry = r3sm[0, 1]
+    assert len(r3sm.entries._built) == 1
+    assert entry is r3sm.entries[0, 0]
+    assert str(entry) == "a.py::L3C4-10=' foo(b' <- L0C0-4='int '"
+    assert entry.name == "foo"
+
+    # sourceless segments and the last segments of lines are unbounded
+    assert str(r3sm[0, 7]) == "LNoneCNone-='?' <- L0C7-='?'"
+    assert str(r3sm[2, 7]) == "b.py::L2C9-='(quux)' <- L2C7-='00 ; foo'"
+    assert r3sm[2, 7].name == "bar"
+    assert str(r3sm[3]) == "a.py::L4C9-='bar, baz)' <- L3C0-='log'"
+
+    # built entries are encoded as they are
+    entry.source_column = 5
+    assert r3sm.to_json()["mappings"] == "AAGKA,IAAK,G;;ECDF,KAACC;ADEA;;"
+
+    unbounded = R3SourceMap.from_json(
+        smap, sources_content_override=contents, target=target, add_right_bounds=False
+    )
+    assert str(unbounded[0]) == "a.py::L3C4-=' foo(bar, baz)' <- L0C0-='int 1 // x'"
+    assert str(unbounded[2]) == "b.py::L2C8-='x(quux)' <- L2C2-='te 0x00 ; foo'"
+
+
+@pytest.mark.serial
+def test_PyTealSourceMap_spans(sourcemap_enabled):
+    from typing import cast
+
+    from algosdk.source_map import SourceMap as PCSourceMap
+
+    import pyteal as pt
+    from pyteal.compiler.sourcemap import PyTealSourceMap
+
+    def program():
+        x = pt.ScratchVar(pt.TealType.uint64)
+        return pt.Seq(
+            x.store(pt.Txn.fee()),
+            pt.If(x.load() > pt.Int(1)).Then(pt.Log(pt.Itob(x.load()))),
+            pt.Approve(),
+        )
+
+    results = pt.Compilation(program(), pt.Mode.Application, version=8).compile(
+        with_sourcemap=True
+    )
+    sourcemap = results.sourcemap
+    assert sourcemap and sourcemap.r3_sourcemap
+    this_file = "tests/unit/sourcemap_test.py"
+    store_line = program.__code__.co_firstlineno + 3
+    teal = results.teal.splitlines()
+
+    (store,) = sourcemap.teal_line_spans(this_file, store_line)
+    assert store == (2, 3)
+    assert teal[1:3] == ["txn Fee", "store 0"]
+    assert sourcemap.teal_line_spans(this_file, store_line, column=100) == []
+    assert sourcemap.teal_line_spans("unknown.py", store_line) == []
+
+    # the index agrees with a scan of the source map
+    entries = sourcemap.r3_sourcemap.entries.values()
+    for line in range(store_line - 1, store_line + 4):
+        expected = [
+            e.line + 1
+            for e in entries
+            if e.source == this_file
+            and cast(int, e.source_line) + 1 <= line <= cast(int, e.source_line_end) + 1
+        ]
+        spans = sourcemap.teal_line_spans(this_file, line)
+        assert [tl for first, last in spans for tl in range(first, last + 1)] == (
+            expected
+        )
+    whole = sourcemap.teal_line_spans(this_file, store_line, end_line=store_line + 2)
+    assert whole[0][0] == store[0]
+    assert whole[-1][1] == len(teal)
+
+    with pytest.raises(ValueError):
+        sourcemap.pc_spans(this_file, store_line)
+
+    # PC 0 for the first TEAL line, then two PC's for every other line
+    pcsm = PCSourceMap({"version": 3, "sources": [], "mappings": ";AACA;" * len(teal)})
+    with_pcs = PyTealSourceMap(None, sourcemap.r3_sourcemap, pcsm, None)
+    assert with_pcs.pc_spans(this_file, store_line) == [(1, 4)]
+
+
 @pytest.mark.serial
 def test_no_regression_with_sourcemap_as_configured_algobank():
     no_regressions_algobank()
@@ -420,6 +543,126 @@ def test_examples_sourcemap():
             ), f"index {i} doesn't match"
 
 
+@pytest.mark.serial
+def test_TealMapColumns(sourcemap_enabled):
+    import pyteal as pt
+    from pyteal.compiler.sourcemap import TealMapItem, _TealMapColumns
+
+    program = pt.Seq(
+        pt.Pop(pt.Txn.fee() + pt.Int(1)), pt.Log(pt.Txn.note()), pt.Approve()
+    )
+    bundle = pt.Compilation(program, pt.Mode.Application, version=8)._compile_impl(
+        with_sourcemap=True
+    )
+    sourcemapper = bundle.sourcemapper
+    assert sourcemapper
+
+    columns = sourcemapper._cached_tmis
+    assert isinstance(columns, _TealMapColumns)
+    assert len(columns) == len(bundle.teal.splitlines())
+
+    # frames and file names are stored once, not once per TEAL line
+    assert len(columns.origin_ids) <= len(columns.components) == len(columns)
+    assert columns.files == ["tests/unit/sourcemap_test.py"]
+
+    # and the frames themselves are not kept
+    assert not hasattr(columns, "frames")
+
+    attrs = {k: k for k in TealMapItem._dict_lazy_attrs}
+    tmis = sourcemapper.as_list()
+    assert [tmi.teal_line for tmi in tmis] == bundle.teal.splitlines()
+    for i, tmi in enumerate(tmis):
+        f = columns.frame_ids[i]
+        assert tmi.teal_lineno == i + 1
+        assert tmi.teal_component is columns.components[columns.component_ids[i]]
+        assert tmi.source_mapping() == columns.source_mapping(i)
+        assert tmi.node_source_window() == columns.windows[columns.window_ids[f]]
+        assert tmi.status_code() == columns.status_codes[f]
+        assert columns[i].asdict(**attrs) == tmi.asdict(**attrs)
+
+
+@pytest.mark.serial
+def test_write_annotated_teal(sourcemap_enabled):
+    import io
+
+    from examples.application.abi.algobank import router
+    from pyteal.ast.router import _RouterCompileInput
+    from pyteal.compiler.sourcemap import _PYTEAL_NODE_AST_SOURCE_BOUNDARIES
+
+    rci = _RouterCompileInput(version=6, assemble_constants=False, with_sourcemaps=True)
+    sourcemapper = router._build_impl(rci).approval_sourcemapper
+    assert sourcemapper
+
+    for omit_headers in (True, False):
+        for concise in (True, False):
+            columns = dict(teal="// GENERATED TEAL", const_col_2="//")
+            if not concise:
+                columns |= dict(
+                    pyteal_filename="PYTEAL PATH", pyteal_line_number="LINE"
+                )
+            columns |= dict(
+                pyteal_hybrid_unparsed="PYTEAL",
+                pyteal_node_ast_source_boundaries="PYTEAL RANGE",
+            )
+            tabulated = sourcemapper.tabulate(
+                tablefmt="plain",
+                numalign="left",
+                omit_headers=omit_headers,
+                omit_repeating_col_except=["// GENERATED TEAL", "_1"],
+                post_process_delete_cols=[_PYTEAL_NODE_AST_SOURCE_BOUNDARIES],
+                **columns,  # type: ignore
+            )
+
+            out = io.StringIO()
+            sourcemapper.write_annotated_teal(out, omit_headers, concise)
+            assert out.getvalue() == tabulated + "\n"
+            assert sourcemapper.annotated_teal(omit_headers, concise) == tabulated
+
+
+@pytest.mark.serial
+def test_sourcemapping_context(sourcemap_disabled):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import pyteal as pt
+    from pyteal.errors import SourceMapDisabledError
+    from pyteal.stack_frame import NatalStackFrame
+
+    outside = pt.Pop(pt.Int(1))
+    assert not outside.stack_frames._frames
+
+    with pt.sourcemapping_context():
+        assert not NatalStackFrame.sourcemapping_is_off()
+        # other threads still follow the feature gate
+        with ThreadPoolExecutor(1) as executor:
+            assert executor.submit(NatalStackFrame.sourcemapping_is_off).result()
+
+        inside = pt.Seq(outside, pt.Approve())
+        assert inside.stack_frames._frames
+        results = pt.Compilation(inside, pt.Mode.Application, version=8).compile(
+            with_sourcemap=True
+        )
+        # the second compilation without sourcemaps doesn't leave the context
+        assert not NatalStackFrame.sourcemapping_is_off()
+
+        with pt.sourcemapping_context(False):
+            assert NatalStackFrame.sourcemapping_is_off()
+        assert not NatalStackFrame.sourcemapping_is_off()
+
+    assert NatalStackFrame.sourcemapping_is_off()
+    assert not pt.Approve().stack_frames._frames
+
+    assert results.sourcemap and results.sourcemap.r3_sourcemap
+    sources = {
+        entry.source for entry in results.sourcemap.r3_sourcemap.entries.values()
+    }
+    assert sources == {"tests/unit/sourcemap_test.py"}
+
+    with pytest.raises(SourceMapDisabledError, match="sourcemapping_context"):
+        pt.Compilation(inside, pt.Mode.Application, version=8).compile(
+            with_sourcemap=True
+        )
+
+
 @pytest.mark.skip(
     reason="""Supressing this flaky test as 
 router_test::test_router_compile_program_idempotence is similar in its goals